@@ -13,7 +13,11 @@ from .workflow import build_claims_workflow, get_compiled_workflow, process_clai
 from .supervisor_workflow import (
     build_supervisor_workflow,
     get_compiled_supervisor_workflow,
-    process_claim_with_supervisor
+    process_claim_with_supervisor,
+    reprocess_claim,
+    resume_claim,
+    resume_interrupted_claims,
+    submit_review
 )
 
 __all__ = [
@@ -38,5 +42,9 @@ __all__ = [
     # Supervisor workflow functions
     "build_supervisor_workflow",
     "get_compiled_supervisor_workflow",
-    "process_claim_with_supervisor"
+    "process_claim_with_supervisor",
+    "reprocess_claim",
+    "resume_claim",
+    "resume_interrupted_claims",
+    "submit_review"
 ]
@@ -0,0 +1,76 @@
+"""
+Agent Input Recording for Incremental Reprocessing
+Records which state fields each agent read (and their values' digests) so a
+corrected claim only re-runs the agents whose inputs actually changed
+"""
+import hashlib
+import json
+from typing import Any, Dict, Optional, Set
+
+# Bookkeeping keys that are never agent inputs or reusable outputs. The
+# speculative fraud score is a cache of the claim fields it was computed
+# from (which the agents read themselves); without a mock seed it differs
+# on every run, so digesting it would defeat reuse.
+NON_MEMO_KEYS = {
+    "workflow_history", "agents_invoked", "node_timings", "agent_memo", "reuse_memo",
+    "next_hop", "parallel_branch", "total_processing_time_ms", "fraud_prescore"
+}
+
+
+def digest(value: Any) -> str:
+    """Stable short fingerprint of a state value"""
+    encoded = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+class TrackingState(dict):
+    """
+    State copy that records the keys an agent reads before writing them.
+
+    Agents take values with `state.get(...)`, `state[...]` and `in`; those
+    are the inputs. A key the agent wrote first is its own output and is not
+    counted.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reads: Set[str] = set()
+        self.written: Set[str] = set()
+
+    def _track(self, key):
+        if key not in self.written and key not in NON_MEMO_KEYS:
+            self.reads.add(key)
+
+    def __getitem__(self, key):
+        self._track(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self._track(key)
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self._track(key)
+        return super().__contains__(key)
+
+    def __setitem__(self, key, value):
+        self.written.add(key)
+        super().__setitem__(key, value)
+
+
+def memo_entry(before: Dict[str, Any], tracked: TrackingState, outputs: Dict[str, Any]) -> Dict[str, Any]:
+    """What one agent run read (as digests of the values it saw) and produced"""
+    return {
+        "inputs": {key: digest(before.get(key)) for key in sorted(tracked.reads)},
+        "outputs": {key: value for key, value in outputs.items() if key not in NON_MEMO_KEYS}
+    }
+
+
+def reusable_outputs(entry: Optional[Dict[str, Any]], state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The recorded outputs if every recorded input still has the same value, else None"""
+    if not entry:
+        return None
+    for key, recorded in entry["inputs"].items():
+        if digest(state.get(key)) != recorded:
+            return None
+    return entry["outputs"]
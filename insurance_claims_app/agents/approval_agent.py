@@ -2,7 +2,7 @@
 Claims Approval Agent
 Makes approval decisions and calculates payouts using external APIs
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -10,13 +10,58 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import config
 from external_apis import CarDamageAPI, FraudScoringAPI, PolicyManagementAPI
 from .state import ClaimState
+from .fraud_prescore import scored_assessment
+
+# Decisions that carry a payout
+PAYABLE_STATUSES = ("APPROVED", "NEEDS_REVIEW")
+
+# Reason prefixes of decisions made from the fraud score alone (see fraud_score_decision)
+FRAUD_DECISION_REASONS = ("High fraud risk detected", "Approved with monitoring flag", "Auto-approved")
+
+
+def fraud_score_decision(
+    fraud_score: float,
+    fraud_indicators: List[str],
+    high: float = None,
+    medium: float = None
+) -> Tuple[str, str]:
+    """(approval_status, approval_reason) for a fraud score; thresholds default to config"""
+    high = config.FRAUD_SCORE_HIGH if high is None else high
+    medium = config.FRAUD_SCORE_MEDIUM if medium is None else medium
+    if fraud_score > high:
+        return (
+            "NEEDS_REVIEW",
+            f"High fraud risk detected (score: {fraud_score:.2f}). Manual review required. Indicators: {', '.join(fraud_indicators)}"
+        )
+    elif fraud_score > medium:
+        return (
+            "APPROVED",
+            f"Approved with monitoring flag. Moderate fraud risk (score: {fraud_score:.2f})"
+        )
+    else:
+        return (
+            "APPROVED",
+            f"Auto-approved. Low fraud risk (score: {fraud_score:.2f})"
+        )
+
+
+def processing_days_for(fraud_score: float, low: float = None) -> int:
+    """Expected processing days for a fraud score; the low threshold defaults to config"""
+    low = config.FRAUD_SCORE_LOW if low is None else low
+    if fraud_score < low:
+        return 2
+    elif fraud_score < 0.5:
+        return 5
+    else:
+        return 10
+
 
 class ClaimsApprovalAgent:
     """Agent that approves/denies claims and calculates payouts"""
     
     def __init__(self):
-        self.damage_api = CarDamageAPI(config.ARYA_API_KEY)
-        self.fraud_api = FraudScoringAPI(config.FRAUD_API_KEY)
+        self.damage_api = CarDamageAPI(config.ARYA_API_KEY, seed=config.MOCK_API_SEED)
+        self.fraud_api = FraudScoringAPI(config.FRAUD_API_KEY, seed=config.MOCK_API_SEED)
         self.policy_api = PolicyManagementAPI(config.POLICY_API_KEY)
     
     def process_approval(self, state: ClaimState) -> ClaimState:
@@ -40,6 +85,10 @@ class ClaimsApprovalAgent:
             state["current_step"] = "approval_complete"
             return state
         
+        # A human reviewer's decision replaces the fraud-based decision
+        if state.get("human_review_decision") in ("APPROVE", "DENY"):
+            return self._apply_review_decision(state)
+        
         # 1. Get damage assessment from Car Damage API
         damage_assessment = self.damage_api.analyze_damage(
             photos=state.get("damage_photos", []),
@@ -47,14 +96,8 @@ class ClaimsApprovalAgent:
         )
         state["damage_assessment"] = damage_assessment
         
-        # 2. Get fraud score
-        fraud_assessment = self.fraud_api.score_claim(
-            claim_amount=state.get("estimated_damage_amount", 0),
-            repair_shop=state.get("repair_shop", ""),
-            claimant_id=state.get("customer_id", ""),
-            vehicle_age=5,  # Default, would come from vehicle data
-            damage_type=state.get("claim_type", "collision")
-        )
+        # 2. Get fraud score (usually already computed while the claim was validated)
+        fraud_assessment = scored_assessment(state, self.fraud_api)
         state["fraud_assessment"] = fraud_assessment
         state["fraud_score"] = fraud_assessment["fraud_score"]
         state["fraud_flags"] = fraud_assessment.get("fraud_indicators", [])
@@ -81,7 +124,7 @@ class ClaimsApprovalAgent:
         state["approval_reason"] = approval_reason
         
         # 5. Calculate payout if approved
-        if approval_status in ["APPROVED", "NEEDS_REVIEW"]:
+        if approval_status in PAYABLE_STATUSES:
             payout = self._calculate_payout(
                 damage_amount=damage_assessment["total_estimated_repair_cost"],
                 deductible=policy_details["deductible"],
@@ -99,23 +142,40 @@ class ClaimsApprovalAgent:
         
         return state
     
-    def _make_decision(self, fraud_score: float, fraud_assessment: Dict) -> tuple:
-        """Make approval decision based on fraud score"""
-        if fraud_score > config.FRAUD_SCORE_HIGH:
-            return (
-                "NEEDS_REVIEW",
-                f"High fraud risk detected (score: {fraud_score:.2f}). Manual review required. Indicators: {', '.join(fraud_assessment.get('fraud_indicators', []))}"
-            )
-        elif fraud_score > config.FRAUD_SCORE_MEDIUM:
-            return (
-                "APPROVED",
-                f"Approved with monitoring flag. Moderate fraud risk (score: {fraud_score:.2f})"
-            )
+    def _apply_review_decision(self, state: ClaimState) -> ClaimState:
+        """Finalize a claim from a human review, reusing assessments already in state"""
+        notes = state.get("human_reviewer_notes") or "no notes"
+        policy_details = state.get("policy_details") or self.policy_api.get_policy_details(state.get("policy_id"))
+        state["policy_details"] = policy_details
+        
+        if state["human_review_decision"] == "DENY" or not policy_details:
+            state["approval_status"] = "DENIED"
+            state["approval_reason"] = f"Denied by human review: {notes}" if policy_details else "Policy not found"
+            state["payout_amount"] = 0
         else:
-            return (
-                "APPROVED",
-                f"Auto-approved. Low fraud risk (score: {fraud_score:.2f})"
+            damage_assessment = state.get("damage_assessment")
+            if not damage_assessment:
+                damage_assessment = self.damage_api.analyze_damage(
+                    photos=state.get("damage_photos", []),
+                    estimated_amount=state.get("estimated_damage_amount")
+                )
+                state["damage_assessment"] = damage_assessment
+            state["approval_status"] = "APPROVED"
+            state["approval_reason"] = f"Approved by human review: {notes}"
+            state["payout_amount"] = self._calculate_payout(
+                damage_amount=damage_assessment["total_estimated_repair_cost"],
+                deductible=policy_details["deductible"],
+                coverage_limit=policy_details["coverage_limit"]
             )
+        if policy_details:
+            state["deductible"] = policy_details["deductible"]
+        state["processing_days"] = self._get_processing_days(state.get("fraud_score") or 0)
+        state["current_step"] = "approval_complete"
+        return state
+    
+    def _make_decision(self, fraud_score: float, fraud_assessment: Dict) -> tuple:
+        """Make approval decision based on fraud score"""
+        return fraud_score_decision(fraud_score, fraud_assessment.get("fraud_indicators", []))
     
     def _calculate_payout(self, damage_amount: float, deductible: float, coverage_limit: float) -> float:
         """Calculate payout amount"""
@@ -126,9 +186,4 @@ class ClaimsApprovalAgent:
     
     def _get_processing_days(self, fraud_score: float) -> int:
         """Determine processing days based on fraud score"""
-        if fraud_score < config.FRAUD_SCORE_LOW:
-            return 2
-        elif fraud_score < 0.5:
-            return 5
-        else:
-            return 10
+        return processing_days_for(fraud_score)
@@ -0,0 +1,188 @@
+"""
+Batch Fraud Scoring
+Scores a whole column of claims at once - the Fraud Scoring API rules plus
+the FraudInvestigationAgent's pattern, repair shop, customer history and
+image checks - with array operations instead of per-claim branching, for
+re-scoring the book of claims in bulk
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, Mapping, Sequence
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from external_apis import FraudScoringAPI
+from .shop_reputation import RepairShopReputation, get_shop_reputation
+
+# Vehicle age used when a claim carries none (as in FraudInvestigationAgent._get_fraud_assessment)
+DEFAULT_VEHICLE_AGE = 5
+
+# Columns read by score_claims; only the first four are required
+CLAIM_COLUMNS = (
+    "estimated_damage_amount", "repair_shop", "incident_date", "claim_date",
+    "customer_id", "vehicle_age", "claim_count", "claims_last_90_days",
+    "duplicate_images", "image_duplicate"
+)
+
+RECOMMENDATIONS = np.array([
+    "APPROVE - Low fraud risk",
+    "APPROVE_WITH_MONITORING - Moderate risk",
+    "ESCALATE - Requires human review",
+    "DENY - High fraud probability"
+])
+
+
+def claims_to_columns(claims: Iterable[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Columnar batch from claim rows (e.g. get_all_claims).
+
+    Optional columns (vehicle age, customer history, image checks) are only
+    included when every claim carries them.
+    """
+    claims = list(claims)
+    columns = {
+        "claim_id": np.array([c.get("claim_id") or "" for c in claims], dtype=str),
+        "estimated_damage_amount": np.array([c.get("estimated_damage_amount") or 0 for c in claims], dtype=float),
+        "repair_shop": np.array([c.get("repair_shop") or "" for c in claims], dtype=str),
+        "incident_date": np.array([c.get("incident_date") or "" for c in claims], dtype=str),
+        "claim_date": np.array([c.get("claim_date") or "" for c in claims], dtype=str),
+        "customer_id": np.array([c.get("customer_id") or "" for c in claims], dtype=str)
+    }
+    for name in ("vehicle_age", "claim_count", "claims_last_90_days", "duplicate_images", "image_duplicate"):
+        if claims and all(c.get(name) is not None for c in claims):
+            columns[name] = np.array([c[name] for c in claims])
+    return columns
+
+
+def _to_datetime64(values: Sequence[str]) -> np.ndarray:
+    """ISO timestamps -> datetime64[s]; anything unparseable becomes NaT"""
+    values = np.asarray(values, dtype=str)
+    try:
+        return values.astype("datetime64[s]")
+    except ValueError:
+        parsed = np.full(values.shape, np.datetime64("NaT"), dtype="datetime64[s]")
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = np.datetime64(datetime.fromisoformat(value), "s")
+            except ValueError:
+                pass
+        return parsed
+
+
+def _column(columns, name: str, default=None, dtype=None) -> np.ndarray:
+    """Column as an array; `columns` may be a mapping of arrays/lists or a pandas DataFrame"""
+    if name in columns:
+        return np.asarray(columns[name], dtype=dtype)
+    if default is None:
+        raise KeyError(f"Batch is missing required column {name!r}")
+    return default
+
+
+def _shop_risk_levels(shops: np.ndarray, reputation: RepairShopReputation) -> np.ndarray:
+    """Risk level per claim, assessing each distinct shop name once"""
+    names, inverse = np.unique(shops, return_inverse=True)
+    levels = np.array([reputation.assess(name)["risk_level"] for name in names], dtype=str)
+    return levels[inverse] if len(names) else np.array([], dtype=str)
+
+
+def score_claims(
+    columns: Mapping[str, Sequence],
+    seed: int = None,
+    fraud_api: FraudScoringAPI = None,
+    shop_reputation: RepairShopReputation = None
+) -> Dict[str, np.ndarray]:
+    """
+    Score a columnar batch of claims (see CLAIM_COLUMNS).
+
+    Combines the API base score with the investigation's risk and
+    mitigating factors exactly as FraudInvestigationAgent.investigate does.
+    Customer history factors only apply when the batch has claim_count and
+    claims_last_90_days columns. The API noise is drawn from a generator
+    seeded with `seed` (MOCK_API_SEED by default), so the same batch always
+    scores the same. Without any seed, each run draws fresh noise.
+
+    Returns one array per output column: fraud_score, base_score,
+    risk_factor_count, mitigating_factor_count, recommendation, the API's
+    risk_level and one boolean column per rule.
+    """
+    amounts = _column(columns, "estimated_damage_amount", dtype=float)
+    n = len(amounts)
+    shop_names = _column(columns, "repair_shop", dtype=str)
+    shops = np.char.lower(shop_names)
+    incident = _to_datetime64(_column(columns, "incident_date", dtype=str))
+    claimed = _to_datetime64(_column(columns, "claim_date", dtype=str))
+    ages = _column(columns, "vehicle_age", np.full(n, DEFAULT_VEHICLE_AGE), dtype=float)
+
+    seed = config.MOCK_API_SEED if seed is None else seed
+    fraud_api = fraud_api or FraudScoringAPI(config.FRAUD_API_KEY, seed=seed)
+    api = fraud_api.score_claims_batch(amounts, shops, ages, rng=np.random.default_rng(seed))
+
+    # Claim patterns (_analyze_claim_patterns); both dates must parse for the timing checks
+    dated = ~np.isnat(incident) & ~np.isnat(claimed)
+    elapsed_s = (claimed - incident).astype(np.int64)
+    same_day = dated & (elapsed_s >= 0) & (elapsed_s < 86400)
+    weekday = (incident.astype("datetime64[D]").astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    weekend = dated & (weekday >= 5)
+    round_amount = (amounts > 1000) & (amounts % 1000 == 0)
+    above_average = amounts > 30000
+
+    # Repair shop reputation (_check_repair_shop)
+    shop_risk = _shop_risk_levels(shop_names, shop_reputation or get_shop_reputation())
+    high_risk_shop = shop_risk == "high"
+    low_risk_shop = shop_risk == "low"
+
+    # Customer history (_analyze_customer_history)
+    zeros = np.zeros(n, dtype=bool)
+    if "customer_id" in columns:
+        known_customer = np.char.str_len(_column(columns, "customer_id", dtype=str)) > 0
+    else:
+        known_customer = ~zeros
+    if "claim_count" in columns and "claims_last_90_days" in columns:
+        many_claims = known_customer & (_column(columns, "claim_count", dtype=float) > 3)
+        history_positive = known_customer & ~many_claims
+        high_velocity = known_customer & (_column(columns, "claims_last_90_days", dtype=float) > 3)
+    else:
+        many_claims = history_positive = high_velocity = zeros
+
+    # Image checks
+    duplicate_images = _column(columns, "duplicate_images", zeros, dtype=bool)
+    image_duplicate = _column(columns, "image_duplicate", zeros, dtype=bool)
+
+    score = api["fraud_score"].copy()
+    score = np.minimum(1.0, score + 0.2 * duplicate_images)
+    score = np.minimum(1.0, score + 0.3 * image_duplicate)
+
+    risk = (
+        same_day.astype(int) + weekend + round_amount + above_average
+        + high_risk_shop + many_claims + high_velocity + duplicate_images + image_duplicate
+    )
+    mitigating = low_risk_shop.astype(int) + history_positive
+    net = risk - mitigating
+    score = np.where(net > 0, np.minimum(1.0, score + 0.1 * net), score)
+    score = np.where(net < 0, np.maximum(0.0, score + 0.05 * net), score)
+    band = np.select([score > 0.8, score > 0.6, score > 0.4], [3, 2, 1], default=0)
+    return {
+        "fraud_score": np.round(score, 3),
+        "base_score": api["fraud_score"],
+        "risk_level": api["risk_level"],
+        "recommendation": RECOMMENDATIONS[band],
+        "risk_factor_count": risk,
+        "mitigating_factor_count": mitigating,
+        "high_value_claim": api["high_value_claim"],
+        "high_claim_old_vehicle": api["high_claim_old_vehicle"],
+        "unverified_repair_shop": api["unverified_repair_shop"],
+        "same_day_filing": same_day,
+        "weekend_incident": weekend,
+        "round_amount": round_amount,
+        "amount_above_average": above_average,
+        "high_risk_shop": high_risk_shop,
+        "low_risk_shop": low_risk_shop,
+        "many_previous_claims": many_claims,
+        "high_claim_velocity": high_velocity,
+        "duplicate_images": duplicate_images,
+        "image_duplicate": image_duplicate
+    }
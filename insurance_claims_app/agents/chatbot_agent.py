@@ -7,14 +7,12 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from langchain_community.chat_models.oci_generative_ai import ChatOCIGenAI
 from langchain_core.messages import HumanMessage, SystemMessage
-from sentence_transformers import SentenceTransformer
 
 from config import config
-from external_apis import DocumentManagementAPI
-from database import get_claim, get_policy
-from database.vector_store import OracleVectorStore
+from external_apis import DocumentManagementAPI, get_llm_client
+from database import get_claim, get_policy, OracleVectorStore
+from database.lexical_index import reciprocal_rank_fusion
 
 class InsuranceChatbotAgent:
     """Chatbot agent using Oracle 23ai Vector Store for RAG"""
@@ -22,19 +20,22 @@ class InsuranceChatbotAgent:
     def __init__(self):
         self.doc_api = DocumentManagementAPI()
         self.llm = self._init_llm()
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.embedding_model = self._init_embedding_model()
         self.vector_store = OracleVectorStore(self.embedding_model)
+        self.lexical_index = self.doc_api.get_lexical_index()
         self._init_vector_store()
     
     def _init_llm(self):
-        """Initialize OCI GenAI LLM"""
-        return ChatOCIGenAI(
-            model_id=config.OCI_MODEL_ID,
-            service_endpoint=config.OCI_SERVICE_ENDPOINT,
-            compartment_id=config.OCI_COMPARTMENT_ID,
-            auth_type="API_KEY",
-            model_kwargs={"temperature": 0, "max_tokens": 500}
-        )
+        """LLM for answers, via the shared client's interactive lane (ahead of claim processing)"""
+        return get_llm_client().lane("interactive")
+    
+    def _init_embedding_model(self):
+        """Sentence embeddings; the fake backend swaps in a hashed model for offline runs"""
+        if config.LLM_BACKEND == "fake":
+            from external_apis.fake_llm import FakeEmbeddingModel
+            return FakeEmbeddingModel()
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer('all-MiniLM-L6-v2')
     
     def _init_vector_store(self):
         """Initialize vector store with policy documents"""
@@ -44,22 +45,8 @@ class InsuranceChatbotAgent:
             return
         
         print("Loading policy documents into Oracle Vector Store...")
-        documents = self.doc_api.get_policy_documents()
-        
-        # Split documents into chunks
-        chunks = []
-        for doc in documents:
-            content = doc["content"]
-            # Simple chunking by paragraphs
-            paragraphs = content.split("\n\n")
-            for i, para in enumerate(paragraphs):
-                if para.strip():
-                    chunks.append({
-                        "id": f"{doc['id']}_{i}",
-                        "title": doc["title"],
-                        "content": para.strip(),
-                        "metadata": {"source": doc["id"], "chunk": i}
-                    })
+        # Same paragraph chunks as the BM25 index, so ids line up for fusion
+        chunks = self.doc_api.get_policy_chunks()
         
         # Generate embeddings
         texts = [chunk["content"] for chunk in chunks]
@@ -101,9 +88,8 @@ class InsuranceChatbotAgent:
             elif any(word in question_lower for word in ["risk", "risky", "fraud", "why flagged", "why high", "suspicious", "duplicate"]):
                 return self._answer_fraud_risk(claim_id)
         
-        # RAG search using Oracle Vector Store
-        query_embedding = self.embedding_model.encode(question).tolist()
-        relevant_docs = self.vector_store.similarity_search(query_embedding, k=3)
+        # Hybrid retrieval: local BM25 first, Oracle vector search only when needed
+        relevant_docs = self.retrieve_documents(question, k=3)
         rag_context = "\n\n".join([doc["content"] for doc in relevant_docs])
         
         # Build prompt
@@ -140,6 +126,33 @@ Please provide a helpful answer based on the above information."""
             "claim_id": claim_id
         }
     
+    def retrieve_documents(self, question: str, k: int = 3) -> List[Dict[str, Any]]:
+        """
+        Retrieve policy chunks for a question.
+        
+        Answers from the local BM25 index alone when its top hit is confident;
+        otherwise fuses BM25 and Oracle vector results with reciprocal rank fusion.
+        """
+        lexical_hits = self.lexical_index.search(question, k=k * 2)
+        confidence = self.lexical_index.confidence(lexical_hits, config.LEXICAL_MIN_MATCHED_TERMS)
+        if confidence >= config.LEXICAL_CONFIDENCE_THRESHOLD:
+            return lexical_hits[:k]
+        
+        try:
+            query_embedding = self.embedding_model.encode(question).tolist()
+            vector_hits = self.vector_store.similarity_search(query_embedding, k=k * 2)
+        except Exception as e:
+            print(f"Vector search error, using lexical results only: {e}")
+            return lexical_hits[:k]
+        
+        docs_by_id = {doc["id"]: doc for doc in vector_hits}
+        docs_by_id.update({doc["id"]: doc for doc in lexical_hits})
+        fused = reciprocal_rank_fusion(
+            [[doc["id"] for doc in lexical_hits], [doc["id"] for doc in vector_hits]],
+            k=config.RRF_K
+        )
+        return [docs_by_id[doc_id] for doc_id, _ in fused[:k]]
+    
     def _build_claim_context(self, claim: Dict) -> str:
         """Build context string from claim data"""
         return f"""
@@ -0,0 +1,254 @@
+"""
+Priority-Aware Claim Scheduler
+Orders pending claims by supervisor priority and age and runs them on
+per-priority worker pools, so a flood of low-priority claims cannot starve
+critical ones
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from external_apis import Deadline, deadline_scope
+from monitoring import get_registry
+
+# Supervisor priorities, most urgent first
+PRIORITIES = ("critical", "high", "medium", "low")
+PRIORITY_RANK = {priority: rank for rank, priority in enumerate(PRIORITIES)}
+
+_metrics = get_registry()
+QUEUE_DEPTH = _metrics.gauge("claim_queue_depth", "Claims waiting for a worker, by priority")
+QUEUE_WAIT = _metrics.histogram("claim_queue_wait_ms", "Time from submission to a worker picking the claim up, by priority")
+CLAIMS_SCHEDULED = _metrics.counter("claims_scheduled_total", "Claims run by the scheduler, by priority and pool")
+
+
+def parse_pool_sizes(spec: str) -> Dict[str, int]:
+    """"critical=2,high=2,medium=4,low=2" -> {"critical": 2, ...}; unknown priorities are rejected"""
+    sizes = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        priority, _, size = part.partition("=")
+        priority = priority.strip()
+        if priority not in PRIORITY_RANK:
+            raise ValueError(f"Unknown priority in scheduler pool sizes: {priority!r}")
+        sizes[priority] = int(size)
+    return sizes
+
+
+class ScheduledClaim:
+    """
+    One pending claim; `future` resolves to the final workflow state.
+    
+    An interactive claim passes the deadline that started at its submission,
+    so time spent queued counts against the budget its caller waits on. A
+    background claim (no deadline) gets a fresh budget when a worker picks it
+    up: however long the backlog, it is processed, not timed out in the queue.
+    """
+    __slots__ = ("claim_data", "priority", "enqueued_at", "deadline", "future")
+
+    def __init__(self, claim_data: Dict[str, Any], priority: str, deadline: Deadline = None):
+        self.claim_data = claim_data
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.deadline = deadline
+        self.future: Future = Future()
+
+
+class InProcessClaimQueue:
+    """
+    In-memory claim queue: one FIFO per priority.
+
+    `take(max_rank)` only returns claims at or above that priority rank.
+    Among those, the head of each FIFO (its oldest claim) competes on
+    priority rank minus one level per `aging_s` waited, so a claim that
+    has waited long enough catches up with newer, more urgent ones.
+    """
+
+    def __init__(self, aging_s: float = None):
+        self.aging_s = aging_s if aging_s is not None else config.SCHEDULER_AGING_S
+        self._queues: Dict[str, Deque[ScheduledClaim]] = {priority: deque() for priority in PRIORITIES}
+        self._ready = threading.Condition()
+        self._closed = False
+
+    def put(self, item: ScheduledClaim):
+        with self._ready:
+            if self._closed:
+                raise RuntimeError("Claim queue is closed")
+            self._queues[item.priority].append(item)
+            QUEUE_DEPTH.set(len(self._queues[item.priority]), priority=item.priority)
+            self._ready.notify_all()
+
+    def take(self, max_rank: int, timeout: float = None) -> Optional[ScheduledClaim]:
+        """Next claim for a worker serving priorities ranked <= max_rank; None on timeout or close"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._ready:
+            while True:
+                item = self._pop_next(max_rank)
+                if item is not None or self._closed:
+                    return item
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._ready.wait(remaining)
+
+    def _pop_next(self, max_rank: int) -> Optional[ScheduledClaim]:
+        now = time.monotonic()
+        best_key, best_priority = None, None
+        for priority in PRIORITIES[:max_rank + 1]:
+            queue = self._queues[priority]
+            if not queue:
+                continue
+            head = queue[0]
+            promoted = int((now - head.enqueued_at) / self.aging_s) if self.aging_s > 0 else 0
+            key = (PRIORITY_RANK[priority] - promoted, head.enqueued_at)
+            if best_key is None or key < best_key:
+                best_key, best_priority = key, priority
+        if best_priority is None:
+            return None
+        item = self._queues[best_priority].popleft()
+        QUEUE_DEPTH.set(len(self._queues[best_priority]), priority=best_priority)
+        return item
+
+    def depth(self) -> Dict[str, int]:
+        with self._ready:
+            return {priority: len(queue) for priority, queue in self._queues.items()}
+
+    def close(self) -> List[ScheduledClaim]:
+        """Stop handing out claims; returns the ones still queued"""
+        with self._ready:
+            self._closed = True
+            left = [item for priority in PRIORITIES for item in self._queues[priority]]
+            for priority, queue in self._queues.items():
+                queue.clear()
+                QUEUE_DEPTH.set(0, priority=priority)
+            self._ready.notify_all()
+        return left
+
+
+class ClaimScheduler:
+    """
+    Runs submitted claims through the supervisor workflow on worker pools.
+
+    Each priority has its own pool (SCHEDULER_POOL_SIZES). A pool serves its
+    own priority and every more urgent one, never a less urgent one: low
+    workers pick up anything, critical workers only critical claims. A
+    backlog of low-priority claims therefore occupies only the low pool,
+    while idle low workers still help drain urgent work.
+
+    A claim's priority is the supervisor's complexity priority computed from
+    the submitted fields (amount, claim type, photos, image fraud check) -
+    the same one the workflow starts from.
+    """
+
+    def __init__(
+        self,
+        processor: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        queue: InProcessClaimQueue = None,
+        pool_sizes: Dict[str, int] = None,
+        triage: Optional[Callable[[Dict[str, Any]], str]] = None
+    ):
+        if processor is None:
+            from .supervisor_workflow import process_claim_with_supervisor
+
+            def processor(claim_data):
+                return process_claim_with_supervisor(claim_data, with_memory=config.WORKFLOW_CHECKPOINTING)
+
+        if triage is None:
+            from .supervisor_workflow import supervisor
+
+            def triage(claim_data):
+                return supervisor.analyze_claim_complexity(claim_data)["priority"]
+
+        self.processor = processor
+        self.triage = triage
+        self.queue = queue or InProcessClaimQueue()
+        self.pool_sizes = pool_sizes or parse_pool_sizes(config.SCHEDULER_POOL_SIZES)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    # ---- lifecycle -------------------------------------------------------
+
+    def start(self):
+        """Start the worker pools (idempotent)"""
+        with self._lock:
+            if self._threads:
+                return
+            for priority, size in self.pool_sizes.items():
+                for index in range(size):
+                    thread = threading.Thread(
+                        target=self._work, args=(priority,), name=f"claims-{priority}-{index}", daemon=True
+                    )
+                    thread.start()
+                    self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0):
+        """Stop taking claims; claims still queued fail with RuntimeError"""
+        for item in self.queue.close():
+            item.future.set_exception(RuntimeError("Claim scheduler stopped before the claim ran"))
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join(timeout)
+
+    # ---- submitting ------------------------------------------------------
+
+    def submit(self, claim_data: Dict[str, Any], priority: str = None, deadline: Deadline = None) -> Future:
+        """Queue a claim; the returned future resolves to its final workflow state"""
+        priority = priority or self.triage(claim_data)
+        if priority not in PRIORITY_RANK:
+            priority = "medium"
+        item = ScheduledClaim(claim_data, priority, deadline)
+        self.queue.put(item)
+        return item.future
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue.depth(),
+            "pool_sizes": dict(self.pool_sizes),
+            "wait_p95_ms": {priority: QUEUE_WAIT.percentile(95, priority=priority) for priority in PRIORITIES}
+        }
+
+    # ---- workers ---------------------------------------------------------
+
+    def _work(self, pool: str):
+        max_rank = PRIORITY_RANK[pool]
+        while True:
+            item = self.queue.take(max_rank)
+            if item is None:
+                return
+            if not item.future.set_running_or_notify_cancel():
+                continue
+            QUEUE_WAIT.observe((time.monotonic() - item.enqueued_at) * 1000, priority=item.priority)
+            CLAIMS_SCHEDULED.inc(priority=item.priority, pool=pool)
+            try:
+                with deadline_scope(item.deadline or Deadline.after()):
+                    item.future.set_result(self.processor(item.claim_data))
+            except Exception as e:
+                item.future.set_exception(e)
+
+
+_scheduler: Optional[ClaimScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_claim_scheduler() -> ClaimScheduler:
+    """Shared, started claim scheduler for this process"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ClaimScheduler()
+            _scheduler.start()
+        return _scheduler
+
+
+def stop_claim_scheduler():
+    """Stop the shared scheduler, if it was started"""
+    global _scheduler
+    with _scheduler_lock:
+        scheduler, _scheduler = _scheduler, None
+    if scheduler is not None:
+        scheduler.stop()
@@ -0,0 +1,241 @@
+"""
+Decision Backfill
+Re-decides stored claims after FRAUD_SCORE_HIGH/MEDIUM/LOW change: streams
+decided claims by keyset, re-applies the approval rules on a process pool,
+writes changed decisions back in batches and reports every change
+
+Usage:
+    python -m agents.decision_backfill --high 0.65 --medium 0.35            # dry run: diff report only
+    python -m agents.decision_backfill --high 0.65 --medium 0.35 --apply    # also write the new decisions
+
+A run is identified by its thresholds and mode. Re-running the same command
+after an interruption resumes after the last committed chunk; --restart
+starts over.
+"""
+import argparse
+import csv
+import json
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from database import iter_claim_decisions, update_claim_decisions
+from .approval_agent import FRAUD_DECISION_REASONS, PAYABLE_STATUSES, fraud_score_decision, processing_days_for
+
+REPORT_COLUMNS = (
+    "claim_id", "fraud_score", "old_status", "new_status",
+    "old_processing_days", "new_processing_days", "old_payout", "new_payout"
+)
+
+
+def current_thresholds() -> Dict[str, float]:
+    return {"high": config.FRAUD_SCORE_HIGH, "medium": config.FRAUD_SCORE_MEDIUM, "low": config.FRAUD_SCORE_LOW}
+
+
+def redecide_chunk(chunk: List[Dict[str, Any]], thresholds: Dict[str, float]) -> List[Dict[str, Any]]:
+    """
+    Decisions in `chunk` that change under `thresholds` (runs in pool workers).
+
+    Only decisions made from the fraud score are re-made. Denials, human
+    review outcomes and supervisor escalations are left alone. Every
+    re-decided claim was payable and fraud decisions are always payable, so
+    a payout only changes if a decision stops being payable.
+    """
+    changes = []
+    for claim in chunk:
+        if not (claim["approval_reason"] or "").startswith(FRAUD_DECISION_REASONS):
+            continue
+        fraud_score = float(claim["fraud_score"])
+        flags = claim["fraud_flags"] or []
+        if isinstance(flags, str):
+            flags = json.loads(flags)
+
+        status, reason = fraud_score_decision(fraud_score, flags, thresholds["high"], thresholds["medium"])
+        days = processing_days_for(fraud_score, thresholds["low"])
+        old_payout = float(claim["payout_amount"] or 0)
+        payout = old_payout if status in PAYABLE_STATUSES else 0.0
+        old_days = claim["processing_time_days"]
+        if status == claim["approval_status"] and days == old_days and payout == old_payout:
+            continue
+
+        changes.append({
+            "claim_id": claim["claim_id"],
+            "customer_id": claim["customer_id"],
+            "fraud_score": fraud_score,
+            "old_status": claim["approval_status"],
+            "approval_status": status,
+            # Keep the original wording unless the decision itself changed
+            "approval_reason": reason if status != claim["approval_status"] else claim["approval_reason"],
+            "old_processing_days": old_days,
+            "processing_time_days": days,
+            "old_payout": old_payout,
+            "payout_amount": payout,
+            "payout_delta": round(payout - old_payout, 2)
+        })
+    return changes
+
+
+class DecisionBackfill:
+    """
+    One backfill run over every decided claim.
+
+    Chunks of BACKFILL_CHUNK_SIZE claims are read in claim_id order and
+    decided on BACKFILL_WORKERS processes. At most two chunks per worker
+    are in flight, so memory stays flat on any number of claims. Results
+    are committed in claim_id order, one transaction per chunk. The commit
+    appends the chunk's changes to the CSV diff report, writes them to the
+    claims table (with `apply`), and records the last claim_id and the
+    report size in the run's checkpoint. A resumed run cuts the report back
+    to the checkpointed size and continues after that claim_id.
+    """
+
+    def __init__(
+        self,
+        thresholds: Dict[str, float] = None,
+        apply: bool = False,
+        chunk_size: int = None,
+        workers: int = None,
+        run_dir: str = None
+    ):
+        self.thresholds = thresholds or current_thresholds()
+        self.apply = apply
+        self.chunk_size = chunk_size or config.BACKFILL_CHUNK_SIZE
+        self.workers = config.BACKFILL_WORKERS if workers is None else workers
+        self.run_dir = run_dir or config.BACKFILL_DIR
+        mode = "apply" if apply else "dryrun"
+        self.run_id = "decisions-h{high}-m{medium}-l{low}".format(**self.thresholds) + f"-{mode}"
+        self.checkpoint_path = os.path.join(self.run_dir, f"{self.run_id}.checkpoint.json")
+        self.report_path = os.path.join(self.run_dir, f"{self.run_id}.diff.csv")
+
+    # ---- checkpoint ------------------------------------------------------
+
+    def _load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]):
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    @staticmethod
+    def _new_checkpoint(thresholds: Dict[str, float], apply: bool) -> Dict[str, Any]:
+        return {
+            "thresholds": thresholds, "apply": apply, "after_claim_id": None, "report_bytes": 0,
+            "completed": False, "scanned": 0, "changed": 0, "written": 0, "stale": 0,
+            "transitions": {}, "processing_days_changed": 0, "payout_delta": 0.0, "elapsed_s": 0.0
+        }
+
+    # ---- run -------------------------------------------------------------
+
+    def run(self, restart: bool = False) -> Dict[str, Any]:
+        """Run (or resume) the backfill; returns the run summary"""
+        os.makedirs(self.run_dir, exist_ok=True)
+        checkpoint = None if restart else self._load_checkpoint()
+        if checkpoint is not None and checkpoint["completed"]:
+            return checkpoint
+        if checkpoint is None:
+            checkpoint = self._new_checkpoint(self.thresholds, self.apply)
+
+        started = time.perf_counter()
+        with open(self.report_path, "a+", newline="", encoding="utf-8") as report:
+            # Drop rows written after the last checkpoint; their chunk runs again
+            report.truncate(checkpoint["report_bytes"])
+            report.seek(checkpoint["report_bytes"])
+            writer = csv.writer(report)
+            if checkpoint["report_bytes"] == 0:
+                writer.writerow(REPORT_COLUMNS)
+
+            chunks = iter_claim_decisions(self.chunk_size, checkpoint["after_claim_id"])
+            if self.workers > 0:
+                with ProcessPoolExecutor(self.workers) as pool:
+                    in_flight = deque()
+                    for chunk in chunks:
+                        future = pool.submit(redecide_chunk, chunk, self.thresholds)
+                        in_flight.append((chunk[-1]["claim_id"], len(chunk), future))
+                        if len(in_flight) >= 2 * self.workers:
+                            last_id, scanned, future = in_flight.popleft()
+                            self._commit(checkpoint, report, writer, last_id, scanned, future.result())
+                    while in_flight:
+                        last_id, scanned, future = in_flight.popleft()
+                        self._commit(checkpoint, report, writer, last_id, scanned, future.result())
+            else:
+                for chunk in chunks:
+                    changes = redecide_chunk(chunk, self.thresholds)
+                    self._commit(checkpoint, report, writer, chunk[-1]["claim_id"], len(chunk), changes)
+
+        checkpoint["completed"] = True
+        checkpoint["elapsed_s"] = round(checkpoint["elapsed_s"] + time.perf_counter() - started, 3)
+        checkpoint["report_path"] = self.report_path
+        self._save_checkpoint(checkpoint)
+        return checkpoint
+
+    def _commit(self, checkpoint, report, writer, last_claim_id: str, scanned: int, changes: List[Dict[str, Any]]):
+        """Report, write and checkpoint one chunk, in that order"""
+        for change in changes:
+            writer.writerow([
+                change["claim_id"], change["fraud_score"], change["old_status"], change["approval_status"],
+                change["old_processing_days"], change["processing_time_days"],
+                change["old_payout"], change["payout_amount"]
+            ])
+        report.flush()
+
+        if self.apply and changes:
+            written = update_claim_decisions(changes)
+            checkpoint["written"] += written
+            checkpoint["stale"] += len(changes) - written
+
+        transitions = Counter(checkpoint["transitions"])
+        transitions.update(
+            f"{c['old_status']}->{c['approval_status']}" for c in changes if c["old_status"] != c["approval_status"]
+        )
+        checkpoint["transitions"] = dict(transitions)
+        checkpoint["scanned"] += scanned
+        checkpoint["changed"] += len(changes)
+        checkpoint["processing_days_changed"] += sum(
+            1 for c in changes if c["old_processing_days"] != c["processing_time_days"]
+        )
+        checkpoint["payout_delta"] = round(checkpoint["payout_delta"] + sum(c["payout_delta"] for c in changes), 2)
+        checkpoint["after_claim_id"] = last_claim_id
+        checkpoint["report_bytes"] = report.tell()
+        self._save_checkpoint(checkpoint)
+
+
+def main():
+    defaults = current_thresholds()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--high", type=float, default=defaults["high"], help="FRAUD_SCORE_HIGH to apply")
+    parser.add_argument("--medium", type=float, default=defaults["medium"], help="FRAUD_SCORE_MEDIUM to apply")
+    parser.add_argument("--low", type=float, default=defaults["low"], help="FRAUD_SCORE_LOW to apply")
+    parser.add_argument("--apply", action="store_true", help="Write the new decisions (default: report only)")
+    parser.add_argument("--chunk-size", type=int, default=config.BACKFILL_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=config.BACKFILL_WORKERS, help="Decision processes (0: in-process)")
+    parser.add_argument("--run-dir", default=config.BACKFILL_DIR, help="Checkpoint and diff report directory")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint for this run")
+    args = parser.parse_args()
+
+    backfill = DecisionBackfill(
+        {"high": args.high, "medium": args.medium, "low": args.low},
+        apply=args.apply, chunk_size=args.chunk_size, workers=args.workers, run_dir=args.run_dir
+    )
+    summary = backfill.run(restart=args.restart)
+    print(f"Scanned {summary['scanned']} claims, {summary['changed']} decisions change "
+          f"({summary['elapsed_s']}s)")
+    for transition, count in sorted(summary["transitions"].items()):
+        print(f"  {transition}: {count}")
+    print(f"  processing days changed: {summary['processing_days_changed']}, payout delta: {summary['payout_delta']}")
+    if args.apply:
+        print(f"  written: {summary['written']}, skipped as decided again since read: {summary['stale']}")
+    print(f"Diff report: {summary['report_path']}")
+
+
+if __name__ == "__main__":
+    main()
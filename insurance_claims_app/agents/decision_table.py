@@ -0,0 +1,146 @@
+"""
+Compiled Supervisor Decision Table
+Precomputes the supervisor's rule-based routing so agent nodes can pick the
+next hop themselves instead of going back through the supervisor node
+"""
+from itertools import product
+from typing import Dict, Any, Optional, Tuple
+
+from .supervisor_agent import ClaimsSupervisorAgent, SupervisorDecision
+
+
+ANY = "*"
+
+# (name, upper bound, representative score) - bounds are the supervisor's thresholds
+FRAUD_BANDS = (
+    ("low", 0.4, 0.2),
+    ("moderate", 0.5, 0.45),
+    ("elevated", 0.7, 0.6),
+    ("high", 0.8, 0.75),
+    ("very_high", float("inf"), 0.9),
+)
+_BAND_SCORES = {name: score for name, _, score in FRAUD_BANDS}
+
+# Static complexity at or above this is already "critical"
+MAX_STATIC_SCORE = 6
+
+# Routing inputs, in key order, and the values each can take
+DIMENSIONS = (
+    "current_step", "validation_status", "approval_status", "fraud_band",
+    "image_duplicate", "supervisor_priority", "static_score", "static_escalation",
+    "human_review_decision"
+)
+DOMAINS = {
+    "validation_status": ("VALID", "INVALID"),
+    "approval_status": ("APPROVED", "DENIED", "NEEDS_REVIEW"),
+    "fraud_band": tuple(name for name, _, _ in FRAUD_BANDS),
+    "image_duplicate": (False, True),
+    "supervisor_priority": (None, "low", "medium", "high", "critical"),
+    "static_score": tuple(range(MAX_STATIC_SCORE + 1)),
+    "static_escalation": (False, True),
+    "human_review_decision": (None, "APPROVE", "DENY"),
+}
+
+# Which inputs each completed step's decision actually reads; the rest are ANY
+STEP_DIMENSIONS = {
+    "document_analysis_complete": ("supervisor_priority",),
+    "validation_complete": ("validation_status", "fraud_band", "image_duplicate", "static_score", "static_escalation"),
+    "fraud_investigation_complete": ("fraud_band",),
+    "approval_complete": ("approval_status",),
+    "human_review_complete": ("human_review_decision",),
+}
+
+
+def fraud_band(score: float) -> str:
+    for name, upper, _ in FRAUD_BANDS:
+        if score <= upper:
+            return name
+    return FRAUD_BANDS[-1][0]
+
+
+class DecisionTable:
+    """
+    Supervisor routing as a lookup table.
+
+    Keys are (current_step, validation_status, approval_status, fraud band,
+    image-fraud flag, supervisor_priority, static complexity score, static
+    escalation flag, human review decision), with ANY for inputs the step's
+    rule does not read.
+    Entries are compiled by running `determine_next_agent` on one
+    representative state per key, so the table cannot drift from the rules.
+    "started" is left out: the first hop always goes through the supervisor.
+    """
+
+    def __init__(self, entries: Dict[Tuple, SupervisorDecision], supervisor: ClaimsSupervisorAgent):
+        self.entries = entries
+        self.supervisor = supervisor
+
+    @classmethod
+    def compile(cls, supervisor: ClaimsSupervisorAgent) -> "DecisionTable":
+        entries = {}
+        for step, dims in STEP_DIMENSIONS.items():
+            for values in product(*(DOMAINS[d] for d in dims)):
+                inputs = dict(zip(dims, values))
+                key = tuple(step if d == "current_step" else inputs.get(d, ANY) for d in DIMENSIONS)
+                decision = supervisor.determine_next_agent(*cls._representative(step, inputs))
+                summary = ", ".join(f"{d}={v}" for d, v in inputs.items())
+                entries[key] = SupervisorDecision(
+                    next_agent=decision.next_agent,
+                    reasoning=f"Decision table: {step} ({summary}) -> {decision.next_agent}",
+                    priority=decision.priority,
+                    parallel_agents=decision.parallel_agents
+                )
+        return cls(entries, supervisor)
+
+    @staticmethod
+    def _representative(step: str, inputs: Dict[str, Any]):
+        """A state (and static complexity) that exercises one key"""
+        state = {"current_step": step}
+        for name in ("validation_status", "approval_status", "human_review_decision"):
+            if name in inputs:
+                state[name] = inputs[name]
+        if inputs.get("supervisor_priority") is not None:
+            state["supervisor_priority"] = inputs["supervisor_priority"]
+        if "fraud_band" in inputs:
+            state["fraud_score"] = _BAND_SCORES[inputs["fraud_band"]]
+        if inputs.get("image_duplicate"):
+            state["image_fraud_check"] = {"is_potential_duplicate": True}
+        static = None
+        if "static_score" in inputs:
+            static = {"score": inputs["static_score"], "factors": [], "escalation": inputs["static_escalation"]}
+        return state, static
+
+    def key_for(self, state: Dict[str, Any]) -> Optional[Tuple]:
+        """Table key for a state, or None if the step is not in the table"""
+        step = state.get("current_step")
+        dims = STEP_DIMENSIONS.get(step)
+        if dims is None:
+            return None
+        inputs = {}
+        if "validation_status" in dims:
+            inputs["validation_status"] = state.get("validation_status")
+        if "approval_status" in dims:
+            inputs["approval_status"] = state.get("approval_status")
+        if "fraud_band" in dims:
+            inputs["fraud_band"] = fraud_band(state.get("fraud_score", 0) or 0)
+        if "image_duplicate" in dims:
+            inputs["image_duplicate"] = bool((state.get("image_fraud_check") or {}).get("is_potential_duplicate", False))
+        if "supervisor_priority" in dims:
+            inputs["supervisor_priority"] = state.get("supervisor_priority")
+        if "human_review_decision" in dims:
+            inputs["human_review_decision"] = state.get("human_review_decision")
+        if "static_score" in dims:
+            static = (state.get("complexity_analysis") or {}).get("static") or self.supervisor.static_complexity(state)
+            inputs["static_score"] = min(static["score"], MAX_STATIC_SCORE)
+            inputs["static_escalation"] = static["escalation"]
+        return tuple(step if d == "current_step" else inputs.get(d, ANY) for d in DIMENSIONS)
+
+    def lookup(self, state: Dict[str, Any]) -> Optional[SupervisorDecision]:
+        """Precomputed decision for this state, or None to fall back to the supervisor"""
+        key = self.key_for(state)
+        if key is None:
+            return None
+        return self.entries.get(key)
+
+    def __len__(self) -> int:
+        return len(self.entries)
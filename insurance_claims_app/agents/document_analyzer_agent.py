@@ -8,7 +8,8 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import config
-from external_apis import CarDamageAPI
+from external_apis import CarDamageAPI, budget_running_low
+from external_apis.deadline import DEADLINE_FALLBACKS
 from .state import ClaimState
 
 
@@ -24,14 +25,14 @@ class DocumentAnalyzerAgent:
     """
     
     def __init__(self):
-        self.damage_api = CarDamageAPI(config.ARYA_API_KEY)
+        self.damage_api = CarDamageAPI(config.ARYA_API_KEY, seed=config.MOCK_API_SEED)
         self.image_vector_store = None  # Lazy load
     
     def _get_image_vector_store(self):
         """Lazy load image vector store"""
         if self.image_vector_store is None:
             try:
-                from database.image_vector_store import ImageVectorStore
+                from database import ImageVectorStore
                 self.image_vector_store = ImageVectorStore()
             except Exception as e:
                 print(f"Warning: Could not initialize ImageVectorStore: {e}")
@@ -65,8 +66,13 @@ class DocumentAnalyzerAgent:
             # Store damage assessment in state
             state["damage_assessment"] = photo_analysis
         
-        # Check for duplicate/fraudulent images
-        duplicate_check = self._check_duplicate_images(photos, state.get("claim_id", ""))
+        # Check for duplicate/fraudulent images (optional: skipped when the claim's deadline is close)
+        if budget_running_low():
+            DEADLINE_FALLBACKS.inc(fallback="skip_image_similarity")
+            analysis_results["image_similarity_skipped"] = True
+            duplicate_check = {}
+        else:
+            duplicate_check = self._check_duplicate_images(photos, state.get("claim_id", ""))
         if duplicate_check.get("duplicates_found"):
             analysis_results["duplicate_images"] = duplicate_check.get("similar_claims", [])
             analysis_results["issues"].append("Potential duplicate images detected")
@@ -0,0 +1,357 @@
+"""
+Fraud Ring Graph
+In-process entity graph linking claims to their customers, policies,
+repair shops and near-duplicate-image claims. Connected components are kept
+with union-find, so a claim's ring statistics are one lookup away
+"""
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from database.repair_shops import normalize_shop_name as normalize_shop
+from monitoring import get_registry
+
+GRAPH_REBUILD_MS = get_registry().histogram("fraud_graph_rebuild_ms", "Full fraud ring graph recompute time")
+
+Node = Tuple[str, str]  # (kind, key): claim, customer, policy or shop
+KIND_TOTALS = {"claim": "claims", "customer": "customers", "policy": "policies"}
+
+
+class FraudRingGraph:
+    """
+    Union-find over claim, customer, policy and repair shop nodes.
+
+    A claim is joined to its customer, its policy, its repair shop and any
+    claim it shares a near-duplicate image with. Each component's root
+    carries running totals (claims, customers, policies, claims per shop,
+    policies shared by several customers, duplicate-image links). The
+    totals are merged smaller-into-larger on union, so adding a claim and
+    reading its ring statistics both take near-constant time.
+
+    Shops with more than FRAUD_GRAPH_HUB_CUSTOMERS customers are hubs.
+    A hub still counts toward shop statistics but no longer links new
+    customers, otherwise a busy national chain would join everyone into
+    one ring. Union-find cannot split components. Links made before a shop
+    became a hub, and links from claims corrected after processing, stay
+    until the next `rebuild`, which recomputes everything from the stored
+    claims with hubs known up front.
+    """
+
+    def __init__(self, hub_customers: int = None):
+        self.hub_customers = hub_customers if hub_customers is not None else config.FRAUD_GRAPH_HUB_CUSTOMERS
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._parent: Dict[Node, Node] = {}
+        self._totals: Dict[Node, Dict[str, Any]] = {}  # root -> component totals
+        self._claims: Set[str] = set()
+        self._shop_customers: Dict[str, Set[str]] = {}
+        self._policy_customers: Dict[str, Set[str]] = {}
+        self._hub_shops: Set[str] = set()
+        self._image_links: Set[Tuple[str, str]] = set()
+        self._replay: Optional[List[tuple]] = None  # calls made while a rebuild runs
+
+    # ---- union-find ------------------------------------------------------
+
+    def _node(self, kind: str, key: str) -> Node:
+        node = (kind, key)
+        if node not in self._parent:
+            self._parent[node] = node
+            self._totals[node] = {
+                "nodes": 1,
+                "claims": int(kind == "claim"),
+                "customers": int(kind == "customer"),
+                "policies": int(kind == "policy"),
+                "shops": Counter(),
+                "busiest_shop": (0, None),  # (claims, shop) with the most claims in the component
+                "shared_policies": 0,
+                "image_links": 0
+            }
+        return node
+
+    def _find(self, node: Node) -> Node:
+        parent = self._parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]  # path halving
+            node = parent[node]
+        return node
+
+    def _union(self, a: Node, b: Node) -> Node:
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return a
+        if self._totals[a]["nodes"] < self._totals[b]["nodes"]:
+            a, b = b, a
+        self._parent[b] = a
+        into, merged = self._totals[a], self._totals.pop(b)
+        for field in ("nodes", "claims", "customers", "policies", "shared_policies", "image_links"):
+            into[field] += merged[field]
+        # Fold the smaller shop counter into the larger; counts only grow, so the
+        # busiest shop is the old one or one of the shops just folded in
+        shops, other = into["shops"], merged["shops"]
+        if len(shops) < len(other):
+            shops, other = other, shops
+        busiest = max(into["busiest_shop"], merged["busiest_shop"], key=lambda entry: entry[0])
+        for shop, count in other.items():
+            shops[shop] += count
+            if shops[shop] > busiest[0]:
+                busiest = (shops[shop], shop)
+        into["shops"], into["busiest_shop"] = shops, busiest
+        return a
+
+    # ---- incremental updates ---------------------------------------------
+
+    def add_claim(
+        self,
+        claim_id: str,
+        customer_id: str = None,
+        policy_id: str = None,
+        repair_shop: str = None,
+        similar_claims: Iterable[str] = ()
+    ):
+        """Record a claim and its links; adding a claim again only adds new links"""
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append(("add_claim", (claim_id, customer_id, policy_id, repair_shop, tuple(similar_claims))))
+            self._add_claim(claim_id, customer_id, policy_id, repair_shop, similar_claims)
+
+    def link_duplicate_images(self, claim_id: str, similar_claims: Iterable[str]):
+        """Join claims found to share near-duplicate images"""
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append(("link", (claim_id, tuple(similar_claims))))
+            self._link_images(claim_id, similar_claims)
+
+    def _add_claim(self, claim_id, customer_id, policy_id, repair_shop, similar_claims):
+        claim = self._node("claim", claim_id)
+        shop = normalize_shop(repair_shop)
+        if claim_id not in self._claims:
+            self._claims.add(claim_id)
+            if shop:
+                totals = self._totals[self._find(claim)]
+                totals["shops"][shop] += 1
+                if totals["shops"][shop] > totals["busiest_shop"][0]:
+                    totals["busiest_shop"] = (totals["shops"][shop], shop)
+        if customer_id:
+            self._union(claim, self._node("customer", customer_id))
+        if policy_id:
+            self._union(claim, self._node("policy", policy_id))
+        if shop:
+            customers = self._shop_customers.setdefault(shop, set())
+            if customer_id and shop not in self._hub_shops:
+                customers.add(customer_id)
+                if len(customers) > self.hub_customers:
+                    self._hub_shops.add(shop)
+            if shop not in self._hub_shops:
+                self._union(claim, self._node("shop", shop))
+        if policy_id and customer_id:
+            policy_customers = self._policy_customers.setdefault(policy_id, set())
+            if customer_id not in policy_customers:
+                policy_customers.add(customer_id)
+                if len(policy_customers) == 2:
+                    self._totals[self._find(claim)]["shared_policies"] += 1
+        self._link_images(claim_id, similar_claims)
+
+    def _link_images(self, claim_id, similar_claims):
+        for other in similar_claims:
+            link = tuple(sorted((claim_id, other)))
+            if other == claim_id or link in self._image_links:
+                continue
+            self._image_links.add(link)
+            root = self._union(self._node("claim", claim_id), self._node("claim", other))
+            self._totals[root]["image_links"] += 1
+
+    # ---- queries ---------------------------------------------------------
+
+    def ring_stats(self, claim_id: str) -> Optional[Dict[str, Any]]:
+        """Statistics of the claim's connected component; None for an unknown claim"""
+        with self._lock:
+            node = ("claim", claim_id)
+            if node not in self._parent:
+                return None
+            totals = self._totals[self._find(node)]
+            busiest_claims, busiest_shop = totals["busiest_shop"]
+            return {
+                "component_claims": totals["claims"],
+                "component_customers": totals["customers"],
+                "component_policies": totals["policies"],
+                "component_shops": len(totals["shops"]),
+                "shared_policies": totals["shared_policies"],
+                "duplicate_image_links": totals["image_links"],
+                "busiest_shop": busiest_shop,
+                # Share of the ring's claims that went to its busiest shop
+                "shared_shop_density": round(busiest_claims / totals["claims"], 3) if totals["claims"] else 0.0
+            }
+
+    def size(self) -> Dict[str, int]:
+        with self._lock:
+            return {"claims": len(self._claims), "components": len(self._totals), "hub_shops": len(self._hub_shops)}
+
+    # ---- batch recompute -------------------------------------------------
+
+    def _batch_build(self, claims: List[Dict[str, Any]], image_links: Set[Tuple[str, str]]):
+        """
+        Fill an empty graph in two passes: plain union-find over integer node
+        ids, then one sweep that totals every component at its root, instead
+        of merging totals on every union.
+        """
+        shops = [normalize_shop(claim.get("repair_shop")) for claim in claims]
+        shop_customers: Dict[str, Set[str]] = {}
+        for claim, shop in zip(claims, shops):
+            if shop and claim.get("customer_id"):
+                shop_customers.setdefault(shop, set()).add(claim["customer_id"])
+        hubs = {shop for shop, customers in shop_customers.items() if len(customers) > self.hub_customers}
+        policy_customers: Dict[str, Set[str]] = {}
+        for claim in claims:
+            if claim.get("policy_id") and claim.get("customer_id"):
+                policy_customers.setdefault(claim["policy_id"], set()).add(claim["customer_id"])
+
+        ids: Dict[Node, int] = {}
+        parent: List[int] = []
+        size: List[int] = []
+
+        def node_id(node: Node) -> int:
+            index = ids.get(node)
+            if index is None:
+                index = ids[node] = len(parent)
+                parent.append(index)
+                size.append(1)
+            return index
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        def union(a: int, b: int):
+            a, b = find(a), find(b)
+            if a != b:
+                if size[a] < size[b]:
+                    a, b = b, a
+                parent[b] = a
+                size[a] += size[b]
+
+        claim_ids = []
+        for claim, shop in zip(claims, shops):
+            claim_id = node_id(("claim", claim["claim_id"]))
+            claim_ids.append(claim_id)
+            if claim.get("customer_id"):
+                union(claim_id, node_id(("customer", claim["customer_id"])))
+            if claim.get("policy_id"):
+                union(claim_id, node_id(("policy", claim["policy_id"])))
+            if shop and shop not in hubs:
+                union(claim_id, node_id(("shop", shop)))
+        for a, b in image_links:
+            union(node_id(("claim", a)), node_id(("claim", b)))
+
+        nodes = list(ids)
+        roots = [find(index) for index in range(len(parent))]
+        totals: Dict[int, Dict[str, Any]] = {}
+        for index, (kind, _) in enumerate(nodes):
+            entry = totals.get(roots[index])
+            if entry is None:
+                entry = totals[roots[index]] = {
+                    "nodes": 0, "claims": 0, "customers": 0, "policies": 0,
+                    "shops": Counter(), "busiest_shop": (0, None), "shared_policies": 0, "image_links": 0
+                }
+            entry["nodes"] += 1
+            if kind in KIND_TOTALS:
+                entry[KIND_TOTALS[kind]] += 1
+        for claim_id, shop in zip(claim_ids, shops):
+            if shop:
+                entry = totals[roots[claim_id]]
+                entry["shops"][shop] += 1
+                if entry["shops"][shop] > entry["busiest_shop"][0]:
+                    entry["busiest_shop"] = (entry["shops"][shop], shop)
+        for policy, customers in policy_customers.items():
+            if len(customers) > 1:
+                totals[roots[ids[("policy", policy)]]]["shared_policies"] += 1
+        for a, _ in image_links:
+            totals[roots[ids[("claim", a)]]]["image_links"] += 1
+
+        self._parent = {node: nodes[roots[index]] for index, node in enumerate(nodes)}
+        self._totals = {nodes[root]: entry for root, entry in totals.items()}
+        self._claims = {claim["claim_id"] for claim in claims}
+        self._shop_customers = {shop: customers for shop, customers in shop_customers.items() if shop not in hubs}
+        self._policy_customers = policy_customers
+        self._hub_shops = hubs
+        self._image_links = set(image_links)
+
+    def rebuild(self, claims: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Recompute the graph from stored claims (claim_id, customer_id,
+        policy_id, repair_shop). Duplicate-image links seen so far are kept,
+        and claims added while the rebuild runs are replayed onto the result.
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self._replay = []
+            image_links = set(self._image_links)
+
+        fresh = FraudRingGraph(self.hub_customers)
+        fresh._batch_build(list(claims), image_links)
+
+        with self._lock:
+            for call, args in self._replay:
+                if call == "add_claim":
+                    fresh._add_claim(*args)
+                else:
+                    fresh._link_images(*args)
+            self._parent, self._totals, self._claims = fresh._parent, fresh._totals, fresh._claims
+            self._shop_customers, self._hub_shops = fresh._shop_customers, fresh._hub_shops
+            self._policy_customers = fresh._policy_customers
+            self._image_links = fresh._image_links
+            self._replay = None
+
+        GRAPH_REBUILD_MS.observe((time.perf_counter() - started) * 1000)
+        return self.size()
+
+
+_graph: Optional[FraudRingGraph] = None
+_graph_lock = threading.Lock()
+_rebuild_stop = threading.Event()
+
+
+def get_fraud_graph() -> FraudRingGraph:
+    """Shared fraud ring graph for this process"""
+    global _graph
+    with _graph_lock:
+        if _graph is None:
+            _graph = FraudRingGraph()
+        return _graph
+
+
+def rebuild_fraud_graph() -> Dict[str, int]:
+    """Recompute the shared graph from every stored claim"""
+    from database import get_claim_links
+    return get_fraud_graph().rebuild(get_claim_links())
+
+
+def start_periodic_rebuild(interval_s: float = None) -> threading.Thread:
+    """Rebuild now, then every `interval_s` (FRAUD_GRAPH_REBUILD_S) until stop_periodic_rebuild"""
+    interval_s = interval_s if interval_s is not None else config.FRAUD_GRAPH_REBUILD_S
+    _rebuild_stop.clear()
+
+    def loop():
+        while True:
+            try:
+                rebuild_fraud_graph()
+            except Exception as e:
+                print(f"Warning: Fraud ring graph rebuild failed: {e}")
+            if _rebuild_stop.wait(interval_s):
+                return
+
+    thread = threading.Thread(target=loop, name="fraud-graph-rebuild", daemon=True)
+    thread.start()
+    return thread
+
+
+def stop_periodic_rebuild():
+    _rebuild_stop.set()
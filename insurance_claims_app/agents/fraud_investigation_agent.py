@@ -11,6 +11,9 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import config
 from external_apis import FraudScoringAPI, PolicyManagementAPI
 from .state import ClaimState
+from .fraud_graph import get_fraud_graph
+from .fraud_prescore import scored_assessment
+from .shop_reputation import get_shop_reputation
 
 
 class FraudInvestigationAgent:
@@ -26,7 +29,7 @@ class FraudInvestigationAgent:
     """
     
     def __init__(self):
-        self.fraud_api = FraudScoringAPI(config.FRAUD_API_KEY)
+        self.fraud_api = FraudScoringAPI(config.FRAUD_API_KEY, seed=config.MOCK_API_SEED)
         self.policy_api = PolicyManagementAPI(config.POLICY_API_KEY)
     
     def investigate(self, state: ClaimState) -> ClaimState:
@@ -64,13 +67,19 @@ class FraudInvestigationAgent:
             investigation_results["mitigating_factors"].append("Reputable repair shop")
         
         # 4. Analyze customer history
-        customer_analysis = self._analyze_customer_history(state.get("customer_id", ""))
+        customer_analysis = self._analyze_customer_history(state.get("customer_id", ""), state.get("claim_id"))
         investigation_results["customer_analysis"] = customer_analysis
         if customer_analysis.get("risk_factors"):
             investigation_results["risk_factors"].extend(customer_analysis["risk_factors"])
         if customer_analysis.get("positive_factors"):
             investigation_results["mitigating_factors"].extend(customer_analysis["positive_factors"])
         
+        # 4b. Check whether the claim sits in a suspicious cluster (fraud ring)
+        ring_check = self._check_fraud_ring(state)
+        investigation_results["fraud_ring_check"] = ring_check
+        if ring_check.get("risk_factor"):
+            investigation_results["risk_factors"].append(ring_check["risk_factor"])
+        
         # 5. Check for image fraud (if document analysis was done)
         if state.get("document_analysis", {}).get("duplicate_images"):
             investigation_results["risk_factors"].append("Duplicate images detected from other claims")
@@ -123,14 +132,8 @@ class FraudInvestigationAgent:
         return state
     
     def _get_fraud_assessment(self, state: ClaimState) -> Dict[str, Any]:
-        """Get fraud assessment from Fraud Scoring API"""
-        return self.fraud_api.score_claim(
-            claim_amount=state.get("estimated_damage_amount", 0),
-            repair_shop=state.get("repair_shop", ""),
-            claimant_id=state.get("customer_id", ""),
-            vehicle_age=5,  # Default, would come from vehicle data
-            damage_type=state.get("claim_type", "collision")
-        )
+        """Get fraud assessment from Fraud Scoring API (or the speculative score cached during validation)"""
+        return scored_assessment(state, self.fraud_api)
     
     def _analyze_claim_patterns(self, state: ClaimState) -> Dict[str, Any]:
         """Analyze patterns that might indicate fraud"""
@@ -169,67 +172,96 @@ class FraudInvestigationAgent:
         }
     
     def _check_repair_shop(self, repair_shop: str) -> Dict[str, Any]:
-        """Check repair shop reputation"""
-        if not repair_shop:
-            return {"risk_level": "unknown", "reason": "No repair shop specified"}
-        
-        # Mock implementation - in production, would check against database
-        # of known fraudulent or high-risk repair shops
-        high_risk_keywords = ["quick", "fast", "cheap", "discount"]
-        low_risk_keywords = ["certified", "authorized", "dealer", "oem"]
-        
-        shop_lower = repair_shop.lower()
-        
-        for keyword in high_risk_keywords:
-            if keyword in shop_lower:
-                return {
-                    "risk_level": "high",
-                    "reason": "Shop name contains high-risk keywords",
-                    "shop_name": repair_shop
-                }
-        
-        for keyword in low_risk_keywords:
-            if keyword in shop_lower:
-                return {
-                    "risk_level": "low",
-                    "reason": "Certified/authorized repair shop",
-                    "shop_name": repair_shop
-                }
+        """Check repair shop reputation (known shops' standing and fraud rate, else the name)"""
+        return get_shop_reputation().assess(repair_shop)
+    
+    def _check_fraud_ring(self, state: ClaimState) -> Dict[str, Any]:
+        """Look up the claim's connected component in the fraud ring graph"""
+        claim_id = state.get("claim_id")
+        if not claim_id:
+            return {}
         
-        return {
-            "risk_level": "medium",
-            "reason": "Standard repair shop",
-            "shop_name": repair_shop
-        }
+        # Record links found while this claim was processed (idempotent for known links)
+        similar_claims = list((state.get("image_fraud_check") or {}).get("similar_claims", []))
+        similar_claims += (state.get("document_analysis") or {}).get("duplicate_images", [])
+        graph = get_fraud_graph()
+        graph.add_claim(
+            claim_id, state.get("customer_id"), state.get("policy_id"), state.get("repair_shop"), similar_claims
+        )
+        ring = graph.ring_stats(claim_id)
+        
+        # Customers who merely use the same shop are its clientele, not a ring: the
+        # ring also needs a policy shared between customers or a duplicate image
+        other_customers = ring["component_customers"] - 1
+        shop_ring = ring["shared_shop_density"] >= config.FRAUD_RING_SHOP_DENSITY and ring["shared_policies"]
+        if ring["component_customers"] >= config.FRAUD_RING_MIN_CUSTOMERS and (
+            shop_ring or ring["duplicate_image_links"]
+        ):
+            ring["risk_factor"] = (
+                f"Possible fraud ring: linked to {other_customers} other customers and "
+                f"{ring['component_claims'] - 1} other claims through shared repair shops, policies or images"
+            )
+        return ring
     
-    def _analyze_customer_history(self, customer_id: str) -> Dict[str, Any]:
-        """Analyze customer's claim history"""
+    def _analyze_customer_history(self, customer_id: str, claim_id: str = None) -> Dict[str, Any]:
+        """Analyze customer's claim history before this claim"""
         if not customer_id:
             return {"risk_factors": [], "positive_factors": []}
         
         risk_factors = []
         positive_factors = []
         
-        # Mock implementation - in production, would query historical claims
-        # For demo, we'll use customer_id patterns
-        
-        # Check if customer has filed multiple claims (mock)
+        # One precomputed row per customer (kept current by create_claim/update_claim)
+        # instead of loading every claim the customer has filed
         try:
-            from database import get_claims_by_customer
-            customer_claims = get_claims_by_customer(customer_id)
-            
-            if len(customer_claims) > 3:
-                risk_factors.append(f"Customer has {len(customer_claims)} previous claims")
-            elif len(customer_claims) == 0:
-                positive_factors.append("First-time claimant")
-            else:
-                positive_factors.append(f"Customer has {len(customer_claims)} previous claims (normal)")
-        except:
+            from database import get_claim, get_customer_claim_stats
+            history = get_customer_claim_stats(customer_id)
+            # A stored claim is already in its customer's aggregate: leave it
+            # out so only the other claims are judged
+            current = get_claim(claim_id) if claim_id else None
+            if current is not None and current.get("customer_id") == customer_id:
+                history = self._without_claim(history, current)
+        except Exception as e:
             # If we can't get history, note it
-            pass
-        
+            print(f"Warning: Customer history unavailable for {customer_id}: {e}")
+            return {"risk_factors": [], "positive_factors": [], "customer_id": customer_id}
+
+        claim_count = history["claim_count"]
+        recent_claims = history["claims_last_90_days"]
+        if claim_count > 3:
+            risk_factors.append(f"Customer has {claim_count} previous claims")
+        elif claim_count == 0:
+            positive_factors.append("First-time claimant")
+        else:
+            positive_factors.append(f"Customer has {claim_count} previous claims (normal)")
+        if recent_claims > 3:
+            risk_factors.append(f"Customer filed {recent_claims} claims in the last 90 days")
+
         return {
             "risk_factors": risk_factors,
             "positive_factors": positive_factors,
-            "customer_id": customer_id
+            "customer_id": customer_id,
+            "claim_count": claim_count,
+            "claims_last_90_days": recent_claims,
+            "total_payout": history["total_payout"],
+            "last_claim_date": history["last_claim_date"]
+        }
+    
+    def _without_claim(self, history: Dict[str, Any], claim: Dict[str, Any]) -> Dict[str, Any]:
+        """A customer's aggregate less one of their stored claims"""
+        from database import get_claims_by_customer
+        from database.customer_stats import as_datetime, in_window
+        
+        created_at = as_datetime(claim["created_at"])
+        last_claim_date = history["last_claim_date"]
+        if last_claim_date is not None and as_datetime(last_claim_date) <= created_at:
+            # The claim is the customer's latest: the one before it is the last
+            earlier = [c for c in get_claims_by_customer(claim["customer_id"], limit=2) if c["claim_id"] != claim["claim_id"]]
+            last_claim_date = as_datetime(earlier[0]["created_at"]).isoformat() if earlier else None
+        return {
+            **history,
+            "claim_count": max(0, history["claim_count"] - 1),
+            "claims_last_90_days": max(0, history["claims_last_90_days"] - (1 if in_window(created_at) else 0)),
+            "total_payout": round(max(0.0, history["total_payout"] - float(claim.get("payout_amount") or 0)), 2),
+            "last_claim_date": last_claim_date
         }
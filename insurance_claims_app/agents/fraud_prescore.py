@@ -0,0 +1,102 @@
+"""
+Speculative Fraud Pre-Scoring
+Starts a claim's fraud score while validation (and, on the fan-out path,
+document analysis) runs. The score needs only fields known at submission
+(amount, repair shop, customer, claim type), so the vendor call overlaps
+work already in flight instead of following it. The result is cached in
+state for the approval and fraud investigation agents, and dropped when
+validation fails
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from external_apis import FraudScoringAPI, current_deadline, deadline_scope
+from monitoring import get_registry
+
+_registry = get_registry()
+PRESCORES = _registry.counter(
+    "fraud_prescores_total", "Speculative fraud scores by outcome (cached, discarded, failed)"
+)
+PRESCORE_REUSE = _registry.counter(
+    "fraud_prescore_reuse_total", "Agent fraud scorings answered from the cached speculative score (hit) or the API (miss)"
+)
+
+
+def fraud_score_inputs(state: Dict[str, Any]) -> Dict[str, Any]:
+    """FraudScoringAPI.score_claim arguments for a claim"""
+    return {
+        "claim_amount": state.get("estimated_damage_amount", 0),
+        "repair_shop": state.get("repair_shop", ""),
+        "claimant_id": state.get("customer_id", ""),
+        "vehicle_age": 5,  # Default, would come from vehicle data
+        "damage_type": state.get("claim_type", "collision")
+    }
+
+
+def scored_assessment(state: Dict[str, Any], fraud_api: FraudScoringAPI) -> Dict[str, Any]:
+    """
+    The claim's fraud assessment: the cached speculative score when it was
+    computed from the claim's current fields, otherwise a score_claim call.
+    """
+    inputs = fraud_score_inputs(state)
+    prescore = state.get("fraud_prescore")
+    if prescore and prescore.get("inputs") == inputs:
+        PRESCORE_REUSE.inc(result="hit")
+        return dict(prescore["assessment"])
+    PRESCORE_REUSE.inc(result="miss")
+    return fraud_api.score_claim(**inputs)
+
+
+class FraudPrescorer:
+    """
+    Runs speculative fraud scores on a small thread pool.
+
+    start() submits the score under the caller's claim deadline; collect()
+    waits for it (at most until the deadline) once validation has passed,
+    and cancels or ignores it otherwise. A failed or late score is simply
+    dropped: the agents then score the claim themselves.
+    """
+
+    def __init__(self, fraud_api: FraudScoringAPI = None, workers: int = None):
+        self.fraud_api = fraud_api or FraudScoringAPI(config.FRAUD_API_KEY, seed=config.MOCK_API_SEED)
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers or config.FRAUD_PRESCORE_WORKERS, thread_name_prefix="fraud-prescore"
+        )
+
+    def start(self, state: Dict[str, Any]) -> Future:
+        return self._pool.submit(self._score, fraud_score_inputs(state), current_deadline())
+
+    def _score(self, inputs: Dict[str, Any], deadline) -> Dict[str, Any]:
+        with deadline_scope(deadline):
+            return {"inputs": inputs, "assessment": self.fraud_api.score_claim(**inputs)}
+
+    def collect(self, future: Future, validation_status: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The finished pre-score if validation passed, else None"""
+        if validation_status != "VALID":
+            future.cancel()
+            PRESCORES.inc(result="discarded")
+            return None
+
+        deadline = current_deadline()
+        try:
+            prescore = future.result(timeout=max(0.0, deadline.remaining_ms() / 1000) if deadline else None)
+        except Exception:
+            future.cancel()
+            PRESCORES.inc(result="failed")
+            return None
+        PRESCORES.inc(result="cached")
+        return prescore
+
+
+_prescorer: Optional[FraudPrescorer] = None
+
+
+def get_fraud_prescorer() -> FraudPrescorer:
+    global _prescorer
+    if _prescorer is None:
+        _prescorer = FraudPrescorer()
+    return _prescorer
@@ -0,0 +1,178 @@
+"""
+Payout Settlement
+Pays approved claims in batches: streams approved, unpaid claims by keyset,
+records them as PENDING payments, writes each batch as an ACH file and
+submits it with one PaymentAPI.process_payments call, then polls the
+processor for status changes in bulk
+
+Usage:
+    python -m agents.payout_settlement            # settle new payouts, then poll open payments
+    python -m agents.payout_settlement --poll     # only poll open payments
+
+Every payment carries an idempotency key derived from its claim, so a claim
+is paid at most once however often a run is repeated. Payments left PENDING
+by an interrupted run are resubmitted first; the processor answers keys it
+has already accepted with the original payment.
+"""
+import argparse
+import json
+import os
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from database import create_payments, iter_payable_claims, iter_payments, update_payment_statuses
+from external_apis import AchBatchWriter, PaymentAPI
+from monitoring import get_registry
+
+_registry = get_registry()
+SETTLEMENT_BATCH_MS = _registry.histogram(
+    "settlement_batch_ms", "ACH file write plus process_payments call, per settlement batch"
+)
+PAYOUTS_SUBMITTED = _registry.counter("settlement_payouts_submitted_total", "Payouts submitted to the payment processor")
+
+# Processor statuses that can still change; SETTLED and FAILED are final
+OPEN_STATUSES = ["SCHEDULED", "PROCESSING"]
+
+
+def payout_idempotency_key(claim_id: str) -> str:
+    """Idempotency key of a claim's payout (one payout per claim)"""
+    return f"PAYOUT-{claim_id}"
+
+
+class PayoutSettlement:
+    """
+    One settlement run.
+
+    Batches hold up to SETTLEMENT_BATCH_SIZE payouts. Each batch is
+    recorded in the payments table before its ACH file is written and
+    submitted, and the processor's answers are written back with one
+    executemany, so the number of database round trips grows with the
+    number of batches, not payouts.
+    """
+
+    def __init__(
+        self,
+        payment_api: PaymentAPI = None,
+        batch_size: int = None,
+        poll_chunk: int = None,
+        out_dir: str = None
+    ):
+        self.payment_api = payment_api or PaymentAPI(config.PAYMENT_API_KEY)
+        self.batch_size = batch_size or config.SETTLEMENT_BATCH_SIZE
+        self.poll_chunk = poll_chunk or config.SETTLEMENT_POLL_CHUNK
+        self.out_dir = out_dir or config.SETTLEMENT_DIR
+        self._batch_number = 0
+
+    def run(self) -> Dict[str, Any]:
+        """Resubmit payments left PENDING, then settle every approved, unpaid claim"""
+        started = time.perf_counter()
+        summary = Counter()
+        files = []
+
+        # Batches cut off between recording and the processor's answer
+        for chunk in iter_payments(["PENDING"], self.batch_size):
+            files.append(self._submit(chunk, summary))
+            summary["resubmitted"] += len(chunk)
+
+        for chunk in iter_payable_claims(self.batch_size):
+            batch_id = self._new_batch_id()
+            payments = [
+                {
+                    "idempotency_key": payout_idempotency_key(claim["claim_id"]),
+                    "claim_id": claim["claim_id"],
+                    "customer_id": claim["customer_id"],
+                    "amount": round(float(claim["payout_amount"]), 2),
+                    "batch_id": batch_id
+                }
+                for claim in chunk
+            ]
+            # Another run may have recorded some of these claims since they were read
+            inserted = set(create_payments(payments))
+            payments = [p for p in payments if p["idempotency_key"] in inserted]
+            if payments:
+                files.append(self._submit(payments, summary, batch_id))
+
+        return dict(summary, ach_files=files, elapsed_s=round(time.perf_counter() - started, 3))
+
+    def _new_batch_id(self) -> str:
+        return f"BATCH-{datetime.now():%Y%m%d}-{uuid.uuid4().hex[:8].upper()}"
+
+    def _submit(self, payments: List[Dict[str, Any]], summary: Counter, batch_id: str = None) -> str:
+        """Write one ACH file for `payments`, submit it and record the results; returns the file path"""
+        started = time.perf_counter()
+        batch_id = batch_id or self._new_batch_id()
+        self._batch_number += 1
+        path = os.path.join(self.out_dir, f"{batch_id}.ach")
+        with AchBatchWriter(
+            path, self._batch_number, config.ACH_ORIGIN_ROUTING, config.ACH_DESTINATION_ROUTING,
+            config.ACH_COMPANY_ID, config.ACH_COMPANY_NAME
+        ) as writer:
+            for payment in payments:
+                writer.add(
+                    payment["idempotency_key"], payment["claim_id"], payment["customer_id"],
+                    int(round(float(payment["amount"]) * 100))
+                )
+
+        response = self.payment_api.process_payments(
+            batch_id,
+            [{k: payment[k] for k in ("idempotency_key", "claim_id", "amount")} for payment in payments],
+            ach_file=path
+        )
+        update_payment_statuses([
+            {
+                "idempotency_key": result["idempotency_key"],
+                "status": result["status"],
+                "payment_id": result.get("payment_id"),
+                "reference_number": result.get("reference_number"),
+                "error": result.get("error"),
+                "batch_id": batch_id
+            }
+            for result in response["results"]
+        ])
+
+        summary["batches"] += 1
+        summary["submitted"] += len(payments)
+        summary.update(result["status"] for result in response["results"])
+        PAYOUTS_SUBMITTED.inc(len(payments))
+        SETTLEMENT_BATCH_MS.observe((time.perf_counter() - started) * 1000)
+        return path
+
+    def poll(self) -> Dict[str, int]:
+        """Ask the processor about every open payment, SETTLEMENT_POLL_CHUNK ids per call; returns status changes"""
+        changes = Counter()
+        for chunk in iter_payments(OPEN_STATUSES, self.poll_chunk):
+            by_payment_id = {payment["payment_id"]: payment for payment in chunk if payment["payment_id"]}
+            updates = []
+            for status in self.payment_api.get_payment_statuses(list(by_payment_id)):
+                payment = by_payment_id.get(status["payment_id"])
+                if payment is not None and status["status"] != payment["status"]:
+                    updates.append({
+                        "idempotency_key": payment["idempotency_key"],
+                        "status": status["status"],
+                        "error": status.get("error")
+                    })
+                    changes[f"{payment['status']}->{status['status']}"] += 1
+            update_payment_statuses(updates)
+        return dict(changes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pay approved claims in ACH batches")
+    parser.add_argument("--poll", action="store_true", help="Only poll the status of open payments")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    settlement = PayoutSettlement(batch_size=args.batch_size)
+    result = {} if args.poll else settlement.run()
+    result["status_changes"] = settlement.poll()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Repair Shop Reputation
+In-process index over the repair_shops table: shop names are matched
+exactly, by word prefix or by trigram similarity, and classified from the
+shop's reputation and historical fraud rate, falling back to name keywords
+for shops the index does not know
+"""
+import bisect
+import math
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from database.repair_shops import normalize_shop_name, trigrams
+
+# Name keywords for shops without a known reputation; high-risk keywords win
+HIGH_RISK_SHOP_KEYWORDS = ("quick", "fast", "cheap", "discount")
+LOW_RISK_SHOP_KEYWORDS = ("certified", "authorized", "dealer", "oem")
+_HIGH_RISK_PATTERN = re.compile("|".join(HIGH_RISK_SHOP_KEYWORDS))
+_LOW_RISK_PATTERN = re.compile("|".join(LOW_RISK_SHOP_KEYWORDS))
+
+# Re-read rows changed slightly before the last watermark (commits land out of order)
+REFRESH_OVERLAP_S = 5.0
+
+
+class ShopNameIndex:
+    """
+    Normalized shop names -> repair_shops rows.
+
+    match() tries, in order: the exact name; a known name the query extends
+    at a word boundary ("certified auto body shop" -> "certified auto body")
+    or a single known name the query is a word prefix of ("certified auto");
+    and the most similar name by trigram Dice coefficient. Fuzzy candidates
+    come from the posting lists of the query's rarest trigrams only, which
+    is enough for any name that can reach the similarity threshold.
+    """
+
+    def __init__(self, min_similarity: float = None, cache_size: int = 4096):
+        self.min_similarity = min_similarity if min_similarity is not None else config.REPAIR_SHOP_MATCH_SIMILARITY
+        self.cache_size = cache_size
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._sorted_keys: List[str] = []
+        self._grams: Dict[str, frozenset] = {}
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._cache: Dict[str, Optional[Tuple[str, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def upsert(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Add or replace rows (keyed by shop_key); returns the number of new names"""
+        added = []
+        for row in rows:
+            key = row["shop_key"]
+            if key not in self._rows:
+                added.append(key)
+                grams = trigrams(key)
+                self._grams[key] = grams
+                for gram in grams:
+                    self._postings[gram].add(key)
+            self._rows[key] = row
+        if len(added) > 64:
+            self._sorted_keys = sorted(self._rows)
+        else:
+            for key in added:
+                bisect.insort(self._sorted_keys, key)
+        # Counts and reputations change the answers too, not just new names
+        self._cache.clear()
+        return len(added)
+
+    def match(self, name: Optional[str]) -> Optional[Tuple[Dict[str, Any], str]]:
+        """(row, "exact" | "prefix" | "fuzzy") for the best matching shop, or None"""
+        key = normalize_shop_name(name)
+        if not key:
+            return None
+        if key in self._cache:
+            found = self._cache[key]
+        else:
+            found = self._match_key(key)
+            if len(self._cache) >= self.cache_size:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = found
+        return (self._rows[found[0]], found[1]) if found else None
+
+    def _match_key(self, key: str) -> Optional[Tuple[str, str]]:
+        if key in self._rows:
+            return key, "exact"
+
+        # Query extends a known name: longest known word prefix of the query
+        words = key.split(" ")
+        for end in range(len(words) - 1, 0, -1):
+            candidate = " ".join(words[:end])
+            if candidate in self._rows:
+                return candidate, "prefix"
+
+        # Query is a word prefix of exactly one known name
+        prefix = key + " "
+        i = bisect.bisect_left(self._sorted_keys, prefix)
+        extensions = [k for k in self._sorted_keys[i:i + 2] if k.startswith(prefix)]
+        if len(extensions) == 1:
+            return extensions[0], "prefix"
+
+        best = self._most_similar(key)
+        return (best, "fuzzy") if best else None
+
+    def _most_similar(self, key: str) -> Optional[str]:
+        query = trigrams(key)
+        s = self.min_similarity
+        # Dice >= s needs |B| >= s|A|/(2-s) and so an overlap of at least s|A|/(2-s)
+        min_overlap = max(1, math.ceil(s * len(query) / (2 - s) - 1e-9))
+        max_len = (2 - s) * len(query) / s
+        rarest = sorted(query, key=lambda gram: len(self._postings.get(gram, ())))
+        candidates: Set[str] = set()
+        for gram in rarest[:len(query) - min_overlap + 1]:
+            candidates.update(self._postings.get(gram, ()))
+
+        best, best_score = None, s
+        for candidate in candidates:
+            grams = self._grams[candidate]
+            if len(grams) > max_len:
+                continue
+            score = 2 * len(query & grams) / (len(query) + len(grams))
+            if score > best_score or (score == best_score and (best is None or candidate < best)):
+                best, best_score = candidate, score
+        return best
+
+
+class RepairShopReputation:
+    """
+    Shop risk assessments backed by a ShopNameIndex over repair_shops.
+
+    The first assessment loads every row; after that, rows changed since
+    the last load are merged in by a background refresh at most every
+    `refresh_s` seconds, so assessments never wait on the database.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[..., List[Dict[str, Any]]] = None,
+        refresh_s: float = None,
+        fraud_rate_high: float = None,
+        min_claims: int = None,
+        index: ShopNameIndex = None
+    ):
+        if loader is None:
+            from database import get_repair_shops
+            loader = get_repair_shops
+        self.loader = loader
+        self.refresh_s = refresh_s if refresh_s is not None else config.REPAIR_SHOP_REFRESH_S
+        self.fraud_rate_high = fraud_rate_high if fraud_rate_high is not None else config.REPAIR_SHOP_FRAUD_RATE_HIGH
+        self.min_claims = min_claims if min_claims is not None else config.REPAIR_SHOP_MIN_CLAIMS
+        self.index = index or ShopNameIndex()
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._loaded_at: Optional[float] = None
+        self._watermark: Optional[str] = None
+
+    def refresh(self) -> int:
+        """Merge rows changed since the last refresh (all rows the first time); returns rows read"""
+        since = None
+        if self._watermark:
+            since = (datetime.fromisoformat(self._watermark) - timedelta(seconds=REFRESH_OVERLAP_S)).isoformat()
+        rows = self.loader(updated_since=since)
+        with self._lock:
+            self.index.upsert(rows)
+            stamps = [row["updated_at"] for row in rows if row.get("updated_at")]
+            if stamps:
+                self._watermark = max([self._watermark or ""] + stamps)
+            self._loaded_at = time.monotonic()
+        return len(rows)
+
+    def _ensure_fresh(self):
+        if self._loaded_at is None:
+            self.refresh()
+            return
+        with self._lock:
+            if self._refreshing or time.monotonic() - self._loaded_at < self.refresh_s:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Warning: Repair shop reputation refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+                    self._loaded_at = time.monotonic()
+
+        threading.Thread(target=run, name="repair-shop-refresh", daemon=True).start()
+
+    def assess(self, repair_shop: Optional[str]) -> Dict[str, Any]:
+        """Risk level ("high", "medium", "low" or "unknown") and reason for a repair shop name"""
+        if not repair_shop:
+            return {"risk_level": "unknown", "reason": "No repair shop specified"}
+
+        self._ensure_fresh()
+        with self._lock:
+            found = self.index.match(repair_shop)
+        shop_lower = repair_shop.lower()
+        high_risk_name = _HIGH_RISK_PATTERN.search(shop_lower) is not None
+        result = {"shop_name": repair_shop}
+        if found:
+            row, how = found
+            claims = int(row.get("claim_count") or 0)
+            fraud_rate = int(row.get("fraud_claim_count") or 0) / claims if claims else 0.0
+            result.update(
+                matched_shop=row["display_name"], match=how, claim_count=claims, fraud_rate=round(fraud_rate, 3)
+            )
+            if claims >= self.min_claims and fraud_rate >= self.fraud_rate_high:
+                return dict(result, risk_level="high", reason=f"Shop has a high fraud rate ({fraud_rate:.0%} of {claims} scored claims)")
+            if row.get("reputation") == "flagged":
+                return dict(result, risk_level="high", reason="Shop is flagged as high-risk")
+            # A trusted name only vouches for near matches that do not look high-risk themselves
+            if row.get("reputation") == "trusted" and (how == "exact" or not high_risk_name):
+                return dict(result, risk_level="low", reason="Certified/authorized repair shop")
+
+        # Unknown or unremarkable shops: judge the name itself
+        if high_risk_name:
+            return dict(result, risk_level="high", reason="Shop name contains high-risk keywords")
+        if _LOW_RISK_PATTERN.search(shop_lower):
+            return dict(result, risk_level="low", reason="Certified/authorized repair shop")
+        return dict(result, risk_level="medium", reason="Standard repair shop")
+
+
+_reputation: Optional[RepairShopReputation] = None
+_reputation_lock = threading.Lock()
+
+
+def get_shop_reputation() -> RepairShopReputation:
+    """Shared repair shop reputation store for this process"""
+    global _reputation
+    with _reputation_lock:
+        if _reputation is None:
+            _reputation = RepairShopReputation()
+        return _reputation
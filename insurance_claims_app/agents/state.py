@@ -2,9 +2,48 @@
 LangGraph State Definition for Claims Processing Workflow
 Supports both simple workflow and supervisor-based multi-agent workflow
 """
-from typing import TypedDict, Optional, List, Dict, Any, Literal
+import operator
+from typing import TypedDict, Optional, List, Dict, Any, Literal, Annotated
 from datetime import datetime
 
+from .step_log import append_steps
+
+
+# Agent completion stages in pipeline order
+STAGE_ORDER = {
+    "document_analysis_complete": 0,
+    "validation_complete": 1,
+    "fraud_investigation_complete": 2,
+    "approval_complete": 3,
+}
+
+
+def merge_current_step(current: Optional[str], update: Optional[str]) -> Optional[str]:
+    """
+    Reducer for `current_step`.
+
+    Parallel branches finish in the same graph step and each reports its own
+    stage; keep the furthest-along one. Any other update simply replaces.
+    """
+    if current in STAGE_ORDER and update in STAGE_ORDER:
+        return current if STAGE_ORDER[current] > STAGE_ORDER[update] else update
+    return update
+
+
+def merge_node_timings(current: Optional[Dict[str, Dict[str, Any]]], update: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Reducer for `node_timings`: sum calls, time and call counts per node"""
+    merged = {node: dict(totals) for node, totals in (current or {}).items()}
+    for node, timing in (update or {}).items():
+        totals = merged.setdefault(node, {})
+        for key, value in timing.items():
+            totals[key] = round(totals.get(key, 0) + value, 3)
+    return merged
+
+
+def merge_agent_memo(current: Optional[Dict[str, Dict[str, Any]]], update: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Reducer for `agent_memo`: parallel agents each add their own entry; a rerun replaces"""
+    return {**(current or {}), **(update or {})}
+
 
 class ClaimState(TypedDict, total=False):
     """Base claim state for simple workflow (backward compatible)"""
@@ -51,11 +90,19 @@ class SupervisorClaimState(ClaimState, total=False):
     """
     Extended state for supervisor-based multi-agent workflow.
     Includes supervisor decision fields and workflow tracking.
+    
+    Nodes return only the keys they change. Keys that parallel branches
+    write in the same step carry reducers (history lists append).
     """
+    current_step: Annotated[str, merge_current_step]
+    
     # Supervisor Agent fields
     supervisor_decision: Literal["document_analyzer", "validation", "fraud_investigation", "approval", "human_review", "complete"]
     supervisor_reasoning: str
     supervisor_priority: Literal["low", "medium", "high", "critical"]
+    parallel_agents: List[str]  # fan-out set for the next step, empty when routing to one agent
+    next_hop: Optional[str]  # set by an agent node when the decision table already knows the next agent
+    parallel_branch: bool  # only on Send payloads: this node runs as one branch of a fan-out
     
     # Complexity analysis
     complexity_analysis: Dict[str, Any]
@@ -67,19 +114,30 @@ class SupervisorClaimState(ClaimState, total=False):
     # Image fraud detection from API (vector store)
     image_fraud_check: Dict[str, Any]
     
+    # Speculative fraud score started with validation: {"inputs": score_claim arguments, "assessment": result}
+    fraud_prescore: Dict[str, Any]
+    
     # Fraud Investigation Agent outputs
     fraud_investigation: Dict[str, Any]
     
     # Human Review fields
     human_review_required: bool
     human_review_reason: str
-    human_review_decision: str
+    human_review_decision: str  # APPROVE or DENY, injected when a paused claim is resumed
     human_reviewer_notes: str
+    human_reviewer: str
+    review_interrupt: bool  # pause at human review for a reviewer (checkpointed runs only)
+    deadline_exceeded: Annotated[bool, operator.or_]  # an agent was skipped because the claim's deadline had passed (set by parallel branches too)
     
     # Workflow tracking
-    workflow_history: List[Dict[str, Any]]
-    agents_invoked: List[str]
+    workflow_history: Annotated[List[tuple], append_steps]  # step records, see step_log.STEP_FIELDS
+    agents_invoked: Annotated[List[str], operator.add]
+    node_timings: Annotated[Dict[str, Dict[str, Any]], merge_node_timings]  # per node: calls, duration_ms, cpu_ms, db_calls, llm_calls
     total_processing_time_ms: int
+    
+    # Incremental reprocessing: per agent, digests of the fields it read and its outputs
+    agent_memo: Annotated[Dict[str, Dict[str, Any]], merge_agent_memo]
+    reuse_memo: Dict[str, Dict[str, Any]]  # agent_memo of the previous run, when reprocessing a corrected claim
 
 
 class ChatState(TypedDict, total=False):
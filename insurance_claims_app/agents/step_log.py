@@ -0,0 +1,116 @@
+"""
+Compact Workflow Step Log
+Each workflow step is one tuple with a fixed field order instead of a
+free-form dict; the log in graph state keeps the newest
+WORKFLOW_HISTORY_MAX_STEPS steps, while each run also collects all of its
+steps, uncapped, for claim_workflow_steps
+"""
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+
+# Field order of a step record (also the claim_workflow_steps column order after claim_id)
+STEP_FIELDS = ("seq", "step", "action", "detail", "duration_ms", "cpu_ms", "db_calls", "llm_calls", "reused")
+SEQ, STEP, ACTION, DETAIL, DURATION_MS, CPU_MS, DB_CALLS, LLM_CALLS, REUSED = range(len(STEP_FIELDS))
+
+# Records are plain tuples so checkpoints store them as bare arrays; after a
+# checkpoint round trip they may come back as lists, so read them by index
+StepRecord = Sequence[Any]
+
+_run_steps: contextvars.ContextVar = contextvars.ContextVar("workflow_run_steps", default=None)
+
+
+def step_record(step: str, action: str, detail: Optional[str] = None, reused: bool = False) -> tuple:
+    """A new step; the log reducer assigns `seq` and the node wrapper adds timing"""
+    return (0, step, action, detail, None, None, None, None, reused)
+
+
+def with_timing(record: StepRecord, timing: Dict[str, Any]) -> tuple:
+    """Copy of the record with the node's wall time, CPU time and call counts"""
+    packed = list(record)
+    packed[DURATION_MS] = timing.get("duration_ms")
+    packed[CPU_MS] = timing.get("cpu_ms")
+    packed[DB_CALLS] = timing.get("db_calls")
+    packed[LLM_CALLS] = timing.get("llm_calls")
+    return tuple(packed)
+
+
+def append_steps(current: Optional[List[StepRecord]], update: Optional[List[StepRecord]]) -> List[StepRecord]:
+    """
+    Reducer for `workflow_history`: number new steps and keep the newest ones.
+
+    `seq` counts every step of the run, so the first kept record shows how
+    many were dropped by the cap.
+    """
+    log = list(current or [])
+    last_seq = log[-1][SEQ] if log else 0
+    for offset, record in enumerate(update or [], 1):
+        log.append((last_seq + offset,) + tuple(record[1:]))
+
+    cap = config.WORKFLOW_HISTORY_MAX_STEPS
+    if cap > 0 and len(log) > cap:
+        del log[:len(log) - cap]
+    return log
+
+
+@contextmanager
+def collect_steps() -> Iterator[List[tuple]]:
+    """Gather the steps that nodes of the run inside this block add (see `record_steps`)"""
+    steps: List[tuple] = []
+    token = _run_steps.set(steps)
+    try:
+        yield steps
+    finally:
+        _run_steps.reset(token)
+
+
+def record_steps(records: Optional[List[StepRecord]], order: tuple = ()):
+    """
+    Add a node's new steps to the current run's collection; no-op outside
+    `collect_steps`. `order` is the position at which the graph applies the
+    node's writes (see `number_run_steps`).
+    """
+    collected = _run_steps.get()
+    if collected is not None and records:
+        collected.extend((order, record) for record in records)
+
+
+def number_run_steps(collected: List[tuple], history: Optional[List[StepRecord]]) -> List[tuple]:
+    """
+    Put a run's collected steps in log order and number them to end at the
+    log's last `seq`.
+
+    Parallel nodes finish in any order but the log reducer applies their
+    steps in graph order, so the steps are sorted by their `order` first.
+    The log counts every step of the claim's runs, so a resumed run's steps
+    continue where the stored ones left off.
+    """
+    records = [record for _, record in sorted(collected, key=lambda item: item[0])]
+    last_seq = history[-1][SEQ] if history else len(records)
+    first_seq = last_seq - len(records) + 1
+    return [(first_seq + offset,) + tuple(record[1:]) for offset, record in enumerate(records)]
+
+
+def step_dicts(history: Optional[List[StepRecord]]) -> List[Dict[str, Any]]:
+    """Records as dicts keyed by STEP_FIELDS"""
+    return [dict(zip(STEP_FIELDS, record)) for record in history or []]
+
+
+def summarize_steps(history: Optional[List[StepRecord]]) -> Dict[str, Any]:
+    """Per-claim summary for API responses: path through the graph and totals"""
+    history = history or []
+    total = history[-1][SEQ] if history else 0
+    return {
+        "total_steps": total,
+        "dropped_steps": total - len(history),
+        "path": [record[STEP] for record in history],
+        "reused_agents": [record[STEP] for record in history if record[REUSED]],
+        "duration_ms": round(sum(record[DURATION_MS] or 0 for record in history), 3),
+        "db_calls": sum(record[DB_CALLS] or 0 for record in history),
+        "llm_calls": sum(record[LLM_CALLS] or 0 for record in history)
+    }
@@ -8,11 +8,12 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from langchain_community.chat_models.oci_generative_ai import ChatOCIGenAI
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from pydantic import BaseModel, Field
 
 from config import config
+from external_apis import get_llm_client, budget_running_low
+from external_apis.deadline import DEADLINE_FALLBACKS
 
 
 class SupervisorDecision(BaseModel):
@@ -47,25 +48,15 @@ class ClaimsSupervisorAgent:
         }
     
     def _init_llm(self):
-        """Initialize OCI GenAI LLM for supervisor reasoning"""
-        return ChatOCIGenAI(
-            model_id=config.OCI_MODEL_ID,
-            service_endpoint=config.OCI_SERVICE_ENDPOINT,
-            compartment_id=config.OCI_COMPARTMENT_ID,
-            auth_type="API_KEY",
-            model_kwargs={"temperature": 0, "max_tokens": 500}
-        )
+        """LLM for supervisor reasoning, via the shared client's batch lane"""
+        return get_llm_client().lane("batch")
+    
+    HIGH_RISK_CLAIM_TYPES = ["total_loss", "theft", "vandalism", "fire"]
     
-    def analyze_claim_complexity(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    def static_complexity(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Analyze claim complexity to determine routing strategy.
-        
-        Factors considered:
-        - Claim amount (high amounts = more scrutiny)
-        - Number of damage photos
-        - Claim type
-        - Customer history (if available)
-        - Time since incident
+        Complexity factors fixed at submission (amount, photos, claim type,
+        filing delay), plus whether they alone force fraud investigation.
         """
         complexity_score = 0
         complexity_factors = []
@@ -91,8 +82,7 @@ class ClaimsSupervisorAgent:
         
         # Factor 3: Claim type
         claim_type = state.get("claim_type", "").lower()
-        high_complexity_types = ["total_loss", "theft", "vandalism", "fire"]
-        if claim_type in high_complexity_types:
+        if claim_type in self.HIGH_RISK_CLAIM_TYPES:
             complexity_score += 2
             complexity_factors.append(f"High-complexity claim type: {claim_type}")
         
@@ -107,6 +97,29 @@ class ClaimsSupervisorAgent:
         except:
             pass
         
+        return {
+            "score": complexity_score,
+            "factors": complexity_factors,
+            # High amounts and high-risk types always get fraud investigation
+            "escalation": amount > 30000 or claim_type in self.HIGH_RISK_CLAIM_TYPES
+        }
+    
+    @staticmethod
+    def dynamic_inputs(state: Dict[str, Any]) -> Dict[str, Any]:
+        """The agent outputs that dynamic complexity depends on"""
+        image_fraud_check = state.get("image_fraud_check") or {}
+        return {
+            "fraud_score": state.get("fraud_score", 0),
+            "image_duplicate": bool(image_fraud_check.get("is_potential_duplicate")),
+            "highest_similarity": image_fraud_check.get("highest_similarity", 0),
+            "similar_claims": list(image_fraud_check.get("similar_claims", []))
+        }
+    
+    def dynamic_complexity(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Complexity factors that change as agents run (fraud score, duplicate images)"""
+        complexity_score = 0
+        complexity_factors = []
+        
         # Factor 5: Existing fraud indicators
         fraud_score = state.get("fraud_score", 0)
         if fraud_score > 0.7:
@@ -126,37 +139,119 @@ class ClaimsSupervisorAgent:
                 f"DUPLICATE IMAGE: {similarity:.2%} match with claims {similar_claims}"
             )
         
-        # Determine priority level
+        return {"score": complexity_score, "factors": complexity_factors}
+    
+    @staticmethod
+    def priority_for_score(complexity_score: int) -> str:
         if complexity_score >= 6:
-            priority = "critical"
+            return "critical"
         elif complexity_score >= 4:
-            priority = "high"
+            return "high"
         elif complexity_score >= 2:
-            priority = "medium"
+            return "medium"
+        return "low"
+    
+    def analyze_claim_complexity(self, state: Dict[str, Any], static: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Analyze claim complexity to determine routing strategy.
+        
+        Factors considered:
+        - Claim amount (high amounts = more scrutiny)
+        - Number of damage photos
+        - Claim type
+        - Customer history (if available)
+        - Time since incident
+        
+        Args:
+            static: Precomputed `static_complexity` result, if available
+        """
+        static = static or self.static_complexity(state)
+        dynamic = self.dynamic_complexity(state)
+        complexity_score = static["score"] + dynamic["score"]
+        
+        return {
+            "complexity_score": complexity_score,
+            "complexity_factors": static["factors"] + dynamic["factors"],
+            "priority": self.priority_for_score(complexity_score),
+            "escalation": static["escalation"]
+        }
+    
+    def update_complexity(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Incrementally maintained complexity analysis.
+        
+        The static part is computed once from the claim inputs and carried in
+        `state["complexity_analysis"]`; the dynamic part is recomputed only
+        when the agent outputs it depends on have changed. Each recompute is
+        appended to `revisions`, so the score's evolution can be audited.
+        Returns the cached analysis unchanged when nothing relevant moved.
+        """
+        cached = state.get("complexity_analysis") or {}
+        inputs = self.dynamic_inputs(state)
+        if "static" in cached and cached.get("dynamic_inputs") == inputs:
+            return cached
+        
+        static = cached.get("static") or self.static_complexity(state)
+        dynamic = self.dynamic_complexity(state)
+        complexity_score = static["score"] + dynamic["score"]
+        priority = self.priority_for_score(complexity_score)
+        
+        previous = cached.get("dynamic_inputs")
+        if previous is None:
+            trigger = ["claim_inputs"]
         else:
-            priority = "low"
+            trigger = [name for name, value in inputs.items() if previous.get(name) != value]
+        revisions = list(cached.get("revisions", []))
+        revisions.append({"trigger": trigger, "complexity_score": complexity_score, "priority": priority})
         
         return {
             "complexity_score": complexity_score,
-            "complexity_factors": complexity_factors,
-            "priority": priority
+            "complexity_factors": static["factors"] + dynamic["factors"],
+            "priority": priority,
+            "escalation": static["escalation"],
+            "static": static,
+            "dynamic": dynamic,
+            "dynamic_inputs": inputs,
+            "revisions": revisions
         }
     
-    def determine_next_agent(self, state: Dict[str, Any]) -> SupervisorDecision:
+    def determine_next_agent(self, state: Dict[str, Any], static: Dict[str, Any] = None) -> SupervisorDecision:
         """
         Determine which agent should process the claim next.
         Uses LLM reasoning combined with rule-based logic.
+        
+        Args:
+            static: Precomputed `static_complexity` result, if available;
+                otherwise the incrementally maintained analysis in state is used
         """
         current_step = state.get("current_step", "started")
         validation_status = state.get("validation_status")
         approval_status = state.get("approval_status")
         fraud_score = state.get("fraud_score", 0)
         
+        # Out of time: a person finishes the claim (once; not again after the review)
+        if state.get("deadline_exceeded") and not state.get("human_review_required"):
+            DEADLINE_FALLBACKS.inc(fallback="human_review")
+            return SupervisorDecision(
+                next_agent="human_review",
+                reasoning="Claim deadline exceeded before processing finished - routing to human review",
+                priority="high",
+                parallel_agents=[]
+            )
+        
         # Rule-based routing for clear cases
         if current_step == "started":
             # New claim - check if we need document analysis first
             photos = state.get("damage_photos", [])
-            if photos and len(photos) > 0:
+            if photos and len(photos) > 0 and config.SUPERVISOR_PARALLEL_FANOUT:
+                # Validation does not read document analysis results, so both run at once
+                return SupervisorDecision(
+                    next_agent="document_analyzer",
+                    reasoning="New claim with damage photos - analyzing documents and validating in parallel",
+                    priority="medium",
+                    parallel_agents=["document_analyzer", "validation"]
+                )
+            elif photos and len(photos) > 0:
                 return SupervisorDecision(
                     next_agent="document_analyzer",
                     reasoning="New claim with damage photos - analyzing documents first",
@@ -189,7 +284,10 @@ class ClaimsSupervisorAgent:
                 )
             
             # Analyze complexity for valid claims
-            complexity = self.analyze_claim_complexity(state)
+            if static is None:
+                complexity = self.update_complexity(state)
+            else:
+                complexity = self.analyze_claim_complexity(state, static)
             
             # Check if fraud investigation is needed based on:
             # 1. High complexity (priority high or critical)
@@ -199,7 +297,7 @@ class ClaimsSupervisorAgent:
             # 5. Duplicate images detected (image fraud)
             amount = state.get("estimated_damage_amount", 0)
             claim_type = state.get("claim_type", "").lower()
-            high_risk_types = ["total_loss", "theft", "vandalism", "fire"]
+            high_risk_types = self.HIGH_RISK_CLAIM_TYPES
             
             # Check for image fraud from API
             image_fraud_check = state.get("image_fraud_check", {})
@@ -208,11 +306,20 @@ class ClaimsSupervisorAgent:
             needs_fraud_investigation = (
                 complexity["priority"] in ["high", "critical"] or
                 fraud_score > 0.5 or
-                amount > 30000 or
-                claim_type in high_risk_types or
+                complexity["escalation"] or  # amount > $30,000 or high-risk type
                 has_duplicate_images  # Always investigate if duplicate images detected
             )
             
+            if needs_fraud_investigation and budget_running_low():
+                # No time left for a deep investigation
+                DEADLINE_FALLBACKS.inc(fallback="human_review")
+                return SupervisorDecision(
+                    next_agent="human_review",
+                    reasoning="Fraud investigation needed but the claim deadline is close - routing to human review",
+                    priority="critical" if has_duplicate_images else complexity["priority"],
+                    parallel_agents=[]
+                )
+            
             if needs_fraud_investigation:
                 # Build detailed reasoning
                 reasons = []
@@ -277,6 +384,14 @@ class ClaimsSupervisorAgent:
                 )
         
         if current_step == "human_review_complete":
+            review_decision = state.get("human_review_decision")
+            if review_decision in ("APPROVE", "DENY"):
+                return SupervisorDecision(
+                    next_agent="approval",
+                    reasoning=f"Human reviewer decided {review_decision} - finalizing approval",
+                    priority="high",
+                    parallel_agents=[]
+                )
             return SupervisorDecision(
                 next_agent="complete",
                 reasoning="Human review complete - workflow finished",
@@ -298,8 +413,9 @@ class ClaimsSupervisorAgent:
         
         Returns updated state with supervisor decision.
         """
-        # Analyze complexity
-        complexity = self.analyze_claim_complexity(state)
+        # Refresh complexity (only the factors whose inputs changed)
+        complexity = self.update_complexity(state)
+        state["complexity_analysis"] = complexity
         
         # Determine next agent
         decision = self.determine_next_agent(state)
@@ -308,7 +424,7 @@ class ClaimsSupervisorAgent:
         state["supervisor_decision"] = decision.next_agent
         state["supervisor_reasoning"] = decision.reasoning
         state["supervisor_priority"] = decision.priority
-        state["complexity_analysis"] = complexity
+        state["parallel_agents"] = decision.parallel_agents
         state["current_step"] = "supervisor_routed"
         
         return state
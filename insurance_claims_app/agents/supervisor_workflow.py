@@ -2,9 +2,11 @@
 Supervisor-Based Multi-Agent Workflow for Claims Processing
 Uses LangGraph with a central Supervisor Agent orchestrating specialized agents
 """
-from typing import Dict, Any, Literal, Annotated
+import time
+from typing import Callable, Dict, Any, Optional
+from langgraph.config import get_config
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Command, Send, interrupt
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,6 +17,16 @@ from .document_analyzer_agent import DocumentAnalyzerAgent
 from .validation_agent import ClaimsValidationAgent
 from .fraud_investigation_agent import FraudInvestigationAgent
 from .approval_agent import ClaimsApprovalAgent
+from .decision_table import DecisionTable
+from .agent_memo import TrackingState, memo_entry, reusable_outputs
+from .step_log import append_steps, collect_steps, number_run_steps, record_steps, step_record, with_timing
+from .fraud_graph import get_fraud_graph
+from .fraud_prescore import fraud_score_inputs, get_fraud_prescorer
+from config import config
+from external_apis import Deadline, DeadlineExceeded, deadline_scope, current_deadline, check_deadline, budget_running_low
+from external_apis.deadline import DEADLINE_FALLBACKS
+from database import get_checkpointer
+from monitoring import get_registry, track_step
 
 
 # Initialize all agents
@@ -24,103 +36,321 @@ validation_agent = ClaimsValidationAgent()
 fraud_agent = FraudInvestigationAgent()
 approval_agent = ClaimsApprovalAgent()
 
+# Supervisor routing precomputed for every completed step
+decision_table = DecisionTable.compile(supervisor)
 
-def supervisor_node(state: SupervisorClaimState) -> SupervisorClaimState:
+
+_metrics = get_registry()
+NODE_DURATION = _metrics.histogram("workflow_node_duration_ms", "Wall time per supervisor graph node")
+NODE_CPU = _metrics.histogram("workflow_node_cpu_ms", "CPU time per supervisor graph node")
+NODE_DB_CALLS = _metrics.histogram("workflow_node_db_calls", "DB round trips per node run", buckets=(0, 1, 2, 3, 5, 8, 13, 21))
+NODE_LLM_CALLS = _metrics.histogram("workflow_node_llm_calls", "LLM calls per node run", buckets=(0, 1, 2, 3, 5, 8))
+CLAIM_PROCESSING_TIME = _metrics.histogram("claim_processing_time_ms", "End-to-end supervisor workflow time per claim")
+FAST_PATH_LOOKUPS = _metrics.counter("decision_table_lookups_total", "Agent-node decision table lookups by result")
+AGENT_REUSE = _metrics.counter("agent_outputs_reused_total", "Agent runs skipped on reprocessing because their inputs were unchanged")
+
+# Agents that may run side by side in one graph step (no data dependencies)
+PARALLEL_SAFE_AGENTS = {"document_analyzer", "validation"}
+
+# Claim fields supplied by the submitter (the workflow's inputs)
+CLAIM_INPUT_FIELDS = (
+    "claim_id", "policy_id", "customer_id", "incident_date", "claim_date", "claim_type",
+    "damage_description", "repair_shop", "estimated_damage_amount", "damage_photos",
+    "incident_report", "repair_estimate", "image_fraud_check"
+)
+
+# Routing targets of a decision, by node name
+AGENT_ROUTES = {
+    "document_analyzer": "document_analyzer",
+    "validation": "validation",
+    "fraud_investigation": "fraud_investigation",
+    "approval": "approval",
+    "human_review": "human_review",
+    "complete": END
+}
+
+
+def _changes(before: SupervisorClaimState, after: SupervisorClaimState, history: list, invoked: list = None) -> Dict[str, Any]:
+    """
+    Keys the node changed, as a partial update.
+    
+    Agents mutate and return the state dict they are given, so each node runs
+    them on a shallow copy and reports only replaced values. History entries
+    are returned on their own; the state reducer appends them.
+    """
+    update = {
+        key: value for key, value in after.items()
+        if key not in ("workflow_history", "agents_invoked") and (key not in before or before[key] is not value)
+    }
+    update["workflow_history"] = history
+    if invoked:
+        update["agents_invoked"] = invoked
+    return update
+
+
+def _run_agent(state: SupervisorClaimState, step: str, action: str, agent_fn) -> Dict[str, Any]:
+    """
+    Run one specialist agent and return its partial update.
+    
+    The fields the agent reads are recorded in `agent_memo`. When a corrected
+    claim is reprocessed (`reuse_memo`) and none of those fields changed, the
+    previous outputs are reused instead of running the agent again.
+    """
+    previous = reusable_outputs((state.get("reuse_memo") or {}).get(step), state)
+    if previous is not None:
+        AGENT_REUSE.inc(agent=step)
+        update = {**previous, "workflow_history": [step_record(step, action, reused=True)], "agents_invoked": [step]}
+        update["agent_memo"] = {step: state["reuse_memo"][step]}
+        return update
+    
+    tracked = TrackingState(state)
+    result = agent_fn(tracked)
+    update = _changes(state, result, [step_record(step, action)], [step])
+    update["agent_memo"] = {step: memo_entry(state, tracked, update)}
+    return update
+
+
+def supervisor_node(state: SupervisorClaimState) -> Dict[str, Any]:
     """
     Supervisor node - analyzes state and determines next agent.
     This is the central coordinator of the workflow.
     """
-    # Track workflow history
-    workflow_history = state.get("workflow_history", [])
-    workflow_history.append({
-        "step": "supervisor",
-        "current_step": state.get("current_step", "started"),
-        "action": "analyzing"
-    })
-    state["workflow_history"] = workflow_history
-    
     # Run supervisor analysis
-    state = supervisor.supervise(state)
+    result = supervisor.supervise(dict(state))
     
-    # Update history with decision
-    workflow_history.append({
-        "step": "supervisor",
-        "decision": state.get("supervisor_decision"),
-        "reasoning": state.get("supervisor_reasoning")
-    })
-    state["workflow_history"] = workflow_history
+    # One history step per visit: the decision and its reasoning
+    if result.get("parallel_agents"):
+        action = "fan out to " + ", ".join(result["parallel_agents"])
+    else:
+        action = f"route to {result.get('supervisor_decision')}"
+    history = [step_record("supervisor", action, result.get("supervisor_reasoning"))]
     
-    return state
+    update = _changes(state, result, history)
+    update["next_hop"] = None
+    return update
 
 
-def document_analyzer_node(state: SupervisorClaimState) -> SupervisorClaimState:
+def document_analyzer_node(state: SupervisorClaimState) -> Dict[str, Any]:
     """Document analysis node"""
-    workflow_history = state.get("workflow_history", [])
-    workflow_history.append({"step": "document_analyzer", "action": "analyzing documents"})
-    state["workflow_history"] = workflow_history
-    
-    return document_analyzer.analyze_documents(state)
+    return _run_agent(state, "document_analyzer", "analyzing documents", document_analyzer.analyze_documents)
 
 
-def validation_node(state: SupervisorClaimState) -> SupervisorClaimState:
+def validation_node(state: SupervisorClaimState) -> Dict[str, Any]:
     """Validation node"""
-    workflow_history = state.get("workflow_history", [])
-    workflow_history.append({"step": "validation", "action": "validating claim"})
-    state["workflow_history"] = workflow_history
-    
-    return validation_agent.validate_claim(state)
+    return _run_agent(state, "validation", "validating claim", validation_agent.validate_claim)
 
 
-def fraud_investigation_node(state: SupervisorClaimState) -> SupervisorClaimState:
+def fraud_investigation_node(state: SupervisorClaimState) -> Dict[str, Any]:
     """Fraud investigation node"""
-    workflow_history = state.get("workflow_history", [])
-    workflow_history.append({"step": "fraud_investigation", "action": "investigating fraud"})
-    state["workflow_history"] = workflow_history
-    
-    return fraud_agent.investigate(state)
+    return _run_agent(state, "fraud_investigation", "investigating fraud", fraud_agent.investigate)
 
 
-def approval_node(state: SupervisorClaimState) -> SupervisorClaimState:
+def approval_node(state: SupervisorClaimState) -> Dict[str, Any]:
     """Approval node"""
-    workflow_history = state.get("workflow_history", [])
-    workflow_history.append({"step": "approval", "action": "processing approval"})
-    state["workflow_history"] = workflow_history
+    return _run_agent(state, "approval", "processing approval", approval_agent.process_approval)
+
+
+def human_review_node(state: SupervisorClaimState) -> Dict[str, Any]:
+    """
+    Human review node - escalates the claim to a human reviewer.
     
-    return approval_agent.process_approval(state)
+    In a checkpointed run (`review_interrupt`) the graph pauses here until a
+    reviewer decision arrives through `submit_review`; the decision then goes
+    to the approval agent, so a review costs one approval step instead of a
+    rerun. Otherwise the claim is simply left as NEEDS_REVIEW.
+    """
+    reason = state.get("supervisor_reasoning", "Requires manual review")
+    update = {
+        "workflow_history": [step_record("human_review", "escalated to human", reason)],
+        "agents_invoked": ["human_review"],
+        "human_review_required": True,
+        "human_review_reason": reason,
+        "current_step": "human_review_complete"
+    }
+    
+    if state.get("approval_status") is None:
+        update["approval_status"] = "NEEDS_REVIEW"
+        update["approval_reason"] = f"Escalated for human review: {state.get('supervisor_reasoning', 'High complexity')}"
+    
+    if state.get("review_interrupt") and not state.get("human_review_decision"):
+        # Pauses the run; resumes here with the reviewer's decision
+        review = interrupt({
+            "claim_id": state.get("claim_id"),
+            "reason": reason,
+            "fraud_score": state.get("fraud_score"),
+            "approval_status": state.get("approval_status")
+        })
+        update["human_review_decision"] = review["decision"]
+        update["human_reviewer_notes"] = review.get("notes")
+        update["human_reviewer"] = review.get("reviewer")
+        update["workflow_history"] = [step_record("human_review", f"reviewer decided {review['decision']}", review.get("notes"))]
+    
+    return update
 
 
-def human_review_node(state: SupervisorClaimState) -> SupervisorClaimState:
+def within_deadline(node_name: str, node_fn):
     """
-    Human review node - marks claim for human review.
-    In production, this would integrate with a ticketing system.
+    Skip an agent node once the claim's deadline has passed.
+    
+    The check runs before the agent starts, and external clients check again
+    before each call; either way the agent's partial work is dropped and the
+    claim is flagged `deadline_exceeded`, which the supervisor routes to
+    human review.
     """
-    workflow_history = state.get("workflow_history", [])
-    workflow_history.append({"step": "human_review", "action": "escalated to human"})
-    state["workflow_history"] = workflow_history
+    def run(state: SupervisorClaimState) -> Dict[str, Any]:
+        try:
+            check_deadline(node_name)
+            return node_fn(state)
+        except DeadlineExceeded as e:
+            DEADLINE_FALLBACKS.inc(fallback=f"skip_{node_name}")
+            return {
+                "deadline_exceeded": True,
+                "workflow_history": [step_record(node_name, "skipped: deadline exceeded", str(e))]
+            }
     
-    state["human_review_required"] = True
-    state["human_review_reason"] = state.get("supervisor_reasoning", "Requires manual review")
-    state["current_step"] = "human_review_complete"
+    run.__name__ = getattr(node_fn, "__name__", node_name)
+    return run
+
+
+def with_fraud_prescore(node_fn):
+    """
+    Score fraud speculatively while the validation node runs.
     
-    # For demo purposes, we'll auto-approve with monitoring
-    # In production, this would pause and wait for human input
-    if state.get("approval_status") is None:
-        state["approval_status"] = "NEEDS_REVIEW"
-        state["approval_reason"] = f"Escalated for human review: {state.get('supervisor_reasoning', 'High complexity')}"
+    The score is started before validation and, when validation passes,
+    collected into `fraud_prescore` for the approval and fraud investigation
+    agents; on the fan-out path it also overlaps document analysis. When
+    validation fails (or is skipped past the deadline) the score is
+    discarded, and a failed score just leaves the agents to call the API.
+    """
+    def run(state: SupervisorClaimState) -> Dict[str, Any]:
+        if not config.FRAUD_PRESCORE or state.get("fraud_prescore"):
+            return node_fn(state)
+        
+        prescorer = get_fraud_prescorer()
+        future = prescorer.start(state)
+        update = {}
+        try:
+            update = node_fn(state)
+        finally:
+            prescore = prescorer.collect(future, update.get("validation_status"))
+        if prescore is not None:
+            update["fraud_prescore"] = prescore
+        return update
     
-    return state
+    run.__name__ = getattr(node_fn, "__name__", "fraud_prescore")
+    return run
 
 
-def route_from_supervisor(state: SupervisorClaimState) -> Literal["document_analyzer", "validation", "fraud_investigation", "approval", "human_review", "complete"]:
+def instrumented(node_name: str, node_fn):
+    """
+    Wrap a node so each run records wall time, CPU time, DB round trips and
+    LLM calls: on its last history entry, in `node_timings`, and as histograms.
+    """
+    def run(state: SupervisorClaimState) -> Dict[str, Any]:
+        with track_step() as stats:
+            update = node_fn(state)
+        timing = stats.as_dict()
+        
+        if update.get("workflow_history"):
+            update["workflow_history"][-1] = with_timing(update["workflow_history"][-1], timing)
+        update["node_timings"] = {node_name: {"calls": 1, **timing}}
+        
+        NODE_DURATION.observe(stats.wall_ms, node=node_name)
+        NODE_CPU.observe(stats.cpu_ms, node=node_name)
+        NODE_DB_CALLS.observe(stats.db_calls, node=node_name)
+        NODE_LLM_CALLS.observe(stats.llm_calls, node=node_name)
+        return update
+    
+    run.__name__ = getattr(node_fn, "__name__", node_name)
+    return run
+
+
+def _write_order(metadata: Dict[str, Any]) -> tuple:
+    """Where LangGraph applies a task's writes: by super-step, then task path within the step"""
+    def path_str(part):
+        if isinstance(part, (tuple, list)):
+            return "~" + ", ".join(path_str(p) for p in part)
+        return f"{part:010d}" if isinstance(part, int) else str(part)
+    return metadata.get("langgraph_step", 0), path_str(metadata.get("langgraph_path", ()))
+
+
+def logged(node_fn):
+    """Outermost node wrapper: hand the node's new steps to the run's uncapped collection"""
+    def run(state: SupervisorClaimState) -> Dict[str, Any]:
+        update = node_fn(state)
+        record_steps(update.get("workflow_history"), _write_order(get_config().get("metadata", {})))
+        return update
+    
+    run.__name__ = getattr(node_fn, "__name__", "logged")
+    return run
+
+
+def with_fast_path(node_fn):
+    """
+    Let an agent node route itself when the decision table covers its result.
+    
+    After the agent runs, the table is consulted on the updated state; a hit
+    records the supervisor's decision as `next_hop` so the graph goes straight
+    to the next agent, skipping a supervisor step. A miss (or a fan-out branch,
+    which must rejoin at the supervisor) leaves `next_hop` empty.
+    """
+    def run(state: SupervisorClaimState) -> Dict[str, Any]:
+        update = node_fn(state)
+        if not config.SUPERVISOR_FAST_PATH or state.get("parallel_branch"):
+            return update
+        if update.get("deadline_exceeded") or budget_running_low():
+            # Deadline fallbacks are supervisor rules outside the table
+            update["next_hop"] = None
+            return update
+        
+        decision = decision_table.lookup({**state, **update})
+        FAST_PATH_LOOKUPS.inc(result="hit" if decision else "miss")
+        if decision is None:
+            update["next_hop"] = None
+            return update
+        
+        merged = {**state, **update}
+        update.update({
+            "next_hop": decision.next_agent,
+            "supervisor_decision": decision.next_agent,
+            "supervisor_reasoning": decision.reasoning,
+            "supervisor_priority": decision.priority,
+            "parallel_agents": decision.parallel_agents,
+            "complexity_analysis": supervisor.update_complexity(merged),
+            "current_step": "supervisor_routed"
+        })
+        update["workflow_history"] = update.get("workflow_history", []) + [
+            step_record("decision_table", f"route to {decision.next_agent}", decision.reasoning)
+        ]
+        return update
+    
+    run.__name__ = getattr(node_fn, "__name__", "fast_path")
+    return run
+
+
+def route_after_agent(state: SupervisorClaimState) -> str:
+    """Go where the decision table sent us, otherwise back to the supervisor"""
+    next_hop = state.get("next_hop")
+    if next_hop in AGENT_ROUTES:
+        return next_hop
+    return "supervisor"
+
+
+def route_from_supervisor(state: SupervisorClaimState):
     """
     Routing function - determines next node based on supervisor decision.
+    
+    A decision with `parallel_agents` fans out with one `Send` per agent;
+    the branches run in the same graph step and all return to the supervisor,
+    which runs once after the last of them finishes.
     """
-    decision = state.get("supervisor_decision", "complete")
+    parallel = [agent for agent in state.get("parallel_agents") or [] if agent in PARALLEL_SAFE_AGENTS]
+    if len(parallel) > 1:
+        return [Send(agent, {**state, "parallel_branch": True}) for agent in parallel]
     
-    # Map decision to node names
-    valid_routes = ["document_analyzer", "validation", "fraud_investigation", "approval", "human_review", "complete"]
+    decision = state.get("supervisor_decision", "complete")
     
-    if decision in valid_routes:
+    if decision in AGENT_ROUTES:
         return decision
     
     return "complete"
@@ -130,7 +360,10 @@ def build_supervisor_workflow() -> StateGraph:
     """
     Build the supervisor-based multi-agent workflow.
     
-    Architecture:
+    Architecture (a supervisor decision may also fan out to several
+    independent agents at once; they rejoin at the supervisor). When the
+    compiled decision table covers an agent's result, the agent routes
+    straight to the next agent (or END) instead of back to the supervisor:
     
                     ┌─────────────┐
                     │   START     │
@@ -165,63 +398,120 @@ def build_supervisor_workflow() -> StateGraph:
     workflow = StateGraph(SupervisorClaimState)
     
     # Add all nodes
-    workflow.add_node("supervisor", supervisor_node)
-    workflow.add_node("document_analyzer", document_analyzer_node)
-    workflow.add_node("validation", validation_node)
-    workflow.add_node("fraud_investigation", fraud_investigation_node)
-    workflow.add_node("approval", approval_node)
-    workflow.add_node("human_review", human_review_node)
+    workflow.add_node("supervisor", logged(instrumented("supervisor", supervisor_node)))
+    for name, node in (("document_analyzer", document_analyzer_node), ("validation", validation_node),
+                       ("fraud_investigation", fraud_investigation_node), ("approval", approval_node)):
+        node = within_deadline(name, node)
+        if name == "validation":
+            node = with_fraud_prescore(node)
+        workflow.add_node(name, logged(with_fast_path(instrumented(name, node))))
+    workflow.add_node("human_review", logged(with_fast_path(instrumented("human_review", human_review_node))))
     
     # Set entry point - always start with supervisor
     workflow.set_entry_point("supervisor")
     
     # Add conditional edges from supervisor
-    workflow.add_conditional_edges(
-        "supervisor",
-        route_from_supervisor,
-        {
-            "document_analyzer": "document_analyzer",
-            "validation": "validation",
-            "fraud_investigation": "fraud_investigation",
-            "approval": "approval",
-            "human_review": "human_review",
-            "complete": END
-        }
-    )
-    
-    # All agent nodes route back to supervisor for next decision
-    workflow.add_edge("document_analyzer", "supervisor")
-    workflow.add_edge("validation", "supervisor")
-    workflow.add_edge("fraud_investigation", "supervisor")
-    workflow.add_edge("approval", "supervisor")
-    workflow.add_edge("human_review", "supervisor")
+    workflow.add_conditional_edges("supervisor", route_from_supervisor, AGENT_ROUTES)
+    
+    # Agent nodes route back to supervisor for the next decision, unless the
+    # decision table already made it
+    after_agent = {**AGENT_ROUTES, "supervisor": "supervisor"}
+    for node in ("document_analyzer", "validation", "fraud_investigation", "approval", "human_review"):
+        workflow.add_conditional_edges(node, route_after_agent, after_agent)
     
     return workflow
 
 
+_compiled_workflow = None
+_compiled_durable_workflow = None
+
+
 def get_compiled_supervisor_workflow(with_memory: bool = False):
     """
     Get the compiled supervisor workflow ready for execution.
     
     Args:
-        with_memory: If True, adds checkpointing for state persistence
+        with_memory: If True, checkpoints every step to the shared durable
+            checkpointer (CHECKPOINT_BACKEND) so runs survive a restart
     """
-    workflow = build_supervisor_workflow()
+    global _compiled_workflow, _compiled_durable_workflow
     
+    # The compiled graph holds no per-claim state (checkpoints are keyed by
+    # thread_id), so build it once instead of on every claim
     if with_memory:
-        checkpointer = MemorySaver()
-        return workflow.compile(checkpointer=checkpointer)
+        if _compiled_durable_workflow is None:
+            _compiled_durable_workflow = build_supervisor_workflow().compile(checkpointer=get_checkpointer())
+        return _compiled_durable_workflow
     
-    return workflow.compile()
+    if _compiled_workflow is None:
+        _compiled_workflow = build_supervisor_workflow().compile()
+    return _compiled_workflow
 
 
-def process_claim_with_supervisor(claim_data: Dict[str, Any], with_memory: bool = False) -> SupervisorClaimState:
+def _thread_config(claim_id: str) -> Dict[str, Any]:
+    return {"configurable": {"thread_id": claim_id or "default"}}
+
+
+def awaiting_review(snapshot) -> bool:
+    """True if a checkpointed run is paused at human review"""
+    return bool(snapshot.interrupts)
+
+
+def _run(app, payload, run_config: Dict[str, Any] = None) -> SupervisorClaimState:
+    """
+    Invoke the graph; a run that pauses for review is marked and its checkpoints compacted.
+    
+    The run is bounded by the current claim deadline (set at submission), or
+    a fresh CLAIM_DEADLINE_MS budget when there is none (resume, review).
+    `run_steps` holds every step this run added; `workflow_history` is capped.
+    A checkpointed run holds a lease on its thread while it lasts, so no
+    other worker resumes it (see `resume_interrupted_claims`).
+    """
+    started = time.perf_counter()
+    thread_id = run_config["configurable"]["thread_id"] if run_config else None
+    leased = thread_id is not None and hasattr(app.checkpointer, "start_run")
+    if leased:
+        app.checkpointer.start_run(thread_id)
+    try:
+        with deadline_scope(current_deadline() or Deadline.after()), collect_steps() as collected:
+            final_state = app.invoke(payload, run_config) if run_config else app.invoke(payload)
+    except Exception:
+        if leased:
+            app.checkpointer.end_run(thread_id, finished=False)
+        raise
+    if leased:
+        app.checkpointer.end_run(thread_id)
+    final_state["run_steps"] = number_run_steps(collected, final_state.get("workflow_history"))
+    
+    if final_state.pop("__interrupt__", None):
+        final_state["human_review_required"] = True
+        final_state["human_review_reason"] = final_state.get("supervisor_reasoning", "Requires manual review")
+        if final_state.get("approval_status") is None:
+            final_state["approval_status"] = "NEEDS_REVIEW"
+            final_state["approval_reason"] = f"Awaiting human review: {final_state['human_review_reason']}"
+        # Reviews can take days; keep only the checkpoint the review resumes from
+        if hasattr(app.checkpointer, "compact"):
+            app.checkpointer.compact(run_config["configurable"]["thread_id"])
+    
+    final_state["total_processing_time_ms"] = int((time.perf_counter() - started) * 1000)
+    CLAIM_PROCESSING_TIME.observe(final_state["total_processing_time_ms"])
+    return final_state
+
+
+def process_claim_with_supervisor(claim_data: Dict[str, Any], with_memory: bool = False,
+                                  reuse_memo: Dict[str, Dict[str, Any]] = None) -> SupervisorClaimState:
     """
     Process a claim through the supervisor-based workflow.
     
     Args:
         claim_data: Dictionary with claim information
-        with_memory: If True, enables state persistence
+        with_memory: If True, checkpoints each step under the claim id. A run
+            of the same claim that stopped part-way (crash, redeploy) is
+            resumed from its last completed step instead of restarting, and
+            the run pauses at human review (HUMAN_REVIEW_INTERRUPT) until
+            `submit_review` is called.
+        reuse_memo: `agent_memo` of an earlier run of this claim; agents whose
+            inputs are unchanged reuse its outputs (see `reprocess_claim`)
         
     Returns:
         Final state with all processing results
@@ -245,18 +535,157 @@ def process_claim_with_supervisor(claim_data: Dict[str, Any], with_memory: bool
         # Include image fraud check from API if available
         "image_fraud_check": claim_data.get("image_fraud_check", {})
     }
+    if reuse_memo:
+        initial_state["reuse_memo"] = reuse_memo
+    if claim_data.get("fraud_prescore"):
+        # Carried over by reprocess_claim: validation skips a new vendor score
+        initial_state["fraud_prescore"] = claim_data["fraud_prescore"]
+    
+    # Keep the fraud ring graph current with every claim that runs
+    if initial_state["claim_id"]:
+        get_fraud_graph().add_claim(
+            initial_state["claim_id"], initial_state["customer_id"], initial_state["policy_id"],
+            initial_state["repair_shop"], initial_state["image_fraud_check"].get("similar_claims", ())
+        )
     
     # Get compiled workflow and run
     app = get_compiled_supervisor_workflow(with_memory=with_memory)
     
-    if with_memory:
-        # Run with thread_id for state persistence
-        config = {"configurable": {"thread_id": claim_data.get("claim_id", "default")}}
-        final_state = app.invoke(initial_state, config)
+    if not with_memory:
+        return _run(app, initial_state)
+    
+    # Run with thread_id for state persistence
+    initial_state["review_interrupt"] = config.HUMAN_REVIEW_INTERRUPT
+    run_config = _thread_config(claim_data.get("claim_id"))
+    # A new claim has no checkpoint: skip building a state snapshot for it
+    if app.checkpointer.get_tuple(run_config) is not None:
+        snapshot = app.get_state(run_config)
+        if snapshot.next and not reuse_memo:
+            # An earlier run of this claim stopped part-way: pick up from there
+            return _run(app, None, run_config)
+        # A finished run is replaced, not appended to
+        app.checkpointer.delete_thread(run_config["configurable"]["thread_id"])
+    return _run(app, initial_state, run_config)
+
+
+def reprocess_claim(claim_id: str, changes: Dict[str, Any], claim_data: Dict[str, Any] = None) -> Optional[SupervisorClaimState]:
+    """
+    Re-run a corrected claim, re-running only the agents whose inputs changed.
+    
+    The claim's last checkpointed run supplies both the original inputs and
+    each agent's `agent_memo` (the fields it read and what it produced).
+    Agents whose recorded fields still have the same values reuse their
+    earlier outputs; the rest run again. Without a checkpoint, `claim_data`
+    (e.g. the stored claim record) is processed in full.
+    
+    Args:
+        changes: Corrected claim fields, e.g. {"estimated_damage_amount": 4200.0}
+        claim_data: Fallback claim input when there is no earlier run
+    
+    Returns:
+        Final state, or None if there is neither a checkpoint nor claim_data
+    """
+    app = get_compiled_supervisor_workflow(with_memory=True)
+    previous = app.get_state(_thread_config(claim_id)).values
+    if previous:
+        base = {field: previous.get(field) for field in CLAIM_INPUT_FIELDS if field in previous}
+        reuse_memo = previous.get("agent_memo") or None
+    elif claim_data:
+        base, reuse_memo = dict(claim_data), None
     else:
-        final_state = app.invoke(initial_state)
+        return None
     
-    return final_state
+    corrected = {**base, **changes, "claim_id": claim_id}
+    prescore = (previous or {}).get("fraud_prescore")
+    if prescore and prescore.get("inputs") == fraud_score_inputs(corrected):
+        # The fields the fraud score depends on are unchanged: keep the earlier score
+        corrected["fraud_prescore"] = prescore
+    return process_claim_with_supervisor(corrected, with_memory=True, reuse_memo=reuse_memo)
+
+
+def resume_claim(claim_id: str) -> Optional[SupervisorClaimState]:
+    """
+    Continue a checkpointed claim run from its last completed step.
+    
+    Returns the final state, or None if the claim has no unfinished run or
+    is waiting for a reviewer (see `submit_review`).
+    """
+    app = get_compiled_supervisor_workflow(with_memory=True)
+    run_config = _thread_config(claim_id)
+    snapshot = app.get_state(run_config)
+    if not snapshot.next or awaiting_review(snapshot):
+        return None
+    return _run(app, None, run_config)
+
+
+def resume_interrupted_claims(requeue: Callable[[str], None] = None) -> Dict[str, SupervisorClaimState]:
+    """
+    Resume the claim runs whose lease expired: their worker stopped (crash,
+    redeploy) or the run failed. Each is taken over first, so a run is
+    resumed by one worker only, and never while its owner is still on it.
+    An in-memory checkpointer does not outlive its worker: nothing to resume.
+
+    Args:
+        requeue: Called with the claim id of a run that never started (a
+            claim queued on a worker that stopped); it takes over the lease
+    """
+    checkpointer = get_compiled_supervisor_workflow(with_memory=True).checkpointer
+    if not hasattr(checkpointer, "expired_runs"):
+        return {}
+    resumed = {}
+    for claim_id in checkpointer.expired_runs():
+        if not checkpointer.take_over(claim_id):
+            continue
+        try:
+            if requeue is not None and checkpointer.get_tuple(_thread_config(claim_id)) is None:
+                requeue(claim_id)
+                continue
+            result = resume_claim(claim_id)
+        except Exception as e:
+            print(f"[Supervisor] Resuming claim {claim_id} failed: {e}")
+            continue
+        if result is None:
+            # Nothing left to run, or waiting for a reviewer
+            checkpointer.end_run(claim_id)
+        else:
+            resumed[claim_id] = result
+    return resumed
+
+
+def submit_review(claim_id: str, decision: str, notes: str = None, reviewer: str = None) -> Optional[SupervisorClaimState]:
+    """
+    Resume a claim paused at human review with the reviewer's decision.
+    
+    Args:
+        decision: "APPROVE" or "DENY"
+    
+    Returns:
+        Final state, or None if the claim is not waiting for review
+    """
+    app = get_compiled_supervisor_workflow(with_memory=True)
+    run_config = _thread_config(claim_id)
+    if not awaiting_review(app.get_state(run_config)):
+        return None
+    return _run(app, Command(resume={"decision": decision, "notes": notes, "reviewer": reviewer}), run_config)
+
+
+def deadline_review_result(claim_data: Dict[str, Any]) -> SupervisorClaimState:
+    """
+    Result for a claim whose deadline passed while it was still queued or
+    running: no decision yet, a person finishes it
+    """
+    DEADLINE_FALLBACKS.inc(fallback="wait_timeout")
+    reason = "Claim deadline exceeded before processing finished - routing to human review"
+    return {
+        "claim_id": claim_data.get("claim_id", ""),
+        "validation_status": "PENDING",
+        "approval_status": "NEEDS_REVIEW",
+        "approval_reason": f"Awaiting human review: {reason}",
+        "human_review_required": True,
+        "human_review_reason": reason,
+        "deadline_exceeded": True,
+        "workflow_history": append_steps(None, [step_record("supervisor", "routed to human_review", reason)])
+    }
 
 
 # Backward compatibility - keep the old function name working
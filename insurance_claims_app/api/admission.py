@@ -0,0 +1,221 @@
+"""
+API Admission Control
+Bounds concurrent work per lane of endpoints so a burst of heavy requests
+(image uploads running CLIP, claim submissions holding database
+connections) cannot starve cheap reads and chat. Each lane admits up to
+its concurrency limit, queues a bounded number of further requests, and
+sheds the rest: 429 when the lane's queue is full, 503 when a request
+waited longer than the lane's queue timeout, both with Retry-After.
+
+Limits are per API process (see ADMISSION_* in config).
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+
+from config import config
+from monitoring import get_registry
+
+LANES = ("images", "writes", "chat", "reads")
+
+# Endpoints with their own lane; other GETs are reads, other methods writes
+ROUTE_LANES = {
+    "/submit-claim-with-images": "images",
+    "/check-image-fraud": "images",
+    "/chat": "chat",
+}
+
+# Never shed: health checks and the views operators need during overload
+EXEMPT_PATHS = {"/health", "/metrics", "/admission/stats", "/docs", "/redoc", "/openapi.json"}
+
+_registry = get_registry()
+ADMISSION_REJECTIONS = _registry.counter("admission_rejections_total", "Requests shed by admission control, by lane and status")
+ADMISSION_QUEUE_WAIT = _registry.histogram("admission_queue_wait_ms", "Time admitted requests waited for a lane slot")
+ADMISSION_IN_FLIGHT = _registry.gauge("admission_in_flight", "Requests holding a lane slot")
+ADMISSION_QUEUED = _registry.gauge("admission_queued", "Requests waiting for a lane slot")
+
+
+def parse_lane_settings(spec: str, cast: Callable[[str], Any] = int) -> Dict[str, Any]:
+    """"images=2,reads=32" -> {"images": 2, "reads": 32}; unknown lanes are rejected"""
+    settings = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        lane, _, value = part.partition("=")
+        lane = lane.strip()
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane in admission settings: {lane!r}")
+        settings[lane] = cast(value.strip())
+    return settings
+
+
+def lane_for(method: str, path: str) -> Optional[str]:
+    """The lane of a request, None for exempt paths"""
+    if path in EXEMPT_PATHS:
+        return None
+    if path in ROUTE_LANES:
+        return ROUTE_LANES[path]
+    return "reads" if method in ("GET", "HEAD") else "writes"
+
+
+class Overloaded(Exception):
+    """A request was shed; `status` is 429 (queue full) or 503 (queue timeout)"""
+
+    def __init__(self, lane: str, status: int, retry_after_s: int):
+        super().__init__(f"{lane} lane overloaded")
+        self.lane = lane
+        self.status = status
+        self.retry_after_s = retry_after_s
+
+
+class AdmissionLane:
+    """
+    Concurrency slots plus a bounded FIFO queue for one lane.
+
+    Slots are handed directly to the oldest waiter on release, so a new
+    arrival cannot overtake queued requests. Runs on the event loop only
+    (no locks); waiters are plain futures, so a lane outlives the loop it
+    was first used on.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout_s: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self._service_s = 0.1  # moving average of time holding a slot, for Retry-After
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after_s(self) -> int:
+        """Seconds until the current queue has likely drained"""
+        estimate = self._service_s * (self.queued + 1) / max(1, self.max_concurrency)
+        return max(1, min(config.ADMISSION_RETRY_AFTER_MAX_S, math.ceil(estimate)))
+
+    def _shed(self, status: int):
+        ADMISSION_REJECTIONS.inc(lane=self.name, status=str(status))
+        raise Overloaded(self.name, status, self.retry_after_s())
+
+    async def acquire(self):
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            ADMISSION_IN_FLIGHT.set(self.in_flight, lane=self.name)
+            ADMISSION_QUEUE_WAIT.observe(0, lane=self.name)
+            return
+        if self.queued >= self.max_queue:
+            self._shed(429)
+
+        started = time.perf_counter()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        ADMISSION_QUEUED.set(self.queued, lane=self.name)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout_s)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot arrived as we gave up: pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            ADMISSION_QUEUED.set(self.queued, lane=self.name)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._shed(503)
+        ADMISSION_QUEUED.set(self.queued, lane=self.name)
+        ADMISSION_QUEUE_WAIT.observe((time.perf_counter() - started) * 1000, lane=self.name)
+
+    def release(self, held_s: float = None):
+        if held_s is not None:
+            self._service_s = 0.8 * self._service_s + 0.2 * held_s
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot moves to the waiter; in_flight is unchanged
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.set(self.in_flight, lane=self.name)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_timeout_s": self.queue_timeout_s,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "avg_service_ms": round(self._service_s * 1000, 1)
+        }
+
+
+class AdmissionController:
+    """The lanes of one API process, built from the ADMISSION_* settings by default"""
+
+    def __init__(self, lanes: Dict[str, AdmissionLane] = None):
+        if lanes is None:
+            concurrency = parse_lane_settings(config.ADMISSION_CONCURRENCY)
+            queue = parse_lane_settings(config.ADMISSION_QUEUE)
+            timeout = parse_lane_settings(config.ADMISSION_QUEUE_TIMEOUT_S, float)
+            lanes = {
+                name: AdmissionLane(name, concurrency.get(name, 8), queue.get(name, 32), timeout.get(name, 10.0))
+                for name in LANES
+            }
+        self.lanes = lanes
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: lane.stats() for name, lane in self.lanes.items()}
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware admitting each HTTP request through its lane.
+
+    A slot is held until the response has been sent, so streamed responses
+    (chat) count for their whole duration.
+    """
+
+    def __init__(self, app, controller: AdmissionController = None):
+        self.app = app
+        self.controller = controller or get_admission_controller()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        name = lane_for(scope["method"], scope["path"])
+        lane = self.controller.lanes.get(name) if name else None
+        if lane is None:
+            return await self.app(scope, receive, send)
+
+        try:
+            await lane.acquire()
+        except Overloaded as e:
+            response = JSONResponse(
+                {"detail": f"Server busy ({e.lane} requests); retry later"},
+                status_code=e.status,
+                headers={"Retry-After": str(e.retry_after_s)}
+            )
+            return await response(scope, receive, send)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lane.release(time.perf_counter() - started)
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+    return _controller
@@ -0,0 +1,92 @@
+"""
+Idempotent Claim Submission
+Collapses repeated submissions of one claim (a UI retry after a timeout, a
+double click) onto a single claim and a single workflow run. A submission
+repeats another when it carries the same Idempotency-Key, or has the same
+content within SUBMISSION_DEDUP_WINDOW_S
+"""
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from database import IdempotencyKeyReused
+from monitoring import get_registry
+
+DUPLICATE_SUBMISSIONS = get_registry().counter(
+    "duplicate_submissions_total",
+    "Repeated claim submissions answered without new work, by source (in_flight: joined a running submission, stored: earlier claim)"
+)
+
+
+def submission_hash(payload: Dict[str, Any], attachments: Iterable[bytes] = ()) -> str:
+    """SHA-256 of a submission's fields (key order ignored) and attachment contents"""
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8"))
+    for blob in attachments:
+        digest.update(hashlib.sha256(blob).digest())
+    return digest.hexdigest()
+
+
+class InFlightSubmissions:
+    """
+    Submissions running in this process, by Idempotency-Key and content hash.
+
+    The first request of a submission runs it as a task; duplicates that
+    arrive while it runs await the same task and get its response. The
+    task is shielded, so a client that disconnects does not cancel the
+    work the others are waiting for. Finished submissions leave the map:
+    later repeats are matched by the claim_submissions table instead (see
+    create_claim_once), which also covers other worker processes.
+    """
+
+    def __init__(self):
+        self._running: Dict[str, asyncio.Future] = {}
+        self._hashes: Dict[asyncio.Future, str] = {}  # running task -> its content hash
+
+    @staticmethod
+    def _keys(idempotency_key: Optional[str], content_hash: str) -> List[str]:
+        keys = [f"key:{idempotency_key}"] if idempotency_key else []
+        if config.SUBMISSION_DEDUP_WINDOW_S > 0:
+            keys.append(f"hash:{content_hash}")
+        return keys
+
+    def __len__(self) -> int:
+        return len(set(map(id, self._running.values())))
+
+    async def run(
+        self,
+        idempotency_key: Optional[str],
+        content_hash: str,
+        work: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        Run `work` unless the same submission is already running; returns (result, joined).
+
+        Raises IdempotencyKeyReused if the key is running with different content.
+        """
+        keys = self._keys(idempotency_key, content_hash)
+        for key in keys:
+            running = self._running.get(key)
+            if running is not None:
+                if self._hashes[running] != content_hash:
+                    raise IdempotencyKeyReused(idempotency_key)
+                DUPLICATE_SUBMISSIONS.inc(source="in_flight")
+                return await asyncio.shield(running), True
+
+        task = asyncio.ensure_future(work())
+        for key in keys:
+            self._running[key] = task
+        self._hashes[task] = content_hash
+
+        def forget(done):
+            for key in keys:
+                if self._running.get(key) is done:
+                    del self._running[key]
+            self._hashes.pop(done, None)
+
+        task.add_done_callback(forget)
+        return await asyncio.shield(task), False
@@ -2,30 +2,43 @@
 FastAPI Backend for Insurance Claims Processing
 Supervisor-Based Multi-Agent System
 """
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Header
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
+import asyncio
 import base64
 import json
 import sys
 import os
+import threading
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database import (
     init_database, seed_sample_policies,
-    create_claim, get_claim, update_claim, get_all_claims,
+    create_claim, create_claim_once, IdempotencyKeyReused, get_claim, update_claim, get_all_claims,
     get_policy, get_all_policies,
-    save_chat_message, get_chat_history,
+    get_chat_history, get_chat_writer, get_checkpointer,
+    save_workflow_steps, get_workflow_steps,
     ImageVectorStore
 )
 # Import both legacy and supervisor workflows
 from agents import process_claim, InsuranceChatbotAgent
-from agents.supervisor_workflow import process_claim_with_supervisor
+from agents.supervisor_workflow import (
+    deadline_review_result, process_claim_with_supervisor, reprocess_claim, resume_interrupted_claims, submit_review
+)
 from agents.supervisor_agent import ClaimsSupervisorAgent
+from agents.step_log import summarize_steps
+from agents.claim_scheduler import get_claim_scheduler, stop_claim_scheduler
+from agents.fraud_graph import start_periodic_rebuild, stop_periodic_rebuild
+from external_apis import Deadline, deadline_scope, close_vendor_clients
+from api.idempotency import DUPLICATE_SUBMISSIONS, InFlightSubmissions, submission_hash
+from api.admission import AdmissionMiddleware, get_admission_controller
+from monitoring import get_registry
+from config import config
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -34,6 +47,10 @@ app = FastAPI(
     version="2.0.0"
 )
 
+# Per-lane concurrency limits and load shedding (added first, so CORS headers wrap its rejections)
+if config.ADMISSION_CONTROL:
+    app.add_middleware(AdmissionMiddleware, controller=get_admission_controller())
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -48,6 +65,9 @@ _chatbot = None
 _image_store = None
 _supervisor = None
 
+# Claim submissions running in this process (see api.idempotency)
+_submissions = InFlightSubmissions()
+
 def get_chatbot():
     global _chatbot
     if _chatbot is None:
@@ -95,8 +115,30 @@ class ClaimResponse(BaseModel):
     fraud_score: Optional[float]
     # Supervisor workflow fields
     supervisor_priority: Optional[str] = None
-    workflow_history: Optional[List[Dict[str, Any]]] = None
+    workflow_summary: Optional[Dict[str, Any]] = None  # full step log: GET /claim/{claim_id}/workflow-steps
     human_review_required: Optional[bool] = None
+    total_processing_time_ms: Optional[int] = None
+    node_timings: Optional[Dict[str, Dict[str, Any]]] = None
+    reused_agents: Optional[List[str]] = None
+    deduplicated: Optional[bool] = None  # a repeated submission, answered with the original claim
+
+class ClaimCorrection(BaseModel):
+    """Corrected claim fields; only the fields that are set are changed"""
+    claim_type: Optional[str] = Field(None, description="Type: collision, comprehensive, liability")
+    damage_description: Optional[str] = None
+    repair_shop: Optional[str] = None
+    estimated_damage_amount: Optional[float] = Field(None, ge=0)
+    damage_photos: Optional[List[str]] = None
+    incident_report: Optional[str] = None
+    repair_estimate: Optional[str] = None
+
+class ReviewDecision(BaseModel):
+    decision: Literal["APPROVE", "DENY"] = Field(..., description="Reviewer decision")
+    notes: Optional[str] = Field(None, description="Reviewer notes, recorded in the approval reason")
+    reviewer: Optional[str] = Field(None, description="Reviewer name or ID")
+
+class ClaimBatch(BaseModel):
+    claims: List[ClaimSubmission] = Field(..., min_length=1, max_length=config.CLAIM_BATCH_MAX_SIZE)
 
 class ChatResponse(BaseModel):
     answer: str
@@ -108,60 +150,311 @@ class ChatResponse(BaseModel):
 async def startup_event():
     init_database()
     seed_sample_policies()
+    get_chat_writer().start()
+    if config.WORKFLOW_CHECKPOINTING:
+        # Finish claims whose worker stopped while processing them, now and every lease period
+        _resume_stop.clear()
+        threading.Thread(target=_resume_claims, name="claim-resume", daemon=True).start()
+    if config.FRAUD_GRAPH_REBUILD_S > 0:
+        # Load the fraud ring graph from stored claims, then recompute it periodically
+        start_periodic_rebuild()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Flush buffered chat history before the process exits
+    get_chat_writer().stop()
+    _resume_stop.set()
+    if config.WORKFLOW_CHECKPOINTING and hasattr(get_checkpointer(), "close"):
+        # Commit queued workflow checkpoints
+        get_checkpointer().close()
+    stop_claim_scheduler()
+    stop_periodic_rebuild()
+    close_vendor_clients()
+
+def _save_workflow_result(claim_id: str, result: Dict[str, Any], corrections: Dict[str, Any] = None) -> Optional[float]:
+    """
+    Write workflow results to the claim record, in one update with the
+    corrected fields they were decided on; returns the stored fraud score
+    """
+    fraud_score = result.get("fraud_score")
+    if (result.get("image_fraud_check") or {}).get("is_potential_duplicate"):
+        fraud_score = max(fraud_score or 0, 0.8)  # Boost fraud score for duplicate images
+        result["fraud_flags"] = result.get("fraud_flags", []) + ["DUPLICATE_IMAGE_DETECTED"]
+    
+    update_claim(claim_id, {
+        **(corrections or {}),
+        "validation_status": result.get("validation_status"),
+        "validation_reason": result.get("validation_reason"),
+        "approval_status": result.get("approval_status"),
+        "approval_reason": result.get("approval_reason"),
+        "payout_amount": result.get("payout_amount", 0),
+        "deductible": result.get("deductible", 0),
+        "processing_time_days": result.get("processing_days", 0),
+        "fraud_score": fraud_score
+    })
+    # Every step of the run, not just the capped history kept in graph state
+    save_workflow_steps(claim_id, result.get("run_steps", result.get("workflow_history")) or [])
+    return fraud_score
+
+def _claim_response(claim_id: str, result: Dict[str, Any], fraud_score: Optional[float]) -> ClaimResponse:
+    summary = summarize_steps(result.get("workflow_history"))
+    return ClaimResponse(
+        claim_id=claim_id,
+        validation_status=result.get("validation_status", "PENDING"),
+        validation_reason=result.get("validation_reason", ""),
+        approval_status=result.get("approval_status", "PENDING"),
+        approval_reason=result.get("approval_reason", ""),
+        payout_amount=result.get("payout_amount", 0),
+        deductible=result.get("deductible", 0),
+        processing_days=result.get("processing_days", 0),
+        fraud_score=fraud_score,
+        supervisor_priority=result.get("supervisor_priority"),
+        workflow_summary=summary,
+        human_review_required=result.get("human_review_required", False),
+        total_processing_time_ms=result.get("total_processing_time_ms"),
+        node_timings=result.get("node_timings"),
+        reused_agents=summary["reused_agents"] or None
+    )
+
+async def _process_claim(claim_data: Dict[str, Any], deadline: Deadline) -> Dict[str, Any]:
+    """
+    Run the supervisor workflow within the claim's deadline, queued by
+    priority on the claim scheduler unless it is disabled.
+    
+    A scheduled claim that is not done when the deadline passes goes to
+    human review without waiting further.
+    """
+    if not config.CLAIM_SCHEDULER:
+        # Off the event loop like every blocking call in a handler; to_thread carries the deadline along
+        with deadline_scope(deadline):
+            return await asyncio.to_thread(
+                process_claim_with_supervisor, claim_data, with_memory=config.WORKFLOW_CHECKPOINTING
+            )
+    future = get_claim_scheduler().submit(claim_data, deadline=deadline)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), deadline.remaining_ms() / 1000)
+    except asyncio.TimeoutError:
+        # Giving up cancels a claim that is still queued; one already running
+        # skips its remaining agents (the deadline has passed) and ends in review
+        return deadline_review_result(claim_data)
+
+def _claim_data(claim: ClaimSubmission) -> Dict[str, Any]:
+    """Workflow input for a submitted claim, with the policy's customer_id"""
+    policy = get_policy(claim.policy_id)
+    claim_data = claim.model_dump()
+    claim_data["customer_id"] = policy.get("customer_id", "UNKNOWN") if policy else "UNKNOWN"
+    return claim_data
+
+def _create_claim(claim: ClaimSubmission) -> Dict[str, Any]:
+    """Store a submitted claim; returns the workflow input with claim_id and customer_id"""
+    claim_data = _claim_data(claim)
+    claim_data["claim_id"] = create_claim(claim_data)
+    return claim_data
+
+def _abandoned(claim: Dict[str, Any]) -> bool:
+    """
+    True if a claim has no decision and nothing is still working on it: its
+    run failed (see `_record_failure`), or it has outlived the claim deadline
+    (the worker running it stopped)
+    """
+    if (claim.get("approval_status") or "PENDING") != "PENDING":
+        return False
+    if claim.get("approval_reason"):
+        return True
+    created_at = claim.get("created_at")
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    return created_at is not None and (datetime.now() - created_at).total_seconds() * 1000 > config.CLAIM_DEADLINE_MS
+
+def _record_failure(claim_id: Optional[str], error: Exception):
+    """Note on a still-PENDING claim that its run failed, so a repeat of the submission runs it again"""
+    if claim_id is None:
+        return
+    try:
+        update_claim(claim_id, {"approval_reason": f"Processing failed: {error}"})
+    except Exception as e:
+        print(f"⚠️ Could not record the failure of claim {claim_id}: {e}")
+
+def _stored_claim_response(claim_id: str) -> Optional[ClaimResponse]:
+    """
+    The claim record as a response, for a repeated submission (PENDING while
+    it is still being processed); None if the claim was abandoned and the
+    repeat should run it again
+    """
+    claim = get_claim(claim_id) or {}
+    if _abandoned(claim):
+        return None
+    DUPLICATE_SUBMISSIONS.inc(source="stored")
+    return ClaimResponse(
+        claim_id=claim_id,
+        validation_status=claim.get("validation_status") or "PENDING",
+        validation_reason=claim.get("validation_reason") or "",
+        approval_status=claim.get("approval_status") or "PENDING",
+        approval_reason=claim.get("approval_reason") or "",
+        payout_amount=claim.get("payout_amount") or 0,
+        deductible=claim.get("deductible") or 0,
+        processing_days=claim.get("processing_time_days") or 0,
+        fraud_score=claim.get("fraud_score"),
+        deduplicated=True
+    )
+
+async def _submit_once(idempotency_key: Optional[str], content_hash: str, work) -> ClaimResponse:
+    """Run a submission once per Idempotency-Key / content; repeats get the original claim's response"""
+    try:
+        response, joined = await _submissions.run(idempotency_key, content_hash, work)
+    except IdempotencyKeyReused as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return response.model_copy(update={"deduplicated": True}) if joined else response
+
+def _leases_queued_claims() -> bool:
+    """True if queued claims hold a checkpointer lease, so a claim lost with its worker's queue is queued again"""
+    return config.WORKFLOW_CHECKPOINTING and hasattr(get_checkpointer(), "start_run")
+
+def _save_when_done(claim_id: str):
+    """Future callback that saves a background claim's result (or logs its failure)"""
+    def save(future):
+        try:
+            _save_workflow_result(claim_id, future.result())
+        except Exception as e:
+            print(f"⚠️ Background processing of claim {claim_id} failed: {e}")
+        if _leases_queued_claims():
+            get_checkpointer().end_run(claim_id, finished=not future.cancelled() and future.exception() is None)
+    return save
+
+def _queue_claim(claim_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Queue a stored claim on the claim scheduler; its result is saved when done"""
+    claim_id = claim_data["claim_id"]
+    if _leases_queued_claims():
+        # The scheduler queue is in memory: the lease lets another worker queue the claim again
+        get_checkpointer().start_run(claim_id)
+    scheduler = get_claim_scheduler()
+    priority = scheduler.triage(claim_data)
+    future = scheduler.submit(claim_data, priority)
+    future.add_done_callback(_save_when_done(claim_id))
+    return {"claim_id": claim_id, "priority": priority}
+
+def _queue_claims(claims: List[ClaimSubmission]) -> List[Dict[str, Any]]:
+    """Store and queue a batch of claims"""
+    return [_queue_claim(_create_claim(claim)) for claim in claims]
+
+def _submitted_claim_data(claim: Dict[str, Any]) -> Dict[str, Any]:
+    """The workflow input a stored claim was submitted with"""
+    claim_data = {field: claim.get(field) for field in ClaimSubmission.model_fields}
+    claim_data.update(claim_id=claim["claim_id"], customer_id=claim.get("customer_id") or "UNKNOWN",
+                      damage_photos=json.loads(claim.get("damage_photos") or "[]"))
+    return claim_data
+
+def _requeue_claim(claim_id: str):
+    """Queue again a claim that was queued on a worker that stopped before running it"""
+    claim = get_claim(claim_id)
+    if claim and (claim.get("approval_status") or "PENDING") == "PENDING":
+        _queue_claim(_submitted_claim_data(claim))
+        print(f"✅ Re-queued claim {claim_id}")
+    else:
+        get_checkpointer().end_run(claim_id)
+
+_resume_stop = threading.Event()
+
+def _resume_claims():
+    """
+    Drop expired checkpoints, then every CHECKPOINT_LEASE_S finish and save
+    the claim runs whose worker stopped renewing their lease
+    """
+    try:
+        checkpointer = get_checkpointer()
+        if hasattr(checkpointer, "prune_expired"):
+            checkpointer.prune_expired()
+    except Exception as e:
+        print(f"⚠️ Could not prune expired checkpoints: {e}")
+    while True:
+        try:
+            for claim_id, result in resume_interrupted_claims(requeue=_requeue_claim).items():
+                _save_workflow_result(claim_id, result)
+                print(f"✅ Resumed interrupted claim {claim_id}")
+        except Exception as e:
+            print(f"⚠️ Could not resume interrupted claims: {e}")
+        if _resume_stop.wait(config.CHECKPOINT_LEASE_S):
+            return
 
 # Health check
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
+# Metrics snapshot
+@app.get("/metrics")
+async def get_metrics():
+    """Counters, gauges and latency histograms for this process"""
+    return get_registry().snapshot()
+
 # Submit claim
 @app.post("/submit-claim", response_model=ClaimResponse)
-async def submit_claim(claim: ClaimSubmission):
-    """Submit a new insurance claim and process through supervisor workflow"""
-    try:
-        # Get customer_id from policy
-        policy = get_policy(claim.policy_id)
-        customer_id = policy.get("customer_id", "UNKNOWN") if policy else "UNKNOWN"
-        
-        # Create claim in database
-        claim_data = claim.model_dump()
-        claim_data["customer_id"] = customer_id
-        claim_id = create_claim(claim_data)
-        claim_data["claim_id"] = claim_id
-        
-        # Process through SUPERVISOR workflow (new multi-agent system)
-        result = process_claim_with_supervisor(claim_data)
-        
-        # Update claim in database with results
-        update_claim(claim_id, {
-            "validation_status": result.get("validation_status"),
-            "validation_reason": result.get("validation_reason"),
-            "approval_status": result.get("approval_status"),
-            "approval_reason": result.get("approval_reason"),
-            "payout_amount": result.get("payout_amount", 0),
-            "deductible": result.get("deductible", 0),
-            "processing_time_days": result.get("processing_days", 0),
-            "fraud_score": result.get("fraud_score")
-        })
-        
-        return ClaimResponse(
-            claim_id=claim_id,
-            validation_status=result.get("validation_status", "PENDING"),
-            validation_reason=result.get("validation_reason", ""),
-            approval_status=result.get("approval_status", "PENDING"),
-            approval_reason=result.get("approval_reason", ""),
-            payout_amount=result.get("payout_amount", 0),
-            deductible=result.get("deductible", 0),
-            processing_days=result.get("processing_days", 0),
-            fraud_score=result.get("fraud_score"),
-            supervisor_priority=result.get("supervisor_priority"),
-            workflow_history=result.get("workflow_history"),
-            human_review_required=result.get("human_review_required", False)
-        )
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+async def submit_claim(claim: ClaimSubmission, idempotency_key: Optional[str] = Header(None, max_length=128)):
+    """
+    Submit a new insurance claim and process through supervisor workflow.
+    
+    A repeat of an earlier submission (same Idempotency-Key header, or the
+    same claim within SUBMISSION_DEDUP_WINDOW_S) creates no second claim: it
+    gets the original claim's result, waiting for it if it is still running.
+    """
+    deadline = Deadline.after()
+    content_hash = submission_hash(claim.model_dump())
+    
+    async def submit() -> ClaimResponse:
+        claim_id = None
+        try:
+            # Create claim in database, unless this submission already did (database
+            # calls run off the event loop, so a slow write cannot stall the other lanes)
+            claim_data = await asyncio.to_thread(_claim_data, claim)
+            claim_id, created = await asyncio.to_thread(
+                create_claim_once, claim_data, idempotency_key, content_hash, config.SUBMISSION_DEDUP_WINDOW_S
+            )
+            if not created:
+                stored = await asyncio.to_thread(_stored_claim_response, claim_id)
+                if stored is not None:
+                    return stored
+                # The earlier run never finished: run it again (resumed from its checkpoint, if any)
+            claim_data["claim_id"] = claim_id
+            
+            # Process through SUPERVISOR workflow (new multi-agent system)
+            result = await _process_claim(claim_data, deadline)
+            
+            # Update claim in database with results
+            fraud_score = await asyncio.to_thread(_save_workflow_result, claim_id, result)
+            
+            return _claim_response(claim_id, result, fraud_score)
+        except IdempotencyKeyReused as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            await asyncio.to_thread(_record_failure, claim_id, e)
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    return await _submit_once(idempotency_key, content_hash, submit)
+
+# Submit a batch of claims for background processing
+@app.post("/claims/batch", status_code=202)
+async def submit_claim_batch(batch: ClaimBatch):
+    """
+    Queue claims on the claim scheduler and return immediately.
+    
+    Each claim is stored, triaged to a priority and processed by that
+    priority's worker pool; results are written to the claim record as
+    they finish (poll GET /claim/{claim_id}).
+    """
+    queued = await asyncio.to_thread(_queue_claims, batch.claims)
+    return {"queued": queued, "queue_depth": get_claim_scheduler().queue.depth()}
+
+@app.get("/scheduler/stats")
+async def get_scheduler_stats():
+    """Queue depth, pool sizes and p95 queue wait per priority"""
+    return get_claim_scheduler().stats()
+
+@app.get("/admission/stats")
+async def get_admission_stats():
+    """Limits, requests in flight and queued, and average service time per admission lane"""
+    return get_admission_controller().stats()
 
 # Submit claim with images (multipart form)
 @app.post("/submit-claim-with-images", response_model=ClaimResponse)
@@ -175,103 +468,100 @@ async def submit_claim_with_images(
     repair_shop: Optional[str] = Form(None),
     incident_report: Optional[str] = Form(None),
     repair_estimate: Optional[str] = Form(None),
-    damage_photos: List[UploadFile] = File(default=[])
+    damage_photos: List[UploadFile] = File(default=[]),
+    idempotency_key: Optional[str] = Header(None, max_length=128)
 ):
-    """Submit a new insurance claim with actual image uploads for vectorization"""
-    try:
-        # Get customer_id from policy
-        policy = get_policy(policy_id)
-        customer_id = policy.get("customer_id", "UNKNOWN") if policy else "UNKNOWN"
-        
-        # Prepare photo list for claim data
-        photo_names = [photo.filename for photo in damage_photos] if damage_photos else []
-        
-        # Create claim in database
-        claim_data = {
-            "policy_id": policy_id,
-            "incident_date": incident_date,
-            "claim_date": claim_date,
-            "claim_type": claim_type,
-            "damage_description": damage_description,
-            "estimated_damage_amount": estimated_damage_amount,
-            "repair_shop": repair_shop or "Unknown",
-            "incident_report": incident_report,
-            "repair_estimate": repair_estimate,
-            "damage_photos": photo_names,
-            "customer_id": customer_id
-        }
-        
-        claim_id = create_claim(claim_data)
-        claim_data["claim_id"] = claim_id
-        
-        # Process images through ImageVectorStore
-        image_fraud_check = {"is_potential_duplicate": False, "fraud_risk": "LOW"}
-        if damage_photos:
-            image_store = get_image_store()
-            images_to_store = []
+    """
+    Submit a new insurance claim with actual image uploads for vectorization.
+    
+    Repeats are answered with the original claim, as in /submit-claim; the
+    content of a submission includes its image bytes.
+    """
+    deadline = Deadline.after()
+    
+    # Prepare photo list for claim data
+    photos = [(photo.filename, await photo.read()) for photo in damage_photos or []]
+    photo_names = [filename for filename, _ in photos]
+    
+    form = {
+        "policy_id": policy_id,
+        "incident_date": incident_date,
+        "claim_date": claim_date,
+        "claim_type": claim_type,
+        "damage_description": damage_description,
+        "estimated_damage_amount": estimated_damage_amount,
+        "repair_shop": repair_shop or "Unknown",
+        "incident_report": incident_report,
+        "repair_estimate": repair_estimate,
+        "damage_photos": photo_names
+    }
+    content_hash = submission_hash(form, (image_bytes for _, image_bytes in photos))
+    
+    async def submit() -> ClaimResponse:
+        claim_id = None
+        try:
+            # Get customer_id from policy
+            policy = await asyncio.to_thread(get_policy, policy_id)
+            customer_id = policy.get("customer_id", "UNKNOWN") if policy else "UNKNOWN"
             
-            for photo in damage_photos:
-                image_bytes = await photo.read()
-                images_to_store.append((photo.filename, image_bytes))
+            # Create claim in database, unless this submission already did
+            claim_data = {**form, "customer_id": customer_id}
+            claim_id, created = await asyncio.to_thread(
+                create_claim_once, claim_data, idempotency_key, content_hash, config.SUBMISSION_DEDUP_WINDOW_S
+            )
+            if not created:
+                stored = await asyncio.to_thread(_stored_claim_response, claim_id)
+                if stored is not None:
+                    return stored
+                # The earlier run never finished: run it again (resumed from its checkpoint, if any)
+            claim_data["claim_id"] = claim_id
+            
+            # Process images through ImageVectorStore
+            image_fraud_check = {"is_potential_duplicate": False, "fraud_risk": "LOW"}
+            if photos:
+                image_store = get_image_store()
+                
+                for _, image_bytes in photos:
+                    # Check for duplicate images (fraud detection; optional when the deadline is close)
+                    if len(image_bytes) > 0 and not deadline.running_low():
+                        # CLIP runs off the event loop, so other lanes keep being served; a re-run
+                        # must not match the images its first attempt stored
+                        fraud_check = await asyncio.to_thread(
+                            image_store.check_for_duplicate_images, image_bytes, exclude_claim_id=claim_id
+                        )
+                        if fraud_check["is_potential_duplicate"]:
+                            image_fraud_check = fraud_check
+                            print(f"⚠️ Potential duplicate image detected! Similar to claims: {fraud_check['similar_claims']}")
                 
-                # Check for duplicate images (fraud detection)
-                if len(image_bytes) > 0:
-                    fraud_check = image_store.check_for_duplicate_images(image_bytes)
-                    if fraud_check["is_potential_duplicate"]:
-                        image_fraud_check = fraud_check
-                        print(f"⚠️ Potential duplicate image detected! Similar to claims: {fraud_check['similar_claims']}")
+                # Store all images with embeddings (a re-run may find them stored already)
+                if created or not await asyncio.to_thread(image_store.get_claim_images, claim_id):
+                    image_ids = await asyncio.to_thread(image_store.add_images_batch, claim_id, photos, claim_type)
+                    print(f"✅ Stored {len(image_ids)} images for claim {claim_id}")
             
-            # Store all images with embeddings
-            if images_to_store:
-                image_ids = image_store.add_images_batch(claim_id, images_to_store, claim_type)
-                print(f"✅ Stored {len(image_ids)} images for claim {claim_id}")
-        
-        # Add image fraud info to claim data for workflow
-        claim_data["image_fraud_check"] = image_fraud_check
-        
-        # Process through SUPERVISOR workflow (new multi-agent system)
-        result = process_claim_with_supervisor(claim_data)
-        
-        # Adjust fraud score if duplicate images detected
-        fraud_score = result.get("fraud_score", 0)
-        if image_fraud_check.get("is_potential_duplicate"):
-            fraud_score = max(fraud_score, 0.8)  # Boost fraud score for duplicate images
-            result["fraud_flags"] = result.get("fraud_flags", []) + ["DUPLICATE_IMAGE_DETECTED"]
-        
-        # Update claim in database with results
-        update_claim(claim_id, {
-            "validation_status": result.get("validation_status"),
-            "validation_reason": result.get("validation_reason"),
-            "approval_status": result.get("approval_status"),
-            "approval_reason": result.get("approval_reason"),
-            "payout_amount": result.get("payout_amount", 0),
-            "deductible": result.get("deductible", 0),
-            "processing_time_days": result.get("processing_days", 0),
-            "fraud_score": fraud_score
-        })
-        
-        return ClaimResponse(
-            claim_id=claim_id,
-            validation_status=result.get("validation_status", "PENDING"),
-            validation_reason=result.get("validation_reason", ""),
-            approval_status=result.get("approval_status", "PENDING"),
-            approval_reason=result.get("approval_reason", ""),
-            payout_amount=result.get("payout_amount", 0),
-            deductible=result.get("deductible", 0),
-            processing_days=result.get("processing_days", 0),
-            fraud_score=fraud_score,
-            supervisor_priority=result.get("supervisor_priority"),
-            workflow_history=result.get("workflow_history"),
-            human_review_required=result.get("human_review_required", False)
-        )
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+            # Add image fraud info to claim data for workflow
+            claim_data["image_fraud_check"] = image_fraud_check
+            
+            # Process through SUPERVISOR workflow (new multi-agent system)
+            result = await _process_claim(claim_data, deadline)
+            
+            # Update claim in database with results (boosts fraud score for duplicate images)
+            fraud_score = await asyncio.to_thread(_save_workflow_result, claim_id, result)
+            
+            return _claim_response(claim_id, result, fraud_score)
+        except IdempotencyKeyReused as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            await asyncio.to_thread(_record_failure, claim_id, e)
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    return await _submit_once(idempotency_key, content_hash, submit)
 
-# Get claim status
+# Get claim status (read endpoints that only make blocking database calls are
+# plain def: FastAPI runs them in its threadpool, off the event loop)
 @app.get("/claim/{claim_id}")
-async def get_claim_status(claim_id: str):
+def get_claim_status(claim_id: str):
     """Get status and details of a claim"""
     claim = get_claim(claim_id)
     if not claim:
@@ -289,9 +579,67 @@ async def get_claim_status(claim_id: str):
     
     return result
 
+# Workflow step log
+@app.get("/claim/{claim_id}/workflow-steps")
+def get_claim_workflow_steps(claim_id: str):
+    """Get every recorded supervisor workflow step of the claim's latest run"""
+    if not get_claim(claim_id):
+        raise HTTPException(status_code=404, detail="Claim not found")
+    return get_workflow_steps(claim_id)
+
+# Resume a claim paused for human review
+@app.post("/claim/{claim_id}/review", response_model=ClaimResponse)
+async def review_claim(claim_id: str, review: ReviewDecision):
+    """Record a reviewer's decision and finish the paused claim (one approval step, no rerun)"""
+    if not await asyncio.to_thread(get_claim, claim_id):
+        raise HTTPException(status_code=404, detail="Claim not found")
+    try:
+        # The approval step runs off the event loop so other requests keep flowing
+        result = await asyncio.to_thread(submit_review, claim_id, review.decision, review.notes, review.reviewer)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=409, detail="Claim is not awaiting human review")
+    
+    fraud_score = await asyncio.to_thread(_save_workflow_result, claim_id, result)
+    return _claim_response(claim_id, result, fraud_score)
+
+# Re-decide a claim after a correction
+@app.post("/claim/{claim_id}/reprocess", response_model=ClaimResponse)
+async def reprocess_corrected_claim(claim_id: str, correction: ClaimCorrection):
+    """
+    Apply corrected claim fields and re-decide the claim.
+    
+    Only agents that read a corrected field (directly or through another
+    agent's output) run again; the others reuse their earlier results.
+    """
+    claim = await asyncio.to_thread(get_claim, claim_id)
+    if not claim:
+        raise HTTPException(status_code=404, detail="Claim not found")
+    changes = correction.model_dump(exclude_none=True)
+    
+    # Without a checkpointed run, the stored record is processed in full
+    claim_data = {**claim, "damage_photos": json.loads(claim.get("damage_photos") or "[]")}
+    try:
+        # The re-run agents work off the event loop so other requests keep flowing
+        result = await asyncio.to_thread(reprocess_claim, claim_id, changes, claim_data)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    # The corrections are stored with the decision made on them: a failed run leaves the claim as it was
+    stored = dict(changes)
+    if "damage_photos" in stored:
+        stored["damage_photos"] = json.dumps(stored["damage_photos"])
+    fraud_score = await asyncio.to_thread(_save_workflow_result, claim_id, result, stored)
+    return _claim_response(claim_id, result, fraud_score)
+
 # List all claims
 @app.get("/claims")
-async def list_claims():
+def list_claims():
     """List all claims"""
     return get_all_claims()
 
@@ -301,16 +649,16 @@ async def chat(message: ChatMessage):
     """Send a message to the insurance chatbot"""
     try:
         chatbot = get_chatbot()
-        response = chatbot.answer_question(message.message, message.claim_id)
+        # Retrieval and the LLM call run off the event loop: the chat lane must not stall the others
+        response = await asyncio.to_thread(chatbot.answer_question, message.message, message.claim_id)
         
-        # Save chat history only if claim exists
+        # Hand chat history to the write-behind buffer, only for claims that exist
         if message.claim_id:
-            claim = get_claim(message.claim_id)
-            if claim:
-                try:
-                    save_chat_message(message.claim_id, message.message, response["answer"])
-                except Exception as e:
-                    print(f"Warning: Could not save chat history: {e}")
+            try:
+                if await asyncio.to_thread(get_claim, message.claim_id):
+                    get_chat_writer().enqueue(message.claim_id, message.message, response["answer"])
+            except Exception as e:
+                print(f"Warning: Could not save chat history: {e}")
         
         return ChatResponse(
             answer=response["answer"],
@@ -322,13 +670,17 @@ async def chat(message: ChatMessage):
 
 # Get chat history
 @app.get("/chat-history/{claim_id}")
-async def get_claim_chat_history(claim_id: str):
-    """Get chat history for a claim"""
-    return get_chat_history(claim_id)
+def get_claim_chat_history(claim_id: str):
+    """Get chat history for a claim, including messages not yet flushed"""
+    # Read the buffer first so a flush in between can't hide a message
+    pending = get_chat_writer().pending_messages(claim_id)
+    history = get_chat_history(claim_id)
+    stored_ids = {row["chat_id"] for row in history}
+    return history + [row for row in pending if row["chat_id"] not in stored_ids]
 
 # Get policy
 @app.get("/policy/{policy_id}")
-async def get_policy_details(policy_id: str):
+def get_policy_details(policy_id: str):
     """Get policy details"""
     policy = get_policy(policy_id)
     if not policy:
@@ -337,13 +689,13 @@ async def get_policy_details(policy_id: str):
 
 # List policies
 @app.get("/policies")
-async def list_policies():
+def list_policies():
     """List all policies"""
     return get_all_policies()
 
 # Get claim images
 @app.get("/claim/{claim_id}/images")
-async def get_claim_images(claim_id: str):
+def get_claim_images(claim_id: str):
     """Get all images for a claim"""
     try:
         image_store = get_image_store()
@@ -354,7 +706,7 @@ async def get_claim_images(claim_id: str):
 
 # Get image data
 @app.get("/image/{image_id}")
-async def get_image(image_id: str):
+def get_image(image_id: str):
     """Get raw image data by ID"""
     try:
         image_store = get_image_store()
@@ -374,14 +726,13 @@ async def check_image_fraud(image: UploadFile = File(...)):
     try:
         image_bytes = await image.read()
         image_store = get_image_store()
-        result = image_store.check_for_duplicate_images(image_bytes)
-        return result
+        return await asyncio.to_thread(image_store.check_for_duplicate_images, image_bytes)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Get image store stats
 @app.get("/image-store/stats")
-async def get_image_store_stats():
+def get_image_store_stats():
     """Get statistics about the image vector store"""
     try:
         image_store = get_image_store()
@@ -450,7 +801,8 @@ async def get_workflow_agents():
             "description": "Escalates complex cases for human review",
             "responsibilities": [
                 "Flag claims requiring manual review",
-                "Prepare case summary for reviewers"
+                "Prepare case summary for reviewers",
+                "Pause the claim until POST /claim/{claim_id}/review"
             ]
         }
     }
@@ -506,12 +858,16 @@ async def get_workflow_architecture():
             "approval_complete": {
                 "NEEDS_REVIEW": "→ human_review",
                 "APPROVED/DENIED": "→ complete"
+            },
+            "human_review_complete": {
+                "reviewer decision": "→ approval",
+                "no decision": "→ complete"
             }
         }
     }
 
 @app.get("/workflow/stats")
-async def get_workflow_stats():
+def get_workflow_stats():
     """Get statistics about workflow processing"""
     try:
         claims = get_all_claims()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+API benchmark for claim submission and chat
+Drives the FastAPI app in-process (TestClient) on the offline backends
+
+Usage:
+    python benchmarks/bench_api.py [--requests 100] [--concurrency 4]
+
+Measures /submit-claim and /submit-claim-with-images throughput and latency,
+and /chat time-to-first-byte (time until response headers reach the client).
+"""
+import argparse
+import random
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import configure_environment, summarize_latencies, write_results
+
+CHAT_QUESTIONS = [
+    "What does comprehensive coverage protect against?",
+    "How many days do I have to report an incident?",
+    "What is a deductible?",
+    "How do I appeal a denied claim?",
+]
+
+
+def _drive(send: Callable[[int], Any], requests: int, concurrency: int) -> Dict[str, Any]:
+    """Run send(i) for i in range(requests) across a thread pool and summarize"""
+    latencies = []
+    failures = 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal failures
+        start = time.perf_counter()
+        response = send(i)
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            if response.status_code == 200:
+                latencies.append(elapsed)
+            else:
+                failures += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    wall_s = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "failures": failures,
+        "requests_per_sec": round(len(latencies) / wall_s, 2) if wall_s else 0.0,
+        "latency": summarize_latencies(latencies)
+    }
+
+
+def run(requests: int = 100, concurrency: int = 4, seed: int = 42) -> Dict[str, Any]:
+    """Benchmark the API endpoints; configure_environment() must have run first"""
+    from fastapi.testclient import TestClient
+    from api.main import app
+    from benchmarks.load_test import generate_claims
+
+    claims = generate_claims(requests, seed)
+    rng = random.Random(seed)
+    # ~10% of uploads reuse an earlier photo to exercise the duplicate path
+    photos = [rng.randbytes(4096) for _ in range(requests)]
+    photos = [photos[rng.randrange(i)] if i and rng.random() < 0.1 else p for i, p in enumerate(photos)]
+
+    results = {}
+    with TestClient(app) as client:
+        client.get("/health")
+
+        def submit(i):
+            return client.post("/submit-claim", json=claims[i])
+
+        def submit_with_images(i):
+            claim = claims[i]
+            form = {k: str(v) for k, v in claim.items() if k != "damage_photos" and v not in (None, "")}
+            files = [("damage_photos", (f"photo_{i}.jpg", photos[i], "image/jpeg"))]
+            return client.post("/submit-claim-with-images", data=form, files=files)
+
+        results["submit_claim"] = _drive(submit, requests, concurrency)
+        results["submit_claim_with_images"] = _drive(submit_with_images, requests, concurrency)
+
+        # Warm the chatbot (vector store load) before timing
+        client.post("/chat", json={"message": CHAT_QUESTIONS[0]})
+        ttfb = []
+        for i in range(requests):
+            start = time.perf_counter()
+            with client.stream("POST", "/chat", json={"message": CHAT_QUESTIONS[i % len(CHAT_QUESTIONS)]}) as response:
+                ttfb.append((time.perf_counter() - start) * 1000)
+                response.read()
+        results["chat"] = {"ttfb": summarize_latencies(ttfb)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--llm-latency", default="constant:20", help="Fake LLM latency distribution")
+    args = parser.parse_args()
+
+    configure_environment(args.seed, args.llm_latency)
+    results = run(args.requests, args.concurrency, args.seed)
+    for name in ("submit_claim", "submit_claim_with_images"):
+        r = results[name]
+        print(f"{name:<26} {r['requests_per_sec']:>8} req/s  p50={r['latency']['p50_ms']:.1f}ms "
+              f"p95={r['latency']['p95_ms']:.1f}ms failures={r['failures']}")
+    print(f"{'chat TTFB':<26} p50={results['chat']['ttfb']['p50_ms']:.1f}ms p95={results['chat']['ttfb']['p95_ms']:.1f}ms")
+    print(f"Results written to {write_results('api', results)}")
+
+
+if __name__ == "__main__":
+    main()
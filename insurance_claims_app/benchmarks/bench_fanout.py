@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Parallel fan-out benchmark for the supervisor graph
+Compares claim latency with document analysis and validation run one after
+the other versus fanned out in the same graph step
+
+Usage:
+    python benchmarks/bench_fanout.py [--claims 20] [--doc-ms 120] [--validation-ms 80]
+
+Agent latency is injected (standing in for the damage API, CLIP and policy
+lookups) so the difference is visible on the offline backends. Expect the
+serial run to cost about doc + validation and the parallel run about the max.
+"""
+import argparse
+import sys
+import os
+import time
+from typing import Dict, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import configure_environment, summarize_latencies, write_results
+
+
+def _with_delay(fn, delay_ms: float):
+    def delayed(state):
+        time.sleep(delay_ms / 1000.0)
+        return fn(state)
+    return delayed
+
+
+def run(claims: int = 20, doc_ms: float = 120, validation_ms: float = 80, seed: int = 42) -> Dict[str, Any]:
+    """Latency per claim with fan-out off and on; configure_environment() must have run first"""
+    from config import config
+    from database import create_claim
+    from agents import supervisor_workflow
+    from benchmarks.load_test import generate_claims
+
+    doc_agent = supervisor_workflow.document_analyzer
+    validator = supervisor_workflow.validation_agent
+    saved = (vars(doc_agent).copy(), vars(validator).copy())
+    doc_agent.analyze_documents = _with_delay(doc_agent.analyze_documents, doc_ms)
+    validator.validate_claim = _with_delay(validator.validate_claim, validation_ms)
+
+    # Only claims with photos take the fan-out path
+    workload = [c for c in generate_claims(claims * 4, seed) if c["damage_photos"]][:claims]
+    results = {"claims": len(workload), "injected_ms": {"document_analyzer": doc_ms, "validation": validation_ms}}
+    original = config.SUPERVISOR_PARALLEL_FANOUT
+    try:
+        for mode, enabled in (("serial", False), ("parallel", True)):
+            config.SUPERVISOR_PARALLEL_FANOUT = enabled
+            samples = []
+            for claim in workload:
+                claim_data = dict(claim, customer_id="CUST-001")
+                claim_data["claim_id"] = create_claim(claim_data)
+                start = time.perf_counter()
+                supervisor_workflow.process_claim_with_supervisor(claim_data)
+                samples.append((time.perf_counter() - start) * 1000)
+            results[mode] = summarize_latencies(samples)
+    finally:
+        config.SUPERVISOR_PARALLEL_FANOUT = original
+        # Restore the agents so later benchmarks see real timings
+        for agent, attrs in zip((doc_agent, validator), saved):
+            vars(agent).clear()
+            vars(agent).update(attrs)
+
+    results["speedup_p50"] = round(results["serial"]["p50_ms"] / results["parallel"]["p50_ms"], 2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, default=20)
+    parser.add_argument("--doc-ms", type=float, default=120, help="Injected document analysis latency")
+    parser.add_argument("--validation-ms", type=float, default=80, help="Injected validation latency")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    configure_environment(args.seed)
+    from database import seed_sample_policies
+    seed_sample_policies()
+
+    results = run(args.claims, args.doc_ms, args.validation_ms, args.seed)
+    print(f"Injected: document_analyzer={args.doc_ms:.0f}ms validation={args.validation_ms:.0f}ms "
+          f"(sum {args.doc_ms + args.validation_ms:.0f}ms, max {max(args.doc_ms, args.validation_ms):.0f}ms)")
+    for mode in ("serial", "parallel"):
+        r = results[mode]
+        print(f"  {mode:<9} p50={r['p50_ms']:.1f}ms p95={r['p95_ms']:.1f}ms")
+    print(f"  speedup at p50: {results['speedup_p50']}x")
+    print(f"Results written to {write_results('fanout', results)}")
+
+
+if __name__ == "__main__":
+    main()
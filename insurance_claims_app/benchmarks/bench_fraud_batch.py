@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Batch fraud scoring benchmark
+Claims scored per second by the vectorized batch scorer versus the
+per-claim FraudInvestigationAgent rule checks, for bulk re-scoring of the book
+
+Usage:
+    python benchmarks/bench_fraud_batch.py [--claims 100000] [--per-claim 2000]
+
+The per-claim figure covers the API score and the pattern and repair shop
+checks only (no customer history lookup), the same rules the batch applies.
+"""
+import argparse
+import sys
+import os
+import time
+from typing import Dict, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import configure_environment, write_results
+
+
+def run(claims: int = 100000, per_claim: int = 2000, seed: int = 42) -> Dict[str, Any]:
+    """Throughput of both paths; configure_environment() must have run first"""
+    from agents.batch_fraud_scoring import claims_to_columns, score_claims
+    from agents.fraud_investigation_agent import FraudInvestigationAgent
+    from benchmarks.load_test import generate_claims
+
+    workload = generate_claims(claims, seed)
+    started = time.perf_counter()
+    columns = claims_to_columns(workload)
+    build_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scores = score_claims(columns, seed=seed)
+    score_s = time.perf_counter() - started
+
+    agent = FraudInvestigationAgent()
+    sample = workload[:per_claim]
+    started = time.perf_counter()
+    for claim in sample:
+        agent._get_fraud_assessment(claim)
+        agent._analyze_claim_patterns(claim)
+        agent._check_repair_shop(claim["repair_shop"])
+    single_s = time.perf_counter() - started
+
+    return {
+        "claims": claims,
+        "columns_build_s": round(build_s, 3),
+        "batch": {"claims_per_sec": round(claims / score_s, 1), "score_s": round(score_s, 3)},
+        "per_claim": {"claims_per_sec": round(len(sample) / single_s, 1)},
+        "mean_fraud_score": round(float(scores["fraud_score"].mean()), 4)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, default=100000)
+    parser.add_argument("--per-claim", type=int, default=2000, help="Claims timed through the per-claim path")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    configure_environment(args.seed)
+    results = run(args.claims, args.per_claim, args.seed)
+    print(f"Batch:     {results['batch']['claims_per_sec']:>12,.0f} claims/sec "
+          f"({results['claims']:,} claims in {results['batch']['score_s']}s)")
+    print(f"Per claim: {results['per_claim']['claims_per_sec']:>12,.0f} claims/sec")
+    print(f"Results written to {write_results('fraud_batch', results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Retrieval quality and latency benchmark for policy document search
+Compares BM25-only, vector-only and hybrid (RRF) retrieval over a fixed question set
+
+Usage:
+    python benchmarks/bench_retrieval.py [--iterations 200] [--no-vector]
+
+Vector and hybrid modes need sentence-transformers; embeddings are searched
+in memory with NumPy so the benchmark runs without Oracle.
+"""
+import argparse
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from external_apis import DocumentManagementAPI
+from database.lexical_index import BM25Index, reciprocal_rank_fusion
+from benchmarks.common import summarize_latencies, time_calls, write_results
+
+# (question, expected source document)
+QUESTIONS = [
+    ("What does comprehensive coverage protect against?", "general_coverage"),
+    ("Does collision coverage apply to single-vehicle accidents?", "general_coverage"),
+    ("Does liability insurance pay for damage to my own car?", "general_coverage"),
+    ("Is theft covered by my policy?", "general_coverage"),
+    ("What happens if a hailstorm damages my vehicle?", "general_coverage"),
+    ("How many days do I have to report an incident?", "claims_process"),
+    ("What documents do I need to submit with a claim?", "claims_process"),
+    ("How many photos of the damage are required?", "claims_process"),
+    ("How long does the claim review take?", "claims_process"),
+    ("What is a deductible?", "deductibles"),
+    ("If my repair costs $5,000 how much does insurance pay?", "deductibles"),
+    ("Are there deductible waivers for windshield repair?", "deductibles"),
+    ("How do I appeal a denied claim?", "appeal_process"),
+    ("What is the deadline to submit an appeal?", "appeal_process"),
+    ("Who do I contact about an appeal?", "appeal_process"),
+    ("Will you pay for a rental car while my vehicle is repaired?", "rental_coverage"),
+    ("What is the daily limit for rental reimbursement?", "rental_coverage"),
+    ("How long until I get paid for a low-risk claim?", "payment_timeline"),
+    ("How fast is direct deposit compared to a check?", "payment_timeline"),
+    ("How can I track my payment status?", "payment_timeline"),
+]
+
+
+class InMemoryVectorSearch:
+    """Cosine search over chunk embeddings, standing in for Oracle VECTOR_DISTANCE"""
+
+    def __init__(self, chunks, model):
+        import numpy as np
+        self.np = np
+        self.chunks = chunks
+        self.model = model
+        self.matrix = model.encode([c["content"] for c in chunks], normalize_embeddings=True)
+
+    def search(self, question, k):
+        query = self.model.encode(question, normalize_embeddings=True)
+        scores = self.matrix @ query
+        order = self.np.argsort(-scores)[:k]
+        return [self.chunks[i] for i in order]
+
+
+def evaluate(retrieve, k: int = 3):
+    """hit@1, hit@k and MRR of a retrieve(question, k) -> chunks function"""
+    hits_at_1 = hits_at_k = 0
+    reciprocal_ranks = 0.0
+    for question, expected in QUESTIONS:
+        sources = [chunk["metadata"]["source"] for chunk in retrieve(question, k)]
+        if sources and sources[0] == expected:
+            hits_at_1 += 1
+        if expected in sources:
+            hits_at_k += 1
+            reciprocal_ranks += 1.0 / (sources.index(expected) + 1)
+    n = len(QUESTIONS)
+    return {
+        "hit@1": round(hits_at_1 / n, 3),
+        f"hit@{k}": round(hits_at_k / n, 3),
+        "mrr": round(reciprocal_ranks / n, 3)
+    }
+
+
+def run(iterations: int = 200, vector: bool = True):
+    """Quality and latency for each retrieval mode"""
+    chunks = DocumentManagementAPI().get_policy_chunks()
+    index = BM25Index.build(chunks)
+    results = {"chunks": len(chunks), "questions": len(QUESTIONS)}
+
+    def lexical(question, k):
+        return index.search(question, k=k)
+
+    # Lexical quality and how often it is confident enough to skip the vector store
+    results["bm25"] = evaluate(lexical)
+    confident = correct_confident = 0
+    for question, expected in QUESTIONS:
+        hits = index.search(question, k=6)
+        if index.confidence(hits, config.LEXICAL_MIN_MATCHED_TERMS) >= config.LEXICAL_CONFIDENCE_THRESHOLD:
+            confident += 1
+            correct_confident += hits[0]["metadata"]["source"] == expected
+    results["bm25"]["confident_share"] = round(confident / len(QUESTIONS), 3)
+    results["bm25"]["confident_precision"] = round(correct_confident / confident, 3) if confident else None
+    results["bm25"]["latency"] = summarize_latencies(
+        time_calls(lambda: [index.search(q, k=6) for q, _ in QUESTIONS], iterations)
+    )
+    results["bm25"]["latency"]["per_query_p50_ms"] = round(results["bm25"]["latency"]["p50_ms"] / len(QUESTIONS), 4)
+
+    if vector:
+        try:
+            from sentence_transformers import SentenceTransformer
+            vectors = InMemoryVectorSearch(chunks, SentenceTransformer("all-MiniLM-L6-v2"))
+        except Exception as e:
+            print(f"Skipping vector/hybrid modes: {e}")
+            vectors = None
+
+        if vectors:
+            def hybrid(question, k):
+                lexical_hits = index.search(question, k=k * 2)
+                if index.confidence(lexical_hits, config.LEXICAL_MIN_MATCHED_TERMS) >= config.LEXICAL_CONFIDENCE_THRESHOLD:
+                    return lexical_hits[:k]
+                vector_hits = vectors.search(question, k * 2)
+                by_id = {c["id"]: c for c in vector_hits + lexical_hits}
+                fused = reciprocal_rank_fusion(
+                    [[c["id"] for c in lexical_hits], [c["id"] for c in vector_hits]], k=config.RRF_K
+                )
+                return [by_id[doc_id] for doc_id, _ in fused[:k]]
+
+            results["vector"] = evaluate(vectors.search)
+            results["vector"]["latency"] = summarize_latencies(
+                time_calls(lambda: [vectors.search(q, 6) for q, _ in QUESTIONS], max(1, iterations // 10))
+            )
+            results["hybrid"] = evaluate(hybrid)
+            results["hybrid"]["latency"] = summarize_latencies(
+                time_calls(lambda: [hybrid(q, 3) for q, _ in QUESTIONS], max(1, iterations // 10))
+            )
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200, help="Timed passes over the question set")
+    parser.add_argument("--no-vector", action="store_true", help="Skip vector and hybrid modes")
+    args = parser.parse_args()
+
+    results = run(args.iterations, vector=not args.no_vector)
+    path = write_results("retrieval", results)
+    for mode in ("bm25", "vector", "hybrid"):
+        if mode in results:
+            r = results[mode]
+            print(f"{mode:>7}: hit@1={r['hit@1']:.2f} hit@3={r['hit@3']:.2f} mrr={r['mrr']:.2f} "
+                  f"p50={r['latency']['p50_ms']:.3f}ms/pass")
+    print(f"BM25 confident on {results['bm25']['confident_share']:.0%} of questions "
+          f"(precision {results['bm25']['confident_precision']})")
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Embedding and vector search benchmark
+CLIP image embedding time, and text vector search latency versus corpus size
+
+Usage:
+    python benchmarks/bench_vectors.py [--sizes 1000,10000,50000] [--queries 50]
+
+CLIP timing needs transformers, torch and Pillow and is skipped otherwise.
+Search runs against the configured database backend's vector store (the
+in-memory store unless DATABASE_BACKEND is set otherwise).
+"""
+import argparse
+import io
+import sys
+import os
+from typing import Dict, Any, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import configure_environment, summarize_latencies, time_calls, write_results
+
+EMBEDDING_DIMENSIONS = 384
+
+
+def bench_clip(images: int = 10) -> Dict[str, Any]:
+    """Per-image CLIP embedding latency, the cost paid per uploaded photo"""
+    try:
+        from PIL import Image
+        from transformers import CLIPProcessor, CLIPModel
+    except ImportError as e:
+        return {"skipped": f"CLIP dependencies not installed ({e.name})"}
+
+    model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32")
+    processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
+    rng = np.random.default_rng(0)
+    payloads = []
+    for _ in range(images):
+        buffer = io.BytesIO()
+        Image.fromarray(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)).save(buffer, format="JPEG")
+        payloads.append(buffer.getvalue())
+
+    counter = iter(range(10 ** 9))
+
+    def embed():
+        # Same steps as ImageVectorStore.get_image_embedding
+        image = Image.open(io.BytesIO(payloads[next(counter) % len(payloads)])).convert("RGB")
+        inputs = processor(images=image, return_tensors="pt")
+        model.get_image_features(**inputs).detach().numpy()
+
+    return {"embed": summarize_latencies(time_calls(embed, images, warmup=2))}
+
+
+def bench_vector_search(sizes: List[int], queries: int = 50) -> Dict[str, Any]:
+    """similarity_search latency (k=3, the chatbot's setting) at each corpus size"""
+    from database import OracleVectorStore
+
+    rng = np.random.default_rng(0)
+    store = OracleVectorStore(None)
+    store.clear_documents()
+    results = {}
+    loaded = 0
+    for size in sorted(sizes):
+        count = size - loaded
+        vectors = rng.standard_normal((count, EMBEDDING_DIMENSIONS)).astype(np.float32)
+        documents = [{"id": f"bench_{loaded + i}", "title": "bench", "content": f"document {loaded + i}",
+                      "metadata": {"source": "bench"}} for i in range(count)]
+        store.add_documents(documents, vectors.tolist())
+        loaded = size
+
+        query_vectors = rng.standard_normal((queries, EMBEDDING_DIMENSIONS)).tolist()
+        counter = iter(range(10 ** 9))
+        samples = time_calls(lambda: store.similarity_search(query_vectors[next(counter) % queries], k=3), queries)
+        results[f"corpus_{size}"] = summarize_latencies(samples)
+    store.clear_documents()
+    return results
+
+
+def run(sizes: List[int], queries: int = 50, clip_images: int = 10) -> Dict[str, Any]:
+    return {
+        "clip": bench_clip(clip_images),
+        "vector_search": bench_vector_search(sizes, queries)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,50000", help="Comma-separated corpus sizes")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--clip-images", type=int, default=10)
+    args = parser.parse_args()
+
+    configure_environment()
+    results = run([int(s) for s in args.sizes.split(",")], args.queries, args.clip_images)
+    clip = results["clip"]
+    if "skipped" in clip:
+        print(f"CLIP: skipped - {clip['skipped']}")
+    else:
+        print(f"CLIP embed: p50={clip['embed']['p50_ms']:.1f}ms p95={clip['embed']['p95_ms']:.1f}ms")
+    for name, stats in results["vector_search"].items():
+        print(f"search {name:<14} p50={stats['p50_ms']:.2f}ms p95={stats['p95_ms']:.2f}ms")
+    print(f"Results written to {write_results('vectors', results)}")
+
+
+if __name__ == "__main__":
+    main()
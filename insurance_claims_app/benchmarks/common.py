@@ -0,0 +1,218 @@
+"""
+Shared helpers for the benchmark scripts
+Timing, percentile summaries and machine-readable result files
+"""
+import hashlib
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, "results")
+BASELINE_PATH = os.path.join(BENCHMARKS_DIR, "baseline.json")
+
+# Flattened metric suffixes that gate regressions, and which way is better
+GATED_SUFFIXES = {
+    "p50_ms": "lower",
+    "p95_ms": "lower",
+    "_per_sec": "higher",
+    "hit@1": "higher",
+    "mrr": "higher",
+}
+
+
+def configure_environment(seed: int = 42, llm_latency: str = "constant:0"):
+    """Select the offline backends; must run before any app module is imported"""
+    os.environ["DATABASE_BACKEND"] = "memory"
+    os.environ["LLM_BACKEND"] = "fake"
+    os.environ["MOCK_API_SEED"] = str(seed)
+    os.environ["LLM_FAKE_SEED"] = str(seed)
+    os.environ["LLM_FAKE_LATENCY"] = llm_latency
+    # Benchmarks measure the app, not the provider quota
+    os.environ.setdefault("LLM_REQUESTS_PER_SECOND", "1000")
+    os.environ.setdefault("LLM_BURST", "1000")
+    # Repeated rounds resubmit the same generated claims; measure processing, not dedup
+    os.environ.setdefault("SUBMISSION_DEDUP_WINDOW_S", "0")
+    runtime_dir = tempfile.mkdtemp(prefix="bench_")
+    os.environ.setdefault("CHAT_SPOOL_PATH", os.path.join(runtime_dir, "chat_spool.jsonl"))
+    os.environ.setdefault("CHECKPOINT_SQLITE_PATH", os.path.join(runtime_dir, "checkpoints.sqlite"))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize_latencies(samples_ms: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max summary of latency samples in milliseconds"""
+    if not samples_ms:
+        return {"count": 0}
+    return {
+        "count": len(samples_ms),
+        "mean_ms": round(sum(samples_ms) / len(samples_ms), 3),
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "p99_ms": round(percentile(samples_ms, 99), 3),
+        "max_ms": round(max(samples_ms), 3)
+    }
+
+
+def time_calls(fn: Callable[[], Any], iterations: int, warmup: int = 3) -> List[float]:
+    """Call fn repeatedly and return per-call wall time in milliseconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def write_results(name: str, results: Dict[str, Any], path: str = None) -> str:
+    """Write benchmark results as JSON and return the file path"""
+    path = path or os.path.join(RESULTS_DIR, f"{name}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = {
+        "benchmark": name,
+        "timestamp": datetime.now().isoformat(),
+        "results": results
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def host_speed_ms() -> float:
+    """
+    Time of a fixed CPU-bound workload (best of 3), in milliseconds.
+
+    Shared and throttled hosts change speed from one second to the next;
+    timing this next to a benchmark round says how fast the host was
+    while the round ran (see `scale_to_host`).
+    """
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        digest = b""
+        for _ in range(20000):
+            digest = hashlib.sha256(digest).digest()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best
+
+
+def scale_to_host(results: Dict[str, Any], factor: float) -> Dict[str, Any]:
+    """
+    Rescale a round's timings to another host speed: `factor` is reference
+    host_speed_ms over the round's. Latencies (*_ms) are multiplied by it,
+    throughputs (*_per_sec) divided; other numbers are unchanged.
+
+    Only valid for CPU-bound work: time spent sleeping (injected agent or
+    LLM latency) does not change with the host's speed.
+    """
+    scaled = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            scaled[key] = scale_to_host(value, factor)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and str(key).endswith("_ms"):
+            scaled[key] = round(value * factor, 3)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and str(key).endswith("_per_sec"):
+            scaled[key] = round(value / factor, 2)
+        else:
+            scaled[key] = value
+    return scaled
+
+
+def median_results(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine repeated runs of one benchmark: every number is the median of
+    its rounds.
+
+    One round disturbed by the host (other processes, a GC pause) does not
+    move the median, while a regression that shows in half the rounds or
+    more does; keeping the best round would hide an intermittent one.
+    """
+    merged = {}
+    for key, value in runs[0].items():
+        values = [run[key] for run in runs if key in run]
+        if isinstance(value, dict):
+            merged[key] = median_results(values)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            merged[key] = round(statistics.median(values), 3)
+        else:
+            merged[key] = value
+    return merged
+
+
+def flatten_metrics(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Nested results -> {"a.b.p95_ms": value} for numeric leaves"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(flatten_metrics(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def metric_direction(name: str) -> str:
+    """Which way is better for a gated metric ("lower"/"higher"); "" if not gated"""
+    for suffix, direction in GATED_SUFFIXES.items():
+        if name.endswith(suffix):
+            return direction
+    return ""
+
+
+def gated_metrics(flat: Dict[str, float]) -> Dict[str, float]:
+    """Subset of flattened metrics that is stored in the baseline"""
+    return {name: value for name, value in flat.items() if metric_direction(name)}
+
+
+def compare_to_baseline(
+    current: Dict[str, float],
+    baseline: Dict[str, float],
+    tolerance: float = 0.25,
+    min_delta_ms: float = 2.0,
+    section_tolerances: Optional[Dict[str, float]] = None
+) -> List[Tuple[str, float, float, str]]:
+    """
+    Compare flattened metrics against a baseline.
+
+    A latency regresses when it is more than `tolerance` slower and at least
+    `min_delta_ms` slower in absolute terms (sub-millisecond timings are
+    noise); throughput and quality regress when more than `tolerance` lower.
+    `section_tolerances` overrides the tolerance for noisier sections, e.g.
+    {"api": 0.5}. Metrics missing from either side are skipped.
+
+    Returns (metric, baseline, current, status) rows; status is "ok",
+    "improved" or "REGRESSED".
+    """
+    rows = []
+    for name, base in sorted(baseline.items()):
+        if name not in current:
+            continue
+        value = current[name]
+        direction = metric_direction(name)
+        allowed = (section_tolerances or {}).get(name.split(".")[0], tolerance)
+        status = "ok"
+        if direction == "lower":
+            if value > base * (1 + allowed) and value - base >= min_delta_ms:
+                status = "REGRESSED"
+            elif value < base * (1 - allowed) and base - value >= min_delta_ms:
+                status = "improved"
+        elif direction == "higher":
+            if value < base * (1 - allowed):
+                status = "REGRESSED"
+            elif value > base * (1 + allowed):
+                status = "improved"
+        rows.append((name, base, value, status))
+    return rows
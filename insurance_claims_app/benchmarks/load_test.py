@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Load test driver for the supervisor claims workflow and the chatbot
+Runs a seeded synthetic workload against the in-memory database, the fake LLM
+and seeded mock APIs, so two runs with the same arguments are comparable
+
+Usage:
+    python benchmarks/load_test.py [--claims 200] [--concurrency 8] [--seed 42]
+                                   [--llm-latency lognormal:400:0.5] [--chats 50]
+
+Reports claims/sec, end-to-end latency and per-agent latency percentiles,
+and writes them to benchmarks/results/load_test.json.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Any, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import configure_environment
+
+# Agent name -> (module-level instance in supervisor_workflow, method)
+AGENT_METHODS = {
+    "supervisor": ("supervisor", "supervise"),
+    "document_analyzer": ("document_analyzer", "analyze_documents"),
+    "validation": ("validation_agent", "validate_claim"),
+    "fraud_investigation": ("fraud_agent", "investigate"),
+    "approval": ("approval_agent", "process_approval"),
+}
+
+CLAIM_TYPES = ["collision", "comprehensive", "liability"]
+REPAIR_SHOPS = ["Certified Auto Body", "Dealer Service Center", "National Chain Repairs", "Joe's Garage", "Quick Fix Auto"]
+DESCRIPTIONS = [
+    "Rear-ended at a stop light, bumper and trunk damaged",
+    "Hail storm dented the hood and roof",
+    "Side-swiped in a parking lot, door and mirror damaged",
+    "Hit a deer on the highway, front end damage",
+    "Vehicle broken into, window smashed and stereo stolen",
+]
+CHAT_QUESTIONS = [
+    "What does comprehensive coverage protect against?",
+    "How many days do I have to report an incident?",
+    "What is a deductible?",
+    "How do I appeal a denied claim?",
+    "Will you pay for a rental car while my vehicle is repaired?",
+]
+BASE_DATE = datetime(2026, 6, 1)
+
+
+def generate_claims(count: int, seed: int) -> List[Dict[str, Any]]:
+    """Deterministic synthetic claims spanning clean, risky and invalid cases"""
+    rng = random.Random(seed)
+    claims = []
+    for i in range(count):
+        incident = BASE_DATE + timedelta(days=rng.randint(0, 90), hours=rng.randint(0, 23))
+        filed_after = rng.choice([1, 2, 3, 5, 10, 20, 45])  # 45 days breaches the filing limit
+        claims.append({
+            "policy_id": rng.choice(["POL-001", "POL-001", "POL-002", "POL-003"]),
+            "incident_date": incident.isoformat(),
+            "claim_date": (incident + timedelta(days=filed_after)).isoformat(),
+            "claim_type": rng.choice(CLAIM_TYPES),
+            "damage_description": rng.choice(DESCRIPTIONS),
+            "repair_shop": rng.choice(REPAIR_SHOPS),
+            "estimated_damage_amount": round(rng.lognormvariate(8.2, 0.8), 2),
+            "damage_photos": [f"photo_{i}_{n}.jpg" for n in range(rng.randint(0, 4))],
+            "incident_report": f"Report #{i}" if rng.random() < 0.7 else "",
+            "repair_estimate": f"Estimate #{i}" if rng.random() < 0.8 else "",
+        })
+    return claims
+
+
+class AgentTimer:
+    """Wraps the workflow's agent instances and records per-call wall time"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def install(self, workflow_module):
+        for agent_name, (attr, method_name) in AGENT_METHODS.items():
+            instance = getattr(workflow_module, attr)
+            setattr(instance, method_name, self._wrap(agent_name, getattr(instance, method_name)))
+
+    def _wrap(self, agent_name, fn):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = (time.perf_counter() - start) * 1000
+                with self._lock:
+                    self.samples[agent_name].append(elapsed)
+        return timed
+
+
+def run_claims(claims: List[Dict[str, Any]], concurrency: int, with_memory: bool = False) -> Dict[str, Any]:
+    """Submit claims the way /submit-claim does and measure the workflow (checkpointed if with_memory)"""
+    from database import create_claim, get_policy, update_claim
+    from agents import supervisor_workflow
+    from benchmarks.common import summarize_latencies
+
+    timer = AgentTimer()
+    timer.install(supervisor_workflow)
+    latencies = []
+    outcomes = []
+    errors = []
+    lock = threading.Lock()
+
+    def submit(index_claim):
+        index, claim = index_claim
+        start = time.perf_counter()
+        try:
+            policy = get_policy(claim["policy_id"])
+            claim_data = dict(claim, customer_id=policy["customer_id"] if policy else "UNKNOWN")
+            claim_data["claim_id"] = create_claim(claim_data)
+            result = supervisor_workflow.process_claim_with_supervisor(claim_data, with_memory=with_memory)
+            update_claim(claim_data["claim_id"], {
+                "validation_status": result.get("validation_status"),
+                "approval_status": result.get("approval_status"),
+                "payout_amount": result.get("payout_amount", 0),
+                "fraud_score": result.get("fraud_score")
+            })
+            outcome = (index, result.get("validation_status"), result.get("approval_status"),
+                       result.get("payout_amount"), result.get("fraud_score"))
+        except Exception as e:
+            with lock:
+                errors.append(f"claim {index}: {e}")
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+            outcomes.append(outcome)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(submit, enumerate(claims)))
+    wall_s = time.perf_counter() - started
+
+    outcomes.sort()
+    return {
+        "claims": len(claims),
+        "concurrency": concurrency,
+        "wall_time_s": round(wall_s, 3),
+        "claims_per_sec": round(len(latencies) / wall_s, 2) if wall_s else 0.0,
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "end_to_end": summarize_latencies(latencies),
+        "per_agent": {name: summarize_latencies(samples) for name, samples in sorted(timer.samples.items())},
+        "approval_status_counts": dict(Counter(o[2] for o in outcomes)),
+        # Same seed and claim count must give the same fingerprint
+        "outcome_fingerprint": hashlib.sha256(json.dumps(outcomes, default=str).encode()).hexdigest()[:16]
+    }
+
+
+def run_chats(count: int, concurrency: int) -> Dict[str, Any]:
+    """Ask the chatbot a rotating set of questions through the fake LLM"""
+    from agents.chatbot_agent import InsuranceChatbotAgent
+    from benchmarks.common import summarize_latencies
+
+    chatbot = InsuranceChatbotAgent()
+    latencies = []
+    lock = threading.Lock()
+
+    def ask(i):
+        start = time.perf_counter()
+        chatbot.answer_question(CHAT_QUESTIONS[i % len(CHAT_QUESTIONS)])
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(ask, range(count)))
+    wall_s = time.perf_counter() - started
+    return {
+        "questions": count,
+        "questions_per_sec": round(count / wall_s, 2) if wall_s else 0.0,
+        "latency": summarize_latencies(latencies)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the claims workflow offline")
+    parser.add_argument("--claims", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--llm-latency", default="lognormal:400:0.5",
+                        help="Fake LLM latency distribution (constant:MS, uniform:LO:HI, lognormal:MEDIAN:SIGMA)")
+    parser.add_argument("--chats", type=int, default=0, help="Chatbot questions to run after the claims")
+    parser.add_argument("--output", default=None, help="Results JSON path")
+    args = parser.parse_args()
+
+    configure_environment(args.seed, args.llm_latency)
+    from database import init_database, seed_sample_policies
+    from benchmarks.common import write_results
+
+    init_database()
+    seed_sample_policies()
+
+    results = {
+        "seed": args.seed,
+        "llm_latency": args.llm_latency,
+        "claims": run_claims(generate_claims(args.claims, args.seed), args.concurrency)
+    }
+    if args.chats:
+        results["chat"] = run_chats(args.chats, args.concurrency)
+
+    claims = results["claims"]
+    print(f"Claims: {claims['claims']} at concurrency {claims['concurrency']} "
+          f"-> {claims['claims_per_sec']} claims/sec ({claims['errors']} errors)")
+    e2e = claims["end_to_end"]
+    if e2e.get("count"):
+        print(f"  end-to-end  p50={e2e['p50_ms']:.1f}ms p95={e2e['p95_ms']:.1f}ms p99={e2e['p99_ms']:.1f}ms")
+    for agent_name, stats in claims["per_agent"].items():
+        print(f"  {agent_name:<20} calls={stats['count']:<5} p50={stats['p50_ms']:.2f}ms "
+              f"p95={stats['p95_ms']:.2f}ms p99={stats['p99_ms']:.2f}ms")
+    print(f"  outcomes {claims['approval_status_counts']} fingerprint={claims['outcome_fingerprint']}")
+    if "chat" in results:
+        chat = results["chat"]
+        print(f"Chat: {chat['questions_per_sec']} questions/sec, p50={chat['latency']['p50_ms']:.1f}ms "
+              f"p95={chat['latency']['p95_ms']:.1f}ms")
+
+    path = write_results("load_test", results, args.output)
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
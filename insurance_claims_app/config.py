@@ -3,16 +3,48 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
 class Config:
     # OCI GenAI
     OCI_COMPARTMENT_ID = os.getenv("OCI_COMPARTMENT_ID", "ocid1.compartment.oc1..aaaaaaaa5jnmxes5yog6ucgnrfttaeckgqewgvfkhaybd32km2lv25fghc4a")
     OCI_SERVICE_ENDPOINT = os.getenv("OCI_SERVICE_ENDPOINT", "https://inference.generativeai.us-chicago-1.oci.oraclecloud.com")
     OCI_MODEL_ID = os.getenv("OCI_MODEL_ID", "cohere.command-a-03-2025")
     
+    # Shared LLM client (rate limiting, concurrency, retries)
+    LLM_BACKEND = os.getenv("LLM_BACKEND", "oci")  # oci or fake
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_REQUESTS_PER_SECOND = float(os.getenv("LLM_REQUESTS_PER_SECOND", "5"))
+    LLM_BURST = int(os.getenv("LLM_BURST", "10"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+    LLM_BACKOFF_BASE_S = float(os.getenv("LLM_BACKOFF_BASE_S", "0.25"))
+    LLM_BACKOFF_MAX_S = float(os.getenv("LLM_BACKOFF_MAX_S", "8"))
+    LLM_FAKE_LATENCY = os.getenv("LLM_FAKE_LATENCY", "constant:0")  # e.g. lognormal:400:0.5
+    LLM_FAKE_SEED = int(os.getenv("LLM_FAKE_SEED", "0"))
+    
     # External APIs
     ARYA_API_KEY = os.getenv("ARYA_API_KEY", "mock_arya_key")
     FRAUD_API_KEY = os.getenv("FRAUD_API_KEY", "mock_fraud_key")
     POLICY_API_KEY = os.getenv("POLICY_API_KEY", "mock_policy_key")
+    PAYMENT_API_KEY = os.getenv("PAYMENT_API_KEY", "mock_payment_key")
+    MOCK_API_SEED = int(os.environ["MOCK_API_SEED"]) if os.getenv("MOCK_API_SEED") else None
+    
+    # Remote vendor APIs over HTTP (EXTERNAL_API_BACKEND=http); per-vendor settings are "vendor=value" lists
+    EXTERNAL_API_BACKEND = os.getenv("EXTERNAL_API_BACKEND", "mock")  # mock or http
+    VENDOR_BASE_URLS = os.getenv(
+        "VENDOR_BASE_URLS",
+        "arya=http://127.0.0.1:8101,fraud=http://127.0.0.1:8102,vertafore=http://127.0.0.1:8103,payments=http://127.0.0.1:8104"
+    )
+    VENDOR_MAX_CONCURRENCY = os.getenv("VENDOR_MAX_CONCURRENCY", "arya=16,fraud=32,vertafore=16,payments=4")  # pooled connections
+    VENDOR_TIMEOUT_S = float(os.getenv("VENDOR_TIMEOUT_S", "5"))  # per attempt, capped by the claim deadline
+    VENDOR_CONNECT_TIMEOUT_S = float(os.getenv("VENDOR_CONNECT_TIMEOUT_S", "1"))
+    VENDOR_REQUEST_TIMEOUT_S = float(os.getenv("VENDOR_REQUEST_TIMEOUT_S", "30"))  # whole request outside a claim deadline
+    VENDOR_MAX_RETRIES = int(os.getenv("VENDOR_MAX_RETRIES", "2"))  # idempotent requests only
+    VENDOR_BACKOFF_BASE_S = float(os.getenv("VENDOR_BACKOFF_BASE_S", "0.05"))
+    VENDOR_BACKOFF_MAX_S = float(os.getenv("VENDOR_BACKOFF_MAX_S", "1"))
+    VENDOR_HEDGE_DELAY_MS = float(os.getenv("VENDOR_HEDGE_DELAY_MS", "150"))  # second copy of a slow read, 0 disables
+    VENDOR_CIRCUIT_FAILURES = int(os.getenv("VENDOR_CIRCUIT_FAILURES", "5"))  # consecutive failures that open a circuit
+    VENDOR_CIRCUIT_RESET_S = float(os.getenv("VENDOR_CIRCUIT_RESET_S", "30"))  # open time before a trial request
     
     # Oracle Database Configuration
     ORACLE_USER = os.getenv("ORACLE_USER", "insurance_user")
@@ -20,11 +52,88 @@ class Config:
     ORACLE_DSN = os.getenv("ORACLE_DSN", "localhost:1521/FREEPDB1")
     ORACLE_WALLET_LOCATION = os.getenv("ORACLE_WALLET_LOCATION", "")
     ORACLE_WALLET_PASSWORD = os.getenv("ORACLE_WALLET_PASSWORD", "")
+    DATABASE_BACKEND = os.getenv("DATABASE_BACKEND", "oracle")  # oracle or memory
     
     # Validation thresholds
     CLAIM_FILING_DAYS_LIMIT = 30
     FRAUD_SCORE_HIGH = 0.7
     FRAUD_SCORE_MEDIUM = 0.4
     FRAUD_SCORE_LOW = 0.2
+    
+    # Supervisor workflow
+    SUPERVISOR_PARALLEL_FANOUT = os.getenv("SUPERVISOR_PARALLEL_FANOUT", "true").lower() == "true"
+    SUPERVISOR_FAST_PATH = os.getenv("SUPERVISOR_FAST_PATH", "true").lower() == "true"
+    WORKFLOW_HISTORY_MAX_STEPS = int(os.getenv("WORKFLOW_HISTORY_MAX_STEPS", "64"))  # newest steps kept in state
+    FRAUD_PRESCORE = os.getenv("FRAUD_PRESCORE", "true").lower() == "true"  # score fraud speculatively during validation
+    FRAUD_PRESCORE_WORKERS = int(os.getenv("FRAUD_PRESCORE_WORKERS", "8"))
+    
+    # Claim scheduler (priority queue and per-priority worker pools)
+    CLAIM_SCHEDULER = os.getenv("CLAIM_SCHEDULER", "true").lower() == "true"
+    SCHEDULER_POOL_SIZES = os.getenv("SCHEDULER_POOL_SIZES", "critical=2,high=2,medium=4,low=2")
+    SCHEDULER_AGING_S = float(os.getenv("SCHEDULER_AGING_S", "30"))  # wait that promotes a claim one priority level
+    CLAIM_BATCH_MAX_SIZE = int(os.getenv("CLAIM_BATCH_MAX_SIZE", "500"))  # claims per POST /claims/batch
+    
+    # Per-claim deadline (set at submission, includes queue wait)
+    CLAIM_DEADLINE_MS = float(os.getenv("CLAIM_DEADLINE_MS", "60000"))
+    CLAIM_DEADLINE_RESERVE_MS = float(os.getenv("CLAIM_DEADLINE_RESERVE_MS", "10000"))  # below this, skip optional checks
+    
+    # API admission control, per process: lanes are images (CLIP uploads), writes (submissions,
+    # reviews), chat and reads (GET lookups); writes + images stay within the 10-connection Oracle pool
+    ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "true").lower() == "true"
+    ADMISSION_CONCURRENCY = os.getenv("ADMISSION_CONCURRENCY", "images=2,writes=8,chat=4,reads=32")
+    ADMISSION_QUEUE = os.getenv("ADMISSION_QUEUE", "images=8,writes=32,chat=16,reads=128")  # beyond this: 429
+    ADMISSION_QUEUE_TIMEOUT_S = os.getenv("ADMISSION_QUEUE_TIMEOUT_S", "images=15,writes=15,chat=10,reads=2")  # then: 503
+    ADMISSION_RETRY_AFTER_MAX_S = int(os.getenv("ADMISSION_RETRY_AFTER_MAX_S", "30"))
+    
+    # Idempotent claim submission (same Idempotency-Key header, or identical payload within the window)
+    SUBMISSION_DEDUP_WINDOW_S = float(os.getenv("SUBMISSION_DEDUP_WINDOW_S", "600"))
+    
+    # Fraud ring graph (claims linked through customers, policies, shops and duplicate images)
+    FRAUD_GRAPH_HUB_CUSTOMERS = int(os.getenv("FRAUD_GRAPH_HUB_CUSTOMERS", "25"))  # busier shops stop linking customers
+    FRAUD_GRAPH_REBUILD_S = float(os.getenv("FRAUD_GRAPH_REBUILD_S", "3600"))  # full recompute interval, 0 disables
+    FRAUD_RING_MIN_CUSTOMERS = int(os.getenv("FRAUD_RING_MIN_CUSTOMERS", "4"))
+    FRAUD_RING_SHOP_DENSITY = float(os.getenv("FRAUD_RING_SHOP_DENSITY", "0.5"))  # share of ring claims at one shop
+    
+    # Repair shop reputation index (repair_shops table, cached in process)
+    REPAIR_SHOP_REFRESH_S = float(os.getenv("REPAIR_SHOP_REFRESH_S", "300"))  # changed rows re-read at most this often
+    REPAIR_SHOP_MATCH_SIMILARITY = float(os.getenv("REPAIR_SHOP_MATCH_SIMILARITY", "0.7"))  # trigram Dice for fuzzy matches
+    REPAIR_SHOP_FRAUD_RATE_HIGH = float(os.getenv("REPAIR_SHOP_FRAUD_RATE_HIGH", "0.3"))
+    REPAIR_SHOP_MIN_CLAIMS = int(os.getenv("REPAIR_SHOP_MIN_CLAIMS", "5"))  # scored claims before the fraud rate counts
+    
+    # Decision backfill (re-decide stored claims after threshold changes)
+    BACKFILL_CHUNK_SIZE = int(os.getenv("BACKFILL_CHUNK_SIZE", "5000"))
+    BACKFILL_WORKERS = int(os.getenv("BACKFILL_WORKERS", "4"))  # 0 decides in-process
+    BACKFILL_DIR = os.getenv("BACKFILL_DIR", os.path.join(APP_DIR, "data", "backfill"))  # checkpoints and diff reports
+    
+    # Payout settlement (approved claims -> ACH batch files -> payment processor)
+    SETTLEMENT_BATCH_SIZE = int(os.getenv("SETTLEMENT_BATCH_SIZE", "1000"))  # entries per ACH file / process_payments call
+    SETTLEMENT_POLL_CHUNK = int(os.getenv("SETTLEMENT_POLL_CHUNK", "500"))  # payment ids per status request
+    SETTLEMENT_DIR = os.getenv("SETTLEMENT_DIR", os.path.join(APP_DIR, "data", "settlement"))  # ACH files
+    ACH_ORIGIN_ROUTING = os.getenv("ACH_ORIGIN_ROUTING", "011000015")  # our bank (ODFI)
+    ACH_DESTINATION_ROUTING = os.getenv("ACH_DESTINATION_ROUTING", "011000015")  # processor's receiving point
+    ACH_COMPANY_ID = os.getenv("ACH_COMPANY_ID", "1234567890")
+    ACH_COMPANY_NAME = os.getenv("ACH_COMPANY_NAME", "AUTO CLAIMS")
+    
+    # Workflow checkpoints (resume claims after a worker restart)
+    WORKFLOW_CHECKPOINTING = os.getenv("WORKFLOW_CHECKPOINTING", "true").lower() == "true"
+    HUMAN_REVIEW_INTERRUPT = os.getenv("HUMAN_REVIEW_INTERRUPT", "true").lower() == "true"
+    CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "sqlite")  # sqlite, oracle or memory
+    CHECKPOINT_SQLITE_PATH = os.getenv("CHECKPOINT_SQLITE_PATH", os.path.join(APP_DIR, "data", "checkpoints.sqlite"))
+    CHECKPOINT_KEEP_LAST = int(os.getenv("CHECKPOINT_KEEP_LAST", "20"))
+    CHECKPOINT_PRUNE_EVERY = int(os.getenv("CHECKPOINT_PRUNE_EVERY", "10"))
+    CHECKPOINT_RETENTION_DAYS = int(os.getenv("CHECKPOINT_RETENTION_DAYS", "30"))
+    CHECKPOINT_COMMIT_INTERVAL_MS = int(os.getenv("CHECKPOINT_COMMIT_INTERVAL_MS", "20"))  # group commit window
+    CHECKPOINT_LEASE_S = int(os.getenv("CHECKPOINT_LEASE_S", "30"))  # a run not renewed this long is resumed elsewhere
+    
+    # Chat history write-behind buffer
+    CHAT_WRITE_BATCH_SIZE = int(os.getenv("CHAT_WRITE_BATCH_SIZE", "50"))
+    CHAT_WRITE_FLUSH_MS = int(os.getenv("CHAT_WRITE_FLUSH_MS", "500"))
+    CHAT_SPOOL_PATH = os.getenv("CHAT_SPOOL_PATH", os.path.join(APP_DIR, "data", "chat_spool.jsonl"))
+    
+    # Hybrid retrieval (BM25 + vector search)
+    LEXICAL_INDEX_PATH = os.getenv("LEXICAL_INDEX_PATH", os.path.join(APP_DIR, "data", "policy_bm25.json"))
+    LEXICAL_CONFIDENCE_THRESHOLD = float(os.getenv("LEXICAL_CONFIDENCE_THRESHOLD", "0.6"))
+    LEXICAL_MIN_MATCHED_TERMS = int(os.getenv("LEXICAL_MIN_MATCHED_TERMS", "2"))  # fewer: always fuse with vectors
+    RRF_K = 60
 
 config = Config()
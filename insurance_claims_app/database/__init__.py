@@ -1,17 +1,51 @@
-from .models import init_database, seed_sample_policies, get_connection, release_connection
-from .crud import (
-    create_claim, get_claim, update_claim, get_all_claims,
-    get_policy, get_all_policies,
-    save_chat_message, get_chat_history
-)
-from .vector_store import OracleVectorStore
-from .image_vector_store import ImageVectorStore
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import config
+
+if config.DATABASE_BACKEND == "memory":
+    # In-process stand-in: same functions, no Oracle driver or CLIP model needed
+    from .memory_backend import (
+        init_database, seed_sample_policies, get_connection, release_connection,
+        get_repair_shops,
+        iter_payable_claims, create_payments, update_payment_statuses, iter_payments, get_payment_counts,
+        create_claim, create_claim_once, get_claim, update_claim, get_all_claims,
+        get_claim_links, get_claims_by_customer, get_customer_claim_stats, rebuild_customer_claim_stats,
+        iter_claim_decisions, update_claim_decisions,
+        get_policy, get_all_policies,
+        save_chat_message, save_chat_messages_batch, get_chat_history,
+        save_workflow_steps, get_workflow_steps,
+        MemoryVectorStore as OracleVectorStore,
+        MemoryImageVectorStore as ImageVectorStore
+    )
+else:
+    from .models import init_database, seed_sample_policies, get_connection, release_connection
+    from .crud import (
+        create_claim, create_claim_once, get_claim, update_claim, get_all_claims,
+        get_claim_links, get_claims_by_customer, get_customer_claim_stats, rebuild_customer_claim_stats,
+        iter_claim_decisions, update_claim_decisions, get_repair_shops,
+        iter_payable_claims, create_payments, update_payment_statuses, iter_payments, get_payment_counts,
+        get_policy, get_all_policies,
+        save_chat_message, save_chat_messages_batch, get_chat_history,
+        save_workflow_steps, get_workflow_steps
+    )
+    from .vector_store import OracleVectorStore
+    from .image_vector_store import ImageVectorStore
+from .errors import IdempotencyKeyReused
+from .chat_writer import ChatWriteBehindBuffer, get_chat_writer
+from .checkpointer import DurableCheckpointSaver, get_checkpointer
 
 __all__ = [
     "init_database", "seed_sample_policies", "get_connection", "release_connection",
-    "create_claim", "get_claim", "update_claim", "get_all_claims",
+    "create_claim", "create_claim_once", "IdempotencyKeyReused", "get_claim", "update_claim", "get_all_claims",
+    "get_claim_links", "get_claims_by_customer", "get_customer_claim_stats", "rebuild_customer_claim_stats",
+    "iter_claim_decisions", "update_claim_decisions", "get_repair_shops",
+    "iter_payable_claims", "create_payments", "update_payment_statuses", "iter_payments", "get_payment_counts",
     "get_policy", "get_all_policies",
-    "save_chat_message", "get_chat_history",
+    "save_chat_message", "save_chat_messages_batch", "get_chat_history",
+    "save_workflow_steps", "get_workflow_steps",
+    "ChatWriteBehindBuffer", "get_chat_writer",
+    "DurableCheckpointSaver", "get_checkpointer",
     "OracleVectorStore",
     "ImageVectorStore"
 ]
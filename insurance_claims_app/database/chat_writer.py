@@ -0,0 +1,252 @@
+"""
+Write-Behind Buffer for Chat History
+Moves chat_history inserts off the request path and writes them in batches
+"""
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Callable
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import config
+
+
+class ChatWriteBehindBuffer:
+    """
+    Buffers chat messages in memory and flushes them to the database in batches.
+
+    Every message is appended to a local spool file before it is acknowledged,
+    so anything accepted before a crash is replayed on the next start. A
+    background thread flushes when `batch_size` messages are pending or
+    `flush_interval_ms` has passed, whichever comes first.
+
+    The append reaches the OS before enqueue returns, which survives a
+    process crash; the spool is fsynced once per flush rather than per
+    message, so a host crash can lose at most the last flush interval.
+
+    Spool layout:
+        <spool_path>           messages not yet handed to the database
+        <spool_path>.inflight  the batch currently being written
+    Replaying an in-flight batch that was already committed is harmless:
+    chat_id is assigned at enqueue time, so the duplicate rows are rejected
+    by the primary key and skipped.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[Callable[[List[tuple]], int]] = None,
+        spool_path: str = None,
+        batch_size: int = None,
+        flush_interval_ms: int = None,
+        fsync: bool = True
+    ):
+        if sink is None:
+            from . import save_chat_messages_batch  # active backend
+            sink = save_chat_messages_batch
+
+        self.sink = sink
+        self.spool_path = spool_path or config.CHAT_SPOOL_PATH
+        self.inflight_path = f"{self.spool_path}.inflight"
+        self.batch_size = batch_size or config.CHAT_WRITE_BATCH_SIZE
+        self.flush_interval = (flush_interval_ms or config.CHAT_WRITE_FLUSH_MS) / 1000.0
+        self.fsync = fsync
+
+        self._lock = threading.Lock()          # guards _pending and the spool file
+        self._flush_lock = threading.Lock()    # one flush at a time
+        self._wakeup = threading.Event()
+        self._pending: List[Dict[str, Any]] = []
+        self._inflight: Optional[List[Dict[str, Any]]] = None
+        self._spool = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    # ---- lifecycle -------------------------------------------------------
+
+    def start(self):
+        """Replay any spooled messages and start the background flusher"""
+        if self._thread is not None:
+            return
+
+        os.makedirs(os.path.dirname(self.spool_path) or ".", exist_ok=True)
+        recovered = self._recover_spool()
+        if recovered:
+            print(f"[ChatWriter] Recovered {recovered} spooled chat messages")
+
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="chat-write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the flusher and write everything still pending"""
+        if self._thread is None:
+            return
+
+        self._stopping = True
+        self._wakeup.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+        try:
+            while self.flush():
+                pass
+        except Exception as e:
+            print(f"[ChatWriter] Final flush failed, messages kept in spool: {e}")
+
+        with self._lock:
+            if self._spool is not None:
+                if self.fsync:
+                    os.fsync(self._spool.fileno())
+                self._spool.close()
+                self._spool = None
+
+    # ---- public API ------------------------------------------------------
+
+    def enqueue(self, claim_id: str, customer_message: str, bot_response: str) -> str:
+        """Accept a chat message for persistence and return its chat_id"""
+        record = {
+            "chat_id": f"CHAT-{uuid.uuid4().hex[:8].upper()}",
+            "claim_id": claim_id,
+            "customer_message": customer_message,
+            "bot_response": bot_response,
+            "timestamp": datetime.now().isoformat()
+        }
+
+        with self._lock:
+            self._append_to_spool(record)
+            self._pending.append(record)
+            should_flush = len(self._pending) >= self.batch_size
+
+        if should_flush:
+            self._wakeup.set()
+        return record["chat_id"]
+
+    def flush(self) -> int:
+        """
+        Write the oldest pending batch to the database.
+
+        Returns the number of messages handed to the sink. Raises if the sink
+        fails; the batch stays in-flight and is retried on the next flush.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._inflight is None and self._pending:
+                    self._rotate_spool()
+                batch = self._inflight
+
+            if not batch:
+                return 0
+
+            self.sink([self._to_row(record) for record in batch])
+
+            with self._lock:
+                self._inflight = None
+                if os.path.exists(self.inflight_path):
+                    os.remove(self.inflight_path)
+            return len(batch)
+
+    def pending_messages(self, claim_id: str) -> List[Dict[str, Any]]:
+        """Messages for a claim that are accepted but not yet in the database"""
+        with self._lock:
+            records = (self._inflight or []) + self._pending
+            return [dict(r) for r in records if r["claim_id"] == claim_id]
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending) + len(self._inflight or [])
+
+    # ---- internals -------------------------------------------------------
+
+    def _run(self):
+        """Background loop: flush on size trigger or interval, back off on errors"""
+        backoff = self.flush_interval
+        while not self._stopping:
+            self._wakeup.wait(backoff)
+            self._wakeup.clear()
+            if self._stopping:
+                break
+            try:
+                while self.flush() and self.pending_count() >= self.batch_size:
+                    pass
+                backoff = self.flush_interval
+            except Exception as e:
+                backoff = min(backoff * 2, 30.0)
+                print(f"[ChatWriter] Flush failed, retrying in {backoff:.1f}s: {e}")
+
+    def _append_to_spool(self, record: Dict[str, Any]):
+        if self._spool is None:
+            self._spool = open(self.spool_path, "a", encoding="utf-8")
+        self._spool.write(json.dumps(record) + "\n")
+        self._spool.flush()
+
+    def _rotate_spool(self):
+        """Move pending messages to the in-flight slot (caller holds _lock)"""
+        if self._spool is not None:
+            # The batch boundary: one fsync covers every message since the last flush
+            if self.fsync:
+                os.fsync(self._spool.fileno())
+            self._spool.close()
+            self._spool = None
+        if os.path.exists(self.spool_path):
+            os.replace(self.spool_path, self.inflight_path)
+        self._inflight = self._pending
+        self._pending = []
+
+    def _recover_spool(self) -> int:
+        """Load spooled messages from a previous run into the pending list"""
+        records = []
+        for path in (self.inflight_path, self.spool_path):
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # Torn final line from a crash mid-write
+                        print(f"[ChatWriter] Skipping corrupt spool line in {path}")
+
+        if not records:
+            return 0
+
+        # Consolidate into a single spool file before deleting the old ones
+        tmp_path = f"{self.spool_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.spool_path)
+        if os.path.exists(self.inflight_path):
+            os.remove(self.inflight_path)
+
+        with self._lock:
+            self._pending = records + self._pending
+        return len(records)
+
+    @staticmethod
+    def _to_row(record: Dict[str, Any]) -> tuple:
+        return (
+            record["chat_id"],
+            record["claim_id"],
+            record["customer_message"],
+            record["bot_response"],
+            datetime.fromisoformat(record["timestamp"])
+        )
+
+
+# Process-wide buffer (lazy)
+_chat_writer: Optional[ChatWriteBehindBuffer] = None
+
+
+def get_chat_writer() -> ChatWriteBehindBuffer:
+    """Get or create the shared chat write-behind buffer"""
+    global _chat_writer
+    if _chat_writer is None:
+        _chat_writer = ChatWriteBehindBuffer()
+    return _chat_writer
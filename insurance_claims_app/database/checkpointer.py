@@ -0,0 +1,845 @@
+"""
+Durable LangGraph Checkpointer for the Supervisor Workflow
+Persists workflow checkpoints (SQLite locally, Oracle in production) so a
+restarted worker resumes a claim from its last completed agent
+"""
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import sys
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+from langgraph.checkpoint.memory import MemorySaver
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import config
+
+
+# (thread_id, checkpoint_ns, checkpoint_id, parent_id, type, checkpoint, metadata_type, metadata, created_at)
+CheckpointRow = Tuple[str, str, str, Optional[str], str, bytes, str, bytes, str]
+# (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, task_path)
+WriteRow = Tuple[str, str, str, str, int, str, str, bytes, str]
+# (thread_id, checkpoint_ns, keep_last)
+PruneSpec = Tuple[str, str, int]
+# (thread_id, owner, lease_expires_at); owner None removes the run
+RunLease = Tuple[str, Optional[str], str]
+
+
+class SQLiteCheckpointStore:
+    """
+    Checkpoint tables in a local SQLite file.
+
+    Connections come from a small pool, one per concurrent caller. In WAL
+    mode readers neither block nor wait for the writer, and concurrent
+    writers queue inside SQLite (busy timeout) only for the length of a
+    commit. With synchronous=NORMAL a commit does not fsync: a crashed worker loses
+    nothing, a power cut at most the last commits.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._idle: List[sqlite3.Connection] = []
+        self._idle_lock = threading.Lock()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        with self._idle_lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield conn
+        finally:
+            with self._idle_lock:
+                self._idle.append(conn)
+
+    def setup(self):
+        with self._connection() as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS workflow_checkpoints (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL,
+                    checkpoint_id TEXT NOT NULL,
+                    parent_checkpoint_id TEXT,
+                    type TEXT,
+                    checkpoint BLOB,
+                    metadata_type TEXT,
+                    metadata BLOB,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS workflow_checkpoint_writes (
+                    thread_id TEXT NOT NULL,
+                    checkpoint_ns TEXT NOT NULL,
+                    checkpoint_id TEXT NOT NULL,
+                    task_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    channel TEXT NOT NULL,
+                    type TEXT,
+                    value BLOB,
+                    task_path TEXT,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS workflow_runs (
+                    thread_id TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    lease_expires_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS workflow_runs_lease ON workflow_runs (lease_expires_at)")
+
+    def write(self, checkpoints: List[CheckpointRow], writes: List[WriteRow], prunes: Sequence[PruneSpec] = (),
+              runs: Sequence[RunLease] = ()):
+        """Store checkpoints and pending writes, then prune and update run leases, in one transaction"""
+        with self._connection() as conn, conn:
+            if checkpoints:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO workflow_checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", checkpoints
+                )
+            # Regular writes keep the first value recorded; special writes (negative idx) replace
+            keep = [w for w in writes if w[4] >= 0]
+            replace = [w for w in writes if w[4] < 0]
+            if keep:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO workflow_checkpoint_writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", keep
+                )
+            if replace:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO workflow_checkpoint_writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", replace
+                )
+            for prune in prunes:
+                self._prune(conn, *prune)
+            # In order: a thread's run may end and start again within one batch
+            for thread_id, owner, lease_expires_at in runs:
+                if owner is None:
+                    conn.execute("DELETE FROM workflow_runs WHERE thread_id = ?", (thread_id,))
+                else:
+                    conn.execute("INSERT OR REPLACE INTO workflow_runs VALUES (?, ?, ?)",
+                                 (thread_id, owner, lease_expires_at))
+
+    def _prune(self, conn: sqlite3.Connection, thread_id: str, checkpoint_ns: str, keep_last: int):
+        row = conn.execute(
+            """SELECT checkpoint_id FROM workflow_checkpoints WHERE thread_id = ? AND checkpoint_ns = ?
+               ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?""",
+            (thread_id, checkpoint_ns, keep_last - 1)
+        ).fetchone()
+        if row:
+            for table in ("workflow_checkpoints", "workflow_checkpoint_writes"):
+                conn.execute(
+                    f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+                    (thread_id, checkpoint_ns, row[0])
+                )
+
+    def _query(self, sql: str, params) -> list:
+        with self._connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def get_checkpoint(self, thread_id: str, checkpoint_ns: str, checkpoint_id: Optional[str]) -> Optional[CheckpointRow]:
+        if checkpoint_id:
+            rows = self._query(
+                """SELECT * FROM workflow_checkpoints
+                   WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?""",
+                (thread_id, checkpoint_ns, checkpoint_id)
+            )
+        else:
+            rows = self._query(
+                """SELECT * FROM workflow_checkpoints WHERE thread_id = ? AND checkpoint_ns = ?
+                   ORDER BY checkpoint_id DESC LIMIT 1""",
+                (thread_id, checkpoint_ns)
+            )
+        return rows[0] if rows else None
+
+    def get_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> List[WriteRow]:
+        return self._query(
+            """SELECT * FROM workflow_checkpoint_writes
+               WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?""",
+            (thread_id, checkpoint_ns, checkpoint_id)
+        )
+
+    def list_checkpoints(self, thread_id: Optional[str], checkpoint_ns: Optional[str],
+                         before_id: Optional[str]) -> List[CheckpointRow]:
+        clauses, params = [], []
+        for column, value in (("thread_id", thread_id), ("checkpoint_ns", checkpoint_ns)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if before_id:
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(f"SELECT * FROM workflow_checkpoints {where} ORDER BY thread_id, checkpoint_id DESC", params)
+
+    def thread_ids(self) -> List[str]:
+        return [r[0] for r in self._query("SELECT DISTINCT thread_id FROM workflow_checkpoints", ())]
+
+    def expired_runs(self, now: str) -> List[str]:
+        return [r[0] for r in self._query(
+            "SELECT thread_id FROM workflow_runs WHERE lease_expires_at < ? ORDER BY lease_expires_at", (now,)
+        )]
+
+    def take_over(self, thread_id: str, owner: str, lease_expires_at: str, now: str) -> bool:
+        with self._connection() as conn, conn:
+            return conn.execute(
+                "UPDATE workflow_runs SET owner = ?, lease_expires_at = ? WHERE thread_id = ? AND lease_expires_at < ?",
+                (owner, lease_expires_at, thread_id, now)
+            ).rowcount == 1
+
+    def renew(self, owner: str, lease_expires_at: str):
+        with self._connection() as conn, conn:
+            conn.execute("UPDATE workflow_runs SET lease_expires_at = ? WHERE owner = ?", (lease_expires_at, owner))
+
+    def delete_thread(self, thread_id: str):
+        with self._connection() as conn, conn:
+            for table in ("workflow_checkpoints", "workflow_checkpoint_writes", "workflow_runs"):
+                conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    def delete_expired(self, cutoff: str) -> int:
+        """Delete threads whose newest checkpoint is older than `cutoff`"""
+        with self._connection() as conn, conn:
+            expired = [r[0] for r in conn.execute(
+                "SELECT thread_id FROM workflow_checkpoints GROUP BY thread_id HAVING MAX(created_at) < ?", (cutoff,)
+            )]
+            for table in ("workflow_checkpoints", "workflow_checkpoint_writes", "workflow_runs"):
+                conn.executemany(f"DELETE FROM {table} WHERE thread_id = ?", [(t,) for t in expired])
+        return len(expired)
+
+    def close(self):
+        with self._idle_lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+class OracleCheckpointStore:
+    """Checkpoint tables in the application's Oracle database"""
+
+    def _connect(self):
+        from .models import get_connection
+        return get_connection()
+
+    def _release(self, conn):
+        from .models import release_connection
+        release_connection(conn)
+
+    def setup(self):
+        conn = self._connect()
+        cursor = conn.cursor()
+        for ddl in (
+            """CREATE TABLE workflow_checkpoints (
+                    thread_id VARCHAR2(100) NOT NULL,
+                    checkpoint_ns VARCHAR2(200) NOT NULL,
+                    checkpoint_id VARCHAR2(64) NOT NULL,
+                    parent_checkpoint_id VARCHAR2(64),
+                    type VARCHAR2(20),
+                    checkpoint BLOB,
+                    metadata_type VARCHAR2(20),
+                    metadata BLOB,
+                    created_at VARCHAR2(32) NOT NULL,
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+                )""",
+            """CREATE TABLE workflow_checkpoint_writes (
+                    thread_id VARCHAR2(100) NOT NULL,
+                    checkpoint_ns VARCHAR2(200) NOT NULL,
+                    checkpoint_id VARCHAR2(64) NOT NULL,
+                    task_id VARCHAR2(100) NOT NULL,
+                    idx NUMBER(10) NOT NULL,
+                    channel VARCHAR2(200) NOT NULL,
+                    type VARCHAR2(20),
+                    value BLOB,
+                    task_path VARCHAR2(500),
+                    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+                )""",
+            """CREATE TABLE workflow_runs (
+                    thread_id VARCHAR2(100) PRIMARY KEY,
+                    owner VARCHAR2(200) NOT NULL,
+                    lease_expires_at VARCHAR2(32) NOT NULL
+                )""",
+            "CREATE INDEX workflow_runs_lease ON workflow_runs (lease_expires_at)",
+        ):
+            cursor.execute(f"""
+                BEGIN
+                    EXECUTE IMMEDIATE '{ddl}';
+                EXCEPTION
+                    WHEN OTHERS THEN
+                        IF SQLCODE != -955 THEN RAISE; END IF;
+                END;
+            """)
+        conn.commit()
+        self._release(conn)
+
+    CHECKPOINT_COLUMNS = ("thread_id", "checkpoint_ns", "checkpoint_id", "parent_checkpoint_id", "type",
+                          "checkpoint", "metadata_type", "metadata", "created_at")
+    WRITE_COLUMNS = ("thread_id", "checkpoint_ns", "checkpoint_id", "task_id", "idx",
+                     "channel", "type", "value", "task_path")
+
+    def write(self, checkpoints: List[CheckpointRow], writes: List[WriteRow], prunes: Sequence[PruneSpec] = (),
+              runs: Sequence[RunLease] = ()):
+        """
+        Store checkpoints and pending writes, then prune and update run
+        leases, in one transaction (one round trip per statement)
+        """
+        import oracledb
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            if checkpoints:
+                # Bind payloads as BLOBs: as RAW they are limited to 32 KB
+                cursor.setinputsizes(checkpoint=oracledb.DB_TYPE_BLOB, metadata=oracledb.DB_TYPE_BLOB)
+                cursor.executemany("""
+                    MERGE INTO workflow_checkpoints t
+                    USING (SELECT :thread_id thread_id, :checkpoint_ns checkpoint_ns, :checkpoint_id checkpoint_id FROM dual) s
+                    ON (t.thread_id = s.thread_id AND t.checkpoint_ns = s.checkpoint_ns AND t.checkpoint_id = s.checkpoint_id)
+                    WHEN MATCHED THEN UPDATE SET parent_checkpoint_id = :parent_checkpoint_id, type = :type,
+                        checkpoint = :checkpoint, metadata_type = :metadata_type, metadata = :metadata, created_at = :created_at
+                    WHEN NOT MATCHED THEN INSERT VALUES (:thread_id, :checkpoint_ns, :checkpoint_id, :parent_checkpoint_id,
+                        :type, :checkpoint, :metadata_type, :metadata, :created_at)
+                """, [dict(zip(self.CHECKPOINT_COLUMNS, row)) for row in checkpoints])
+            # Regular writes keep the first value recorded; special writes (negative idx) replace
+            keep = [dict(zip(self.WRITE_COLUMNS, w)) for w in writes if w[4] >= 0]
+            replace = [dict(zip(self.WRITE_COLUMNS, w)) for w in writes if w[4] < 0]
+            merge_writes = """
+                MERGE INTO workflow_checkpoint_writes t
+                USING (SELECT :thread_id thread_id, :checkpoint_ns checkpoint_ns, :checkpoint_id checkpoint_id,
+                              :task_id task_id, :idx idx FROM dual) s
+                ON (t.thread_id = s.thread_id AND t.checkpoint_ns = s.checkpoint_ns AND t.checkpoint_id = s.checkpoint_id
+                    AND t.task_id = s.task_id AND t.idx = s.idx)
+                {matched}
+                WHEN NOT MATCHED THEN INSERT VALUES (:thread_id, :checkpoint_ns, :checkpoint_id, :task_id, :idx,
+                    :channel, :type, :value, :task_path)
+            """
+            if keep:
+                cursor.setinputsizes(value=oracledb.DB_TYPE_BLOB)
+                cursor.executemany(merge_writes.format(matched=""), keep)
+            if replace:
+                cursor.setinputsizes(value=oracledb.DB_TYPE_BLOB)
+                cursor.executemany(merge_writes.format(
+                    matched="WHEN MATCHED THEN UPDATE SET channel = :channel, type = :type, value = :value, task_path = :task_path"
+                ), replace)
+            for thread_id, checkpoint_ns, keep_last in prunes:
+                cursor.execute("""
+                    SELECT checkpoint_id FROM workflow_checkpoints WHERE thread_id = :1 AND checkpoint_ns = :2
+                    ORDER BY checkpoint_id DESC OFFSET :3 ROWS FETCH NEXT 1 ROWS ONLY
+                """, [thread_id, checkpoint_ns, keep_last - 1])
+                row = cursor.fetchone()
+                if row:
+                    for table in ("workflow_checkpoints", "workflow_checkpoint_writes"):
+                        cursor.execute(
+                            f"DELETE FROM {table} WHERE thread_id = :1 AND checkpoint_ns = :2 AND checkpoint_id < :3",
+                            [thread_id, checkpoint_ns, row[0]]
+                        )
+            # In order: a thread's run may end and start again within one batch
+            for thread_id, owner, lease_expires_at in runs:
+                if owner is None:
+                    cursor.execute("DELETE FROM workflow_runs WHERE thread_id = :1", [thread_id])
+                else:
+                    cursor.execute("""
+                        MERGE INTO workflow_runs t USING (SELECT :1 thread_id FROM dual) s ON (t.thread_id = s.thread_id)
+                        WHEN MATCHED THEN UPDATE SET owner = :2, lease_expires_at = :3
+                        WHEN NOT MATCHED THEN INSERT VALUES (:1, :2, :3)
+                    """, [thread_id, owner, lease_expires_at])
+            conn.commit()
+        finally:
+            self._release(conn)
+
+    def _query(self, sql: str, params) -> list:
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            # Read LOBs before the connection goes back to the pool
+            return [tuple(v.read() if hasattr(v, "read") else v for v in row) for row in cursor.fetchall()]
+        finally:
+            self._release(conn)
+
+    def get_checkpoint(self, thread_id: str, checkpoint_ns: str, checkpoint_id: Optional[str]) -> Optional[CheckpointRow]:
+        if checkpoint_id:
+            rows = self._query(
+                """SELECT * FROM workflow_checkpoints
+                   WHERE thread_id = :1 AND checkpoint_ns = :2 AND checkpoint_id = :3""",
+                [thread_id, checkpoint_ns, checkpoint_id]
+            )
+        else:
+            rows = self._query(
+                """SELECT * FROM workflow_checkpoints WHERE thread_id = :1 AND checkpoint_ns = :2
+                   ORDER BY checkpoint_id DESC FETCH FIRST 1 ROWS ONLY""",
+                [thread_id, checkpoint_ns]
+            )
+        return rows[0] if rows else None
+
+    def get_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> List[WriteRow]:
+        return self._query(
+            """SELECT * FROM workflow_checkpoint_writes
+               WHERE thread_id = :1 AND checkpoint_ns = :2 AND checkpoint_id = :3""",
+            [thread_id, checkpoint_ns, checkpoint_id]
+        )
+
+    def list_checkpoints(self, thread_id: Optional[str], checkpoint_ns: Optional[str],
+                         before_id: Optional[str]) -> List[CheckpointRow]:
+        clauses, params = [], {}
+        for column, op, value in (("thread_id", "=", thread_id), ("checkpoint_ns", "=", checkpoint_ns),
+                                  ("checkpoint_id", "<", before_id)):
+            if value is not None:
+                clauses.append(f"{column} {op} :{column}")
+                params[column] = value
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(f"SELECT * FROM workflow_checkpoints {where} ORDER BY thread_id, checkpoint_id DESC", params)
+
+    def thread_ids(self) -> List[str]:
+        return [r[0] for r in self._query("SELECT DISTINCT thread_id FROM workflow_checkpoints", [])]
+
+    def expired_runs(self, now: str) -> List[str]:
+        return [r[0] for r in self._query(
+            "SELECT thread_id FROM workflow_runs WHERE lease_expires_at < :1 ORDER BY lease_expires_at", [now]
+        )]
+
+    def take_over(self, thread_id: str, owner: str, lease_expires_at: str, now: str) -> bool:
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """UPDATE workflow_runs SET owner = :1, lease_expires_at = :2
+                   WHERE thread_id = :3 AND lease_expires_at < :4""",
+                [owner, lease_expires_at, thread_id, now]
+            )
+            conn.commit()
+            return cursor.rowcount == 1
+        finally:
+            self._release(conn)
+
+    def renew(self, owner: str, lease_expires_at: str):
+        conn = self._connect()
+        try:
+            conn.cursor().execute(
+                "UPDATE workflow_runs SET lease_expires_at = :1 WHERE owner = :2", [lease_expires_at, owner]
+            )
+            conn.commit()
+        finally:
+            self._release(conn)
+
+    def delete_thread(self, thread_id: str):
+        conn = self._connect()
+        try:
+            cursor = conn.cursor()
+            for table in ("workflow_checkpoints", "workflow_checkpoint_writes", "workflow_runs"):
+                cursor.execute(f"DELETE FROM {table} WHERE thread_id = :1", [thread_id])
+            conn.commit()
+        finally:
+            self._release(conn)
+
+    def delete_expired(self, cutoff: str) -> int:
+        """Delete threads whose newest checkpoint is older than `cutoff`"""
+        expired = [r[0] for r in self._query(
+            "SELECT thread_id FROM workflow_checkpoints GROUP BY thread_id HAVING MAX(created_at) < :1", [cutoff]
+        )]
+        if expired:
+            conn = self._connect()
+            try:
+                cursor = conn.cursor()
+                for table in ("workflow_checkpoints", "workflow_checkpoint_writes", "workflow_runs"):
+                    cursor.executemany(f"DELETE FROM {table} WHERE thread_id = :1", [[t] for t in expired])
+                conn.commit()
+            finally:
+                self._release(conn)
+        return len(expired)
+
+    def close(self):
+        pass
+
+
+class DurableCheckpointSaver(BaseCheckpointSaver):
+    """
+    LangGraph checkpoint saver backed by a SQL checkpoint store.
+
+    Write-behind with group commit: `put` and `put_writes` (one call per
+    finished task) only serialize and queue their rows, so the workflow
+    never waits on the store. A writer thread commits everything queued
+    in one transaction, at most once every `commit_interval_ms`: the
+    steps of all claims running meanwhile share the commit, and of a
+    thread's checkpoints queued together only the newest is written (the
+    older ones' state is part of it). A read of a thread with queued rows
+    commits them first. A crashed worker loses only the rows queued since
+    the last commit; the resumed run repeats those steps, never an agent
+    whose writes were committed (e.g. the finished branch of a failed
+    parallel step).
+
+    Pruning: every `prune_every` checkpoints of a thread, all but its newest
+    `keep_last` are deleted (with their writes). `prune_expired()` drops
+    threads untouched for `retention_days`.
+
+    Run leases: `start_run` records this worker as the owner of a thread's
+    run, with a lease the writer thread renews every `lease_s / 3` while
+    the run lasts; `end_run` removes the run (or releases it, if it
+    failed). The runs table is the index of unfinished runs: another worker
+    resumes one only after its lease expired (`expired_runs`, `take_over`),
+    so a run is never resumed while its owner is still working on it.
+    """
+
+    def __init__(
+        self,
+        store,
+        *,
+        serde=None,
+        keep_last: int = None,
+        prune_every: int = None,
+        retention_days: int = None,
+        lease_s: float = None,
+        commit_interval_ms: int = None
+    ):
+        super().__init__(serde=serde)
+        self.store = store
+        self.keep_last = keep_last or config.CHECKPOINT_KEEP_LAST
+        self.prune_every = prune_every or config.CHECKPOINT_PRUNE_EVERY
+        self.retention_days = retention_days or config.CHECKPOINT_RETENTION_DAYS
+        self.lease_s = config.CHECKPOINT_LEASE_S if lease_s is None else lease_s
+        self.commit_interval_ms = config.CHECKPOINT_COMMIT_INTERVAL_MS if commit_interval_ms is None else commit_interval_ms
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()          # guards the queue, counters and writer thread
+        self._flush_lock = threading.Lock()    # one commit at a time, in queue order
+        self._wakeup = threading.Event()
+        self._queue: List[Tuple[str, List[CheckpointRow], List[WriteRow], Optional[PruneSpec], Optional[RunLease]]] = []
+        self._queued: Counter = Counter()      # queued entries with checkpoint rows per thread_id
+        self._running: Counter = Counter()     # runs of this worker per thread_id, whose leases it renews
+        self._writer: Optional[threading.Thread] = None
+        self._closing = threading.Event()
+        self._puts: Dict[Tuple[str, str], int] = {}
+        self.store.setup()
+
+    # ---- writing ---------------------------------------------------------
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        type_, payload = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_payload = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+        row = (
+            thread_id, checkpoint_ns, checkpoint["id"], config["configurable"].get("checkpoint_id"),
+            type_, payload, metadata_type, metadata_payload, datetime.now().isoformat()
+        )
+
+        with self._lock:
+            count = self._puts.get((thread_id, checkpoint_ns), 0) + 1
+            self._puts[(thread_id, checkpoint_ns)] = count
+        prune = (thread_id, checkpoint_ns, self.keep_last) if count % self.prune_every == 0 else None
+        self._enqueue(thread_id, [row], [], prune)
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, payload = self.serde.dumps_typed(value)
+            rows.append((
+                thread_id, checkpoint_ns, checkpoint_id, task_id,
+                WRITES_IDX_MAP.get(channel, idx), channel, type_, payload, task_path
+            ))
+        self._enqueue(thread_id, [], rows)
+
+    def _enqueue(self, thread_id: str, checkpoints: List[CheckpointRow], writes: List[WriteRow],
+                 prune: Optional[PruneSpec] = None, run: Optional[RunLease] = None):
+        with self._lock:
+            self._queue.append((thread_id, checkpoints, writes, prune, run))
+            if checkpoints or writes:
+                self._queued[thread_id] += 1
+            if self._writer is None:
+                self._closing.clear()
+                self._writer = threading.Thread(target=self._write_behind, name="checkpoint-writer", daemon=True)
+                self._writer.start()
+        self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Commit everything queued so far in one transaction; returns the
+        number of queued entries written. Raises if the store fails; the
+        entries stay queued, ahead of newer ones.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._queue = self._queue, []
+            if not batch:
+                return 0
+            checkpoints, writes = self._latest_state(batch)
+            try:
+                self.store.write(
+                    checkpoints, writes,
+                    [prune for _, _, _, prune, _ in batch if prune],
+                    [run for _, _, _, _, run in batch if run]
+                )
+            except Exception:
+                with self._lock:
+                    self._queue = batch + self._queue
+                raise
+            with self._lock:
+                for thread_id, thread_checkpoints, thread_writes, _, _ in batch:
+                    if thread_checkpoints or thread_writes:
+                        self._queued[thread_id] -= 1
+                        if not self._queued[thread_id]:
+                            del self._queued[thread_id]
+            return len(batch)
+
+    @staticmethod
+    def _latest_state(batch) -> Tuple[List[CheckpointRow], List[WriteRow]]:
+        """
+        The rows of a batch worth committing: a checkpoint holds the state
+        its thread's older ones led to, so when a batch has several, only
+        the newest is written, along with the writes that are not older
+        than it (checkpoint ids sort by time)
+        """
+        latest: Dict[Tuple[str, str], str] = {}
+        for _, checkpoints, _, _, _ in batch:
+            for row in checkpoints:
+                latest[row[0], row[1]] = max(latest.get((row[0], row[1]), ""), row[2])
+        checkpoints = [row for _, rows, _, _, _ in batch for row in rows if row[2] == latest[row[0], row[1]]]
+        writes = [row for _, _, rows, _, _ in batch for row in rows if row[2] >= latest.get((row[0], row[1]), "")]
+        return checkpoints, writes
+
+    def _flush_thread(self, thread_id: str):
+        """Read-your-writes: commit the queue if it holds rows of this thread"""
+        with self._lock:
+            queued = self._queued[thread_id] > 0
+        if queued:
+            self.flush()
+
+    def _write_behind(self):
+        """
+        Writer thread: commit the queue whenever it is not empty, back off on
+        errors, and renew this worker's run leases while it has runs
+        """
+        backoff = 0.0
+        renewed = committed = time.monotonic()
+        while True:
+            with self._lock:
+                renew_in = max(self.lease_s / 3, 0.1) if self._running else None
+            self._wakeup.wait(backoff or renew_in)
+            # Group commit: let the steps of the commit interval queue up
+            pause = self.commit_interval_ms / 1000 - (time.monotonic() - committed)
+            if pause > 0:
+                self._closing.wait(pause)
+            self._wakeup.clear()
+            try:
+                self.flush()
+                committed = time.monotonic()
+                backoff = 0.0
+                if renew_in is not None and time.monotonic() - renewed >= renew_in:
+                    self.store.renew(self.owner, self._lease_until())
+                    renewed = time.monotonic()
+            except Exception as e:
+                backoff = min(max(backoff * 2, 0.1), 5.0)
+                print(f"[Checkpointer] Commit failed, retrying in {backoff:.1f}s: {e}")
+            with self._lock:
+                if self._closing.is_set() and not self._queue:
+                    self._writer = None
+                    return
+
+    # ---- run leases ------------------------------------------------------
+
+    def _lease_until(self, seconds: float = None) -> str:
+        expires = datetime.now() + timedelta(seconds=self.lease_s if seconds is None else seconds)
+        return expires.isoformat(timespec="microseconds")
+
+    def start_run(self, thread_id: str):
+        """Record this worker as the owner of a thread's run; its lease is renewed until `end_run`"""
+        with self._lock:
+            self._running[thread_id] += 1
+        self._enqueue(thread_id, [], [], run=(thread_id, self.owner, self._lease_until()))
+
+    def end_run(self, thread_id: str, finished: bool = True):
+        """
+        Stop renewing a thread's lease. A finished run (or one paused for a
+        reviewer) leaves the index; a failed one stays, unowned, and other
+        workers may resume it once its lease expires.
+        """
+        with self._lock:
+            self._running[thread_id] -= 1
+            if self._running[thread_id] <= 0:
+                del self._running[thread_id]
+        run = (thread_id, None, "") if finished else (thread_id, "", self._lease_until())
+        self._enqueue(thread_id, [], [], run=run)
+
+    def expired_runs(self) -> List[str]:
+        """Threads with an unfinished run whose owner stopped renewing its lease, oldest first"""
+        self.flush()
+        return self.store.expired_runs(self._lease_until(0))
+
+    def take_over(self, thread_id: str) -> bool:
+        """Make this worker the owner of an expired run; False if another worker got to it first"""
+        self.flush()
+        return self.store.take_over(thread_id, self.owner, self._lease_until(), self._lease_until(0))
+
+    # ---- reading ---------------------------------------------------------
+
+    def _to_tuple(self, row: CheckpointRow) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, type_, payload, metadata_type, metadata, _ = row
+        # Replay order must match the order the step applied them in
+        writes = sorted(self.store.get_writes(thread_id, checkpoint_ns, checkpoint_id),
+                        key=lambda w: writes_sort_key(w[8] or "", w[3], w[4]))
+        return CheckpointTuple(
+            config={"configurable": {
+                "thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id
+            }},
+            checkpoint=self.serde.loads_typed((type_, payload)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id}}
+                if parent_id else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for _, _, _, task_id, _, channel, value_type, value, _ in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        self._flush_thread(config["configurable"]["thread_id"])
+        row = self.store.get_checkpoint(
+            config["configurable"]["thread_id"],
+            config["configurable"].get("checkpoint_ns", ""),
+            get_checkpoint_id(config)
+        )
+        return self._to_tuple(row) if row else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        configurable = (config or {}).get("configurable", {})
+        if configurable.get("thread_id"):
+            self._flush_thread(configurable["thread_id"])
+        else:
+            self.flush()
+        checkpoint_id = get_checkpoint_id(config) if config else None
+        rows = self.store.list_checkpoints(
+            configurable.get("thread_id"), configurable.get("checkpoint_ns"),
+            get_checkpoint_id(before) if before else None
+        )
+        for row in rows:
+            if checkpoint_id and row[2] != checkpoint_id:
+                continue
+            if filter:
+                metadata = self.serde.loads_typed((row[6], row[7]))
+                if not all(metadata.get(k) == v for k, v in filter.items()):
+                    continue
+            if limit is not None and limit <= 0:
+                break
+            if limit is not None:
+                limit -= 1
+            yield self._to_tuple(row)
+
+    # ---- housekeeping ----------------------------------------------------
+
+    def thread_ids(self) -> List[str]:
+        self.flush()
+        return self.store.thread_ids()
+
+    def delete_thread(self, thread_id: str) -> None:
+        # Commit first, or queued rows would bring the thread back
+        self._flush_thread(thread_id)
+        with self._lock:
+            self._puts = {k: v for k, v in self._puts.items() if k[0] != thread_id}
+        self.store.delete_thread(thread_id)
+
+    def compact(self, thread_id: str, checkpoint_ns: str = ""):
+        """Keep only a thread's latest checkpoint, e.g. while it waits for a reviewer"""
+        self._enqueue(thread_id, [], [], (thread_id, checkpoint_ns, 1))
+
+    def prune_expired(self) -> int:
+        """Delete threads with no checkpoint in the last `retention_days`"""
+        self.flush()
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+        return self.store.delete_expired(cutoff)
+
+    def close(self, timeout: float = 10.0):
+        """Commit what is queued and stop the writer thread"""
+        with self._lock:
+            writer = self._writer
+            self._closing.set()
+        self._wakeup.set()
+        if writer is not None:
+            writer.join(timeout)
+        self.flush()
+        self.store.close()
+
+    # Async variants run the sync implementation; the workflow is invoked synchronously
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path: str = "") -> None:
+        return self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return self.delete_thread(thread_id)
+
+
+# Global saver instance
+_checkpointer: Optional[BaseCheckpointSaver] = None
+_checkpointer_lock = threading.Lock()
+
+
+def get_checkpointer() -> BaseCheckpointSaver:
+    """Get the process-wide workflow checkpointer for CHECKPOINT_BACKEND"""
+    global _checkpointer
+    with _checkpointer_lock:
+        if _checkpointer is None:
+            if config.CHECKPOINT_BACKEND == "memory":
+                _checkpointer = MemorySaver()
+            elif config.CHECKPOINT_BACKEND == "oracle":
+                _checkpointer = DurableCheckpointSaver(OracleCheckpointStore())
+            else:
+                _checkpointer = DurableCheckpointSaver(SQLiteCheckpointStore(config.CHECKPOINT_SQLITE_PATH))
+        return _checkpointer
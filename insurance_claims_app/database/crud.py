@@ -3,10 +3,14 @@ Oracle Database CRUD Operations
 """
 import json
 import uuid
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 import oracledb
 from .models import get_connection, release_connection
+from . import customer_stats
+from .repair_shops import fraud_count_deltas, normalize_shop_name
+from .errors import IdempotencyKeyReused
+from config import config
 
 def _row_to_dict(cursor, row) -> Dict[str, Any]:
     """Convert Oracle row to dictionary, handling LOB and datetime types"""
@@ -30,7 +34,13 @@ def create_claim(claim_data: Dict[str, Any]) -> str:
     """Create a new claim"""
     conn = get_connection()
     cursor = conn.cursor()
-    
+    claim_id = _insert_claim(cursor, claim_data)
+    conn.commit()
+    release_connection(conn)
+    return claim_id
+
+def _insert_claim(cursor, claim_data: Dict[str, Any]) -> str:
+    """Insert a claim row and count it in the customer's aggregate (uncommitted)"""
     claim_id = f"CLM-{uuid.uuid4().hex[:8].upper()}"
     now = datetime.now()
     
@@ -63,11 +73,101 @@ def create_claim(claim_data: Dict[str, Any]) -> str:
         now,
         now
     ])
-    
-    conn.commit()
-    release_connection(conn)
+    _record_customer_claim(cursor, claim_data.get("customer_id", ""), now)
     return claim_id
 
+def create_claim_once(
+    claim_data: Dict[str, Any],
+    idempotency_key: Optional[str],
+    content_hash: str,
+    window_s: float
+) -> Tuple[str, bool]:
+    """
+    Create a claim unless the same submission already created one.
+    
+    A submission repeats an earlier one with the same Idempotency-Key (any
+    age; idx_claim_submissions_key is unique) or the same content hash within
+    the last `window_s` seconds. Returns (claim_id, created).
+    
+    Raises IdempotencyKeyReused if the key's first submission had different content.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        existing = _submitted_claim(cursor, idempotency_key, content_hash, window_s)
+        if existing is not None:
+            return existing, False
+        
+        claim_id = _insert_claim(cursor, claim_data)
+        cursor.execute("""
+            INSERT INTO claim_submissions (claim_id, idempotency_key, content_hash, created_at)
+            VALUES (:1, :2, :3, :4)
+        """, [claim_id, idempotency_key, content_hash, datetime.now()])
+        conn.commit()
+        return claim_id, True
+    except oracledb.IntegrityError:
+        # A concurrent request with the same key committed first
+        conn.rollback()
+        existing = _submitted_claim(cursor, idempotency_key, content_hash, 0)
+        if existing is None:
+            raise
+        return existing, False
+    finally:
+        release_connection(conn)
+
+def _submitted_claim(cursor, idempotency_key: Optional[str], content_hash: str, window_s: float) -> Optional[str]:
+    if idempotency_key:
+        cursor.execute("SELECT claim_id, content_hash FROM claim_submissions WHERE idempotency_key = :1", [idempotency_key])
+        row = cursor.fetchone()
+        if row:
+            if row[1] != content_hash:
+                raise IdempotencyKeyReused(idempotency_key, row[0])
+            return row[0]
+    if content_hash and window_s > 0:
+        cursor.execute("""
+            SELECT claim_id FROM claim_submissions
+            WHERE content_hash = :1 AND created_at >= :2
+            ORDER BY created_at DESC FETCH FIRST 1 ROWS ONLY
+        """, [content_hash, datetime.now() - timedelta(seconds=window_s)])
+        row = cursor.fetchone()
+        if row:
+            return row[0]
+    return None
+
+def _record_customer_claim(cursor, customer_id: str, created_at: datetime):
+    """Fold a new claim into the customer's aggregate row, in the claim's transaction"""
+    # Two first claims of a customer can both miss the row and insert it; the
+    # later insert fails once the earlier one commits, and the row is there
+    cursor.execute("""
+        BEGIN
+            MERGE INTO customer_claim_stats s
+            USING (SELECT :1 AS customer_id FROM dual) d ON (s.customer_id = d.customer_id)
+            WHEN NOT MATCHED THEN INSERT (customer_id, claim_count, total_payout) VALUES (d.customer_id, 0, 0);
+        EXCEPTION
+            WHEN DUP_VAL_ON_INDEX THEN NULL;
+        END;
+    """, [customer_id])
+    cursor.execute("""
+        SELECT customer_id, claim_count, total_payout, last_claim_date, recent_claim_days
+        FROM customer_claim_stats WHERE customer_id = :1 FOR UPDATE
+    """, [customer_id])
+    stats = _row_to_dict(cursor, cursor.fetchone())
+    stats["recent_claim_days"] = customer_stats.decode_days(stats["recent_claim_days"])
+
+    stats = customer_stats.record_claim(stats, created_at)
+    cursor.setinputsizes(None, None, oracledb.DB_TYPE_CLOB, None, None)
+    cursor.execute("""
+        UPDATE customer_claim_stats
+        SET claim_count = :1, last_claim_date = :2, recent_claim_days = :3, updated_at = :4
+        WHERE customer_id = :5
+    """, [
+        stats["claim_count"],
+        customer_stats.as_datetime(stats["last_claim_date"]),
+        customer_stats.encode_days(stats["recent_claim_days"]),
+        created_at,
+        customer_id
+    ])
+
 def get_claim(claim_id: str) -> Optional[Dict[str, Any]]:
     """Get a claim by ID"""
     conn = get_connection()
@@ -86,7 +186,17 @@ def update_claim(claim_id: str, updates: Dict[str, Any]) -> bool:
     cursor = conn.cursor()
     
     updates["updated_at"] = datetime.now()
-    
+
+    # A payout change moves the customer's total payout by the difference,
+    # a fraud score change moves the repair shop's claim and fraud counts
+    previous = None
+    if "payout_amount" in updates or "fraud_score" in updates:
+        cursor.execute(
+            "SELECT customer_id, payout_amount, repair_shop, fraud_score FROM claims WHERE claim_id = :1 FOR UPDATE",
+            [claim_id]
+        )
+        previous = cursor.fetchone()
+
     # Build SET clause with bind variables
     set_parts = []
     values = []
@@ -101,13 +211,64 @@ def update_claim(claim_id: str, updates: Dict[str, Any]) -> bool:
         f"UPDATE claims SET {set_clause} WHERE claim_id = :{len(values)}",
         values
     )
-    
-    conn.commit()
     affected = cursor.rowcount
+
+    if previous is not None:
+        customer_id, old_payout, repair_shop, old_score = previous
+        repair_shop = updates.get("repair_shop", repair_shop)
+        delta = float(updates.get("payout_amount", old_payout) or 0) - float(old_payout or 0)
+        if delta:
+            cursor.execute("""
+                UPDATE customer_claim_stats SET total_payout = total_payout + :1, updated_at = :2
+                WHERE customer_id = :3
+            """, [delta, updates["updated_at"], customer_id])
+        shop_key = normalize_shop_name(repair_shop)
+        if "fraud_score" in updates and shop_key:
+            claims_delta, fraud_delta = fraud_count_deltas(old_score, updates["fraud_score"], config.FRAUD_SCORE_HIGH)
+            if claims_delta or fraud_delta:
+                _record_shop_claim(cursor, shop_key, repair_shop, claims_delta, fraud_delta, updates["updated_at"])
+
+    conn.commit()
     release_connection(conn)
-    
+
     return affected > 0
 
+def _record_shop_claim(cursor, shop_key: str, display_name: str, claims_delta: int, fraud_delta: int, now: datetime):
+    """Move a repair shop's scored/fraud claim counts; unseen shops start as 'standard'"""
+    cursor.execute("""
+        MERGE INTO repair_shops s
+        USING (SELECT :shop_key AS shop_key FROM dual) d
+        ON (s.shop_key = d.shop_key)
+        WHEN MATCHED THEN UPDATE SET
+            claim_count = s.claim_count + :claims_delta,
+            fraud_claim_count = s.fraud_claim_count + :fraud_delta,
+            updated_at = :now
+        WHEN NOT MATCHED THEN INSERT (shop_key, display_name, reputation, claim_count, fraud_claim_count, updated_at)
+            VALUES (d.shop_key, :display_name, 'standard', :claims_delta, :fraud_delta, :now)
+    """, {
+        "shop_key": shop_key, "display_name": display_name[:200],
+        "claims_delta": claims_delta, "fraud_delta": fraud_delta, "now": now
+    })
+
+def get_repair_shops(updated_since: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Repair shop reputation rows, only those changed after updated_since when given"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.arraysize = 5000
+
+    columns = "shop_key, display_name, reputation, claim_count, fraud_claim_count, updated_at"
+    if updated_since:
+        cursor.execute(
+            f"SELECT {columns} FROM repair_shops WHERE updated_at > :1",
+            [datetime.fromisoformat(updated_since)]
+        )
+    else:
+        cursor.execute(f"SELECT {columns} FROM repair_shops")
+    results = [_row_to_dict(cursor, row) for row in cursor.fetchall()]
+
+    release_connection(conn)
+    return results
+
 def get_all_claims() -> List[Dict[str, Any]]:
     """Get all claims"""
     conn = get_connection()
@@ -120,6 +281,321 @@ def get_all_claims() -> List[Dict[str, Any]]:
     release_connection(conn)
     return results
 
+def get_claim_links() -> List[Dict[str, Any]]:
+    """claim_id, customer_id, policy_id and repair_shop of every claim (fraud ring graph rebuilds)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.arraysize = 5000
+
+    cursor.execute("SELECT claim_id, customer_id, policy_id, repair_shop FROM claims")
+    results = [
+        {"claim_id": claim_id, "customer_id": customer_id, "policy_id": policy_id, "repair_shop": repair_shop}
+        for claim_id, customer_id, policy_id, repair_shop in cursor.fetchall()
+    ]
+
+    release_connection(conn)
+    return results
+
+def get_claims_by_customer(customer_id: str, limit: int = None) -> List[Dict[str, Any]]:
+    """Get a customer's claims, newest first (served by idx_claims_customer_created)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    query = "SELECT * FROM claims WHERE customer_id = :1 ORDER BY created_at DESC"
+    params = [customer_id]
+    if limit is not None:
+        query += " FETCH FIRST :2 ROWS ONLY"
+        params.append(limit)
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    results = [_row_to_dict(cursor, row) for row in rows]
+
+    release_connection(conn)
+    return results
+
+def get_customer_claim_stats(customer_id: str) -> Dict[str, Any]:
+    """
+    Get a customer's claim aggregate: claim_count, total_payout,
+    last_claim_date and claims_last_90_days. One primary-key lookup; a
+    customer with no claims gets zeros.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT customer_id, claim_count, total_payout, last_claim_date, recent_claim_days
+        FROM customer_claim_stats WHERE customer_id = :1
+    """, [customer_id])
+    stats = _row_to_dict(cursor, cursor.fetchone())
+
+    release_connection(conn)
+    if stats is None:
+        return customer_stats.to_public(customer_stats.empty_stats(customer_id))
+    stats["recent_claim_days"] = customer_stats.decode_days(stats["recent_claim_days"])
+    return customer_stats.to_public(stats)
+
+def rebuild_customer_claim_stats() -> int:
+    """
+    Recompute every customer's aggregate from the claims table (initial load,
+    or repair after claims were written outside create_claim/update_claim).
+    Returns the number of customers.
+    """
+    window = customer_stats.VELOCITY_WINDOW_DAYS
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT customer_id, COUNT(*), NVL(SUM(payout_amount), 0), MAX(created_at)
+            FROM claims GROUP BY customer_id
+        """)
+        totals = cursor.fetchall()
+        cursor.execute(f"""
+            SELECT customer_id, TO_CHAR(TRUNC(created_at), 'YYYY-MM-DD'), COUNT(*)
+            FROM claims WHERE created_at >= TRUNC(SYSDATE) - {window - 1}
+            GROUP BY customer_id, TRUNC(created_at)
+        """)
+        days: Dict[str, Dict[str, int]] = {}
+        for customer_id, day, count in cursor.fetchall():
+            days.setdefault(customer_id, {})[day] = count
+
+        now = datetime.now()
+        rows = [
+            (customer_id, count, payout, last, customer_stats.encode_days(days.get(customer_id, {})), now)
+            for customer_id, count, payout, last in totals
+        ]
+        cursor.execute("DELETE FROM customer_claim_stats")
+        if rows:
+            cursor.setinputsizes(None, None, None, None, oracledb.DB_TYPE_CLOB, None)
+            cursor.executemany("""
+                INSERT INTO customer_claim_stats
+                    (customer_id, claim_count, total_payout, last_claim_date, recent_claim_days, updated_at)
+                VALUES (:1, :2, :3, :4, :5, :6)
+            """, rows)
+        conn.commit()
+    finally:
+        release_connection(conn)
+
+    return len(rows)
+
+# Decision backfill (see agents/decision_backfill.py)
+_DECISION_COLUMNS = """
+    claim_id, customer_id, fraud_score, fraud_flags, approval_status, approval_reason,
+    payout_amount, processing_time_days
+"""
+
+def iter_claim_decisions(chunk_size: int = 1000, after_claim_id: str = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream decided claims (APPROVED/NEEDS_REVIEW with a fraud score) in
+    claim_id order, one chunk at a time.
+    
+    Each chunk is a keyset query on the primary key starting after the
+    previous chunk's last claim_id, so memory stays at one chunk however
+    many claims there are, and a stopped scan can resume from any claim_id.
+    """
+    while True:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            params = {"chunk_size": chunk_size}
+            keyset = ""
+            if after_claim_id is not None:
+                keyset = "AND claim_id > :after_claim_id"
+                params["after_claim_id"] = after_claim_id
+            cursor.execute(f"""
+                SELECT {_DECISION_COLUMNS} FROM claims
+                WHERE fraud_score IS NOT NULL AND approval_status IN ('APPROVED', 'NEEDS_REVIEW') {keyset}
+                ORDER BY claim_id FETCH FIRST :chunk_size ROWS ONLY
+            """, params)
+            chunk = [_row_to_dict(cursor, row) for row in cursor.fetchall()]
+        finally:
+            release_connection(conn)
+        if not chunk:
+            return
+        yield chunk
+        after_claim_id = chunk[-1]["claim_id"]
+
+def update_claim_decisions(changes: List[Dict[str, Any]]) -> int:
+    """
+    Write re-made decisions in one transaction with executemany.
+    
+    Each change has claim_id, customer_id, old_status, approval_status,
+    approval_reason, payout_amount, payout_delta and processing_time_days.
+    A claim whose status is no longer old_status (decided again since it
+    was read) is left alone. Payout deltas of the rows written are applied
+    to the customers' claim aggregates. Returns the number of claims updated.
+    """
+    if not changes:
+        return 0
+    
+    now = datetime.now()
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.setinputsizes(None, oracledb.DB_TYPE_CLOB, None, None, None, None, None)
+        cursor.executemany("""
+            UPDATE claims
+            SET approval_status = :1, approval_reason = :2, payout_amount = :3,
+                processing_time_days = :4, updated_at = :5
+            WHERE claim_id = :6 AND approval_status = :7
+        """, [
+            (c["approval_status"], c["approval_reason"], c["payout_amount"], c["processing_time_days"],
+             now, c["claim_id"], c["old_status"])
+            for c in changes
+        ], arraydmlrowcounts=True)
+        written = [change for change, count in zip(changes, cursor.getarraydmlrowcounts()) if count]
+        
+        payouts = [(c["payout_delta"], now, c["customer_id"]) for c in written if c["payout_delta"]]
+        if payouts:
+            cursor.executemany("""
+                UPDATE customer_claim_stats SET total_payout = total_payout + :1, updated_at = :2
+                WHERE customer_id = :3
+            """, payouts)
+        conn.commit()
+    finally:
+        release_connection(conn)
+    
+    return len(written)
+
+# Payments
+_PAYMENT_COLUMNS = """
+    idempotency_key, claim_id, customer_id, amount, batch_id, status,
+    payment_id, reference_number, error, created_at, updated_at
+"""
+
+def iter_payable_claims(chunk_size: int = 1000, after_claim_id: str = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream approved claims with a payout and no payment yet (claim_id,
+    customer_id, payout_amount) in claim_id order, one keyset chunk at a time.
+    """
+    while True:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            params = {"chunk_size": chunk_size}
+            keyset = ""
+            if after_claim_id is not None:
+                keyset = "AND c.claim_id > :after_claim_id"
+                params["after_claim_id"] = after_claim_id
+            cursor.execute(f"""
+                SELECT c.claim_id, c.customer_id, c.payout_amount FROM claims c
+                WHERE c.approval_status = 'APPROVED' AND c.payout_amount > 0
+                AND NOT EXISTS (SELECT 1 FROM payments p WHERE p.claim_id = c.claim_id) {keyset}
+                ORDER BY c.claim_id FETCH FIRST :chunk_size ROWS ONLY
+            """, params)
+            chunk = [_row_to_dict(cursor, row) for row in cursor.fetchall()]
+        finally:
+            release_connection(conn)
+        if not chunk:
+            return
+        yield chunk
+        after_claim_id = chunk[-1]["claim_id"]
+
+def create_payments(payments: List[Dict[str, Any]]) -> List[str]:
+    """
+    Record PENDING payments (idempotency_key, claim_id, customer_id, amount,
+    batch_id) with one executemany. Claims that already have a payment are
+    skipped; returns the idempotency keys actually inserted.
+    """
+    if not payments:
+        return []
+    
+    now = datetime.now()
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.executemany("""
+            MERGE INTO payments p
+            USING (SELECT :claim_id AS claim_id FROM dual) d
+            ON (p.claim_id = d.claim_id)
+            WHEN NOT MATCHED THEN INSERT (idempotency_key, claim_id, customer_id, amount, batch_id, status, created_at, updated_at)
+                VALUES (:idempotency_key, d.claim_id, :customer_id, :amount, :batch_id, 'PENDING', :now, :now)
+        """, [
+            {
+                "claim_id": p["claim_id"], "idempotency_key": p["idempotency_key"], "customer_id": p["customer_id"],
+                "amount": p["amount"], "batch_id": p["batch_id"], "now": now
+            }
+            for p in payments
+        ], arraydmlrowcounts=True)
+        inserted = [p["idempotency_key"] for p, count in zip(payments, cursor.getarraydmlrowcounts()) if count]
+        conn.commit()
+    finally:
+        release_connection(conn)
+    
+    return inserted
+
+def update_payment_statuses(updates: List[Dict[str, Any]]) -> int:
+    """
+    Apply processor results (idempotency_key, status and optionally
+    payment_id, reference_number, error, batch_id) with one executemany. Payments
+    that are already SETTLED or FAILED keep their status. Returns the
+    number of payments updated.
+    """
+    if not updates:
+        return 0
+    
+    now = datetime.now()
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.executemany("""
+            UPDATE payments
+            SET status = :status, payment_id = NVL(:payment_id, payment_id),
+                reference_number = NVL(:reference_number, reference_number), batch_id = NVL(:batch_id, batch_id),
+                error = :error, updated_at = :now
+            WHERE idempotency_key = :idempotency_key AND status IN ('PENDING', 'SCHEDULED', 'PROCESSING')
+        """, [
+            {
+                "status": u["status"], "payment_id": u.get("payment_id"), "reference_number": u.get("reference_number"),
+                "batch_id": u.get("batch_id"),
+                "error": (u.get("error") or None) and u["error"][:500], "now": now,
+                "idempotency_key": u["idempotency_key"]
+            }
+            for u in updates
+        ], arraydmlrowcounts=True)
+        updated = sum(cursor.getarraydmlrowcounts())
+        conn.commit()
+    finally:
+        release_connection(conn)
+    
+    return updated
+
+def iter_payments(statuses: List[str], chunk_size: int = 1000, after_key: str = None) -> Iterator[List[Dict[str, Any]]]:
+    """Stream payments in the given statuses in idempotency_key order, one keyset chunk at a time"""
+    status_binds = ", ".join(f":status{i}" for i in range(len(statuses)))
+    while True:
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            params = {f"status{i}": status for i, status in enumerate(statuses)}
+            params["chunk_size"] = chunk_size
+            keyset = ""
+            if after_key is not None:
+                keyset = "AND idempotency_key > :after_key"
+                params["after_key"] = after_key
+            cursor.execute(f"""
+                SELECT {_PAYMENT_COLUMNS} FROM payments
+                WHERE status IN ({status_binds}) {keyset}
+                ORDER BY idempotency_key FETCH FIRST :chunk_size ROWS ONLY
+            """, params)
+            chunk = [_row_to_dict(cursor, row) for row in cursor.fetchall()]
+        finally:
+            release_connection(conn)
+        if not chunk:
+            return
+        yield chunk
+        after_key = chunk[-1]["idempotency_key"]
+
+def get_payment_counts() -> Dict[str, int]:
+    """Number of payments per status"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute("SELECT status, COUNT(*) FROM payments GROUP BY status")
+    results = {status: count for status, count in cursor.fetchall()}
+    
+    release_connection(conn)
+    return results
+
 # Policies CRUD
 def get_policy(policy_id: str) -> Optional[Dict[str, Any]]:
     """Get a policy by ID"""
@@ -162,6 +638,36 @@ def save_chat_message(claim_id: str, customer_message: str, bot_response: str) -
     release_connection(conn)
     return chat_id
 
+def save_chat_messages_batch(messages: List[tuple]) -> int:
+    """
+    Save a batch of chat messages in a single executemany round trip.
+    
+    Each row is (chat_id, claim_id, customer_message, bot_response, timestamp).
+    Rows rejected individually (unknown claim_id, or a chat_id already written
+    by an earlier replay) are logged and skipped; the rest are committed.
+    """
+    if not messages:
+        return 0
+    
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.setinputsizes(None, None, oracledb.DB_TYPE_CLOB, oracledb.DB_TYPE_CLOB, None)
+        cursor.executemany("""
+            INSERT INTO chat_history (chat_id, claim_id, customer_message, bot_response, timestamp)
+            VALUES (:1, :2, :3, :4, :5)
+        """, messages, batcherrors=True)
+        
+        errors = cursor.getbatcherrors()
+        for error in errors:
+            print(f"Warning: Skipped chat message {messages[error.offset][0]}: {error.message}")
+        
+        conn.commit()
+    finally:
+        release_connection(conn)
+    
+    return len(messages) - len(errors)
+
 def get_chat_history(claim_id: str) -> List[Dict[str, Any]]:
     """Get chat history for a claim"""
     conn = get_connection()
@@ -176,3 +682,53 @@ def get_chat_history(claim_id: str) -> List[Dict[str, Any]]:
     
     release_connection(conn)
     return results
+
+# Workflow Step Log CRUD
+def save_workflow_steps(claim_id: str, steps: List[tuple]) -> int:
+    """
+    Store a run's steps in one transaction, replacing stored steps from the
+    first one's seq on (a new run starts at 1; a resumed run appends).
+    
+    Each step is (seq, step, action, detail, duration_ms, cpu_ms, db_calls,
+    llm_calls, reused); all rows go in a single executemany round trip.
+    """
+    rows = [
+        (claim_id, seq, step, action, detail, duration_ms, cpu_ms, db_calls, llm_calls, int(bool(reused)))
+        for seq, step, action, detail, duration_ms, cpu_ms, db_calls, llm_calls, reused in steps
+    ]
+    
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM claim_workflow_steps WHERE claim_id = :1 AND seq >= :2",
+                       [claim_id, rows[0][1] if rows else 1])
+        if rows:
+            cursor.setinputsizes(None, None, None, None, oracledb.DB_TYPE_CLOB, None, None, None, None, None)
+            cursor.executemany("""
+                INSERT INTO claim_workflow_steps
+                    (claim_id, seq, step, action, detail, duration_ms, cpu_ms, db_calls, llm_calls, reused)
+                VALUES (:1, :2, :3, :4, :5, :6, :7, :8, :9, :10)
+            """, rows)
+        conn.commit()
+    finally:
+        release_connection(conn)
+    
+    return len(rows)
+
+def get_workflow_steps(claim_id: str) -> List[Dict[str, Any]]:
+    """Get a claim's workflow step log in step order"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        SELECT seq, step, action, detail, duration_ms, cpu_ms, db_calls, llm_calls, reused
+        FROM claim_workflow_steps WHERE claim_id = :1 ORDER BY seq
+    """, [claim_id])
+    
+    rows = cursor.fetchall()
+    results = [_row_to_dict(cursor, row) for row in rows]
+    for result in results:
+        result["reused"] = bool(result["reused"])
+    
+    release_connection(conn)
+    return results
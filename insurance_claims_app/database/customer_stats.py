@@ -0,0 +1,78 @@
+"""
+Per-Customer Claim Aggregates
+Claim count, total payout, last claim date and rolling 90-day claim velocity,
+maintained incrementally as claims are created and paid instead of scanning
+a customer's claims on every fraud check
+"""
+import json
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Union
+
+VELOCITY_WINDOW_DAYS = 90
+
+
+def empty_stats(customer_id: str) -> Dict[str, Any]:
+    return {
+        "customer_id": customer_id,
+        "claim_count": 0,
+        "total_payout": 0.0,
+        "last_claim_date": None,
+        "recent_claim_days": {}  # "YYYY-MM-DD" -> claims filed that day, last VELOCITY_WINDOW_DAYS only
+    }
+
+
+def as_datetime(value: Union[str, datetime, None]) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def _window_start(today: date) -> str:
+    return (today - timedelta(days=VELOCITY_WINDOW_DAYS - 1)).isoformat()
+
+
+def record_claim(stats: Dict[str, Any], created_at: datetime) -> Dict[str, Any]:
+    """Count a newly filed claim; day buckets that left the window are dropped"""
+    day = created_at.date().isoformat()
+    start = _window_start(created_at.date())
+    days = {d: n for d, n in (stats.get("recent_claim_days") or {}).items() if d >= start}
+    days[day] = days.get(day, 0) + 1
+
+    last = as_datetime(stats.get("last_claim_date"))
+    return {
+        **stats,
+        "claim_count": stats.get("claim_count", 0) + 1,
+        "last_claim_date": created_at if last is None or created_at > last else last,
+        "recent_claim_days": days
+    }
+
+
+def claims_in_window(stats: Dict[str, Any], now: datetime = None) -> int:
+    """Claims filed in the last VELOCITY_WINDOW_DAYS days (today included)"""
+    start = _window_start((now or datetime.now()).date())
+    return sum(n for d, n in (stats.get("recent_claim_days") or {}).items() if d >= start)
+
+
+def in_window(created_at: Union[str, datetime], now: datetime = None) -> bool:
+    """True if a claim filed at `created_at` counts in claims_in_window"""
+    return as_datetime(created_at).date().isoformat() >= _window_start((now or datetime.now()).date())
+
+
+def to_public(stats: Dict[str, Any], now: datetime = None) -> Dict[str, Any]:
+    """Aggregate as returned by get_customer_claim_stats"""
+    last = as_datetime(stats.get("last_claim_date"))
+    return {
+        "customer_id": stats["customer_id"],
+        "claim_count": stats.get("claim_count", 0),
+        "total_payout": round(float(stats.get("total_payout") or 0), 2),
+        "last_claim_date": last.isoformat() if last else None,
+        f"claims_last_{VELOCITY_WINDOW_DAYS}_days": claims_in_window(stats, now)
+    }
+
+
+def encode_days(days: Dict[str, int]) -> str:
+    return json.dumps(days, sort_keys=True)
+
+
+def decode_days(value: Optional[str]) -> Dict[str, int]:
+    return json.loads(value) if value else {}
@@ -0,0 +1,15 @@
+"""
+Database Errors
+Raised by both backends (memory and Oracle)
+"""
+from typing import Optional
+
+
+class IdempotencyKeyReused(ValueError):
+    """An Idempotency-Key was sent again with a different submission than the one it was first used for"""
+
+    def __init__(self, idempotency_key: str, claim_id: Optional[str] = None):
+        used_for = f" (claim {claim_id})" if claim_id else ""
+        super().__init__(f"Idempotency-Key {idempotency_key!r} was already used for a different submission{used_for}")
+        self.idempotency_key = idempotency_key
+        self.claim_id = claim_id
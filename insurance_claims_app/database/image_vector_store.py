@@ -10,7 +10,7 @@ import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from .models import get_connection, release_connection
+from .models import get_connection, release_connection, deadline_bounded
 
 class ImageVectorStore:
     """Vector store for damage images using Oracle 23ai and CLIP embeddings"""
@@ -187,50 +187,54 @@ class ImageVectorStore:
         embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
         
         conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Build query with optional exclusion
-        if exclude_claim_id:
-            cursor.execute("""
-                SELECT image_id, claim_id, image_name, damage_type, metadata,
-                       VECTOR_DISTANCE(embedding, TO_VECTOR(:1, 512, FLOAT32), COSINE) as distance
-                FROM damage_images
-                WHERE claim_id != :2
-                ORDER BY distance
-                FETCH FIRST :3 ROWS ONLY
-            """, [embedding_str, exclude_claim_id, k])
-        else:
-            cursor.execute("""
-                SELECT image_id, claim_id, image_name, damage_type, metadata,
-                       VECTOR_DISTANCE(embedding, TO_VECTOR(:1, 512, FLOAT32), COSINE) as distance
-                FROM damage_images
-                ORDER BY distance
-                FETCH FIRST :2 ROWS ONLY
-            """, [embedding_str, k])
-        
-        results = []
-        for row in cursor.fetchall():
-            metadata = row[4]
-            if hasattr(metadata, 'read'):
-                metadata = metadata.read()
-            
-            similarity = 1 - row[5]  # Convert distance to similarity
-            
-            results.append({
-                "image_id": row[0],
-                "claim_id": row[1],
-                "image_name": row[2],
-                "damage_type": row[3],
-                "metadata": json.loads(metadata) if metadata else {},
-                "similarity": round(similarity, 4),
-                "is_potential_fraud": similarity > 0.85  # High similarity = potential fraud
-            })
-        
-        release_connection(conn)
+        try:
+            # The search gets whatever is left of the claim's budget
+            with deadline_bounded(conn, "image similarity search"):
+                cursor = conn.cursor()
+                
+                # Build query with optional exclusion
+                if exclude_claim_id:
+                    cursor.execute("""
+                        SELECT image_id, claim_id, image_name, damage_type, metadata,
+                               VECTOR_DISTANCE(embedding, TO_VECTOR(:1, 512, FLOAT32), COSINE) as distance
+                        FROM damage_images
+                        WHERE claim_id != :2
+                        ORDER BY distance
+                        FETCH FIRST :3 ROWS ONLY
+                    """, [embedding_str, exclude_claim_id, k])
+                else:
+                    cursor.execute("""
+                        SELECT image_id, claim_id, image_name, damage_type, metadata,
+                               VECTOR_DISTANCE(embedding, TO_VECTOR(:1, 512, FLOAT32), COSINE) as distance
+                        FROM damage_images
+                        ORDER BY distance
+                        FETCH FIRST :2 ROWS ONLY
+                    """, [embedding_str, k])
+                
+                results = []
+                for row in cursor.fetchall():
+                    metadata = row[4]
+                    if hasattr(metadata, 'read'):
+                        metadata = metadata.read()
+                    
+                    similarity = 1 - row[5]  # Convert distance to similarity
+                    
+                    results.append({
+                        "image_id": row[0],
+                        "claim_id": row[1],
+                        "image_name": row[2],
+                        "damage_type": row[3],
+                        "metadata": json.loads(metadata) if metadata else {},
+                        "similarity": round(similarity, 4),
+                        "is_potential_fraud": similarity > 0.85  # High similarity = potential fraud
+                    })
+        finally:
+            release_connection(conn)
         return results
     
     def check_for_duplicate_images(self, image_bytes: bytes, 
-                                   similarity_threshold: float = 0.85) -> Dict[str, Any]:
+                                   similarity_threshold: float = 0.85,
+                                   exclude_claim_id: str = None) -> Dict[str, Any]:
         """
         Check if an image is a potential duplicate (fraud indicator)
         
@@ -238,11 +242,12 @@ class ImageVectorStore:
             image_bytes: Image to check
             similarity_threshold: Threshold above which images are considered duplicates
                                  (0.85 = 85% similar, catches near-identical images)
+            exclude_claim_id: Ignore this claim's own images
             
         Returns:
             Dict with fraud analysis results
         """
-        similar_images = self.find_similar_images(image_bytes, k=3)
+        similar_images = self.find_similar_images(image_bytes, k=3, exclude_claim_id=exclude_claim_id)
         
         # Debug logging
         print(f"[ImageVectorStore] Checking for duplicates, found {len(similar_images)} similar images")
@@ -0,0 +1,187 @@
+"""
+Local BM25 Inverted Index for Policy Documents
+Lexical retrieval that answers without a database round trip, plus
+reciprocal rank fusion for combining it with Oracle vector search
+"""
+import hashlib
+import json
+import math
+import os
+import re
+from typing import List, Dict, Any, Optional, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be by can do does for from how i if in is it my of on or
+our that the this to was we what when where which who will with you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords, fold plurals"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Fuse several ranked id lists into one using reciprocal rank fusion.
+
+    score(id) = sum over rankings of 1 / (k + rank), rank starting at 1.
+    Returns (id, score) pairs, best first.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed set of chunks.
+
+    Postings, document lengths and IDF are computed once at build time and
+    persisted as JSON, so a query is a handful of dict lookups.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.chunks: List[Dict[str, Any]] = []
+        self.postings: Dict[str, List[List[int]]] = {}  # term -> [[chunk_idx, tf], ...]
+        self.idf: Dict[str, float] = {}
+        self.doc_lengths: List[int] = []
+        self.avg_doc_length = 0.0
+        self.fingerprint = ""
+
+    @staticmethod
+    def fingerprint_chunks(chunks: List[Dict[str, Any]]) -> str:
+        digest = hashlib.sha256()
+        for chunk in chunks:
+            digest.update(chunk["id"].encode())
+            digest.update(chunk["content"].encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def build(cls, chunks: List[Dict[str, Any]], **kwargs) -> "BM25Index":
+        """Build the index from chunks with id, title, content, metadata"""
+        index = cls(**kwargs)
+        index.chunks = chunks
+        index.fingerprint = cls.fingerprint_chunks(chunks)
+
+        for idx, chunk in enumerate(chunks):
+            tokens = tokenize(f"{chunk.get('title', '')} {chunk['content']}")
+            index.doc_lengths.append(len(tokens))
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for term, tf in counts.items():
+                index.postings.setdefault(term, []).append([idx, tf])
+
+        n = len(chunks)
+        index.avg_doc_length = (sum(index.doc_lengths) / n) if n else 0.0
+        index.idf = {
+            term: math.log(1 + (n - len(plist) + 0.5) / (len(plist) + 0.5))
+            for term, plist in index.postings.items()
+        }
+        return index
+
+    def search(self, query: str, k: int = 3) -> List[Dict[str, Any]]:
+        """Return the top-k chunks with their BM25 score and matched terms"""
+        terms = set(tokenize(query))
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+
+        for term in terms:
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+            idf = self.idf[term]
+            for idx, tf in plist:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[idx] / self.avg_doc_length)
+                scores[idx] = scores.get(idx, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+                matched[idx] = matched.get(idx, 0) + 1
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [
+            {
+                **self.chunks[idx],
+                "score": round(score, 4),
+                "matched_terms": matched[idx],
+                "term_coverage": matched[idx] / len(terms) if terms else 0.0
+            }
+            for idx, score in ranked
+        ]
+
+    @staticmethod
+    def confidence(results: List[Dict[str, Any]], min_matched_terms: int = 2) -> float:
+        """
+        How safely the top lexical hit can stand alone (0-1).
+
+        Averages the share of query terms the top chunk contains with its
+        score margin over the runner-up. A top chunk matching fewer than
+        `min_matched_terms` terms scores 0: a short generic query ("what is
+        covered") is fully covered by whichever chunk says "covered".
+        """
+        if not results or results[0].get("matched_terms", 0) < min_matched_terms:
+            return 0.0
+        top = results[0]["score"]
+        second = results[1]["score"] if len(results) > 1 else 0.0
+        margin = 1 - (second / top) if top > 0 else 0.0
+        return round(0.5 * results[0]["term_coverage"] + 0.5 * margin, 4)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "k1": self.k1,
+                "b": self.b,
+                "fingerprint": self.fingerprint,
+                "chunks": self.chunks,
+                "postings": self.postings,
+                "idf": self.idf,
+                "doc_lengths": self.doc_lengths,
+                "avg_doc_length": self.avg_doc_length
+            }, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(k1=data["k1"], b=data["b"])
+        index.fingerprint = data["fingerprint"]
+        index.chunks = data["chunks"]
+        index.postings = data["postings"]
+        index.idf = data["idf"]
+        index.doc_lengths = data["doc_lengths"]
+        index.avg_doc_length = data["avg_doc_length"]
+        return index
+
+    @classmethod
+    def load_or_build(cls, path: Optional[str], chunks: List[Dict[str, Any]]) -> "BM25Index":
+        """Load the persisted index, rebuilding it if the chunks have changed"""
+        if path and os.path.exists(path):
+            try:
+                index = cls.load(path)
+                if index.fingerprint == cls.fingerprint_chunks(chunks):
+                    return index
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Warning: Could not load BM25 index from {path}: {e}")
+
+        index = cls.build(chunks)
+        if path:
+            try:
+                index.save(path)
+            except OSError as e:
+                print(f"Warning: Could not persist BM25 index to {path}: {e}")
+        return index
@@ -0,0 +1,627 @@
+"""
+In-Memory Database Backend
+Drop-in stand-in for the Oracle-backed `database` package, used for load
+tests and local runs without a database (DATABASE_BACKEND=memory)
+"""
+import copy
+import hashlib
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+
+import numpy as np
+
+from monitoring.step_stats import counts_as_db_call
+from external_apis.deadline import check_deadline
+from config import config
+from . import customer_stats
+from .repair_shops import SAMPLE_REPAIR_SHOPS, fraud_count_deltas, normalize_shop_name
+from .errors import IdempotencyKeyReused
+
+_db_call = counts_as_db_call("memory")
+
+_lock = threading.RLock()
+_claims: Dict[str, Dict[str, Any]] = {}
+_policies: Dict[str, Dict[str, Any]] = {}
+_chat_history: Dict[str, Dict[str, Any]] = {}
+_workflow_steps: Dict[str, List[Dict[str, Any]]] = {}
+# Stand-ins for idx_claims_customer_created and customer_claim_stats
+_claims_by_customer: Dict[str, List[str]] = {}
+_customer_stats: Dict[str, Dict[str, Any]] = {}
+_repair_shops: Dict[str, Dict[str, Any]] = {}
+_payments: Dict[str, Dict[str, Any]] = {}
+_payment_by_claim: Dict[str, str] = {}
+# Stand-ins for claim_submissions and its unique key / content hash indexes
+_submission_by_key: Dict[str, Tuple[str, str]] = {}  # key -> (claim_id, content_hash)
+_submissions_by_hash: Dict[str, List[Tuple[datetime, str]]] = {}
+
+# Column order of a workflow step row after claim_id (see crud.save_workflow_steps)
+_STEP_COLUMNS = ("seq", "step", "action", "detail", "duration_ms", "cpu_ms", "db_calls", "llm_calls", "reused")
+
+
+def _iso(value) -> Optional[str]:
+    if value is None:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+# Connection management (no connections in memory mode)
+def get_connection():
+    raise RuntimeError("get_connection() is not available with DATABASE_BACKEND=memory")
+
+
+def release_connection(conn):
+    pass
+
+
+def init_database():
+    """Nothing to create; tables are dicts"""
+
+
+def _seed_repair_shops():
+    now = datetime.now().isoformat()
+    for name, reputation in SAMPLE_REPAIR_SHOPS:
+        _repair_shops.setdefault(normalize_shop_name(name), {
+            "shop_key": normalize_shop_name(name), "display_name": name, "reputation": reputation,
+            "claim_count": 0, "fraud_claim_count": 0, "updated_at": now
+        })
+
+
+_seed_repair_shops()
+
+
+def reset_database():
+    """Drop all rows (used between benchmark runs)"""
+    with _lock:
+        _claims.clear()
+        _policies.clear()
+        _chat_history.clear()
+        _workflow_steps.clear()
+        _claims_by_customer.clear()
+        _customer_stats.clear()
+        _repair_shops.clear()
+        _seed_repair_shops()
+        _payments.clear()
+        _payment_by_claim.clear()
+        _submission_by_key.clear()
+        _submissions_by_hash.clear()
+
+
+def seed_sample_policies():
+    """Seed the same sample policies as the Oracle backend"""
+    sample_policies = [
+        ("POL-001", "CUST-001", "comprehensive", 50000.0, 500.0, 1, "2025-01-01", "2027-01-01", ["rental_car", "roadside_assistance"]),
+        ("POL-002", "CUST-002", "collision", 30000.0, 1000.0, 1, "2025-06-01", "2027-06-01", []),
+        ("POL-003", "CUST-003", "liability", 100000.0, 250.0, 0, "2024-01-01", "2025-01-01", ["rental_car"]),
+    ]
+    now = datetime.now().isoformat()
+    with _lock:
+        for policy_id, customer_id, coverage_type, limit, deductible, active, start, end, riders in sample_policies:
+            _policies.setdefault(policy_id, {
+                "policy_id": policy_id,
+                "customer_id": customer_id,
+                "coverage_type": coverage_type,
+                "coverage_limit": limit,
+                "deductible": deductible,
+                "is_active": active,
+                "start_date": f"{start}T00:00:00",
+                "end_date": f"{end}T00:00:00",
+                "riders": json.dumps(riders),
+                "policy_document": f"{coverage_type.title()} Auto Insurance Policy...".encode(),
+                "created_at": now
+            })
+
+
+# Claims CRUD
+@_db_call
+def create_claim(claim_data: Dict[str, Any]) -> str:
+    """Create a new claim"""
+    claim_id = f"CLM-{uuid.uuid4().hex[:8].upper()}"
+    created_at = datetime.now()
+    now = created_at.isoformat()
+    row = {
+        "claim_id": claim_id,
+        "policy_id": claim_data.get("policy_id"),
+        "customer_id": claim_data.get("customer_id", ""),
+        "incident_date": claim_data.get("incident_date", "")[:19],
+        "claim_date": claim_data.get("claim_date", "")[:19],
+        "claim_type": claim_data.get("claim_type"),
+        "damage_description": claim_data.get("damage_description"),
+        "repair_shop": claim_data.get("repair_shop"),
+        "estimated_damage_amount": claim_data.get("estimated_damage_amount"),
+        "validation_status": "PENDING",
+        "validation_reason": None,
+        "validation_results": None,
+        "fraud_score": None,
+        "fraud_flags": None,
+        "approval_status": "PENDING",
+        "approval_reason": None,
+        "payout_amount": None,
+        "deductible": None,
+        "processing_time_days": None,
+        "damage_photos": json.dumps(claim_data.get("damage_photos", [])),
+        "incident_report": claim_data.get("incident_report"),
+        "repair_estimate": claim_data.get("repair_estimate"),
+        "created_at": now,
+        "updated_at": now
+    }
+    customer_id = row["customer_id"]
+    with _lock:
+        _claims[claim_id] = row
+        _claims_by_customer.setdefault(customer_id, []).append(claim_id)
+        stats = _customer_stats.get(customer_id) or customer_stats.empty_stats(customer_id)
+        _customer_stats[customer_id] = customer_stats.record_claim(stats, created_at)
+    return claim_id
+
+
+@_db_call
+def create_claim_once(
+    claim_data: Dict[str, Any],
+    idempotency_key: Optional[str],
+    content_hash: str,
+    window_s: float
+) -> Tuple[str, bool]:
+    """Create a claim unless the same submission already created one; returns (claim_id, created)"""
+    with _lock:
+        if idempotency_key and idempotency_key in _submission_by_key:
+            claim_id, first_hash = _submission_by_key[idempotency_key]
+            if first_hash != content_hash:
+                raise IdempotencyKeyReused(idempotency_key, claim_id)
+            return claim_id, False
+        now = datetime.now()
+        since = now - timedelta(seconds=window_s)
+        recent = [entry for entry in _submissions_by_hash.get(content_hash, []) if entry[0] >= since]
+        if recent and window_s > 0:
+            return recent[-1][1], False
+
+        # One round trip, as in the Oracle backend
+        claim_id = create_claim.__wrapped__(claim_data)
+        if idempotency_key:
+            _submission_by_key[idempotency_key] = (claim_id, content_hash)
+        _submissions_by_hash[content_hash] = recent + [(now, claim_id)]
+        return claim_id, True
+
+
+@_db_call
+def get_claim(claim_id: str) -> Optional[Dict[str, Any]]:
+    """Get a claim by ID"""
+    with _lock:
+        row = _claims.get(claim_id)
+        return dict(row) if row else None
+
+
+@_db_call
+def update_claim(claim_id: str, updates: Dict[str, Any]) -> bool:
+    """Update a claim"""
+    with _lock:
+        row = _claims.get(claim_id)
+        if row is None:
+            return False
+        if "payout_amount" in updates:
+            delta = float(updates["payout_amount"] or 0) - float(row["payout_amount"] or 0)
+            stats = _customer_stats.get(row["customer_id"])
+            if delta and stats is not None:
+                stats["total_payout"] += delta
+        repair_shop = updates.get("repair_shop", row.get("repair_shop"))
+        shop_key = normalize_shop_name(repair_shop)
+        if "fraud_score" in updates and shop_key:
+            claims_delta, fraud_delta = fraud_count_deltas(row["fraud_score"], updates["fraud_score"], config.FRAUD_SCORE_HIGH)
+            if claims_delta or fraud_delta:
+                shop = _repair_shops.setdefault(shop_key, {
+                    "shop_key": shop_key, "display_name": repair_shop, "reputation": "standard",
+                    "claim_count": 0, "fraud_claim_count": 0
+                })
+                shop["claim_count"] += claims_delta
+                shop["fraud_claim_count"] += fraud_delta
+                shop["updated_at"] = datetime.now().isoformat()
+        for key, value in updates.items():
+            row[key] = _iso(value) if isinstance(value, datetime) else value
+        row["updated_at"] = datetime.now().isoformat()
+        return True
+
+
+@_db_call
+def get_repair_shops(updated_since: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Repair shop reputation rows, only those changed after updated_since when given"""
+    with _lock:
+        return [
+            dict(shop) for shop in _repair_shops.values()
+            if not updated_since or shop["updated_at"] > updated_since
+        ]
+
+
+@_db_call
+def get_all_claims() -> List[Dict[str, Any]]:
+    """Get all claims, newest first"""
+    with _lock:
+        rows = [dict(r) for r in _claims.values()]
+    return sorted(rows, key=lambda r: r["created_at"], reverse=True)
+
+
+@_db_call
+def get_claim_links() -> List[Dict[str, Any]]:
+    """claim_id, customer_id, policy_id and repair_shop of every claim"""
+    with _lock:
+        return [
+            {column: row[column] for column in ("claim_id", "customer_id", "policy_id", "repair_shop")}
+            for row in _claims.values()
+        ]
+
+
+@_db_call
+def get_claims_by_customer(customer_id: str, limit: int = None) -> List[Dict[str, Any]]:
+    """Get a customer's claims, newest first"""
+    with _lock:
+        claim_ids = _claims_by_customer.get(customer_id, [])
+        return [dict(_claims[claim_id]) for claim_id in claim_ids[::-1][:limit]]
+
+
+@_db_call
+def get_customer_claim_stats(customer_id: str) -> Dict[str, Any]:
+    """Get a customer's claim aggregate (zeros for a customer with no claims)"""
+    with _lock:
+        stats = copy.deepcopy(_customer_stats.get(customer_id)) or customer_stats.empty_stats(customer_id)
+    return customer_stats.to_public(stats)
+
+
+def rebuild_customer_claim_stats() -> int:
+    """Recompute every customer's aggregate from the stored claims"""
+    with _lock:
+        _claims_by_customer.clear()
+        _customer_stats.clear()
+        for row in sorted(_claims.values(), key=lambda r: r["created_at"]):
+            customer_id = row["customer_id"]
+            _claims_by_customer.setdefault(customer_id, []).append(row["claim_id"])
+            stats = _customer_stats.get(customer_id) or customer_stats.empty_stats(customer_id)
+            stats = customer_stats.record_claim(stats, datetime.fromisoformat(row["created_at"]))
+            stats["total_payout"] += float(row["payout_amount"] or 0)
+            _customer_stats[customer_id] = stats
+        return len(_customer_stats)
+
+
+# Decision backfill
+_DECISION_COLUMNS = (
+    "claim_id", "customer_id", "fraud_score", "fraud_flags", "approval_status", "approval_reason",
+    "payout_amount", "processing_time_days"
+)
+
+
+def iter_claim_decisions(chunk_size: int = 1000, after_claim_id: str = None) -> Iterator[List[Dict[str, Any]]]:
+    """Stream decided claims in claim_id order, one chunk at a time"""
+    while True:
+        with _lock:
+            claim_ids = sorted(
+                claim_id for claim_id, row in _claims.items()
+                if (after_claim_id is None or claim_id > after_claim_id)
+                and row["fraud_score"] is not None and row["approval_status"] in ("APPROVED", "NEEDS_REVIEW")
+            )[:chunk_size]
+            chunk = [{column: _claims[claim_id][column] for column in _DECISION_COLUMNS} for claim_id in claim_ids]
+        if not chunk:
+            return
+        yield chunk
+        after_claim_id = chunk[-1]["claim_id"]
+
+
+@_db_call
+def update_claim_decisions(changes: List[Dict[str, Any]]) -> int:
+    """Write re-made decisions; claims decided again since they were read are left alone"""
+    now = datetime.now().isoformat()
+    written = 0
+    with _lock:
+        for change in changes:
+            row = _claims.get(change["claim_id"])
+            if row is None or row["approval_status"] != change["old_status"]:
+                continue
+            for column in ("approval_status", "approval_reason", "payout_amount", "processing_time_days"):
+                row[column] = change[column]
+            row["updated_at"] = now
+            stats = _customer_stats.get(row["customer_id"])
+            if change["payout_delta"] and stats is not None:
+                stats["total_payout"] += change["payout_delta"]
+            written += 1
+    return written
+
+
+# Payments
+def iter_payable_claims(chunk_size: int = 1000, after_claim_id: str = None) -> Iterator[List[Dict[str, Any]]]:
+    """Stream approved claims with a payout and no payment yet, in claim_id order"""
+    while True:
+        with _lock:
+            claim_ids = sorted(
+                claim_id for claim_id, row in _claims.items()
+                if (after_claim_id is None or claim_id > after_claim_id)
+                and row["approval_status"] == "APPROVED" and (row["payout_amount"] or 0) > 0
+                and claim_id not in _payment_by_claim
+            )[:chunk_size]
+            chunk = [
+                {column: _claims[claim_id][column] for column in ("claim_id", "customer_id", "payout_amount")}
+                for claim_id in claim_ids
+            ]
+        if not chunk:
+            return
+        yield chunk
+        after_claim_id = chunk[-1]["claim_id"]
+
+
+@_db_call
+def create_payments(payments: List[Dict[str, Any]]) -> List[str]:
+    """Record PENDING payments, skipping claims that already have one; returns the keys inserted"""
+    now = datetime.now().isoformat()
+    inserted = []
+    with _lock:
+        for payment in payments:
+            if payment["claim_id"] in _payment_by_claim:
+                continue
+            key = payment["idempotency_key"]
+            _payments[key] = {
+                "idempotency_key": key, "claim_id": payment["claim_id"], "customer_id": payment["customer_id"],
+                "amount": payment["amount"], "batch_id": payment["batch_id"], "status": "PENDING",
+                "payment_id": None, "reference_number": None, "error": None, "created_at": now, "updated_at": now
+            }
+            _payment_by_claim[payment["claim_id"]] = key
+            inserted.append(key)
+    return inserted
+
+
+@_db_call
+def update_payment_statuses(updates: List[Dict[str, Any]]) -> int:
+    """Apply processor results; SETTLED and FAILED payments keep their status"""
+    now = datetime.now().isoformat()
+    updated = 0
+    with _lock:
+        for update in updates:
+            row = _payments.get(update["idempotency_key"])
+            if row is None or row["status"] in ("SETTLED", "FAILED"):
+                continue
+            row["status"] = update["status"]
+            row["payment_id"] = update.get("payment_id") or row["payment_id"]
+            row["reference_number"] = update.get("reference_number") or row["reference_number"]
+            row["batch_id"] = update.get("batch_id") or row["batch_id"]
+            row["error"] = (update.get("error") or None) and update["error"][:500]
+            row["updated_at"] = now
+            updated += 1
+    return updated
+
+
+def iter_payments(statuses: List[str], chunk_size: int = 1000, after_key: str = None) -> Iterator[List[Dict[str, Any]]]:
+    """Stream payments in the given statuses in idempotency_key order"""
+    while True:
+        with _lock:
+            keys = sorted(
+                key for key, row in _payments.items()
+                if (after_key is None or key > after_key) and row["status"] in statuses
+            )[:chunk_size]
+            chunk = [dict(_payments[key]) for key in keys]
+        if not chunk:
+            return
+        yield chunk
+        after_key = chunk[-1]["idempotency_key"]
+
+
+@_db_call
+def get_payment_counts() -> Dict[str, int]:
+    """Number of payments per status"""
+    counts: Dict[str, int] = {}
+    with _lock:
+        for row in _payments.values():
+            counts[row["status"]] = counts.get(row["status"], 0) + 1
+    return counts
+
+
+# Policies CRUD
+@_db_call
+def get_policy(policy_id: str) -> Optional[Dict[str, Any]]:
+    """Get a policy by ID"""
+    with _lock:
+        row = _policies.get(policy_id)
+        return dict(row) if row else None
+
+
+@_db_call
+def get_all_policies() -> List[Dict[str, Any]]:
+    """Get all policies"""
+    with _lock:
+        return [dict(r) for r in _policies.values()]
+
+
+# Chat History CRUD
+def save_chat_message(claim_id: str, customer_message: str, bot_response: str) -> str:
+    """Save a chat message"""
+    chat_id = f"CHAT-{uuid.uuid4().hex[:8].upper()}"
+    save_chat_messages_batch([(chat_id, claim_id, customer_message, bot_response, datetime.now())])
+    return chat_id
+
+
+@_db_call
+def save_chat_messages_batch(messages: List[tuple]) -> int:
+    """Save a batch of chat messages, skipping unknown claims and duplicate ids"""
+    saved = 0
+    with _lock:
+        for chat_id, claim_id, customer_message, bot_response, timestamp in messages:
+            if chat_id in _chat_history or (claim_id and claim_id not in _claims):
+                continue
+            _chat_history[chat_id] = {
+                "chat_id": chat_id,
+                "claim_id": claim_id,
+                "customer_message": customer_message,
+                "bot_response": bot_response,
+                "timestamp": _iso(timestamp)
+            }
+            saved += 1
+    return saved
+
+
+@_db_call
+def get_chat_history(claim_id: str) -> List[Dict[str, Any]]:
+    """Get chat history for a claim"""
+    with _lock:
+        rows = [dict(r) for r in _chat_history.values() if r["claim_id"] == claim_id]
+    return sorted(rows, key=lambda r: r["timestamp"])
+
+
+# Workflow Step Log CRUD
+@_db_call
+def save_workflow_steps(claim_id: str, steps: List[tuple]) -> int:
+    """
+    Store a run's steps, replacing stored steps from the first one's seq on
+    (a new run starts at 1; a resumed run appends). Unknown claims are
+    skipped, like a failed FK.
+    """
+    rows = [dict(zip(_STEP_COLUMNS, step)) for step in steps]
+    for row in rows:
+        row["reused"] = bool(row["reused"])
+    first_seq = rows[0]["seq"] if rows else 1
+    with _lock:
+        if claim_id not in _claims:
+            return 0
+        kept = [row for row in _workflow_steps.get(claim_id, []) if row["seq"] < first_seq]
+        _workflow_steps[claim_id] = kept + rows
+    return len(rows)
+
+
+@_db_call
+def get_workflow_steps(claim_id: str) -> List[Dict[str, Any]]:
+    """Get a claim's workflow step log in step order"""
+    with _lock:
+        return [dict(row) for row in _workflow_steps.get(claim_id, [])]
+
+
+# Vector stores
+def hash_embedding(data: bytes, dimensions: int) -> List[float]:
+    """Deterministic unit vector derived from the bytes (identical input, identical vector)"""
+    seed = int.from_bytes(hashlib.sha256(data).digest()[:8], "big")
+    vector = np.random.default_rng(seed).standard_normal(dimensions)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class MemoryVectorStore:
+    """Brute-force cosine search with the OracleVectorStore interface"""
+
+    def __init__(self, embedding_model=None):
+        self.embedding_model = embedding_model
+        self._docs: Dict[str, Tuple[Dict[str, Any], np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    @_db_call
+    def add_documents(self, documents: List[Dict[str, Any]], embeddings: List[List[float]]):
+        with self._lock:
+            for doc, embedding in zip(documents, embeddings):
+                doc_id = doc.get("id", f"doc_{hash(doc['content'][:50])}")
+                vector = np.asarray(embedding, dtype=np.float32)
+                self._docs.setdefault(doc_id, ({
+                    "id": doc_id,
+                    "title": doc.get("title", ""),
+                    "content": doc.get("content", ""),
+                    "metadata": copy.deepcopy(doc.get("metadata", {}))
+                }, vector / (np.linalg.norm(vector) or 1.0)))
+
+    @_db_call
+    def similarity_search(self, query_embedding: List[float], k: int = 3) -> List[Dict[str, Any]]:
+        check_deadline("document similarity search")
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        with self._lock:
+            scored = [(1 - float(vec @ query), doc) for doc, vec in self._docs.values()]
+        scored.sort(key=lambda item: item[0])
+        return [{**doc, "distance": distance} for distance, doc in scored[:k]]
+
+    @_db_call
+    def get_document_count(self) -> int:
+        with self._lock:
+            return len(self._docs)
+
+    @_db_call
+    def clear_documents(self):
+        with self._lock:
+            self._docs.clear()
+
+
+class MemoryImageVectorStore:
+    """ImageVectorStore interface over hash embeddings (exact duplicates match, no CLIP)"""
+
+    def __init__(self):
+        self._images: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_image_embedding(self, image_bytes: bytes) -> List[float]:
+        return hash_embedding(image_bytes, 512)
+
+    @_db_call
+    def add_image(self, claim_id: str, image_name: str, image_bytes: bytes,
+                  damage_type: str = None, metadata: dict = None) -> str:
+        image_id = f"IMG-{uuid.uuid4().hex[:8].upper()}"
+        with self._lock:
+            self._images[image_id] = {
+                "image_id": image_id,
+                "claim_id": claim_id,
+                "image_name": image_name,
+                "image_data": image_bytes,
+                "embedding": np.asarray(self.get_image_embedding(image_bytes), dtype=np.float32),
+                "damage_type": damage_type or "unknown",
+                "metadata": metadata or {},
+                "created_at": datetime.now().isoformat()
+            }
+        return image_id
+
+    def add_images_batch(self, claim_id: str, images: List[Tuple[str, bytes]],
+                         damage_type: str = None) -> List[str]:
+        return [self.add_image(claim_id, name, data, damage_type) for name, data in images]
+
+    @_db_call
+    def find_similar_images(self, image_bytes: bytes, k: int = 5,
+                            exclude_claim_id: str = None) -> List[Dict[str, Any]]:
+        query = np.asarray(self.get_image_embedding(image_bytes), dtype=np.float32)
+        # Checked after the embedding, which is most of the cost
+        check_deadline("image similarity search")
+        with self._lock:
+            candidates = [img for img in self._images.values() if img["claim_id"] != exclude_claim_id]
+        scored = sorted(((float(img["embedding"] @ query), img) for img in candidates),
+                        key=lambda item: item[0], reverse=True)[:k]
+        return [{
+            "image_id": img["image_id"],
+            "claim_id": img["claim_id"],
+            "image_name": img["image_name"],
+            "damage_type": img["damage_type"],
+            "metadata": img["metadata"],
+            "similarity": round(similarity, 4),
+            "is_potential_fraud": similarity > 0.85
+        } for similarity, img in scored]
+
+    def check_for_duplicate_images(self, image_bytes: bytes, similarity_threshold: float = 0.85,
+                                   exclude_claim_id: str = None) -> Dict[str, Any]:
+        similar_images = self.find_similar_images(image_bytes, k=3, exclude_claim_id=exclude_claim_id)
+        duplicates = [img for img in similar_images if img["similarity"] >= similarity_threshold]
+        return {
+            "is_potential_duplicate": len(duplicates) > 0,
+            "duplicate_count": len(duplicates),
+            "similar_claims": [img["claim_id"] for img in duplicates],
+            "highest_similarity": max([img["similarity"] for img in similar_images]) if similar_images else 0,
+            "fraud_risk": "HIGH" if duplicates else "LOW",
+            "details": duplicates
+        }
+
+    @_db_call
+    def get_claim_images(self, claim_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{
+                "image_id": img["image_id"],
+                "image_name": img["image_name"],
+                "damage_type": img["damage_type"],
+                "metadata": img["metadata"],
+                "created_at": img["created_at"]
+            } for img in self._images.values() if img["claim_id"] == claim_id]
+
+    @_db_call
+    def get_image_data(self, image_id: str) -> Optional[bytes]:
+        with self._lock:
+            img = self._images.get(image_id)
+            return img["image_data"] if img else None
+
+    @_db_call
+    def get_image_count(self) -> int:
+        with self._lock:
+            return len(self._images)
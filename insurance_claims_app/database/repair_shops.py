@@ -0,0 +1,44 @@
+"""
+Repair Shop Names and Reputation Rows
+Shop name normalization shared by the repair_shops table, the reputation
+index and the fraud ring graph, plus the seed reputations
+"""
+import re
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple
+
+# Reputations a repair_shops row can carry; "standard" rows are learned from claims
+REPUTATIONS = ("trusted", "standard", "flagged")
+
+SAMPLE_REPAIR_SHOPS = [
+    ("Certified Auto Body", "trusted"),
+    ("Dealer Service Center", "trusted"),
+    ("National Chain Repairs", "trusted"),
+    ("OEM Authorized Collision Center", "trusted"),
+    ("Quick Fix Auto", "flagged"),
+    ("Cheap Dent Discount Repairs", "flagged"),
+]
+
+
+@lru_cache(maxsize=65536)
+def normalize_shop_name(name: Optional[str]) -> str:
+    """"  Joe's  Auto-Body " -> "joe s auto body"; shops are stored and matched on this form"""
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", (name or "").lower()).split())
+
+
+def trigrams(key: str) -> FrozenSet[str]:
+    """Character trigrams of a normalized name, padded so word edges count"""
+    padded = f"  {key} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def fraud_count_deltas(old_score: Optional[float], new_score: Optional[float], high: float) -> Tuple[int, int]:
+    """
+    (scored claims delta, fraud claims delta) for a claim's fraud score
+    changing from old_score to new_score. A claim counts once however often
+    it is re-scored, and as a fraud claim while its score is above `high`.
+    """
+    if new_score is None:
+        return 0, 0
+    was_fraud = old_score is not None and old_score > high
+    return int(old_score is None), int(new_score > high) - int(was_fraud)
@@ -9,7 +9,7 @@ import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from .models import get_connection, release_connection
+from .models import get_connection, release_connection, deadline_bounded
 
 class OracleVectorStore:
     """Vector store using Oracle 23ai native vector capabilities"""
@@ -96,39 +96,43 @@ class OracleVectorStore:
     def similarity_search(self, query_embedding: List[float], k: int = 3) -> List[Dict[str, Any]]:
         """Search for similar documents using Oracle vector similarity"""
         conn = get_connection()
-        cursor = conn.cursor()
         
         # Convert query embedding to Oracle VECTOR format
         embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
         
-        # Use Oracle's VECTOR_DISTANCE function for similarity search
-        cursor.execute("""
-            SELECT doc_id, title, content, metadata,
-                   VECTOR_DISTANCE(embedding, TO_VECTOR(:1, 384, FLOAT32), COSINE) as distance
-            FROM policy_documents
-            ORDER BY distance
-            FETCH FIRST :2 ROWS ONLY
-        """, [embedding_str, k])
-        
-        results = []
-        for row in cursor.fetchall():
-            content = row[2]
-            if hasattr(content, 'read'):
-                content = content.read()
-            
-            metadata = row[3]
-            if hasattr(metadata, 'read'):
-                metadata = metadata.read()
-            
-            results.append({
-                "id": row[0],
-                "title": row[1],
-                "content": content,
-                "metadata": json.loads(metadata) if metadata else {},
-                "distance": row[4]
-            })
-        
-        release_connection(conn)
+        try:
+            # Within a claim, the search gets whatever is left of its budget
+            with deadline_bounded(conn, "document similarity search"):
+                cursor = conn.cursor()
+                
+                # Use Oracle's VECTOR_DISTANCE function for similarity search
+                cursor.execute("""
+                    SELECT doc_id, title, content, metadata,
+                           VECTOR_DISTANCE(embedding, TO_VECTOR(:1, 384, FLOAT32), COSINE) as distance
+                    FROM policy_documents
+                    ORDER BY distance
+                    FETCH FIRST :2 ROWS ONLY
+                """, [embedding_str, k])
+                
+                results = []
+                for row in cursor.fetchall():
+                    content = row[2]
+                    if hasattr(content, 'read'):
+                        content = content.read()
+                    
+                    metadata = row[3]
+                    if hasattr(metadata, 'read'):
+                        metadata = metadata.read()
+                    
+                    results.append({
+                        "id": row[0],
+                        "title": row[1],
+                        "content": content,
+                        "metadata": json.loads(metadata) if metadata else {},
+                        "distance": row[4]
+                    })
+        finally:
+            release_connection(conn)
         return results
     
     def get_document_count(self) -> int:
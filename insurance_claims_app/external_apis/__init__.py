@@ -1,13 +1,44 @@
-from .car_damage_api import CarDamageAPI
-from .fraud_scoring_api import FraudScoringAPI
-from .policy_management_api import PolicyManagementAPI
-from .payment_api import PaymentAPI
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import config
+
+if config.EXTERNAL_API_BACKEND == "http":
+    # Remote vendors: same classes and methods, calls go over the pooled vendor transport
+    from .remote_apis import (
+        RemoteCarDamageAPI as CarDamageAPI,
+        RemoteFraudScoringAPI as FraudScoringAPI,
+        RemotePolicyManagementAPI as PolicyManagementAPI,
+        RemotePaymentAPI as PaymentAPI
+    )
+else:
+    from .car_damage_api import CarDamageAPI
+    from .fraud_scoring_api import FraudScoringAPI
+    from .policy_management_api import PolicyManagementAPI
+    from .payment_api import PaymentAPI
+from .ach_file import AchBatchWriter
 from .document_api import DocumentManagementAPI
+from .llm_client import SharedLLMClient, get_llm_client
+from .http_transport import VendorError, CircuitOpenError, get_vendor_clients, close_vendor_clients
+from .deadline import Deadline, DeadlineExceeded, deadline_scope, current_deadline, check_deadline, budget_running_low
 
 __all__ = [
     "CarDamageAPI",
     "FraudScoringAPI", 
     "PolicyManagementAPI",
     "PaymentAPI",
-    "DocumentManagementAPI"
+    "AchBatchWriter",
+    "DocumentManagementAPI",
+    "SharedLLMClient",
+    "get_llm_client",
+    "Deadline",
+    "DeadlineExceeded",
+    "deadline_scope",
+    "current_deadline",
+    "check_deadline",
+    "budget_running_low",
+    "VendorError",
+    "CircuitOpenError",
+    "get_vendor_clients",
+    "close_vendor_clients"
 ]
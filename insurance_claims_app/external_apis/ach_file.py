@@ -0,0 +1,135 @@
+"""
+ACH Batch Files (NACHA format)
+Streaming writer for one-batch credit files: entries go to disk as they are
+added and the control totals are kept as running sums, so a file of any
+size is written in constant memory
+"""
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+RECORD_SIZE = 94
+BLOCKING_FACTOR = 10
+SERVICE_CLASS_CREDITS = "220"
+TRANSACTION_CHECKING_CREDIT = "22"
+
+
+def _alpha(value: Any, width: int) -> str:
+    return str(value or "").upper()[:width].ljust(width)
+
+
+def _numeric(value: int, width: int) -> str:
+    return str(int(value)).rjust(width, "0")[-width:]
+
+
+class AchBatchWriter:
+    """
+    Writes one PPD credit batch to `path`.
+
+    Use as a context manager: add() writes an entry detail record right
+    away; closing writes the batch and file control records and the block
+    padding, then moves the finished file into place. A writer that exits
+    with an exception leaves no file behind.
+
+    Payee bank accounts are held by the payment processor, so each entry
+    routes to the processor (destination_routing) and identifies the payee
+    by customer id, with the claim id as individual id.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_number: int,
+        origin_routing: str,
+        destination_routing: str,
+        company_id: str,
+        company_name: str,
+        effective_date: Optional[datetime] = None,
+        description: str = "CLAIMPAY"
+    ):
+        self.path = path
+        self.batch_number = batch_number
+        self.origin_routing = origin_routing
+        self.destination_routing = destination_routing
+        self.company_id = company_id
+        self.company_name = company_name
+        self.description = description
+        self.created = datetime.now()
+        self.effective_date = effective_date or self.created + timedelta(days=1)
+        self.entry_count = 0
+        self.entry_hash = 0
+        self.total_credit_cents = 0
+        self._records = 0
+        self._file = None
+
+    def __enter__(self) -> "AchBatchWriter":
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path + ".part", "w", encoding="ascii", newline="\n", buffering=1 << 16)
+        self._write_headers()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._file.close()
+            os.remove(self.path + ".part")
+            return False
+        self._write_controls()
+        self._file.close()
+        os.replace(self.path + ".part", self.path)
+        return False
+
+    def _write(self, record: str):
+        assert len(record) == RECORD_SIZE, f"ACH record is {len(record)} characters"
+        self._file.write(record + "\n")
+        self._records += 1
+
+    def _write_headers(self):
+        self._write(
+            "101" + " " + _numeric(self.destination_routing, 9) + _alpha(self.company_id, 10)
+            + self.created.strftime("%y%m%d%H%M") + "A" + "094" + "10" + "1"
+            + _alpha("PAYMENT PROCESSOR", 23) + _alpha(self.company_name, 23) + _alpha("", 8)
+        )
+        self._write(
+            "5" + SERVICE_CLASS_CREDITS + _alpha(self.company_name, 16) + _alpha("", 20) + _alpha(self.company_id, 10)
+            + "PPD" + _alpha(self.description, 10) + self.created.strftime("%y%m%d")
+            + self.effective_date.strftime("%y%m%d") + "   " + "1" + self.origin_routing[:8]
+            + _numeric(self.batch_number, 7)
+        )
+
+    def add(self, idempotency_key: str, claim_id: str, customer_id: str, amount_cents: int) -> str:
+        """Write one credit entry; returns its trace number"""
+        self.entry_count += 1
+        routing = _numeric(self.destination_routing, 9)
+        self.entry_hash += int(routing[:8])
+        self.total_credit_cents += amount_cents
+        trace_number = self.origin_routing[:8] + _numeric(self.entry_count, 7)
+        self._write(
+            "6" + TRANSACTION_CHECKING_CREDIT + routing + _alpha(customer_id, 17) + _numeric(amount_cents, 10)
+            + _alpha(claim_id, 15) + _alpha(idempotency_key, 22) + "  " + "0" + trace_number
+        )
+        return trace_number
+
+    def _write_controls(self):
+        entry_hash = _numeric(self.entry_hash % 10 ** 10, 10)
+        self._write(
+            "8" + SERVICE_CLASS_CREDITS + _numeric(self.entry_count, 6) + entry_hash + _numeric(0, 12)
+            + _numeric(self.total_credit_cents, 12) + _alpha(self.company_id, 10) + _alpha("", 19) + _alpha("", 6)
+            + self.origin_routing[:8] + _numeric(self.batch_number, 7)
+        )
+        blocks = (self._records + 1 + BLOCKING_FACTOR - 1) // BLOCKING_FACTOR
+        self._write(
+            "9" + _numeric(1, 6) + _numeric(blocks, 6) + _numeric(self.entry_count, 8) + entry_hash
+            + _numeric(0, 12) + _numeric(self.total_credit_cents, 12) + _alpha("", 39)
+        )
+        while self._records % BLOCKING_FACTOR:
+            self._file.write("9" * RECORD_SIZE + "\n")
+            self._records += 1
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "batch_number": self.batch_number,
+            "entry_count": self.entry_count,
+            "entry_hash": self.entry_hash % 10 ** 10,
+            "total_credit_cents": self.total_credit_cents
+        }
@@ -4,6 +4,7 @@ Analyzes damage photos and returns damage assessment
 """
 import random
 from typing import List, Dict, Any
+from .deadline import check_deadline
 
 class CarDamageAPI:
     """Mock Car Damage Detection API similar to Arya.ai"""
@@ -21,8 +22,15 @@ class CarDamageAPI:
         "total_loss": (20000, 50000)
     }
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, seed: int = None):
         self.api_key = api_key
+        self.seed = seed
+    
+    def _rng(self, *inputs):
+        """Per-call generator; with a seed, identical inputs always analyze identically"""
+        if self.seed is None:
+            return random
+        return random.Random(f"{self.seed}:{inputs!r}")
     
     def analyze_damage(self, photos: List[str], estimated_amount: float = None) -> Dict[str, Any]:
         """
@@ -35,7 +43,9 @@ class CarDamageAPI:
         Returns:
             Dict with damaged_parts, total_estimated_repair_cost, confidence
         """
+        check_deadline("car damage analysis")
         # Mock implementation - in production, this would call actual API
+        rng = self._rng(list(photos or []), estimated_amount)
         num_photos = len(photos) if photos else 1
         
         # Determine severity based on estimated amount or random
@@ -49,19 +59,19 @@ class CarDamageAPI:
             else:
                 severity = "total_loss"
         else:
-            severity = random.choice(list(self.DAMAGE_SEVERITY.keys()))
+            severity = rng.choice(list(self.DAMAGE_SEVERITY.keys()))
         
         # Generate damaged parts
         num_parts = {"minor": 1, "moderate": 2, "severe": 4, "total_loss": 6}[severity]
-        damaged_parts = random.sample(self.DAMAGE_PARTS, min(num_parts, len(self.DAMAGE_PARTS)))
+        damaged_parts = rng.sample(self.DAMAGE_PARTS, min(num_parts, len(self.DAMAGE_PARTS)))
         
         # Calculate repair cost
         min_cost, max_cost = self.DAMAGE_SEVERITY[severity]
         if estimated_amount:
             # Use estimated amount with some variance
-            repair_cost = estimated_amount * random.uniform(0.85, 1.15)
+            repair_cost = estimated_amount * rng.uniform(0.85, 1.15)
         else:
-            repair_cost = random.uniform(min_cost, max_cost)
+            repair_cost = rng.uniform(min_cost, max_cost)
         
         # Confidence based on number of photos
         base_confidence = 0.7
@@ -0,0 +1,79 @@
+"""
+Per-Claim Deadline Budget
+A claim's deadline is set once at submission and checked by every workflow
+node and external client that runs on its behalf
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from monitoring import get_registry
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar("claim_deadline", default=None)
+
+DEADLINE_FALLBACKS = get_registry().counter(
+    "claim_deadline_fallbacks_total", "Degraded paths taken because a claim's deadline was close or past, by fallback"
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The claim's time budget ran out before `operation` could start"""
+
+    def __init__(self, operation: str):
+        super().__init__(f"Claim deadline exceeded before {operation}")
+        self.operation = operation
+
+
+class Deadline:
+    """Absolute point in (monotonic) time by which a claim should be decided"""
+    __slots__ = ("expires_at", "budget_ms")
+
+    def __init__(self, expires_at: float, budget_ms: float):
+        self.expires_at = expires_at
+        self.budget_ms = budget_ms
+
+    @classmethod
+    def after(cls, budget_ms: float = None) -> "Deadline":
+        budget_ms = config.CLAIM_DEADLINE_MS if budget_ms is None else budget_ms
+        return cls(time.monotonic() + budget_ms / 1000.0, budget_ms)
+
+    def remaining_ms(self) -> float:
+        return max(0.0, (self.expires_at - time.monotonic()) * 1000)
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def running_low(self) -> bool:
+        """Less than CLAIM_DEADLINE_RESERVE_MS left: time to skip optional work"""
+        return self.remaining_ms() < config.CLAIM_DEADLINE_RESERVE_MS
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Make `deadline` the current claim's deadline in this context (and the workflow threads it starts)"""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+def check_deadline(operation: str):
+    """Raise DeadlineExceeded if the current claim is out of time; no-op outside a claim"""
+    deadline = _current_deadline.get()
+    if deadline is not None and deadline.expired():
+        raise DeadlineExceeded(operation)
+
+
+def budget_running_low() -> bool:
+    deadline = _current_deadline.get()
+    return deadline is not None and deadline.running_low()
@@ -3,6 +3,14 @@ Document Management API (Mock implementation)
 Retrieves policy documents for RAG
 """
 from typing import Dict, Any, List
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+
+# Shared BM25 index over the policy chunks (built once per process)
+_lexical_index = None
 
 class DocumentManagementAPI:
     """Mock Document Management API for RAG"""
@@ -146,18 +154,43 @@ Log into your account or contact customer service to track payment status.
             })
         return documents
     
-    def search_documents(self, query: str) -> List[Dict[str, Any]]:
-        """Simple keyword search in documents"""
-        results = []
-        query_lower = query.lower()
-        
-        for doc_id, content in self.POLICY_DOCUMENTS.items():
-            if query_lower in content.lower():
-                results.append({
-                    "id": doc_id,
-                    "title": doc_id.replace("_", " ").title(),
-                    "content": content.strip(),
-                    "relevance": content.lower().count(query_lower)
-                })
+    def get_policy_chunks(self) -> List[Dict[str, Any]]:
+        """
+        Split policy documents into paragraph chunks for retrieval.
         
-        return sorted(results, key=lambda x: x["relevance"], reverse=True)
+        Chunk ids match the doc_id used in the Oracle vector store, so lexical
+        and vector results can be fused by id.
+        """
+        chunks = []
+        for doc in self.get_policy_documents():
+            paragraphs = doc["content"].split("\n\n")
+            for i, para in enumerate(paragraphs):
+                if para.strip():
+                    chunks.append({
+                        "id": f"{doc['id']}_{i}",
+                        "title": doc["title"],
+                        "content": para.strip(),
+                        "metadata": {"source": doc["id"], "chunk": i}
+                    })
+        return chunks
+    
+    def get_lexical_index(self):
+        """Get the BM25 index over policy chunks, loading the persisted copy if current"""
+        global _lexical_index
+        if _lexical_index is None:
+            from database.lexical_index import BM25Index
+            _lexical_index = BM25Index.load_or_build(config.LEXICAL_INDEX_PATH, self.get_policy_chunks())
+        return _lexical_index
+    
+    def search_documents(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        """BM25 keyword search over policy chunks"""
+        results = []
+        for hit in self.get_lexical_index().search(query, k=k):
+            results.append({
+                "id": hit["id"],
+                "title": hit["title"],
+                "content": hit["content"],
+                "source": hit["metadata"]["source"],
+                "relevance": hit["score"]
+            })
+        return results
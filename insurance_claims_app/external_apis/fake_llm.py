@@ -0,0 +1,142 @@
+"""
+Fake Chat Model (local stand-in for OCI GenAI)
+Lets the LLM client layer, agents and load tests run without network access
+"""
+import hashlib
+import math
+import random
+import threading
+import time
+from typing import Callable, List, Optional, Any, Union
+
+import numpy as np
+from langchain_core.messages import AIMessage
+
+
+class FakeLLMError(Exception):
+    """Error raised by the fake model; `status` mimics the OCI ServiceError field"""
+
+    def __init__(self, message: str, status: int = 500):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_latency(spec: Union[str, float, None]) -> Callable[[random.Random], float]:
+    """
+    Parse a latency distribution into a sampler returning milliseconds.
+
+    Accepted forms: a number (constant), "constant:MS", "uniform:LO:HI",
+    "normal:MEAN:STDDEV" and "lognormal:MEDIAN:SIGMA" (heavy tail, like real
+    provider latency).
+    """
+    if spec is None or spec == "":
+        return lambda rng: 0.0
+    if isinstance(spec, (int, float)):
+        return lambda rng: float(spec)
+
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    if kind == "constant" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0]) if values[0] > 0 else 0.0
+        return lambda rng: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Invalid latency distribution: {spec!r}")
+
+
+class FakeChatModel:
+    """
+    Minimal chat model with the `invoke(messages)` surface of ChatOCIGenAI.
+
+    Args:
+        responses: Replies returned in order (cycled); defaults to an echo
+        latency_ms: Delay per call, a number or a distribution (see `parse_latency`)
+        fail_first: Number of leading calls that raise `FakeLLMError`
+        fail_status: HTTP-style status carried by injected errors (429 = throttled)
+        seed: Latency is drawn from a generator seeded by (seed, prompt), so a
+            replayed workload sees the same delays regardless of call order
+    """
+
+    def __init__(
+        self,
+        responses: Optional[List[str]] = None,
+        latency_ms: Union[str, float, None] = 0,
+        fail_first: int = 0,
+        fail_status: int = 429,
+        seed: int = 0
+    ):
+        self.responses = responses or []
+        self.latency_ms = latency_ms
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.seed = seed
+        self.calls = 0
+        self._sample_latency = parse_latency(latency_ms)
+        self._lock = threading.Lock()
+
+    def invoke(self, messages: Any, **kwargs) -> AIMessage:
+        with self._lock:
+            call_number = self.calls
+            self.calls += 1
+
+        prompt = self._prompt_text(messages)
+        delay_ms = self._sample_latency(random.Random(f"{self.seed}:{prompt}"))
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000.0)
+
+        if call_number < self.fail_first:
+            raise FakeLLMError(f"Injected failure on call {call_number + 1}", status=self.fail_status)
+
+        if self.responses:
+            content = self.responses[call_number % len(self.responses)]
+        else:
+            content = f"[fake-llm] {prompt[-200:]}"
+
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": self._count_tokens(prompt),
+                "output_tokens": self._count_tokens(content),
+                "total_tokens": self._count_tokens(prompt) + self._count_tokens(content)
+            }
+        )
+
+    @staticmethod
+    def _prompt_text(messages: Any) -> str:
+        if isinstance(messages, str):
+            return messages
+        return "\n".join(getattr(m, "content", str(m)) for m in messages)
+
+    @staticmethod
+    def _count_tokens(text: str) -> int:
+        # Rough whitespace count; good enough for metrics in tests
+        return len(text.split())
+
+
+class FakeEmbeddingModel:
+    """
+    Stand-in for SentenceTransformer: deterministic hashed bag-of-words vectors.
+
+    Texts sharing words land close together, so retrieval still behaves
+    sensibly in load tests without downloading a model.
+    """
+
+    def __init__(self, dimensions: int = 384):
+        self.dimensions = dimensions
+
+    def encode(self, texts: Union[str, List[str]]) -> np.ndarray:
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        vectors = np.zeros((len(batch), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(batch):
+            for word in text.lower().split():
+                bucket = int.from_bytes(hashlib.md5(word.encode()).digest()[:4], "big")
+                vectors[row, bucket % self.dimensions] += 1.0
+            norm = np.linalg.norm(vectors[row])
+            if norm:
+                vectors[row] /= norm
+        return vectors[0] if single else vectors
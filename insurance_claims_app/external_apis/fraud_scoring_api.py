@@ -3,7 +3,14 @@ Fraud Scoring API (Mock implementation - simulates Fraud.ai)
 Scores fraud risk for insurance claims
 """
 import random
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Sequence
+
+import numpy as np
+
+from .deadline import check_deadline
+
+# Shops whose names contain one of these are treated as verified
+KNOWN_SHOPS = ("certified_auto", "dealer_service", "national_chain")
 
 class FraudScoringAPI:
     """Mock Fraud Scoring API similar to Fraud.ai"""
@@ -28,8 +35,15 @@ class FraudScoringAPI:
         (0.7, 1.0): "HIGH"
     }
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, seed: int = None):
         self.api_key = api_key
+        self.seed = seed
+    
+    def _rng(self, *inputs):
+        """Per-call generator; with a seed, identical inputs always score identically"""
+        if self.seed is None:
+            return random
+        return random.Random(f"{self.seed}:{inputs!r}")
     
     def score_claim(
         self,
@@ -52,6 +66,9 @@ class FraudScoringAPI:
         Returns:
             Dict with fraud_score, fraud_indicators, risk_level
         """
+        check_deadline("fraud scoring")
+        rng = self._rng(claim_amount, repair_shop, claimant_id, vehicle_age, damage_type)
+        
         # Mock scoring logic
         base_score = 0.15
         indicators = []
@@ -69,19 +86,18 @@ class FraudScoringAPI:
             indicators.append("high_claim_old_vehicle")
         
         # Unknown repair shops are riskier
-        known_shops = ["certified_auto", "dealer_service", "national_chain"]
-        if repair_shop and not any(shop in repair_shop.lower() for shop in known_shops):
+        if repair_shop and not any(shop in repair_shop.lower() for shop in KNOWN_SHOPS):
             base_score += 0.1
             indicators.append("unverified_repair_shop")
         
         # Add some randomness for simulation
-        base_score += random.uniform(-0.1, 0.15)
+        base_score += rng.uniform(-0.1, 0.15)
         
         # Clamp score between 0 and 1
         fraud_score = max(0.0, min(1.0, base_score))
         
-        # Determine risk level
-        risk_level = "LOW"
+        # Determine risk level (the ranges are half-open, so a clamped 1.0 is HIGH)
+        risk_level = "HIGH"
         for (low, high), level in self.RISK_LEVELS.items():
             if low <= fraud_score < high:
                 risk_level = level
@@ -89,7 +105,7 @@ class FraudScoringAPI:
         
         # Add random indicators for high scores
         if fraud_score > 0.5:
-            additional = random.sample(self.FRAUD_INDICATORS, min(2, len(self.FRAUD_INDICATORS)))
+            additional = rng.sample(self.FRAUD_INDICATORS, min(2, len(self.FRAUD_INDICATORS)))
             indicators.extend([i for i in additional if i not in indicators])
         
         return {
@@ -97,9 +113,66 @@ class FraudScoringAPI:
             "fraud_indicators": indicators,
             "risk_level": risk_level,
             "recommendation": self._get_recommendation(fraud_score),
-            "confidence": round(random.uniform(0.75, 0.95), 2)
+            "confidence": round(rng.uniform(0.75, 0.95), 2)
         }
     
+    def score_claims_batch(
+        self,
+        claim_amounts: Sequence[float],
+        repair_shops: Sequence[str],
+        vehicle_ages: Sequence[int],
+        rng: np.random.Generator = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score many claims at once with array operations.
+
+        Applies the same rules as score_claim to whole columns. The
+        simulation noise comes from `rng`, or from a generator seeded with
+        this API's seed, so a given seed and claim order always give the
+        same scores. Single-claim calls seed per claim instead, so the two
+        paths share the rules but not the noise. The randomly sampled extra
+        indicators of high scores are not simulated.
+
+        Returns:
+            Columns fraud_score, risk_level, recommendation, high_value_claim,
+            high_claim_old_vehicle and unverified_repair_shop, one entry per claim
+        """
+        check_deadline("fraud scoring")
+        amounts = np.asarray(claim_amounts, dtype=float)
+        ages = np.asarray(vehicle_ages, dtype=float)
+        shops = np.char.lower(np.asarray(repair_shops, dtype=str))
+        if rng is None:
+            rng = np.random.default_rng(self.seed)
+
+        high_value = amounts > 15000
+        high_claim_old_vehicle = (ages > 10) & (amounts > 10000)
+        known = np.zeros(amounts.shape, dtype=bool)
+        for shop in KNOWN_SHOPS:
+            known |= np.char.find(shops, shop) >= 0
+        unverified_shop = (np.char.str_len(shops) > 0) & ~known
+
+        score = (
+            0.15
+            + np.where(high_value, 0.15, np.where(amounts > 8000, 0.08, 0.0))
+            + 0.2 * high_claim_old_vehicle
+            + 0.1 * unverified_shop
+            + rng.uniform(-0.1, 0.15, amounts.shape)
+        )
+        score = np.clip(score, 0.0, 1.0)
+
+        # Same cut points as RISK_LEVELS and _get_recommendation
+        band = np.searchsorted([0.2, 0.4, 0.7], score, side="right")
+        return {
+            "fraud_score": np.round(score, 3),
+            "risk_level": np.array(["LOW", "MODERATE_LOW", "MODERATE_HIGH", "HIGH"])[band],
+            "recommendation": np.array([
+                "AUTO_APPROVE", "APPROVE_WITH_MONITORING", "MANUAL_REVIEW_RECOMMENDED", "INVESTIGATION_REQUIRED"
+            ])[band],
+            "high_value_claim": high_value,
+            "high_claim_old_vehicle": high_claim_old_vehicle,
+            "unverified_repair_shop": unverified_shop
+        }
+
     def _get_recommendation(self, score: float) -> str:
         if score < 0.2:
             return "AUTO_APPROVE"
@@ -0,0 +1,394 @@
+"""
+Vendor HTTP Transport
+Shared, pooled async HTTP clients for the remote vendor APIs (Arya, Fraud.ai,
+Vertafore, the payment processor) with per-vendor concurrency limits,
+timeouts, retries, circuit breakers and hedged reads
+"""
+import asyncio
+import concurrent.futures
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from config import config
+from monitoring import get_registry
+from .deadline import DeadlineExceeded, check_deadline, current_deadline
+from .llm_client import RETRYABLE_STATUSES
+
+VENDORS = ("arya", "fraud", "vertafore", "payments")
+
+_metrics = get_registry()
+VENDOR_LATENCY = _metrics.histogram("vendor_request_latency_ms", "Vendor HTTP attempt latency by vendor and outcome")
+VENDOR_REQUESTS = _metrics.counter("vendor_requests_total", "Vendor requests by vendor and final outcome")
+VENDOR_RETRIES = _metrics.counter("vendor_retries_total", "Retried vendor attempts by vendor")
+VENDOR_HEDGES = _metrics.counter("vendor_hedges_total", "Hedged vendor reads by vendor and winning copy")
+VENDOR_CIRCUIT_OPENED = _metrics.counter("vendor_circuit_opened_total", "Times a vendor circuit opened")
+VENDOR_IN_FLIGHT = _metrics.gauge("vendor_in_flight", "Vendor attempts holding a concurrency slot")
+
+
+def parse_vendor_settings(spec: str, cast: Callable[[str], Any] = str) -> Dict[str, Any]:
+    """"arya=16,fraud=32" -> {"arya": 16, "fraud": 32}; unknown vendors are rejected"""
+    settings = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        vendor, _, value = part.partition("=")
+        vendor = vendor.strip()
+        if vendor not in VENDORS:
+            raise ValueError(f"Unknown vendor in vendor settings: {vendor!r}")
+        settings[vendor] = cast(value.strip())
+    return settings
+
+
+class VendorError(Exception):
+    """A vendor request failed; `status` is the HTTP status, None for transport errors"""
+
+    def __init__(self, vendor: str, message: str, status: int = None):
+        super().__init__(f"{vendor}: {message}")
+        self.vendor = vendor
+        self.status = status
+
+
+class CircuitOpenError(VendorError):
+    """The vendor's circuit is open; the request was not sent"""
+
+    def __init__(self, vendor: str):
+        super().__init__(vendor, "circuit open, request not sent", status=503)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After `failure_threshold` failed attempts in a row the circuit opens and
+    requests fail fast. Once `reset_s` has passed, one trial request is let
+    through (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = None, reset_s: float = None, vendor: str = ""):
+        self.failure_threshold = failure_threshold or config.VENDOR_CIRCUIT_FAILURES
+        self.reset_s = reset_s if reset_s is not None else config.VENDOR_CIRCUIT_RESET_S
+        self.vendor = vendor
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_s:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_abandoned(self):
+        """An attempt ended without an outcome (cancelled, or failed before it was sent)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or (self.state == "closed" and self._failures >= self.failure_threshold):
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                VENDOR_CIRCUIT_OPENED.inc(vendor=self.vendor)
+            self._trial_in_flight = False
+
+
+class VendorTransport:
+    """
+    Async client for one vendor over one keep-alive connection pool.
+
+    At most `max_concurrency` attempts are in flight (the pool has as many
+    connections). Idempotent requests - GETs, requests carrying an
+    Idempotency-Key and reads sent as POST - are retried on throttling,
+    server errors and transport errors with full-jitter backoff. Reads that
+    have not answered after `hedge_delay_ms` are sent a second time and the
+    first answer wins. Every attempt counts towards the circuit breaker.
+    """
+
+    def __init__(
+        self,
+        vendor: str,
+        base_url: str,
+        max_concurrency: int = 16,
+        timeout_s: float = None,
+        connect_timeout_s: float = None,
+        max_retries: int = None,
+        backoff_base: float = None,
+        backoff_max: float = None,
+        hedge_delay_ms: float = None,
+        breaker: CircuitBreaker = None,
+        transport: httpx.AsyncBaseTransport = None
+    ):
+        self.vendor = vendor
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.timeout_s = timeout_s if timeout_s is not None else config.VENDOR_TIMEOUT_S
+        self.connect_timeout_s = connect_timeout_s if connect_timeout_s is not None else config.VENDOR_CONNECT_TIMEOUT_S
+        self.max_retries = max_retries if max_retries is not None else config.VENDOR_MAX_RETRIES
+        self.backoff_base = backoff_base if backoff_base is not None else config.VENDOR_BACKOFF_BASE_S
+        self.backoff_max = backoff_max if backoff_max is not None else config.VENDOR_BACKOFF_MAX_S
+        self.hedge_delay_ms = hedge_delay_ms if hedge_delay_ms is not None else config.VENDOR_HEDGE_DELAY_MS
+        self.breaker = breaker or CircuitBreaker(vendor=vendor)
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        # Created on first use so both belong to the loop that runs the requests
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+                timeout=httpx.Timeout(self.timeout_s, connect=self.connect_timeout_s),
+                transport=self._transport
+            )
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        json: Any = None,
+        headers: Dict[str, str] = None,
+        read: bool = None,
+        timeout_s: float = None
+    ) -> Any:
+        """
+        Send one request and return the decoded JSON body.
+
+        `read` marks a request without side effects (default: GET); reads
+        are hedged and retried. Writes are retried only with an
+        Idempotency-Key header. `timeout_s` bounds the whole request - the
+        wait for a slot, every attempt, backoff and hedges (the claim's
+        remaining deadline). Raises VendorError, or CircuitOpenError
+        without sending anything.
+        """
+        self._ensure_client()
+        if timeout_s is None:
+            return await self._request(method, path, json, headers, read, None)
+        try:
+            return await asyncio.wait_for(
+                self._request(method, path, json, headers, read, time.monotonic() + timeout_s), timeout_s
+            )
+        except asyncio.TimeoutError:
+            VENDOR_REQUESTS.inc(vendor=self.vendor, outcome="timeout")
+            raise VendorError(self.vendor, f"no answer within {timeout_s:.3f}s")
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        json: Any,
+        headers: Optional[Dict[str, str]],
+        read: Optional[bool],
+        expires_at: Optional[float]
+    ) -> Any:
+        read = method.upper() == "GET" if read is None else read
+        retryable = read or bool(headers and "Idempotency-Key" in headers)
+        # Each attempt gets what is left of the request's time
+        remaining = lambda: None if expires_at is None else max(0.001, expires_at - time.monotonic())
+        send = lambda: self._attempt(method, path, json, headers, remaining())
+        hedge = read and self.hedge_delay_ms > 0
+
+        attempt = 0
+        while True:
+            try:
+                body = await (self._hedged(send) if hedge else send())
+            except VendorError as e:
+                backoff = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt + 1))))
+                if isinstance(e, CircuitOpenError) or not retryable or attempt >= self.max_retries or (
+                    e.status is not None and e.status not in RETRYABLE_STATUSES
+                ) or (expires_at is not None and time.monotonic() + backoff >= expires_at):
+                    VENDOR_REQUESTS.inc(vendor=self.vendor, outcome="error")
+                    raise
+                attempt += 1
+                VENDOR_RETRIES.inc(vendor=self.vendor)
+                await asyncio.sleep(backoff)
+                continue
+            VENDOR_REQUESTS.inc(vendor=self.vendor, outcome="ok")
+            return body
+
+    async def _hedged(self, send: Callable):
+        """Send; if no answer within hedge_delay_ms, send again and take the first success"""
+        first = asyncio.ensure_future(send())
+        done, _ = await asyncio.wait({first}, timeout=self.hedge_delay_ms / 1000)
+        if done:
+            return first.result()
+
+        second = asyncio.ensure_future(send())
+        pending = {first, second}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        VENDOR_HEDGES.inc(vendor=self.vendor, winner="primary" if task is first else "hedge")
+                        return task.result()
+                    error = task.exception()
+            VENDOR_HEDGES.inc(vendor=self.vendor, winner="none")
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _attempt(self, method: str, path: str, json: Any, headers: Optional[Dict[str, str]], timeout_s: Optional[float]):
+        timeout = httpx.USE_CLIENT_DEFAULT
+        if timeout_s is not None and timeout_s < self.timeout_s:
+            timeout = httpx.Timeout(timeout_s, connect=min(self.connect_timeout_s, timeout_s))
+
+        async with self._slots:
+            # Asked only once a slot is held: a half-open trial is never left waiting for one
+            if not self.breaker.allow():
+                raise CircuitOpenError(self.vendor)
+            VENDOR_IN_FLIGHT.inc(vendor=self.vendor)
+            started = time.perf_counter()
+            try:
+                response = await self._client.request(method, path, json=json, headers=headers, timeout=timeout)
+            except httpx.HTTPError as e:
+                self._finish(started, "transport_error", failed=True)
+                raise VendorError(self.vendor, f"{type(e).__name__}: {e}") from e
+            except BaseException as e:
+                # A hedge lost the race, or the request could not be built; says
+                # nothing about the vendor's health, but frees a half-open trial
+                self._finish(started, "cancelled" if isinstance(e, asyncio.CancelledError) else "client_error", failed=None)
+                raise
+            finally:
+                VENDOR_IN_FLIGHT.dec(vendor=self.vendor)
+
+        if response.status_code >= 400:
+            # Client errors are the caller's fault, not the vendor's
+            self._finish(started, str(response.status_code), failed=response.status_code >= 500 or response.status_code == 429)
+            raise VendorError(self.vendor, f"HTTP {response.status_code}: {response.text[:200]}", status=response.status_code)
+        self._finish(started, "ok", failed=False)
+        return response.json() if response.content else None
+
+    def _finish(self, started: float, outcome: str, failed: Optional[bool]):
+        VENDOR_LATENCY.observe((time.perf_counter() - started) * 1000, vendor=self.vendor, outcome=outcome)
+        if failed is None:
+            self.breaker.record_abandoned()
+        elif failed:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class VendorClients:
+    """
+    One VendorTransport per vendor on a private event loop thread.
+
+    Agents run in worker threads; call() hands the request to the loop and
+    waits for it, so every thread shares the same connection pools.
+    """
+
+    def __init__(self, base_urls: Dict[str, str] = None, max_concurrency: Dict[str, int] = None, **transport_kwargs):
+        self.base_urls = base_urls or parse_vendor_settings(config.VENDOR_BASE_URLS)
+        self.max_concurrency = max_concurrency or parse_vendor_settings(config.VENDOR_MAX_CONCURRENCY, int)
+        self.transport_kwargs = transport_kwargs
+        self._transports: Dict[str, VendorTransport] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def transport(self, vendor: str) -> VendorTransport:
+        with self._lock:
+            if vendor not in self._transports:
+                if vendor not in self.base_urls:
+                    raise ValueError(f"No base URL configured for vendor {vendor!r}")
+                self._transports[vendor] = VendorTransport(
+                    vendor, self.base_urls[vendor], self.max_concurrency.get(vendor, 16), **self.transport_kwargs
+                )
+            return self._transports[vendor]
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="vendor-http", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def call(self, vendor: str, method: str, path: str, **kwargs) -> Any:
+        """
+        Blocking request on the shared loop, bounded by the current claim's
+        deadline (VENDOR_REQUEST_TIMEOUT_S outside a claim)
+        """
+        check_deadline(f"{vendor} request")
+        deadline = current_deadline()
+        kwargs.setdefault(
+            "timeout_s", deadline.remaining_ms() / 1000 if deadline is not None else config.VENDOR_REQUEST_TIMEOUT_S
+        )
+        future = asyncio.run_coroutine_threadsafe(
+            self.transport(vendor).request(method, path, **kwargs), self._ensure_loop()
+        )
+        try:
+            # The request times itself out; the margin covers a loop too busy to notice
+            return future.result(timeout=kwargs["timeout_s"] + 1)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            if deadline is not None and deadline.expired():
+                raise DeadlineExceeded(f"{vendor} request")
+            raise VendorError(vendor, f"no answer within {kwargs['timeout_s']:.3f}s")
+        except VendorError:
+            if deadline is not None and deadline.expired():
+                raise DeadlineExceeded(f"{vendor} request")
+            raise
+
+    def close(self):
+        """Close every pool and stop the loop thread"""
+        with self._lock:
+            loop, transports = self._loop, list(self._transports.values())
+            self._loop, self._transports = None, {}
+        if loop is None:
+            return
+        for transport in transports:
+            asyncio.run_coroutine_threadsafe(transport.aclose(), loop).result(timeout=5)
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5)
+        loop.close()
+
+
+# Process-wide clients (lazy)
+_vendor_clients: Optional[VendorClients] = None
+_vendor_clients_lock = threading.Lock()
+
+
+def get_vendor_clients() -> VendorClients:
+    """Get or create the shared vendor clients"""
+    global _vendor_clients
+    with _vendor_clients_lock:
+        if _vendor_clients is None:
+            _vendor_clients = VendorClients()
+        return _vendor_clients
+
+
+def close_vendor_clients():
+    global _vendor_clients
+    with _vendor_clients_lock:
+        clients, _vendor_clients = _vendor_clients, None
+    if clients is not None:
+        clients.close()
@@ -0,0 +1,303 @@
+"""
+Shared LLM Client for OCI GenAI
+One rate-limited, priority-scheduled entry point for every agent's LLM calls
+"""
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Dict, Optional
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from monitoring import get_registry, record_llm_call
+from .deadline import DeadlineExceeded, check_deadline, current_deadline
+
+# Lower number = scheduled first
+LANE_PRIORITIES = {
+    "interactive": 0,  # customer-facing chat
+    "batch": 1         # claim processing
+}
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+_metrics = get_registry()
+LLM_CALL_LATENCY = _metrics.histogram("llm_call_latency_ms", "Provider call latency per attempt")
+LLM_QUEUE_WAIT = _metrics.histogram("llm_queue_wait_ms", "Time waiting for a concurrency slot and rate token")
+LLM_CALLS = _metrics.counter("llm_calls_total", "LLM calls by lane and outcome")
+LLM_RETRIES = _metrics.counter("llm_retries_total", "Retried LLM attempts by lane")
+LLM_TOKENS = _metrics.counter("llm_tokens_total", "Prompt and completion tokens by lane")
+LLM_IN_FLIGHT = _metrics.gauge("llm_in_flight", "LLM calls currently holding a concurrency slot")
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `capacity` banked"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0, timeout: float = None) -> bool:
+        """Block until `tokens` are available, then take them; False if that would take longer than `timeout`"""
+        give_up_at = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+            if give_up_at is not None and now + wait > give_up_at:
+                return False
+            time.sleep(wait)
+
+
+class PrioritySemaphore:
+    """
+    Counting semaphore that hands freed slots to the highest-priority waiter.
+
+    Waiters are ordered by (priority, arrival), so interactive calls overtake
+    queued batch calls but calls within a lane stay FIFO.
+    """
+
+    def __init__(self, slots: int):
+        self._available = slots
+        self._lock = threading.Lock()
+        self._waiters = []
+        self._seq = itertools.count()
+
+    def acquire(self, priority: int, timeout: float = None) -> bool:
+        """Take a slot, waiting up to `timeout` seconds (forever if None); False on timeout"""
+        with self._lock:
+            if self._available > 0 and not self._waiters:
+                self._available -= 1
+                return True
+            waiter = (priority, next(self._seq), threading.Event())
+            heapq.heappush(self._waiters, waiter)
+        if waiter[2].wait(timeout):
+            return True
+        with self._lock:
+            if waiter[2].is_set():
+                return True  # handed a slot just as the wait timed out
+            self._waiters.remove(waiter)
+            heapq.heapify(self._waiters)
+        return False
+
+    def release(self):
+        with self._lock:
+            if self._waiters:
+                _, _, event = heapq.heappop(self._waiters)
+                event.set()  # slot passes straight to the waiter
+            else:
+                self._available += 1
+
+    def queued(self) -> int:
+        with self._lock:
+            return len(self._waiters)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Throttling, server errors and timeouts are worth retrying"""
+    if isinstance(error, DeadlineExceeded):
+        return False  # the claim's budget is spent; another attempt cannot help
+    status = getattr(error, "status", None) or getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    text = str(error).lower()
+    return any(marker in text for marker in ("429", "too many requests", "throttl", "timed out", "timeout"))
+
+
+def create_chat_model(model_kwargs: Optional[Dict[str, Any]] = None):
+    """Create the underlying chat model for the configured LLM backend"""
+    model_kwargs = model_kwargs or {"temperature": 0, "max_tokens": 500}
+    if config.LLM_BACKEND == "fake":
+        from .fake_llm import FakeChatModel
+        return FakeChatModel(latency_ms=config.LLM_FAKE_LATENCY, seed=config.LLM_FAKE_SEED)
+
+    from langchain_community.chat_models.oci_generative_ai import ChatOCIGenAI
+    return ChatOCIGenAI(
+        model_id=config.OCI_MODEL_ID,
+        service_endpoint=config.OCI_SERVICE_ENDPOINT,
+        compartment_id=config.OCI_COMPARTMENT_ID,
+        auth_type="API_KEY",
+        model_kwargs=model_kwargs
+    )
+
+
+class SharedLLMClient:
+    """
+    Process-wide gateway in front of the chat model.
+
+    Each call waits for a concurrency slot (priority by lane), then a
+    rate-limit token, then calls the model, retrying throttling and
+    transient errors with full-jitter exponential backoff. The slot is
+    given up during each backoff and waited for again before the retry,
+    so a throttled call does not hold back the others. Latency, queue
+    wait, retries and token usage are recorded per lane.
+
+    Within a claim, the slot wait, the token wait and the model call are
+    each bounded by the claim's remaining budget and raise DeadlineExceeded
+    when it runs out. A model call given up on keeps its slot until the
+    provider answers, so the concurrency limit still holds.
+    """
+
+    def __init__(
+        self,
+        model=None,
+        max_concurrency: int = None,
+        requests_per_second: float = None,
+        burst: int = None,
+        max_retries: int = None,
+        backoff_base: float = None,
+        backoff_max: float = None
+    ):
+        self.model = model if model is not None else create_chat_model()
+        self.max_retries = config.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = backoff_base if backoff_base is not None else config.LLM_BACKOFF_BASE_S
+        self.backoff_max = backoff_max if backoff_max is not None else config.LLM_BACKOFF_MAX_S
+        max_concurrency = max_concurrency or config.LLM_MAX_CONCURRENCY
+        self._slots = PrioritySemaphore(max_concurrency)
+        # Runs deadline-bounded model calls; every call holds a slot, so it never queues
+        self._calls = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm-call")
+        self._bucket = TokenBucket(
+            rate=requests_per_second or config.LLM_REQUESTS_PER_SECOND,
+            capacity=burst or config.LLM_BURST
+        )
+
+    def lane(self, name: str) -> "LLMLane":
+        """Handle bound to a lane; drop-in for a chat model's `invoke`"""
+        if name not in LANE_PRIORITIES:
+            raise ValueError(f"Unknown LLM lane: {name}")
+        return LLMLane(self, name)
+
+    def invoke(self, messages: Any, lane: str = "batch", **kwargs):
+        priority = LANE_PRIORITIES[lane]
+        check_deadline("LLM call")
+        deadline = current_deadline()
+        record_llm_call()
+        queued_at = time.perf_counter()
+        self._acquire_slot(priority, lane, deadline)
+        holding, abandoned = True, None
+        try:
+            self._take_token(lane, deadline)
+            LLM_QUEUE_WAIT.observe((time.perf_counter() - queued_at) * 1000, lane=lane)
+
+            attempt = 0
+            while True:
+                started = time.perf_counter()
+                try:
+                    if deadline is None:
+                        response = self.model.invoke(messages, **kwargs)
+                    else:
+                        call = self._calls.submit(self.model.invoke, messages, **kwargs)
+                        try:
+                            response = call.result(timeout=deadline.remaining_ms() / 1000)
+                        except FutureTimeout:
+                            abandoned = call
+                            raise DeadlineExceeded("LLM response")
+                except Exception as e:
+                    LLM_CALL_LATENCY.observe((time.perf_counter() - started) * 1000, lane=lane, outcome="error")
+                    if attempt >= self.max_retries or not is_retryable(e):
+                        LLM_CALLS.inc(lane=lane, outcome="error")
+                        raise
+                    attempt += 1
+                    backoff = self._backoff(attempt)
+                    if deadline is not None and backoff * 1000 >= deadline.remaining_ms():
+                        # The retry could not finish within the claim's budget
+                        LLM_CALLS.inc(lane=lane, outcome="error")
+                        raise
+                    LLM_RETRIES.inc(lane=lane)
+                    # Other calls use the slot while this one backs off
+                    self._release(lane)
+                    holding = False
+                    time.sleep(backoff)
+                    self._acquire_slot(priority, lane, deadline)
+                    holding = True
+                    # Retries spend rate budget too, so throttling can drain
+                    self._take_token(lane, deadline)
+                    continue
+
+                LLM_CALL_LATENCY.observe((time.perf_counter() - started) * 1000, lane=lane, outcome="ok")
+                LLM_CALLS.inc(lane=lane, outcome="ok")
+                self._record_tokens(response, lane)
+                return response
+        finally:
+            if abandoned is not None:
+                abandoned.add_done_callback(lambda _: self._release(lane))
+            elif holding:
+                self._release(lane)
+
+    def _acquire_slot(self, priority: int, lane: str, deadline):
+        """Wait for a concurrency slot, for at most the claim's remaining budget"""
+        if not self._slots.acquire(priority, timeout=_remaining_s(deadline)):
+            LLM_CALLS.inc(lane=lane, outcome="error")
+            raise DeadlineExceeded("LLM concurrency slot")
+        LLM_IN_FLIGHT.inc(lane=lane)
+
+    def _take_token(self, lane: str, deadline):
+        """Wait for a rate-limit token, for at most the claim's remaining budget"""
+        if not self._bucket.acquire(timeout=_remaining_s(deadline)):
+            LLM_CALLS.inc(lane=lane, outcome="error")
+            raise DeadlineExceeded("LLM rate limit token")
+
+    def _release(self, lane: str):
+        LLM_IN_FLIGHT.dec(lane=lane)
+        self._slots.release()
+
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, min(cap, base * 2^attempt)]"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _record_tokens(response: Any, lane: str):
+        usage = getattr(response, "usage_metadata", None) or {}
+        if not usage:
+            metadata = getattr(response, "response_metadata", None) or {}
+            token_usage = metadata.get("token_usage") or {}
+            usage = {
+                "input_tokens": token_usage.get("prompt_tokens", 0),
+                "output_tokens": token_usage.get("completion_tokens", 0)
+            }
+        if usage.get("input_tokens"):
+            LLM_TOKENS.inc(usage["input_tokens"], lane=lane, kind="prompt")
+        if usage.get("output_tokens"):
+            LLM_TOKENS.inc(usage["output_tokens"], lane=lane, kind="completion")
+
+
+def _remaining_s(deadline) -> Optional[float]:
+    """Seconds left on the claim's deadline; None (wait forever) outside a claim"""
+    return None if deadline is None else deadline.remaining_ms() / 1000
+
+
+class LLMLane:
+    """Chat-model-like view of the shared client for one priority lane"""
+
+    def __init__(self, client: SharedLLMClient, lane: str):
+        self.client = client
+        self.lane = lane
+
+    def invoke(self, messages: Any, **kwargs):
+        return self.client.invoke(messages, lane=self.lane, **kwargs)
+
+
+# Process-wide client (lazy)
+_llm_client: Optional[SharedLLMClient] = None
+_llm_client_lock = threading.Lock()
+
+
+def get_llm_client() -> SharedLLMClient:
+    """Get or create the shared LLM client"""
+    global _llm_client
+    with _llm_client_lock:
+        if _llm_client is None:
+            _llm_client = SharedLLMClient()
+        return _llm_client
@@ -2,15 +2,20 @@
 Payment Processing API (Mock implementation)
 Processes claim payouts
 """
+import threading
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List
+from .deadline import check_deadline
 
 class PaymentAPI:
     """Mock Payment Processing API"""
     
     def __init__(self, api_key: str = None):
         self.api_key = api_key
+        # Batch submissions already accepted, by idempotency key
+        self._accepted: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
     
     def process_payment(self, claim_id: str, payout_amount: float) -> Dict[str, Any]:
         """
@@ -23,6 +28,7 @@ class PaymentAPI:
         Returns:
             Dict with payment details
         """
+        check_deadline("payment")
         if payout_amount <= 0:
             return {
                 "payment_id": None,
@@ -44,8 +50,47 @@ class PaymentAPI:
             "reference_number": f"REF-{uuid.uuid4().hex[:12].upper()}"
         }
     
+    def process_payments(self, batch_id: str, payments: List[Dict[str, Any]], ach_file: str = None) -> Dict[str, Any]:
+        """
+        Submit a batch of claim payouts (one ACH file) in one call
+        
+        Args:
+            batch_id: Settlement batch identifier
+            payments: Dicts with idempotency_key, claim_id and amount
+            ach_file: Path of the batch's ACH file
+            
+        Returns:
+            Dict with the batch id and one result per payment, in order. A
+            payment whose idempotency key was accepted before gets that
+            earlier result back instead of being paid again.
+        """
+        check_deadline("payment batch")
+        results = []
+        with self._lock:
+            for payment in payments:
+                key = payment["idempotency_key"]
+                if key not in self._accepted:
+                    result = self.process_payment(payment["claim_id"], payment["amount"])
+                    result["idempotency_key"] = key
+                    if result["status"] == "FAILED":
+                        results.append(result)
+                        continue
+                    self._accepted[key] = result
+                results.append(dict(self._accepted[key]))
+        return {"batch_id": batch_id, "ach_file": ach_file, "results": results}
+    
+    def get_payment_statuses(self, payment_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get the status of many payments in one call"""
+        check_deadline("payment status check")
+        estimated_completion = (datetime.now() + timedelta(days=1)).isoformat()
+        return [
+            {"payment_id": payment_id, "status": "PROCESSING", "estimated_completion": estimated_completion}
+            for payment_id in payment_ids
+        ]
+    
     def get_payment_status(self, payment_id: str) -> Dict[str, Any]:
         """Get status of a payment"""
+        check_deadline("payment status check")
         # Mock implementation
         return {
             "payment_id": payment_id,
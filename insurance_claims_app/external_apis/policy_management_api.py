@@ -9,6 +9,8 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from .deadline import check_deadline
+
 def _get_policy_from_db(policy_id: str):
     """Lazy import to avoid circular dependency"""
     from database import get_policy
@@ -30,6 +32,7 @@ class PolicyManagementAPI:
         Returns:
             Dict with policy details or None if not found
         """
+        check_deadline("policy lookup")
         policy = _get_policy_from_db(policy_id)
         
         if not policy:
@@ -68,6 +71,7 @@ class PolicyManagementAPI:
         Returns:
             Dict with coverage status and details
         """
+        check_deadline("coverage check")
         policy = self.get_policy_details(policy_id)
         
         if not policy:
@@ -0,0 +1,108 @@
+"""
+Remote Vendor APIs
+HTTP clients with the same methods as the mock vendor APIs, used with
+EXTERNAL_API_BACKEND=http; every call goes through the shared vendor
+transport (pooling, limits, retries, circuit breakers, hedged reads)
+"""
+import uuid
+from typing import Any, Dict, List, Optional
+
+from .car_damage_api import CarDamageAPI
+from .fraud_scoring_api import FraudScoringAPI
+from .http_transport import VendorClients, VendorError, get_vendor_clients
+from .payment_api import PaymentAPI
+from .policy_management_api import PolicyManagementAPI
+
+
+class _RemoteVendor:
+    vendor = ""
+
+    def __init__(self, api_key: str = None, clients: VendorClients = None):
+        self.api_key = api_key
+        self._clients = clients
+
+    def _call(self, method: str, path: str, headers: Dict[str, str] = None, **kwargs) -> Any:
+        headers = dict(headers or {})
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        clients = self._clients or get_vendor_clients()
+        return clients.call(self.vendor, method, path, headers=headers, **kwargs)
+
+
+class RemoteCarDamageAPI(_RemoteVendor, CarDamageAPI):
+    """Arya damage detection over HTTP"""
+    vendor = "arya"
+
+    def __init__(self, api_key: str = None, seed: int = None, clients: VendorClients = None):
+        super().__init__(api_key, clients)
+        self.seed = seed
+
+    def analyze_damage(self, photos: List[str], estimated_amount: float = None) -> Dict[str, Any]:
+        # Analysis has no side effects, so it is hedged and retried like a read
+        return self._call(
+            "POST", "/v1/damage/analyze", json={"photos": list(photos or []), "estimated_amount": estimated_amount}, read=True
+        )
+
+
+class RemoteFraudScoringAPI(_RemoteVendor, FraudScoringAPI):
+    """
+    Fraud.ai scoring over HTTP.
+
+    Bulk re-scoring (score_claims_batch) keeps applying the vendor's rules
+    locally; only per-claim scoring is remote.
+    """
+    vendor = "fraud"
+
+    def __init__(self, api_key: str = None, seed: int = None, clients: VendorClients = None):
+        super().__init__(api_key, clients)
+        self.seed = seed
+
+    def score_claim(
+        self,
+        claim_amount: float,
+        repair_shop: str,
+        claimant_id: str,
+        vehicle_age: int,
+        damage_type: str
+    ) -> Dict[str, Any]:
+        return self._call("POST", "/v1/fraud/score", json={
+            "claim_amount": claim_amount, "repair_shop": repair_shop, "claimant_id": claimant_id,
+            "vehicle_age": vehicle_age, "damage_type": damage_type
+        }, read=True)
+
+
+class RemotePolicyManagementAPI(_RemoteVendor, PolicyManagementAPI):
+    """Vertafore policy lookups over HTTP; coverage checks run on the fetched policy"""
+    vendor = "vertafore"
+
+    def get_policy_details(self, policy_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._call("GET", f"/v1/policies/{policy_id}")
+        except VendorError as e:
+            if e.status == 404:
+                return None
+            raise
+
+
+class RemotePaymentAPI(_RemoteVendor, PaymentAPI):
+    """Payment processor over HTTP; every write carries an Idempotency-Key"""
+    vendor = "payments"
+
+    def process_payment(self, claim_id: str, payout_amount: float) -> Dict[str, Any]:
+        # One key per call: retries of this call cannot pay twice
+        return self._call(
+            "POST", "/v1/payments", json={"claim_id": claim_id, "amount": payout_amount},
+            headers={"Idempotency-Key": f"{claim_id}-{uuid.uuid4().hex}"}
+        )
+
+    def process_payments(self, batch_id: str, payments: List[Dict[str, Any]], ach_file: str = None) -> Dict[str, Any]:
+        return self._call(
+            "POST", "/v1/payment-batches", json={"batch_id": batch_id, "payments": payments, "ach_file": ach_file},
+            headers={"Idempotency-Key": batch_id}
+        )
+
+    def get_payment_statuses(self, payment_ids: List[str]) -> List[Dict[str, Any]]:
+        return self._call("POST", "/v1/payments/status", json={"payment_ids": list(payment_ids)}, read=True)
+
+    def get_payment_status(self, payment_id: str) -> Dict[str, Any]:
+        return self._call("GET", f"/v1/payments/{payment_id}")
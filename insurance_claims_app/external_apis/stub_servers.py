@@ -0,0 +1,211 @@
+"""
+Local Vendor Stub Servers
+HTTP stand-ins for the remote vendor APIs, backed by the mock API classes,
+with configurable latency and failure modes for offline load testing of
+the vendor transport
+
+Usage:
+    python -m external_apis.stub_servers                                    # all vendors on VENDOR_BASE_URLS ports
+    python -m external_apis.stub_servers --latency lognormal:40:0.6 --error-rate 0.02
+"""
+import argparse
+import asyncio
+import random
+import socket
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+from fastapi import Body, FastAPI, Header, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from config import config
+from .car_damage_api import CarDamageAPI
+from .fake_llm import parse_latency
+from .fraud_scoring_api import FraudScoringAPI
+from .http_transport import VENDORS, parse_vendor_settings
+from .payment_api import PaymentAPI
+from .policy_management_api import PolicyManagementAPI
+
+
+def _routes(vendor: str, app: FastAPI, seed: Optional[int]):
+    if vendor == "arya":
+        api = CarDamageAPI(seed=seed)
+
+        @app.post("/v1/damage/analyze")
+        def analyze_damage(body: Dict[str, Any] = Body(...)):
+            return api.analyze_damage(body.get("photos") or [], body.get("estimated_amount"))
+
+    elif vendor == "fraud":
+        api = FraudScoringAPI(seed=seed)
+
+        @app.post("/v1/fraud/score")
+        def score_claim(body: Dict[str, Any] = Body(...)):
+            return api.score_claim(
+                body["claim_amount"], body.get("repair_shop"), body.get("claimant_id"),
+                body.get("vehicle_age", 5), body.get("damage_type")
+            )
+
+    elif vendor == "vertafore":
+        api = PolicyManagementAPI()
+
+        @app.get("/v1/policies/{policy_id}")
+        def get_policy(policy_id: str):
+            policy = api.get_policy_details(policy_id)
+            if policy is None:
+                raise HTTPException(status_code=404, detail="Policy not found")
+            return policy
+
+    elif vendor == "payments":
+        api = PaymentAPI()
+        single_payments: Dict[str, Dict[str, Any]] = {}
+        lock = threading.Lock()
+
+        @app.post("/v1/payments")
+        def process_payment(body: Dict[str, Any] = Body(...), idempotency_key: str = Header(None)):
+            with lock:
+                if idempotency_key and idempotency_key in single_payments:
+                    return single_payments[idempotency_key]
+                result = api.process_payment(body["claim_id"], body["amount"])
+                if idempotency_key:
+                    single_payments[idempotency_key] = result
+                return result
+
+        @app.post("/v1/payment-batches")
+        def process_payments(body: Dict[str, Any] = Body(...)):
+            return api.process_payments(body["batch_id"], body["payments"], ach_file=body.get("ach_file"))
+
+        @app.post("/v1/payments/status")
+        def get_payment_statuses(body: Dict[str, Any] = Body(...)):
+            return api.get_payment_statuses(body["payment_ids"])
+
+        @app.get("/v1/payments/{payment_id}")
+        def get_payment_status(payment_id: str):
+            return api.get_payment_status(payment_id)
+
+    else:
+        raise ValueError(f"Unknown vendor: {vendor!r}")
+
+
+class StubVendorServer:
+    """
+    One vendor's API served over HTTP on localhost.
+
+    Every request first waits a latency drawn from `latency_ms` (see
+    fake_llm.parse_latency), then fails with `error_status` with
+    probability `error_rate`. inject() queues faults for the next requests
+    in arrival order, for deterministic tests of retries, hedging and
+    circuit breaking.
+    """
+
+    def __init__(
+        self,
+        vendor: str,
+        latency_ms: Any = None,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = None
+    ):
+        if vendor not in VENDORS:
+            raise ValueError(f"Unknown vendor: {vendor!r}")
+        self.vendor = vendor
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self._latency = parse_latency(latency_ms)
+        self._rng = random.Random(seed)
+        self._faults = deque()
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self.base_url: Optional[str] = None
+
+        self.app = FastAPI(title=f"{vendor} stub")
+        self.app.middleware("http")(self._inject_faults)
+        _routes(vendor, self.app, config.MOCK_API_SEED if seed is None else seed)
+
+    def inject(self, count: int = 1, status: int = None, delay_ms: float = 0):
+        """Make the next `count` requests wait `delay_ms` and then fail with `status` (None: answer normally)"""
+        for _ in range(count):
+            self._faults.append((status, delay_ms))
+
+    async def _inject_faults(self, request: Request, call_next):
+        self.requests += 1
+        status, delay_ms = self._faults.popleft() if self._faults else (None, 0)
+        delay_ms += self._latency(self._rng)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+        if status is None and self.error_rate and self._rng.random() < self.error_rate:
+            status = self.error_status
+        if status is not None:
+            return JSONResponse({"detail": f"Injected {self.vendor} failure"}, status_code=status)
+        return await call_next(request)
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve in a background thread; returns the base URL (port 0 picks a free port)"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        self._server = uvicorn.Server(uvicorn.Config(self.app, log_level="warning", lifespan="off", access_log=False))
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [sock]}, name=f"stub-{self.vendor}", daemon=True
+        )
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError(f"{self.vendor} stub server failed to start")
+            time.sleep(0.01)
+        self.base_url = f"http://{host}:{sock.getsockname()[1]}"
+        return self.base_url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=5)
+            self._server = None
+
+
+def start_stub_servers(vendors: List[str] = None, use_configured_ports: bool = False, **options) -> Dict[str, StubVendorServer]:
+    """Start one stub per vendor; with use_configured_ports, on the ports of VENDOR_BASE_URLS"""
+    base_urls = parse_vendor_settings(config.VENDOR_BASE_URLS)
+    servers = {}
+    for vendor in vendors or VENDORS:
+        server = StubVendorServer(vendor, **options)
+        url = urlparse(base_urls[vendor]) if use_configured_ports else None
+        server.start(url.hostname if url else "127.0.0.1", url.port if url else 0)
+        servers[vendor] = server
+    return servers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve local vendor API stubs")
+    parser.add_argument("--vendors", default=",".join(VENDORS))
+    parser.add_argument("--latency", default=None, help="Latency distribution, e.g. lognormal:40:0.6")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+
+    from database import init_database, seed_sample_policies
+    init_database()
+    seed_sample_policies()
+
+    servers = start_stub_servers(
+        args.vendors.split(","), use_configured_ports=True,
+        latency_ms=args.latency, error_rate=args.error_rate, error_status=args.error_status
+    )
+    for vendor, server in servers.items():
+        print(f"{vendor}: {server.base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        for server in servers.values():
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+from .metrics import Counter, Gauge, Histogram, MetricsRegistry, get_registry
+from .step_stats import StepStats, track_step, record_db_call, record_llm_call
+
+__all__ = [
+    "Counter", "Gauge", "Histogram", "MetricsRegistry", "get_registry",
+    "StepStats", "track_step", "record_db_call", "record_llm_call"
+]
@@ -0,0 +1,196 @@
+"""
+In-Process Metrics
+Thread-safe counters, gauges and histograms with a JSON snapshot for /metrics
+"""
+import bisect
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+# Millisecond buckets suited to API, DB and LLM latencies
+DEFAULT_LATENCY_BUCKETS_MS = (
+    1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, Any]]) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Counter:
+    """Monotonic counter, one series per label set"""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"labels": dict(k), "value": v} for k, v in self._values.items()]
+
+
+class Gauge:
+    """Point-in-time value, one series per label set"""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"labels": dict(k), "value": v} for k, v in self._values.items()]
+
+
+class _HistogramSeries:
+    __slots__ = ("bucket_counts", "count", "total", "min", "max")
+
+    def __init__(self, num_buckets: int):
+        self.bucket_counts = [0] * (num_buckets + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+
+class Histogram:
+    """Fixed-bucket histogram with count/sum/min/max and bucket-based percentiles"""
+
+    def __init__(self, name: str, description: str = "", buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_MS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._series: Dict[LabelKey, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.buckets))
+            series.bucket_counts[idx] += 1
+            series.count += 1
+            series.total += value
+            series.min = value if series.min is None else min(series.min, value)
+            series.max = value if series.max is None else max(series.max, value)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(_label_key(labels))
+            return series.count if series else 0
+
+    def percentile(self, pct: float, **labels) -> Optional[float]:
+        """Upper bound of the bucket holding the pct-th observation"""
+        with self._lock:
+            series = self._series.get(_label_key(labels))
+            if not series or series.count == 0:
+                return None
+            return self._percentile(series, pct)
+
+    def _percentile(self, series: _HistogramSeries, pct: float) -> float:
+        target = pct / 100.0 * series.count
+        running = 0
+        for idx, bucket_count in enumerate(series.bucket_counts):
+            running += bucket_count
+            if running >= target and bucket_count:
+                return self.buckets[idx] if idx < len(self.buckets) else series.max
+        return series.max
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            result = []
+            for key, series in self._series.items():
+                result.append({
+                    "labels": dict(key),
+                    "count": series.count,
+                    "sum": round(series.total, 3),
+                    "min": series.min,
+                    "max": series.max,
+                    "p50": self._percentile(series, 50),
+                    "p95": self._percentile(series, 95),
+                    "p99": self._percentile(series, 99),
+                    "buckets": {
+                        **{str(b): c for b, c in zip(self.buckets, series.bucket_counts)},
+                        "+Inf": series.bucket_counts[-1]
+                    }
+                })
+            return result
+
+
+class MetricsRegistry:
+    """Holds named metrics; get-or-create so modules can declare them at import"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {}
+
+    def _get_or_create(self, cls, name: str, description: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, description, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {type(metric).__name__}")
+            return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, description)
+
+    def histogram(self, name: str, description: str = "", buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_MS) -> Histogram:
+        return self._get_or_create(Histogram, name, description, buckets=buckets)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {
+            name: {
+                "type": type(metric).__name__.lower(),
+                "description": metric.description,
+                "series": metric.snapshot()
+            }
+            for name, metric in sorted(metrics.items())
+        }
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Process-wide metrics registry"""
+    return _registry
@@ -0,0 +1,78 @@
+"""
+Per-Step Resource Accounting
+Counts DB round trips and LLM calls made while a workflow step runs
+"""
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+
+from .metrics import get_registry
+
+_current_step: contextvars.ContextVar = contextvars.ContextVar("current_step_stats", default=None)
+
+_metrics = get_registry()
+DB_ROUND_TRIPS = _metrics.counter("db_round_trips_total", "Database round trips by backend")
+
+
+class StepStats:
+    """Wall time, CPU time and external calls for one workflow step"""
+    __slots__ = ("db_calls", "llm_calls", "wall_ms", "cpu_ms", "_wall_start", "_cpu_start")
+
+    def __init__(self):
+        self.db_calls = 0
+        self.llm_calls = 0
+        self.wall_ms = 0.0
+        self.cpu_ms = 0.0
+        self._wall_start = time.perf_counter()
+        # Per-thread CPU, so parallel branches don't count each other's work
+        self._cpu_start = time.thread_time()
+
+    def stop(self):
+        self.wall_ms = (time.perf_counter() - self._wall_start) * 1000
+        self.cpu_ms = (time.thread_time() - self._cpu_start) * 1000
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "duration_ms": round(self.wall_ms, 3),
+            "cpu_ms": round(self.cpu_ms, 3),
+            "db_calls": self.db_calls,
+            "llm_calls": self.llm_calls
+        }
+
+
+@contextmanager
+def track_step() -> Iterator[StepStats]:
+    """Attribute DB and LLM calls made in this context (and thread) to a new StepStats"""
+    stats = StepStats()
+    token = _current_step.set(stats)
+    try:
+        yield stats
+    finally:
+        stats.stop()
+        _current_step.reset(token)
+
+
+def record_db_call(backend: str = "oracle"):
+    DB_ROUND_TRIPS.inc(backend=backend)
+    stats = _current_step.get()
+    if stats is not None:
+        stats.db_calls += 1
+
+
+def record_llm_call():
+    stats = _current_step.get()
+    if stats is not None:
+        stats.llm_calls += 1
+
+
+def counts_as_db_call(backend: str):
+    """Decorator: each call of the wrapped function is one round trip"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            record_db_call(backend)
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -7,6 +7,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from datetime import datetime, timedelta
 from agents.supervisor_workflow import process_claim_with_supervisor
+from agents.step_log import step_dicts, summarize_steps
 from agents.supervisor_agent import ClaimsSupervisorAgent
 
 def test_supervisor_workflow():
@@ -69,10 +70,8 @@ def test_supervisor_workflow():
             print(f"   Complexity Factors: {', '.join(ca['complexity_factors'])}")
     
     print("\n📜 WORKFLOW HISTORY:")
-    for i, step in enumerate(result.get('workflow_history', []), 1):
-        step_name = step.get('step', 'unknown')
-        action = step.get('action', step.get('decision', 'N/A'))
-        print(f"   {i}. {step_name}: {action}")
+    for step in step_dicts(result.get('workflow_history')):
+        print(f"   {step['seq']}. {step['step']}: {step['action']}")
     
     print("\n" + "=" * 60)
     return result
@@ -113,7 +112,7 @@ def test_high_risk_claim():
     print(f"   Human Review Required: {result.get('human_review_required', False)}")
     
     # Check if fraud investigation was triggered
-    workflow_steps = [s.get('step') for s in result.get('workflow_history', [])]
+    workflow_steps = summarize_steps(result.get('workflow_history'))['path']
     print(f"\n📜 Workflow Steps: {workflow_steps}")
     
     if 'fraud_investigation' in workflow_steps:
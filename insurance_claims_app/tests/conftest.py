@@ -0,0 +1,33 @@
+"""
+Run the test suite on the offline backends (in-memory database, fake LLM,
+seeded mock APIs) unless the environment already selects others
+"""
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_BACKEND", "memory")
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("MOCK_API_SEED", "42")
+# Tests resubmit identical sample claims; content dedup is tested explicitly
+os.environ.setdefault("SUBMISSION_DEDUP_WINDOW_S", "0")
+_runtime_dir = tempfile.mkdtemp(prefix="tests_")
+os.environ.setdefault("CHAT_SPOOL_PATH", os.path.join(_runtime_dir, "chat_spool.jsonl"))
+os.environ.setdefault("CHECKPOINT_SQLITE_PATH", os.path.join(_runtime_dir, "checkpoints.sqlite"))
+
+# A collision claim as submitted to the API
+CLAIM = {
+    "policy_id": "POL-001", "incident_date": "2026-06-01T10:00:00", "claim_date": "2026-06-03T10:00:00",
+    "claim_type": "collision", "damage_description": "Rear-ended at a stop light, bumper damaged",
+    "repair_shop": "Certified Auto", "estimated_damage_amount": 3000.0, "damage_photos": ["front.jpg"],
+    "incident_report": "report", "repair_estimate": "estimate"
+}
+
+
+def stored_claim(**overrides):
+    """CLAIM stored for CUST-001 with `overrides` applied; the workflow input, claim_id included"""
+    # Imported here: the environment above must be set before config loads
+    from database import create_claim, seed_sample_policies
+    claim = {**CLAIM, "customer_id": "CUST-001", **overrides}
+    seed_sample_policies()
+    claim["claim_id"] = create_claim(claim)
+    return claim
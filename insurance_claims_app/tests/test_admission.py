@@ -0,0 +1,136 @@
+"""
+Tests for API admission control (per-lane limits and load shedding)
+"""
+import sys
+import os
+import asyncio
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.admission import (
+    ADMISSION_REJECTIONS, AdmissionController, AdmissionLane, AdmissionMiddleware, Overloaded,
+    lane_for, parse_lane_settings
+)
+
+
+def test_requests_map_to_lanes():
+    assert lane_for("POST", "/submit-claim-with-images") == "images"
+    assert lane_for("POST", "/submit-claim") == "writes"
+    assert lane_for("POST", "/chat") == "chat"
+    assert lane_for("GET", "/claim/CLM-1") == "reads"
+    assert lane_for("GET", "/health") is None
+    assert parse_lane_settings("images=2, reads=32") == {"images": 2, "reads": 32}
+    with pytest.raises(ValueError):
+        parse_lane_settings("uploads=2")
+
+
+def test_lane_queues_in_order_then_sheds():
+    async def scenario():
+        lane = AdmissionLane("writes", max_concurrency=1, max_queue=2, queue_timeout_s=0.2)
+        order = []
+        await lane.acquire()
+
+        async def queued(tag):
+            await lane.acquire()
+            order.append(tag)
+            lane.release()
+
+        waiting = [asyncio.ensure_future(queued(tag)) for tag in ("first", "second")]
+        await asyncio.sleep(0)
+        assert lane.queued == 2
+
+        # Queue full: rejected at once with 429
+        with pytest.raises(Overloaded) as full:
+            await lane.acquire()
+        assert full.value.status == 429 and full.value.retry_after_s >= 1
+
+        lane.release()
+        await asyncio.gather(*waiting)
+        assert order == ["first", "second"] and lane.in_flight == 0
+
+        # A queued request that waits past the timeout gets 503
+        await lane.acquire()
+        with pytest.raises(Overloaded) as slow:
+            await lane.acquire()
+        assert slow.value.status == 503 and lane.queued == 0
+        lane.release()
+        assert lane.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_heavy_writes_are_shed_while_reads_are_served():
+    app = FastAPI()
+    release = threading.Event()
+
+    @app.post("/submit-claim-with-images")
+    def upload():
+        release.wait(5)
+        return {"ok": True}
+
+    @app.get("/claim/{claim_id}")
+    def lookup(claim_id: str):
+        return {"claim_id": claim_id}
+
+    controller = AdmissionController({
+        "images": AdmissionLane("images", max_concurrency=1, max_queue=0, queue_timeout_s=1),
+        "reads": AdmissionLane("reads", max_concurrency=4, max_queue=4, queue_timeout_s=1)
+    })
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    rejected = ADMISSION_REJECTIONS.value(lane="images", status="429")
+
+    with TestClient(app) as client:
+        first = threading.Thread(target=lambda: client.post("/submit-claim-with-images"))
+        first.start()
+        while controller.lanes["images"].in_flight == 0:
+            time.sleep(0.01)
+
+        shed = client.post("/submit-claim-with-images")
+        assert shed.status_code == 429 and int(shed.headers["Retry-After"]) >= 1
+        assert client.get("/claim/CLM-1").json() == {"claim_id": "CLM-1"}
+
+        release.set()
+        first.join()
+        assert client.post("/submit-claim-with-images").status_code == 200
+
+    assert ADMISSION_REJECTIONS.value(lane="images", status="429") == rejected + 1
+    assert controller.stats()["images"]["in_flight"] == 0
+
+
+def test_reads_are_served_while_the_chat_lane_is_saturated(monkeypatch):
+    from api import main
+
+    release = threading.Event()
+    answering = threading.Semaphore(0)
+
+    class SlowChatbot:
+        def answer_question(self, question, claim_id=None):
+            answering.release()
+            release.wait(5)
+            return {"answer": "ok", "sources": []}
+
+    monkeypatch.setattr(main, "get_chatbot", lambda: SlowChatbot())
+    with TestClient(main.app) as client:
+        chats = [threading.Thread(target=lambda: client.post("/chat", json={"message": "status?"})) for _ in range(4)]
+        for chat in chats:
+            chat.start()
+        assert answering.acquire(timeout=5)
+
+        read = {}
+        reader = threading.Thread(target=lambda: read.update(response=client.get("/policy/POL-001")))
+        reader.start()
+        reader.join(2)
+        served_while_chatting = not reader.is_alive()
+
+        release.set()
+        reader.join()
+        for chat in chats:
+            chat.join()
+
+    assert served_while_chatting
+    assert read["response"].status_code == 200
@@ -0,0 +1,55 @@
+"""
+Tests for vectorized batch fraud scoring
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from agents.batch_fraud_scoring import claims_to_columns, score_claims
+from agents.fraud_investigation_agent import FraudInvestigationAgent
+from benchmarks.load_test import generate_claims
+
+EXTRA_CLAIMS = [
+    # same-day filing on a Saturday, round amount, high-risk shop
+    {"incident_date": "2026-06-06T09:00:00", "claim_date": "2026-06-06T18:00:00",
+     "estimated_damage_amount": 32000.0, "repair_shop": "Quick Fix Discount"},
+    # filed before the incident, unparseable dates, no shop
+    {"incident_date": "2026-06-03T10:00:00", "claim_date": "2026-06-02T22:00:00",
+     "estimated_damage_amount": 999.0, "repair_shop": ""},
+    {"incident_date": "yesterday", "claim_date": "2026-06-02T22:00:00",
+     "estimated_damage_amount": 5000.0, "repair_shop": "OEM Authorized Body"},
+]
+
+
+def test_rule_features_match_the_per_claim_checks():
+    claims = generate_claims(200, seed=7) + EXTRA_CLAIMS
+    scores = score_claims(claims_to_columns(claims), seed=1)
+    agent = FraudInvestigationAgent()
+
+    for i, claim in enumerate(claims):
+        patterns = agent._analyze_claim_patterns(claim)["suspicious_patterns"]
+        shop_risk = agent._check_repair_shop(claim["repair_shop"])["risk_level"]
+        assert scores["same_day_filing"][i] == ("Claim filed same day as incident" in patterns)
+        assert scores["weekend_incident"][i] == ("Incident occurred on weekend" in patterns)
+        assert scores["round_amount"][i] == ("Claim amount is a round number" in patterns)
+        assert scores["amount_above_average"][i] == ("Claim amount significantly above average" in patterns)
+        assert scores["high_risk_shop"][i] == (shop_risk == "high")
+        assert scores["low_risk_shop"][i] == (shop_risk == "low")
+
+
+def test_scores_are_reproducible_per_seed_and_history_raises_risk():
+    columns = claims_to_columns(generate_claims(500, seed=3))
+    first, again, other = score_claims(columns, seed=11), score_claims(columns, seed=11), score_claims(columns, seed=12)
+    assert np.array_equal(first["fraud_score"], again["fraud_score"])
+    assert not np.array_equal(first["fraud_score"], other["fraud_score"])
+    assert ((first["fraud_score"] >= 0) & (first["fraud_score"] <= 1)).all()
+
+    n = len(columns["repair_shop"])
+    with_history = dict(
+        columns, customer_id=np.full(n, "CUST-001"), claim_count=np.full(n, 6), claims_last_90_days=np.full(n, 5)
+    )
+    risky = score_claims(with_history, seed=11)
+    assert (risky["risk_factor_count"] == first["risk_factor_count"] + 2).all()
+    assert (risky["fraud_score"] >= first["fraud_score"]).all()
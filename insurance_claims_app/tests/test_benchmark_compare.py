@@ -0,0 +1,53 @@
+"""
+Tests for the benchmark baseline comparison
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import compare_to_baseline, median_results, flatten_metrics, gated_metrics, scale_to_host
+
+
+def test_flatten_keeps_numeric_leaves_and_gates_by_suffix():
+    flat = flatten_metrics({"api": {"submit": {"latency": {"p95_ms": 50.0, "count": 10}, "requests_per_sec": 80.0}},
+                            "quick": True, "note": "x"})
+    assert flat == {"api.submit.latency.p95_ms": 50.0, "api.submit.latency.count": 10,
+                    "api.submit.requests_per_sec": 80.0}
+    assert set(gated_metrics(flat)) == {"api.submit.latency.p95_ms", "api.submit.requests_per_sec"}
+
+
+def test_regressions_respect_direction_and_noise_floor():
+    baseline = {"a.p95_ms": 50.0, "b.p50_ms": 0.1, "c.requests_per_sec": 100.0, "d.hit@1": 0.9, "gone.p50_ms": 1.0}
+    current = {"a.p95_ms": 70.0, "b.p50_ms": 0.5, "c.requests_per_sec": 60.0, "d.hit@1": 0.9}
+
+    status = {name: s for name, _, _, s in compare_to_baseline(current, baseline, tolerance=0.25)}
+
+    assert status["a.p95_ms"] == "REGRESSED"
+    assert status["b.p50_ms"] == "ok"  # 5x slower but under the absolute floor
+    assert status["c.requests_per_sec"] == "REGRESSED"
+    assert status["d.hit@1"] == "ok"
+    assert "gone.p50_ms" not in status
+
+
+def test_repeated_rounds_gate_on_the_median_and_rescale_to_host_speed():
+    rounds = [
+        {"latency": {"p50_ms": 30.0, "count": 10}, "requests_per_sec": 100.0, "hit@1": 0.9},
+        {"latency": {"p50_ms": 50.0, "count": 12}, "requests_per_sec": 60.0, "hit@1": 0.9},
+        {"latency": {"p50_ms": 40.0, "count": 11}, "requests_per_sec": 80.0, "hit@1": 0.9},
+    ]
+    assert median_results(rounds) == {"latency": {"p50_ms": 40.0, "count": 11}, "requests_per_sec": 80.0, "hit@1": 0.9}
+
+    # A regression in most rounds shows even when one round is fast
+    slow = [rounds[0], {**rounds[1], "requests_per_sec": 50.0}, {**rounds[2], "requests_per_sec": 55.0}]
+    assert median_results(slow)["requests_per_sec"] == 55.0
+
+    # A round on a host running at half speed counts as if it ran at full speed
+    assert scale_to_host(rounds[1], 0.5) == {"latency": {"p50_ms": 25.0, "count": 12}, "requests_per_sec": 120.0, "hit@1": 0.9}
+
+
+def test_section_tolerances_override_the_default():
+    baseline = {"api.p95_ms": 50.0, "pipeline.p95_ms": 50.0}
+    current = {"api.p95_ms": 70.0, "pipeline.p95_ms": 70.0}
+
+    rows = compare_to_baseline(current, baseline, tolerance=0.25, section_tolerances={"api": 0.5})
+    assert {name: s for name, _, _, s in rows} == {"api.p95_ms": "ok", "pipeline.p95_ms": "REGRESSED"}
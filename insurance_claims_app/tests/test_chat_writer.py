@@ -0,0 +1,130 @@
+"""
+Tests for the chat history write-behind buffer
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from api import main
+from database.chat_writer import ChatWriteBehindBuffer
+from tests.conftest import CLAIM
+
+
+class RecordingSink:
+    def __init__(self, fail_times=0):
+        self.batches = []
+        self.fail_times = fail_times
+
+    def __call__(self, rows):
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise ConnectionError("database unavailable")
+        self.batches.append(list(rows))
+        return len(rows)
+
+
+def _buffer(tmp_path, sink, **kwargs):
+    return ChatWriteBehindBuffer(
+        sink=sink,
+        spool_path=str(tmp_path / "chat_spool.jsonl"),
+        batch_size=kwargs.get("batch_size", 3),
+        flush_interval_ms=kwargs.get("flush_interval_ms", 60000),
+        fsync=False
+    )
+
+
+def test_flush_batches_pending_messages(tmp_path):
+    sink = RecordingSink()
+    writer = _buffer(tmp_path, sink)
+
+    ids = [writer.enqueue("CLM-1", f"question {i}", f"answer {i}") for i in range(2)]
+    assert writer.pending_count() == 2
+    assert [m["chat_id"] for m in writer.pending_messages("CLM-1")] == ids
+
+    assert writer.flush() == 2
+    assert len(sink.batches) == 1
+    assert [row[0] for row in sink.batches[0]] == ids
+    assert writer.pending_count() == 0
+    assert not os.path.exists(writer.inflight_path)
+
+
+def test_spool_is_fsynced_per_flush_not_per_message(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    writer = ChatWriteBehindBuffer(sink=RecordingSink(), spool_path=str(tmp_path / "chat_spool.jsonl"),
+                                   batch_size=10, flush_interval_ms=60000, fsync=True)
+
+    for i in range(5):
+        writer.enqueue("CLM-1", f"question {i}", f"answer {i}")
+    assert synced == []
+    with open(writer.spool_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 5
+
+    assert writer.flush() == 5
+    assert len(synced) == 1
+
+
+def test_failed_flush_keeps_batch_for_retry(tmp_path):
+    sink = RecordingSink(fail_times=1)
+    writer = _buffer(tmp_path, sink)
+    writer.enqueue("CLM-1", "q", "a")
+
+    try:
+        writer.flush()
+        assert False, "expected the sink failure to propagate"
+    except ConnectionError:
+        pass
+
+    assert writer.pending_count() == 1
+    assert writer.flush() == 1
+    assert len(sink.batches) == 1
+
+
+def test_spool_is_replayed_after_crash(tmp_path):
+    crashed = _buffer(tmp_path, RecordingSink(fail_times=1))
+    crashed.enqueue("CLM-1", "q1", "a1")
+    try:
+        crashed.flush()  # leaves the batch in-flight
+    except ConnectionError:
+        pass
+    crashed.enqueue("CLM-2", "q2", "a2")
+    # Process dies here without stop()
+
+    sink = RecordingSink()
+    restarted = _buffer(tmp_path, sink)
+    restarted.start()
+    restarted.stop()
+
+    written = [row[1] for batch in sink.batches for row in batch]
+    assert written == ["CLM-1", "CLM-2"]
+    assert not os.path.exists(restarted.spool_path) or os.path.getsize(restarted.spool_path) == 0
+
+
+def test_batch_size_triggers_background_flush(tmp_path):
+    sink = RecordingSink()
+    writer = _buffer(tmp_path, sink, batch_size=2)
+    writer.start()
+    try:
+        writer.enqueue("CLM-1", "q1", "a1")
+        writer.enqueue("CLM-1", "q2", "a2")
+        for _ in range(100):
+            if sink.batches:
+                break
+            time.sleep(0.01)
+        assert sum(len(b) for b in sink.batches) == 2
+    finally:
+        writer.stop()
+
+
+def test_chat_history_is_kept_only_for_existing_claims(monkeypatch):
+    enqueued = []
+    monkeypatch.setattr(main.get_chat_writer(), "enqueue", lambda claim_id, *message: enqueued.append(claim_id))
+    with TestClient(main.app) as client:
+        claim_id = client.post("/submit-claim", json=CLAIM).json()["claim_id"]
+        for known in (claim_id, "CLM-MISSING"):
+            assert client.post("/chat", json={"message": "What is my claim status?", "claim_id": known}).status_code == 200
+
+    assert enqueued == [claim_id]
@@ -0,0 +1,199 @@
+"""
+Tests for the durable workflow checkpointer and claim resume
+"""
+import sys
+import os
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from config import config
+from database import DurableCheckpointSaver
+from database.checkpointer import SQLiteCheckpointStore
+from agents import supervisor_workflow
+from tests.conftest import stored_claim
+
+
+class CountingStore(SQLiteCheckpointStore):
+    def __init__(self, path):
+        super().__init__(path)
+        self.transactions = []
+
+    def write(self, checkpoints, writes, prunes=(), runs=()):
+        self.transactions.append((len(checkpoints), len(writes)))
+        super().write(checkpoints, writes, prunes, runs)
+
+
+def test_restarted_worker_resumes_after_last_completed_agent():
+    path = os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite")
+    saver = DurableCheckpointSaver(SQLiteCheckpointStore(path))
+    app = supervisor_workflow.build_supervisor_workflow().compile(checkpointer=saver)
+    claim = stored_claim()
+    run_config = {"configurable": {"thread_id": claim["claim_id"]}}
+    calls = {"document_analyzer": 0, "validation": 0}
+
+    def counted(name, fn):
+        def wrapped(state):
+            calls[name] += 1
+            return fn(state)
+        return wrapped
+
+    def crash(state):
+        raise RuntimeError("worker killed")
+
+    doc_agent, validator, approver = (supervisor_workflow.document_analyzer,
+                                      supervisor_workflow.validation_agent, supervisor_workflow.approval_agent)
+    saved = [vars(agent).copy() for agent in (doc_agent, validator, approver)]
+    doc_agent.analyze_documents = counted("document_analyzer", doc_agent.analyze_documents)
+    validator.validate_claim = counted("validation", validator.validate_claim)
+    approver.process_approval = crash
+    try:
+        with pytest.raises(RuntimeError):
+            app.invoke({**claim, "current_step": "started", "workflow_history": []}, run_config)
+        saver.flush()  # the writer thread's commit before the worker died
+        del approver.process_approval
+
+        # New process: fresh saver on the same file
+        restarted = supervisor_workflow.build_supervisor_workflow().compile(
+            checkpointer=DurableCheckpointSaver(SQLiteCheckpointStore(path)))
+        assert restarted.get_state(run_config).next == ("approval",)
+        result = restarted.invoke(None, run_config)
+    finally:
+        for agent, attrs in zip((doc_agent, validator, approver), saved):
+            vars(agent).clear()
+            vars(agent).update(attrs)
+
+    assert calls == {"document_analyzer": 1, "validation": 1}
+    assert result["approval_status"] == "APPROVED"
+    assert result["agents_invoked"].count("validation") == 1
+
+
+def test_runs_do_not_wait_on_the_store_and_queued_steps_collapse_into_one_commit():
+    store = CountingStore(os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite"))
+    saver = DurableCheckpointSaver(store, keep_last=2, prune_every=1, commit_interval_ms=60000)
+    app = supervisor_workflow.build_supervisor_workflow().compile(checkpointer=saver)
+    claims = [stored_claim(), stored_claim()]
+
+    # Both claims run to the end before the writer's first commit
+    for claim in claims:
+        result = app.invoke({**claim, "current_step": "started", "workflow_history": []},
+                            {"configurable": {"thread_id": claim["claim_id"]}})
+        assert result["approval_status"] == "APPROVED"
+    assert store.transactions == []
+
+    # Reading a thread commits the queue: all steps of both claims in one transaction,
+    # with only the newest checkpoint of each
+    run_config = {"configurable": {"thread_id": claims[1]["claim_id"]}}
+    assert saver.get_tuple(run_config).checkpoint["channel_values"]["approval_status"] == "APPROVED"
+    saver.close()
+    assert len(store.transactions) == 1
+    assert store.transactions[0][0] == 2
+    assert len(list(saver.list(run_config))) == 1
+
+
+def test_finished_branch_of_a_failed_step_is_not_repeated(monkeypatch):
+    monkeypatch.setattr(config, "SUPERVISOR_PARALLEL_FANOUT", True)
+    path = os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite")
+    saver = DurableCheckpointSaver(SQLiteCheckpointStore(path))
+    app = supervisor_workflow.build_supervisor_workflow().compile(checkpointer=saver)
+    claim = stored_claim()
+    run_config = {"configurable": {"thread_id": claim["claim_id"]}}
+    doc_agent, validator = supervisor_workflow.document_analyzer, supervisor_workflow.validation_agent
+    analyze, validate, analyzed = doc_agent.analyze_documents, validator.validate_claim, []
+
+    def crash(state):
+        raise RuntimeError("worker killed")
+
+    monkeypatch.setattr(doc_agent, "analyze_documents", lambda state: analyzed.append(1) or analyze(state))
+    monkeypatch.setattr(validator, "validate_claim", crash)
+    with pytest.raises(RuntimeError):
+        app.invoke({**claim, "current_step": "started", "workflow_history": []}, run_config)
+    saver.flush()  # the writer thread's commit before the worker died
+    monkeypatch.setattr(validator, "validate_claim", validate)
+
+    # New process: the document analysis finished before the crash and is not redone
+    restarted = supervisor_workflow.build_supervisor_workflow().compile(
+        checkpointer=DurableCheckpointSaver(SQLiteCheckpointStore(path)))
+    result = restarted.invoke(None, run_config)
+    assert len(analyzed) == 1
+    assert result["approval_status"] == "APPROVED"
+
+
+def test_process_claim_with_memory_resumes_or_replaces_runs():
+    claim = stored_claim()
+    first = supervisor_workflow.process_claim_with_supervisor(claim, with_memory=True)
+    second = supervisor_workflow.process_claim_with_supervisor(claim, with_memory=True)
+
+    # A finished run is replaced rather than appended to
+    assert first["agents_invoked"] == second["agents_invoked"]
+    assert supervisor_workflow.resume_claim(claim["claim_id"]) is None
+
+
+def _worker(monkeypatch, path, lease_s):
+    """Point the durable workflow at a checkpoint file, as a worker process of its own would"""
+    saver = DurableCheckpointSaver(SQLiteCheckpointStore(path), lease_s=lease_s)
+    monkeypatch.setattr(supervisor_workflow, "_compiled_durable_workflow",
+                        supervisor_workflow.build_supervisor_workflow().compile(checkpointer=saver))
+    return saver
+
+
+def test_a_run_is_not_resumed_while_its_worker_renews_the_lease(monkeypatch):
+    path = os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite")
+    saver = _worker(monkeypatch, path, lease_s=0.6)
+    other = DurableCheckpointSaver(SQLiteCheckpointStore(path))
+    claim = stored_claim()
+    approver = supervisor_workflow.approval_agent
+    approve, entered, release, calls = approver.process_approval, threading.Event(), threading.Event(), []
+
+    def slow(state):
+        calls.append(1)
+        entered.set()
+        release.wait(5)
+        return approve(state)
+
+    monkeypatch.setattr(approver, "process_approval", slow)
+    running = threading.Thread(target=supervisor_workflow.process_claim_with_supervisor, args=(claim,),
+                               kwargs={"with_memory": True})
+    running.start()
+    assert entered.wait(5)
+    time.sleep(1.5)  # longer than the lease: only the renewals keep it
+
+    assert other.expired_runs() == []
+    assert not other.take_over(claim["claim_id"])
+    assert supervisor_workflow.resume_interrupted_claims() == {}
+    release.set()
+    running.join(5)
+    assert calls == [1]
+    # A finished run leaves the index: it is not resumed once its lease runs out
+    saver.flush()
+    time.sleep(0.7)
+    assert other.expired_runs() == []
+
+
+def test_a_failed_run_is_resumed_by_one_worker_once_its_lease_expired(monkeypatch):
+    path = os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite")
+    saver = _worker(monkeypatch, path, lease_s=0.5)
+    claim = stored_claim()
+    approver = supervisor_workflow.approval_agent
+    approve = approver.process_approval
+
+    def crash(state):
+        raise RuntimeError("worker killed")
+
+    monkeypatch.setattr(approver, "process_approval", crash)
+    with pytest.raises(RuntimeError):
+        supervisor_workflow.process_claim_with_supervisor(claim, with_memory=True)
+    monkeypatch.setattr(approver, "process_approval", approve)
+    assert saver.expired_runs() == []
+    saver.close()
+
+    time.sleep(0.6)
+    _worker(monkeypatch, path, lease_s=0.5)
+    rival = DurableCheckpointSaver(SQLiteCheckpointStore(path))
+    resumed = supervisor_workflow.resume_interrupted_claims()
+    assert resumed[claim["claim_id"]]["approval_status"] == "APPROVED"
+    assert not rival.take_over(claim["claim_id"])
+    assert rival.expired_runs() == []
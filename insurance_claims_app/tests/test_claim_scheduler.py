@@ -0,0 +1,131 @@
+"""
+Tests for the priority-aware claim scheduler
+"""
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from agents.claim_scheduler import (
+    ClaimScheduler, InProcessClaimQueue, ScheduledClaim, QUEUE_WAIT, parse_pool_sizes
+)
+from agents.supervisor_workflow import resume_interrupted_claims
+from api import main
+from api.main import app
+from config import config
+from database import get_claim
+from database.checkpointer import DurableCheckpointSaver, SQLiteCheckpointStore, get_checkpointer
+from external_apis import current_deadline
+from tests.conftest import CLAIM, stored_claim
+
+
+def test_queue_orders_by_priority_then_age_and_ages_waiting_claims():
+    queue = InProcessClaimQueue(aging_s=60)
+    for claim_id, priority in [("L1", "low"), ("M1", "medium"), ("C1", "critical"), ("M2", "medium")]:
+        queue.put(ScheduledClaim({"claim_id": claim_id}, priority))
+    assert [queue.take(3, timeout=0).claim_data["claim_id"] for _ in range(4)] == ["C1", "M1", "M2", "L1"]
+
+    # A low claim that has waited two aging periods outranks a fresh medium one
+    old, fresh = ScheduledClaim({"claim_id": "OLD"}, "low"), ScheduledClaim({"claim_id": "NEW"}, "medium")
+    old.enqueued_at -= 121
+    queue.put(fresh)
+    queue.put(old)
+    assert queue.take(3, timeout=0).claim_data["claim_id"] == "OLD"
+
+    # A critical worker never takes less urgent claims
+    assert queue.take(0, timeout=0) is None
+    assert queue.depth()["medium"] == 1
+
+
+def test_low_priority_flood_does_not_starve_critical_claims():
+    release = threading.Event()
+
+    def processor(claim):
+        if claim["priority"] == "low":
+            release.wait(5)
+        return {"claim_id": claim["claim_id"]}
+
+    scheduler = ClaimScheduler(processor=processor, pool_sizes=parse_pool_sizes("critical=1,low=2"),
+                               triage=lambda claim: claim["priority"])
+    scheduler.start()
+    try:
+        flood = [scheduler.submit({"claim_id": f"LOW-{i}", "priority": "low"}) for i in range(20)]
+        time.sleep(0.05)
+        waits_before = QUEUE_WAIT.count(priority="critical")
+        urgent = scheduler.submit({"claim_id": "CRIT-1", "priority": "critical"})
+
+        assert urgent.result(timeout=2) == {"claim_id": "CRIT-1"}
+        assert not any(future.done() for future in flood)
+        assert scheduler.stats()["queue_depth"]["low"] == 18
+        assert QUEUE_WAIT.count(priority="critical") == waits_before + 1
+    finally:
+        release.set()
+        scheduler.stop()
+
+
+def test_background_claim_budget_starts_when_a_worker_picks_it_up(monkeypatch):
+    monkeypatch.setattr(config, "CLAIM_DEADLINE_MS", 100.0)
+    release = threading.Event()
+    expired = {}
+
+    def processor(claim):
+        expired[claim["claim_id"]] = current_deadline().expired()
+        if claim["claim_id"] == "FIRST":
+            release.wait(5)
+        return claim
+
+    scheduler = ClaimScheduler(processor=processor, pool_sizes=parse_pool_sizes("low=1"), triage=lambda claim: "low")
+    scheduler.start()
+    try:
+        scheduler.submit({"claim_id": "FIRST"})
+        backlog = scheduler.submit({"claim_id": "QUEUED"})
+        time.sleep(0.2)  # queued for twice the claim deadline
+        release.set()
+        backlog.result(timeout=2)
+    finally:
+        scheduler.stop()
+    assert expired == {"FIRST": False, "QUEUED": False}
+
+
+def test_batch_endpoint_queues_claims_and_saves_results():
+    with TestClient(app) as client:
+        response = client.post("/claims/batch", json={"claims": [CLAIM, {**CLAIM, "estimated_damage_amount": 45000.0}]})
+        assert response.status_code == 202
+        queued = response.json()["queued"]
+        assert [q["priority"] for q in queued] == ["low", "medium"]
+
+        for _ in range(200):
+            statuses = [client.get(f"/claim/{q['claim_id']}").json()["approval_status"] for q in queued]
+            if all(status not in (None, "PENDING") for status in statuses):
+                break
+            time.sleep(0.02)
+        assert statuses[0] == "APPROVED"
+        assert statuses[1] is not None and statuses[1] != "PENDING"
+
+
+def test_batch_endpoint_rejects_batches_over_the_size_cap():
+    with TestClient(app) as client:
+        response = client.post("/claims/batch", json={"claims": [CLAIM] * (config.CLAIM_BATCH_MAX_SIZE + 1)})
+    assert response.status_code == 422
+
+
+def test_a_claim_queued_on_a_worker_that_stopped_is_queued_again():
+    with TestClient(app):
+        claim_id = stored_claim()["claim_id"]
+        # Another worker queued the claim, then stopped before running it
+        stopped = DurableCheckpointSaver(SQLiteCheckpointStore(config.CHECKPOINT_SQLITE_PATH), lease_s=0.2)
+        stopped.start_run(claim_id)
+        stopped.close()
+        time.sleep(0.4)
+
+        assert resume_interrupted_claims(requeue=main._requeue_claim) == {}
+        for _ in range(200):
+            if (get_claim(claim_id).get("approval_status") or "PENDING") != "PENDING":
+                break
+            time.sleep(0.02)
+        assert get_claim(claim_id)["approval_status"] == "APPROVED"
+        get_checkpointer().flush()
+        assert claim_id not in get_checkpointer().expired_runs()
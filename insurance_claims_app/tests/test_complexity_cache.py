@@ -0,0 +1,67 @@
+"""
+Tests for the incrementally maintained complexity analysis
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import seed_sample_policies, create_claim
+from agents import supervisor_workflow
+from agents.supervisor_agent import ClaimsSupervisorAgent
+
+
+class CountingSupervisor(ClaimsSupervisorAgent):
+    def __init__(self):
+        super().__init__()
+        self.static_runs = 0
+        self.dynamic_runs = 0
+
+    def static_complexity(self, state):
+        self.static_runs += 1
+        return super().static_complexity(state)
+
+    def dynamic_complexity(self, state):
+        self.dynamic_runs += 1
+        return super().dynamic_complexity(state)
+
+
+def test_only_changed_factors_are_recomputed():
+    supervisor = CountingSupervisor()
+    state = {"estimated_damage_amount": 60000, "claim_type": "theft", "damage_photos": ["a.jpg"],
+             "incident_date": "2026-06-01T10:00:00", "claim_date": "2026-06-03T10:00:00"}
+
+    first = supervisor.update_complexity(state)
+    state["complexity_analysis"] = first
+    assert supervisor.update_complexity(state) is first  # nothing changed
+    assert (supervisor.static_runs, supervisor.dynamic_runs) == (1, 1)
+
+    state["fraud_score"] = 0.75
+    second = supervisor.update_complexity(state)
+    assert (supervisor.static_runs, supervisor.dynamic_runs) == (1, 2)
+    assert second["complexity_score"] == first["complexity_score"] + 3
+    assert second == {**second, **supervisor.analyze_claim_complexity(state)}
+    assert [r["trigger"] for r in second["revisions"]] == [["claim_inputs"], ["fraud_score"]]
+
+
+def test_claim_computes_static_complexity_once():
+    seed_sample_policies()
+    claim = {
+        "policy_id": "POL-001", "customer_id": "CUST-001",
+        "incident_date": "2026-06-01T10:00:00", "claim_date": "2026-06-03T10:00:00",
+        "claim_type": "collision", "damage_description": "Rear-ended at a stop light, bumper damaged",
+        "repair_shop": "Certified Auto", "estimated_damage_amount": 3000.0,
+        "damage_photos": ["front.jpg", "rear.jpg"], "incident_report": "report", "repair_estimate": "estimate"
+    }
+    claim["claim_id"] = create_claim(claim)
+
+    counting = CountingSupervisor()
+    original = supervisor_workflow.supervisor
+    supervisor_workflow.supervisor = counting
+    try:
+        result = supervisor_workflow.process_claim_with_supervisor(claim)
+    finally:
+        supervisor_workflow.supervisor = original
+
+    assert counting.static_runs == 1
+    assert result["complexity_analysis"]["static"]["score"] == 0
+    assert result["complexity_analysis"]["revisions"][0]["trigger"] == ["claim_inputs"]
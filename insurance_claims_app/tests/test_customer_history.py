@@ -0,0 +1,105 @@
+"""
+Tests for the per-customer claim aggregate and history lookups
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+import database
+from database import (
+    create_claim, get_claim, update_claim, get_claims_by_customer, get_customer_claim_stats, rebuild_customer_claim_stats
+)
+from database.customer_stats import claims_in_window, empty_stats, record_claim
+from agents import supervisor_workflow
+from agents.fraud_investigation_agent import FraudInvestigationAgent
+from api import main
+from tests.conftest import CLAIM
+
+
+def _claim(customer_id):
+    return {
+        "policy_id": "POL-001", "customer_id": customer_id, "incident_date": "2026-06-01T10:00:00",
+        "claim_date": "2026-06-03T10:00:00", "claim_type": "collision", "estimated_damage_amount": 1000.0
+    }
+
+
+def test_aggregate_follows_creates_and_payouts():
+    claim_ids = [create_claim(_claim("CUST-HIST-1")) for _ in range(3)]
+    update_claim(claim_ids[0], {"payout_amount": 500.0})
+    update_claim(claim_ids[0], {"payout_amount": 700.0})
+    update_claim(claim_ids[1], {"payout_amount": 250.0})
+
+    stats = get_customer_claim_stats("CUST-HIST-1")
+    assert stats["claim_count"] == 3
+    assert stats["claims_last_90_days"] == 3
+    assert stats["total_payout"] == 950.0
+    assert stats["last_claim_date"] is not None
+    assert [c["claim_id"] for c in get_claims_by_customer("CUST-HIST-1", limit=2)] == claim_ids[:0:-1]
+
+    rebuild_customer_claim_stats()
+    assert get_customer_claim_stats("CUST-HIST-1") == stats
+
+
+def test_velocity_window_drops_old_claims():
+    start = datetime(2026, 1, 1, 12)
+    stats = record_claim(empty_stats("C"), start)
+    stats = record_claim(stats, start + timedelta(days=100))
+
+    assert stats["claim_count"] == 2
+    assert list(stats["recent_claim_days"]) == ["2026-04-11"]
+    assert claims_in_window(stats, start + timedelta(days=100)) == 1
+    assert claims_in_window(stats, start + timedelta(days=200)) == 0
+
+
+def test_fraud_agent_reads_the_aggregate():
+    agent = FraudInvestigationAgent()
+    assert agent._analyze_customer_history("CUST-HIST-NEW")["positive_factors"] == ["First-time claimant"]
+
+    for _ in range(5):
+        create_claim(_claim("CUST-HIST-2"))
+    analysis = agent._analyze_customer_history("CUST-HIST-2")
+    assert analysis["claim_count"] == 5
+    assert "Customer filed 5 claims in the last 90 days" in analysis["risk_factors"]
+
+
+def test_the_claim_under_review_leaves_its_payout_date_and_window_count_out(monkeypatch):
+    agent = FraudInvestigationAgent()
+    first, second = create_claim(_claim("CUST-HIST-3")), create_claim(_claim("CUST-HIST-3"))
+    update_claim(first, {"payout_amount": 500.0})
+    update_claim(second, {"payout_amount": 200.0})
+
+    latest = agent._analyze_customer_history("CUST-HIST-3", second)
+    assert (latest["claim_count"], latest["claims_last_90_days"], latest["total_payout"]) == (1, 1, 500.0)
+    assert latest["last_claim_date"] == get_claim(first)["created_at"]
+
+    # An old claim being reprocessed fell out of the 90-day window already
+    stored = database.get_claim
+    old = {**stored(first), "created_at": (datetime.now() - timedelta(days=200)).isoformat()}
+    monkeypatch.setattr(database, "get_claim", lambda claim_id: old if claim_id == first else stored(claim_id))
+    reprocessed = agent._analyze_customer_history("CUST-HIST-3", first)
+    assert (reprocessed["claim_count"], reprocessed["claims_last_90_days"], reprocessed["total_payout"]) == (1, 2, 200.0)
+    assert reprocessed["last_claim_date"] == get_claim(second)["created_at"]
+
+
+def test_submitted_claim_is_not_its_own_history(monkeypatch):
+    analyze, analyses = supervisor_workflow.fraud_agent._analyze_customer_history, []
+    monkeypatch.setattr(supervisor_workflow.fraud_agent, "_analyze_customer_history",
+                        lambda *args: analyses.append(analyze(*args)) or analyses[-1])
+    claim = {**CLAIM, "repair_shop": "Quick Fix Auto", "estimated_damage_amount": 40000.0}
+
+    with TestClient(main.app) as client:
+        # A customer of their own, so other tests' claims don't count
+        policy = {**main.get_policy("POL-001"), "customer_id": "CUST-HIST-API"}
+        monkeypatch.setattr(main, "get_policy", lambda policy_id: policy)
+        for _ in range(4):
+            assert client.post("/submit-claim", json=claim).status_code == 200
+
+    assert [a["claim_count"] for a in analyses] == [0, 1, 2, 3]
+    assert analyses[0]["positive_factors"] == ["First-time claimant"]
+    # Three earlier claims are normal; the current one is not counted as a fourth
+    assert analyses[-1]["risk_factors"] == []
+    assert get_customer_claim_stats("CUST-HIST-API")["claim_count"] == 4
@@ -0,0 +1,81 @@
+"""
+Tests for the per-claim deadline budget and its degraded fallbacks
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from concurrent.futures import Future
+from fastapi.testclient import TestClient
+
+from config import config
+from agents import supervisor_workflow
+from agents.step_log import step_dicts, summarize_steps
+from external_apis import CarDamageAPI, Deadline, DeadlineExceeded, deadline_scope
+from api import main
+from tests.conftest import CLAIM, stored_claim
+
+
+def test_external_clients_refuse_work_past_the_deadline():
+    api = CarDamageAPI(seed=1)
+    with deadline_scope(Deadline.after(0)):
+        with pytest.raises(DeadlineExceeded):
+            api.analyze_damage(["front.jpg"], 1000.0)
+    # Outside a claim there is no budget to enforce
+    assert api.analyze_damage(["front.jpg"], 1000.0)["total_estimated_repair_cost"] > 0
+
+
+def test_expired_claim_skips_agents_and_goes_to_human_review():
+    with deadline_scope(Deadline.after(0)):
+        result = supervisor_workflow.process_claim_with_supervisor(stored_claim())
+
+    assert result["deadline_exceeded"] is True
+    assert result["human_review_required"] is True
+    assert result["approval_status"] == "NEEDS_REVIEW"
+    skipped = [s["step"] for s in step_dicts(result["workflow_history"]) if s["action"].startswith("skipped")]
+    assert sorted(skipped) == ["document_analyzer", "validation"]
+    assert "approval" not in summarize_steps(result["workflow_history"])["path"]
+
+
+def test_low_budget_skips_image_similarity_and_fraud_investigation():
+    budget = config.CLAIM_DEADLINE_RESERVE_MS / 2
+    with deadline_scope(Deadline.after(budget)):
+        result = supervisor_workflow.process_claim_with_supervisor(stored_claim(estimated_damage_amount=45000.0))
+
+    assert result["document_analysis"]["image_similarity_skipped"] is True
+    assert result["validation_status"] == "VALID"
+    assert "fraud_investigation" not in result["agents_invoked"]
+    assert "human_review" in result["agents_invoked"]
+    assert "deadline is close" in result["human_review_reason"]
+
+
+def test_full_budget_runs_the_normal_path():
+    result = supervisor_workflow.process_claim_with_supervisor(stored_claim(estimated_damage_amount=45000.0))
+    assert "fraud_investigation" in result["agents_invoked"]
+    assert not result.get("deadline_exceeded")
+    assert "image_similarity_skipped" not in result["document_analysis"]
+
+
+def test_claim_still_queued_at_the_deadline_goes_to_human_review(monkeypatch):
+    queued = Future()
+
+    class StuckScheduler:
+        def submit(self, claim_data, priority=None, deadline=None):
+            return queued
+
+    monkeypatch.setattr(config, "CLAIM_DEADLINE_MS", 50.0)
+    monkeypatch.setattr(main, "get_claim_scheduler", lambda: StuckScheduler())
+    with TestClient(main.app) as client:
+        response = client.post("/submit-claim", json=CLAIM)
+        claim_id = response.json()["claim_id"]
+        stored = client.get(f"/claim/{claim_id}").json()
+        steps = client.get(f"/claim/{claim_id}/workflow-steps").json()
+
+    assert response.status_code == 200
+    assert response.json()["approval_status"] == "NEEDS_REVIEW"
+    assert response.json()["human_review_required"] is True
+    assert stored["approval_status"] == "NEEDS_REVIEW"
+    assert response.json()["workflow_summary"]["total_steps"] == 1
+    assert [step["seq"] for step in steps] == [1]
+    assert queued.cancelled()
@@ -0,0 +1,79 @@
+"""
+Tests for the resumable decision backfill
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import csv
+
+import pytest
+
+import agents.decision_backfill as decision_backfill
+from agents.approval_agent import fraud_score_decision, processing_days_for
+from agents.decision_backfill import DecisionBackfill
+from database import create_claim, get_claim, get_customer_claim_stats, update_claim
+
+NEW_THRESHOLDS = {"high": 0.5, "medium": 0.3, "low": 0.05}
+
+
+def _decided_claims(customer_id, scores):
+    claim_ids = []
+    for score in scores:
+        claim_id = create_claim({
+            "policy_id": "POL-001", "customer_id": customer_id, "incident_date": "2026-06-01T10:00:00",
+            "claim_date": "2026-06-03T10:00:00", "claim_type": "collision", "estimated_damage_amount": 2000.0
+        })
+        status, reason = fraud_score_decision(score, [])
+        update_claim(claim_id, {
+            "validation_status": "VALID", "approval_status": status, "approval_reason": reason,
+            "payout_amount": 1500.0, "processing_time_days": processing_days_for(score), "fraud_score": score
+        })
+        claim_ids.append(claim_id)
+    return claim_ids
+
+
+def _report_ids(path, claim_ids):
+    with open(path, newline="", encoding="utf-8") as f:
+        return sorted(row["claim_id"] for row in csv.DictReader(f) if row["claim_id"] in claim_ids)
+
+
+def test_dry_run_reports_and_apply_writes(tmp_path):
+    claim_ids = _decided_claims("CUST-BACKFILL-1", [0.1, 0.35, 0.6, 0.8])
+    human = _decided_claims("CUST-BACKFILL-1", [0.6])[0]
+    update_claim(human, {"approval_reason": "Approved by human review: checked"})
+
+    dry = DecisionBackfill(NEW_THRESHOLDS, apply=False, chunk_size=2, workers=0, run_dir=str(tmp_path)).run()
+    assert _report_ids(dry["report_path"], claim_ids + [human]) == sorted([claim_ids[0], claim_ids[2]])
+    assert get_claim(claim_ids[2])["approval_status"] == "APPROVED"
+
+    applied = DecisionBackfill(NEW_THRESHOLDS, apply=True, chunk_size=2, workers=2, run_dir=str(tmp_path)).run()
+    assert applied["written"] >= 2 and applied["transitions"]["APPROVED->NEEDS_REVIEW"] >= 1
+    moved = get_claim(claim_ids[2])
+    assert moved["approval_status"] == "NEEDS_REVIEW" and moved["approval_reason"].startswith("High fraud risk")
+    assert get_claim(claim_ids[0])["processing_time_days"] == 5
+    assert get_claim(human)["approval_status"] == "APPROVED"
+    assert get_customer_claim_stats("CUST-BACKFILL-1")["total_payout"] == 5 * 1500.0
+
+
+def test_interrupted_run_resumes_without_duplicate_rows(tmp_path, monkeypatch):
+    claim_ids = _decided_claims("CUST-BACKFILL-2", [0.45, 0.55, 0.65, 0.45, 0.55])
+    thresholds = {"high": 0.4, "medium": 0.3, "low": 0.25}
+    calls = []
+    real_update = decision_backfill.update_claim_decisions
+
+    def failing_update(changes):
+        calls.append(len(changes))
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        return real_update(changes)
+
+    monkeypatch.setattr(decision_backfill, "update_claim_decisions", failing_update)
+    backfill = DecisionBackfill(thresholds, apply=True, chunk_size=1, workers=0, run_dir=str(tmp_path))
+    with pytest.raises(RuntimeError):
+        backfill.run()
+
+    summary = backfill.run()
+    assert summary["completed"]
+    assert _report_ids(summary["report_path"], claim_ids) == sorted(claim_ids)
+    assert all(get_claim(claim_id)["approval_status"] == "NEEDS_REVIEW" for claim_id in claim_ids)
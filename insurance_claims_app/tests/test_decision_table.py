@@ -0,0 +1,86 @@
+"""
+Tests for the compiled supervisor decision table and the agent fast path
+"""
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from database import seed_sample_policies, create_claim
+from agents import supervisor_workflow
+from agents.decision_table import STEP_DIMENSIONS, fraud_band
+from agents.step_log import summarize_steps
+
+
+def _random_state(rng):
+    incident_day = rng.randint(1, 10)
+    return {
+        "current_step": rng.choice(list(STEP_DIMENSIONS)),
+        "validation_status": rng.choice(["VALID", "INVALID"]),
+        "approval_status": rng.choice(["APPROVED", "DENIED", "NEEDS_REVIEW"]),
+        "human_review_decision": rng.choice([None, "APPROVE", "DENY"]),
+        "supervisor_priority": rng.choice(["low", "medium", "high", "critical"]),
+        "fraud_score": round(rng.random(), 2),
+        "image_fraud_check": {"is_potential_duplicate": rng.random() < 0.2},
+        "estimated_damage_amount": rng.choice([800, 4000, 12000, 25000, 35000, 60000]),
+        "damage_photos": ["p.jpg"] * rng.randint(0, 7),
+        "claim_type": rng.choice(["collision", "comprehensive", "theft", "fire"]),
+        "incident_date": f"2026-06-{incident_day:02d}T10:00:00",
+        "claim_date": f"2026-06-{incident_day + rng.choice([1, 5, 25]):02d}T10:00:00",
+    }
+
+
+def test_table_matches_supervisor_rules():
+    table = supervisor_workflow.decision_table
+    supervisor = supervisor_workflow.supervisor
+    rng = random.Random(7)
+    for _ in range(2000):
+        state = _random_state(rng)
+        expected = supervisor.determine_next_agent(state)
+        decision = table.lookup(state)
+        assert decision is not None, state
+        assert (decision.next_agent, decision.priority) == (expected.next_agent, expected.priority), state
+
+
+def test_table_misses_fall_back_to_supervisor():
+    table = supervisor_workflow.decision_table
+    assert table.lookup({"current_step": "started"}) is None
+    assert table.lookup({"current_step": "approval_complete", "approval_status": "ERROR"}) is None
+    assert fraud_band(0.5) == "moderate" and fraud_band(0.81) == "very_high"
+
+
+def _run(claim, fast_path: bool, fanout: bool):
+    config.SUPERVISOR_FAST_PATH, config.SUPERVISOR_PARALLEL_FANOUT = fast_path, fanout
+    try:
+        return supervisor_workflow.process_claim_with_supervisor(claim)
+    finally:
+        config.SUPERVISOR_FAST_PATH, config.SUPERVISOR_PARALLEL_FANOUT = True, True
+
+
+def test_clean_claim_skips_supervisor_hops():
+    seed_sample_policies()
+    claim = {
+        "policy_id": "POL-001", "customer_id": "CUST-001",
+        "incident_date": "2026-06-01T10:00:00", "claim_date": "2026-06-03T10:00:00",
+        "claim_type": "collision", "damage_description": "Rear-ended at a stop light, bumper damaged",
+        "repair_shop": "Certified Auto", "estimated_damage_amount": 3000.0,
+        "damage_photos": ["front.jpg"], "incident_report": "report", "repair_estimate": "estimate"
+    }
+    claim["claim_id"] = create_claim(claim)
+
+    def node_runs(result):
+        return sum(t["calls"] for t in result["node_timings"].values())
+
+    # Serial: supervisor + 3 agents, instead of a supervisor hop after each agent
+    slow, fast = _run(claim, False, False), _run(claim, True, False)
+    assert (node_runs(slow), node_runs(fast)) == (7, 4)
+    assert fast["node_timings"]["supervisor"]["calls"] == 1
+    assert summarize_steps(fast["workflow_history"])["path"].count("decision_table") == 3
+    for key in ("approval_status", "payout_amount", "supervisor_priority", "agents_invoked"):
+        assert fast[key] == slow[key]
+
+    # Fan-out branches still rejoin at the supervisor; approval routes itself
+    slow, fast = _run(claim, False, True), _run(claim, True, True)
+    assert (slow["node_timings"]["supervisor"]["calls"], fast["node_timings"]["supervisor"]["calls"]) == (3, 2)
+    assert fast["approval_status"] == slow["approval_status"] == "APPROVED"
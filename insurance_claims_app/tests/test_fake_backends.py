@@ -0,0 +1,76 @@
+"""
+Tests for the offline load-testing backends: fake LLM, seeded mock APIs, in-memory database
+"""
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from external_apis.fake_llm import FakeEmbeddingModel, parse_latency
+from external_apis.fraud_scoring_api import FraudScoringAPI
+from external_apis.car_damage_api import CarDamageAPI
+from database import memory_backend
+
+
+def test_latency_distributions():
+    rng = random.Random(1)
+    assert parse_latency("constant:25")(rng) == 25
+    assert all(10 <= parse_latency("uniform:10:20")(rng) <= 20 for _ in range(100))
+    samples = sorted(parse_latency("lognormal:100:0.5")(rng) for _ in range(2000))
+    assert 85 < samples[1000] < 115  # median close to the configured value
+    try:
+        parse_latency("gamma:1")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+def test_seeded_mock_apis_replay_identically():
+    args = (12000.0, "Joe's Garage", "CUST-001", 5, "collision")
+    first = FraudScoringAPI(seed=7).score_claim(*args)
+    # Interleaved calls with other inputs must not shift the sequence
+    other = FraudScoringAPI(seed=7)
+    other.score_claim(500.0, "dealer_service", "CUST-002", 1, "liability")
+    assert other.score_claim(*args) == first
+
+    damage = CarDamageAPI(seed=7).analyze_damage(["a.jpg", "b.jpg"], 4500.0)
+    assert CarDamageAPI(seed=7).analyze_damage(["a.jpg", "b.jpg"], 4500.0) == damage
+
+
+def test_fake_embeddings_are_deterministic_and_topical():
+    model = FakeEmbeddingModel()
+    vectors = model.encode(["rental car coverage", "rental car limit", "appeal deadline"])
+    assert vectors.shape == (3, 384)
+    assert np.allclose(model.encode("rental car coverage"), vectors[0])
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+
+def test_memory_backend_claim_and_chat_roundtrip():
+    memory_backend.reset_database()
+    memory_backend.seed_sample_policies()
+    assert memory_backend.get_policy("POL-003")["is_active"] == 0
+
+    claim_id = memory_backend.create_claim({
+        "policy_id": "POL-001", "customer_id": "CUST-001",
+        "incident_date": "2026-06-01T10:00:00", "claim_date": "2026-06-03T10:00:00",
+        "claim_type": "collision", "damage_description": "bumper", "estimated_damage_amount": 1200.0
+    })
+    assert memory_backend.update_claim(claim_id, {"approval_status": "APPROVED"})
+    assert memory_backend.get_claim(claim_id)["approval_status"] == "APPROVED"
+
+    rows = [("CHAT-1", claim_id, "hi", "hello", "2026-06-03T10:00:00"),
+            ("CHAT-2", "CLM-MISSING", "hi", "hello", "2026-06-03T10:00:01")]
+    assert memory_backend.save_chat_messages_batch(rows) == 1
+    assert memory_backend.save_chat_messages_batch(rows[:1]) == 0  # replay is idempotent
+    assert [m["chat_id"] for m in memory_backend.get_chat_history(claim_id)] == ["CHAT-1"]
+
+
+def test_memory_image_store_flags_exact_duplicates():
+    store = memory_backend.MemoryImageVectorStore()
+    store.add_image("CLM-A", "front.jpg", b"same-bytes")
+    store.add_image("CLM-B", "rear.jpg", b"other-bytes")
+    check = store.check_for_duplicate_images(b"same-bytes")
+    assert check["is_potential_duplicate"]
+    assert check["similar_claims"] == ["CLM-A"]
@@ -0,0 +1,100 @@
+"""
+Tests for the fraud ring graph
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import time
+
+from agents.fraud_graph import FraudRingGraph
+from agents.fraud_investigation_agent import FraudInvestigationAgent
+
+
+def test_ring_through_shared_shop_and_images():
+    graph = FraudRingGraph(hub_customers=10)
+    for i in range(4):
+        graph.add_claim(f"R-{i}", f"CUST-R{i}", f"POL-R{i}", "Joe's Body-Shop")
+    graph.add_claim("R-4", "CUST-R4", "POL-R4", "Elsewhere Garage", similar_claims=["R-0"])
+    graph.add_claim("LONE", "CUST-LONE", "POL-LONE", "Another Shop")
+
+    ring = graph.ring_stats("R-4")
+    assert (ring["component_claims"], ring["component_customers"], ring["component_shops"]) == (5, 5, 2)
+    assert ring["busiest_shop"] == "joe s body shop" and ring["shared_shop_density"] == 0.8
+    assert ring["duplicate_image_links"] == 1
+    assert graph.ring_stats("LONE")["component_claims"] == 1
+    assert graph.ring_stats("UNKNOWN") is None
+
+    # Adding a claim again changes nothing
+    graph.add_claim("R-1", "CUST-R1", "POL-R1", "Joe's Body-Shop")
+    assert graph.ring_stats("R-1") == ring
+
+
+def test_hub_shops_stop_linking_and_rebuild_matches():
+    claims = [
+        {"claim_id": f"C-{i}", "customer_id": f"CUST-{i}", "policy_id": f"POL-{i}", "repair_shop": "National Chain"}
+        for i in range(6)
+    ]
+    graph = FraudRingGraph(hub_customers=3)
+    for claim in claims:
+        graph.add_claim(**claim)
+    # The first customers were linked before the shop turned out to be a hub
+    assert graph.ring_stats("C-0")["component_customers"] == 3
+    assert graph.ring_stats("C-5")["component_customers"] == 1
+
+    graph.link_duplicate_images("C-4", ["C-5"])
+    graph.rebuild(claims)
+    assert graph.ring_stats("C-0")["component_customers"] == 1
+    assert graph.ring_stats("C-5")["component_customers"] == 2
+    assert graph.size()["hub_shops"] == 1
+
+
+def test_queries_stay_sub_millisecond_on_a_large_graph():
+    rng = random.Random(5)
+    graph = FraudRingGraph(hub_customers=50)
+    for i in range(50000):
+        graph.add_claim(f"L-{i}", f"CUST-{rng.randrange(20000)}", f"POL-{i}", f"Shop {rng.randrange(2000)}")
+
+    started = time.perf_counter()
+    for i in range(1000):
+        graph.ring_stats(f"L-{rng.randrange(50000)}")
+    assert (time.perf_counter() - started) / 1000 < 0.001
+
+
+def test_fraud_agent_flags_a_ring():
+    agent = FraudInvestigationAgent()
+    for i in range(4):
+        check = agent._check_fraud_ring({
+            "claim_id": f"RING-{i}", "customer_id": f"CUST-RING-{i}", "policy_id": f"POL-RING-{i % 2}",
+            "repair_shop": "Ring Leader Motors"
+        })
+    assert check["component_customers"] == 4 and check["shared_policies"] == 2
+    assert check["risk_factor"].startswith("Possible fraud ring: linked to 3 other customers")
+
+
+def test_customers_sharing_only_a_shop_are_not_a_ring():
+    agent = FraudInvestigationAgent()
+    for i in range(5):
+        check = agent._check_fraud_ring({
+            "claim_id": f"MAIN-{i}", "customer_id": f"CUST-MAIN-{i}", "policy_id": f"POL-MAIN-{i}",
+            "repair_shop": "Main Street Auto Body"
+        })
+    assert check["component_customers"] == 5 and check["shared_shop_density"] == 1.0
+    assert check["shared_policies"] == 0
+    assert "risk_factor" not in check
+
+
+def test_rebuild_counts_shared_policies():
+    claims = [
+        {"claim_id": f"P-{i}", "customer_id": f"CUST-P{i}", "policy_id": "POL-FAMILY", "repair_shop": f"Shop {i}"}
+        for i in range(3)
+    ]
+    graph = FraudRingGraph(hub_customers=10)
+    for claim in claims:
+        graph.add_claim(**claim)
+    incremental = graph.ring_stats("P-0")
+    assert incremental["shared_policies"] == 1 and incremental["component_customers"] == 3
+
+    graph.rebuild(claims)
+    assert graph.ring_stats("P-0") == incremental
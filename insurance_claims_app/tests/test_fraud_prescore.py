@@ -0,0 +1,85 @@
+"""
+Tests for speculative fraud pre-scoring during validation
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config
+from external_apis import FraudScoringAPI
+from agents import supervisor_workflow
+from agents.fraud_prescore import FraudPrescorer, PRESCORES, fraud_score_inputs, get_fraud_prescorer, scored_assessment
+from tests.conftest import stored_claim
+
+
+def _no_api_scoring(*args, **kwargs):
+    raise AssertionError("fraud score should come from the speculative pre-score")
+
+
+def test_agents_use_the_prescore_computed_during_validation(monkeypatch):
+    monkeypatch.setattr(config, "SUPERVISOR_PARALLEL_FANOUT", True)
+    monkeypatch.setattr(supervisor_workflow.approval_agent.fraud_api, "score_claim", _no_api_scoring)
+    monkeypatch.setattr(supervisor_workflow.fraud_agent.fraud_api, "score_claim", _no_api_scoring)
+
+    for claim in (stored_claim(), stored_claim(estimated_damage_amount=40000.0, repair_shop="Quick Fix Auto")):
+        result = supervisor_workflow.process_claim_with_supervisor(claim)
+        assert result["validation_status"] == "VALID"
+        assert result["fraud_prescore"]["inputs"] == fraud_score_inputs(result)
+        assert result["fraud_assessment"] == result["fraud_prescore"]["assessment"]
+        assert result["approval_status"] in ("APPROVED", "NEEDS_REVIEW")
+
+    # Without the fan-out, the score still overlaps validation
+    monkeypatch.setattr(config, "SUPERVISOR_PARALLEL_FANOUT", False)
+    result = supervisor_workflow.process_claim_with_supervisor(stored_claim())
+    assert result["fraud_assessment"] == result["fraud_prescore"]["assessment"]
+
+
+def test_prescore_is_discarded_when_validation_fails():
+    discarded = PRESCORES.value(result="discarded")
+    late = stored_claim(incident_date="2026-03-01T10:00:00", claim_date="2026-06-03T10:00:00")
+
+    result = supervisor_workflow.process_claim_with_supervisor(late)
+    assert result["validation_status"] == "INVALID"
+    assert "fraud_prescore" not in result
+    assert PRESCORES.value(result="discarded") == discarded + 1
+
+
+def test_stale_or_missing_prescore_falls_back_to_the_api():
+    api = FraudScoringAPI(seed=3)
+    state = {"estimated_damage_amount": 3000.0, "repair_shop": "Quick Fix", "customer_id": "CUST-9", "claim_type": "collision"}
+    prescore = {"inputs": fraud_score_inputs(state), "assessment": {"fraud_score": 0.99, "fraud_indicators": []}}
+
+    assert scored_assessment({**state, "fraud_prescore": prescore}, api)["fraud_score"] == 0.99
+    corrected = {**state, "estimated_damage_amount": 4200.0, "fraud_prescore": prescore}
+    assert scored_assessment(corrected, api) == api.score_claim(**fraud_score_inputs(corrected))
+
+    # A scoring error is dropped rather than failing validation
+    failing = FraudPrescorer(fraud_api=FraudScoringAPI(seed=3), workers=1)
+    failing.fraud_api.score_claim = lambda **kwargs: 1 / 0
+    assert failing.collect(failing.start(state), "VALID") is None
+
+
+def test_vendor_latency_overlaps_validation(monkeypatch):
+    prescorer = get_fraud_prescorer()
+    score, validate = prescorer.fraud_api.score_claim, supervisor_workflow.validation_agent.validate_claim
+
+    def slow_score(**kwargs):
+        time.sleep(0.2)
+        return score(**kwargs)
+
+    def slow_validate(state):
+        time.sleep(0.2)
+        return validate(state)
+
+    monkeypatch.setattr(prescorer.fraud_api, "score_claim", slow_score)
+    monkeypatch.setattr(supervisor_workflow.validation_agent, "validate_claim", slow_validate)
+    claim = stored_claim()
+    started = time.perf_counter()
+    update = supervisor_workflow.with_fraud_prescore(supervisor_workflow.validation_node)(claim)
+    elapsed = time.perf_counter() - started
+
+    # The node takes as long as validation, not validation plus scoring
+    assert elapsed < 0.35
+    assert update["validation_status"] == "VALID"
+    assert update["fraud_prescore"]["assessment"] == score(**fraud_score_inputs(claim))
@@ -0,0 +1,83 @@
+"""
+Tests for pausing claims at human review and resuming them with a decision
+"""
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agents import supervisor_workflow
+from api import main
+from api.main import app
+from tests.conftest import CLAIM
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Every claim is flagged by the approval agent
+    monkeypatch.setattr(supervisor_workflow.approval_agent, "_make_decision",
+                        lambda score, assessment: ("NEEDS_REVIEW", "Flagged for review"))
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_review_resumes_paused_claim_with_one_approval_step(client):
+    submitted = client.post("/submit-claim", json=CLAIM).json()
+    assert submitted["approval_status"] == "NEEDS_REVIEW"
+    assert submitted["human_review_required"] is True
+    claim_id = submitted["claim_id"]
+
+    response = client.post(f"/claim/{claim_id}/review",
+                           json={"decision": "APPROVE", "notes": "photos check out", "reviewer": "adjuster-7"})
+    assert response.status_code == 200
+    reviewed = response.json()
+    assert reviewed["approval_status"] == "APPROVED"
+    assert reviewed["approval_reason"] == "Approved by human review: photos check out"
+    assert reviewed["payout_amount"] > 0
+    # Only the approval step ran again
+    calls = {node: t["calls"] for node, t in reviewed["node_timings"].items()}
+    assert calls["approval"] == 2 and calls["validation"] == 1 and calls["document_analyzer"] == 1
+    assert client.get(f"/claim/{claim_id}").json()["approval_status"] == "APPROVED"
+
+    # Nothing left to review
+    again = client.post(f"/claim/{claim_id}/review", json={"decision": "DENY"})
+    assert again.status_code == 409
+
+
+def test_deny_decision_and_paused_claims_are_not_auto_resumed(client):
+    claim_id = client.post("/submit-claim", json=CLAIM).json()["claim_id"]
+    assert supervisor_workflow.resume_claim(claim_id) is None
+
+    reviewed = client.post(f"/claim/{claim_id}/review", json={"decision": "DENY", "notes": "staged"}).json()
+    assert reviewed["approval_status"] == "DENIED"
+    assert reviewed["payout_amount"] == 0
+    assert client.post("/claim/CLM-MISSING/review", json={"decision": "DENY"}).status_code == 404
+
+
+def test_review_does_not_block_other_requests(client, monkeypatch):
+    claim_id = client.post("/submit-claim", json=CLAIM).json()["claim_id"]
+    started, release = threading.Event(), threading.Event()
+    real_submit_review = main.submit_review
+
+    def slow_submit_review(*args):
+        started.set()
+        release.wait(5)
+        return real_submit_review(*args)
+
+    monkeypatch.setattr(main, "submit_review", slow_submit_review)
+    responses = []
+    review = threading.Thread(target=lambda: responses.append(
+        client.post(f"/claim/{claim_id}/review", json={"decision": "APPROVE"})))
+    review.start()
+    assert started.wait(5)
+    try:
+        # Answered while the review is still running
+        assert client.get("/health").status_code == 200
+        assert review.is_alive()
+    finally:
+        release.set()
+        review.join()
+    assert responses[0].json()["approval_status"] == "APPROVED"
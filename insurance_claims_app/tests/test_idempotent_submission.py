@@ -0,0 +1,122 @@
+"""
+Tests for idempotent claim submission (Idempotency-Key and content dedup)
+"""
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import config
+from database import IdempotencyKeyReused, create_claim_once, get_all_claims, get_claim
+from agents import supervisor_workflow
+from api.idempotency import submission_hash
+from api.main import app
+
+
+def _claim(**overrides):
+    claim = {
+        "policy_id": "POL-001", "incident_date": "2026-06-01T10:00:00", "claim_date": "2026-06-03T10:00:00",
+        "claim_type": "collision", "damage_description": "Side mirror knocked off in a car park",
+        "repair_shop": "Certified Auto", "estimated_damage_amount": 640.0,
+        "damage_photos": ["mirror.jpg"], "incident_report": "report", "repair_estimate": "estimate"
+    }
+    claim.update(overrides)
+    return claim
+
+
+def test_create_claim_once_matches_key_or_recent_content():
+    claim = {**_claim(), "customer_id": "CUST-001"}
+    content_hash = submission_hash(_claim(damage_description="Hail dents on the roof"))
+
+    first, created = create_claim_once(claim, "key-once-1", content_hash, 600)
+    assert created
+    assert create_claim_once(claim, "key-once-1", content_hash, 600) == (first, False)
+    assert create_claim_once(claim, None, content_hash, 600) == (first, False)
+    # The key belongs to the first submission's content
+    with pytest.raises(IdempotencyKeyReused):
+        create_claim_once(claim, "key-once-1", "other-content", 600)
+
+    # Outside the window only the key identifies a repeat
+    second, created = create_claim_once(claim, "key-once-2", content_hash, 0)
+    assert created and second != first
+
+
+def test_repeated_submission_returns_the_original_claim(monkeypatch):
+    monkeypatch.setattr(config, "SUBMISSION_DEDUP_WINDOW_S", 600.0)
+    claim = _claim(estimated_damage_amount=655.0)
+
+    with TestClient(app) as client:
+        before = len(get_all_claims())
+        first = client.post("/submit-claim", json=claim, headers={"Idempotency-Key": "ui-retry-1"}).json()
+        retry = client.post("/submit-claim", json=claim, headers={"Idempotency-Key": "ui-retry-1"}).json()
+        # Same content without the key: caught by the content hash
+        resubmit = client.post("/submit-claim", json=claim).json()
+        edited = client.post("/submit-claim", json={**claim, "estimated_damage_amount": 700.0}).json()
+
+    assert first["deduplicated"] is None
+    assert retry["claim_id"] == resubmit["claim_id"] == first["claim_id"]
+    assert retry["deduplicated"] and retry["approval_status"] == first["approval_status"]
+    assert retry["payout_amount"] == first["payout_amount"]
+    assert edited["claim_id"] != first["claim_id"]
+    assert len(get_all_claims()) == before + 2
+
+
+def test_concurrent_duplicates_share_one_workflow_run(monkeypatch):
+    monkeypatch.setattr(config, "SUBMISSION_DEDUP_WINDOW_S", 600.0)
+    validator = supervisor_workflow.validation_agent
+    validate, runs = validator.validate_claim, []
+
+    def slow_validate(state):
+        runs.append(state.get("claim_id"))
+        time.sleep(0.3)
+        return validate(state)
+
+    monkeypatch.setattr(validator, "validate_claim", slow_validate)
+    claim = _claim(estimated_damage_amount=672.0)
+
+    with TestClient(app) as client:
+        with ThreadPoolExecutor(4) as pool:
+            responses = list(pool.map(lambda _: client.post("/submit-claim", json=claim).json(), range(4)))
+
+    assert len({r["claim_id"] for r in responses}) == 1
+    assert len(runs) == 1
+    assert sum(bool(r["deduplicated"]) for r in responses) == 3
+    assert all(r["approval_status"] == responses[0]["approval_status"] for r in responses)
+
+
+def test_key_reused_for_a_different_claim_is_rejected():
+    claim = _claim(estimated_damage_amount=681.0)
+    with TestClient(app) as client:
+        first = client.post("/submit-claim", json=claim, headers={"Idempotency-Key": "ui-reuse-1"})
+        other = client.post("/submit-claim", json={**claim, "estimated_damage_amount": 9999.0},
+                            headers={"Idempotency-Key": "ui-reuse-1"})
+    assert first.status_code == 200
+    assert other.status_code == 422
+    assert "ui-reuse-1" in other.json()["detail"]
+
+
+def test_retry_after_a_failed_run_processes_the_claim(monkeypatch):
+    validator = supervisor_workflow.validation_agent
+    validate = validator.validate_claim
+    failures = [RuntimeError("policy service unavailable")]
+
+    def flaky_validate(state):
+        if failures:
+            raise failures.pop()
+        return validate(state)
+
+    monkeypatch.setattr(validator, "validate_claim", flaky_validate)
+    claim = _claim(estimated_damage_amount=688.0)
+    with TestClient(app) as client:
+        failed = client.post("/submit-claim", json=claim, headers={"Idempotency-Key": "ui-failed-1"})
+        retry = client.post("/submit-claim", json=claim, headers={"Idempotency-Key": "ui-failed-1"})
+
+    assert failed.status_code == 500
+    assert retry.status_code == 200
+    claim_id = retry.json()["claim_id"]
+    assert retry.json()["approval_status"] != "PENDING"
+    assert get_claim(claim_id)["approval_status"] == retry.json()["approval_status"]
@@ -0,0 +1,46 @@
+"""
+Tests for the BM25 policy index and reciprocal rank fusion
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from external_apis import DocumentManagementAPI
+from database.lexical_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+
+def test_tokenize_drops_stopwords_and_folds_plurals():
+    assert tokenize("What are the Claims deadlines?") == ["claim", "deadline"]
+
+
+def test_search_ranks_expected_policy_section_first():
+    index = BM25Index.build(DocumentManagementAPI().get_policy_chunks())
+    hits = index.search("rental car reimbursement daily limit", k=3)
+    assert hits[0]["metadata"]["source"] == "rental_coverage"
+    assert hits[0]["score"] >= hits[-1]["score"]
+    assert 0 < index.confidence(hits) <= 1
+
+
+def test_short_generic_query_is_not_confident():
+    index = BM25Index.build(DocumentManagementAPI().get_policy_chunks())
+    hits = index.search("what is covered", k=6)
+    # Every query term is in the top chunk, but that is a single word
+    assert hits[0]["term_coverage"] == 1.0 and hits[0]["matched_terms"] == 1
+    assert index.confidence(hits) == 0.0
+    assert index.confidence(index.search("what is the deductible for collision", k=6)) >= 0.6
+
+
+def test_index_round_trips_through_disk(tmp_path):
+    chunks = DocumentManagementAPI().get_policy_chunks()
+    path = str(tmp_path / "bm25.json")
+    built = BM25Index.load_or_build(path, chunks)
+    loaded = BM25Index.load_or_build(path, chunks)
+    query = "appeal a denied claim"
+    assert [h["id"] for h in loaded.search(query)] == [h["id"] for h in built.search(query)]
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "a", "d"]])
+    scores = dict(fused)
+    assert {doc_id for doc_id, _ in fused[:2]} == {"a", "b"}
+    assert scores["a"] > scores["c"]
@@ -0,0 +1,138 @@
+"""
+Tests for the shared LLM client against the local fake model
+"""
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from external_apis.deadline import Deadline, DeadlineExceeded, deadline_scope
+from external_apis.fake_llm import FakeChatModel, FakeLLMError
+from external_apis.llm_client import SharedLLMClient, TokenBucket, PrioritySemaphore, LLM_RETRIES
+
+
+def _client(model, **kwargs):
+    params = dict(max_concurrency=2, requests_per_second=1000, burst=1000,
+                  max_retries=3, backoff_base=0.001, backoff_max=0.01)
+    params.update(kwargs)
+    return SharedLLMClient(model=model, **params)
+
+
+def test_retries_throttling_then_succeeds():
+    model = FakeChatModel(responses=["ok"], fail_first=2, fail_status=429)
+    retries_before = LLM_RETRIES.value(lane="interactive")
+
+    response = _client(model).lane("interactive").invoke("hello")
+
+    assert response.content == "ok"
+    assert model.calls == 3
+    assert LLM_RETRIES.value(lane="interactive") - retries_before == 2
+
+
+def test_non_retryable_error_is_raised_immediately():
+    model = FakeChatModel(fail_first=1, fail_status=400)
+    try:
+        _client(model).invoke("hello")
+        assert False, "expected FakeLLMError"
+    except FakeLLMError as e:
+        assert e.status == 400
+    assert model.calls == 1
+
+
+def test_interactive_lane_overtakes_queued_batch_calls():
+    slots = PrioritySemaphore(1)
+    slots.acquire(priority=1)  # occupy the only slot
+    order = []
+
+    def waiter(name, priority):
+        slots.acquire(priority)
+        order.append(name)
+        slots.release()
+
+    batch = threading.Thread(target=waiter, args=("batch", 1))
+    batch.start()
+    while slots.queued() < 1:
+        time.sleep(0.001)
+    interactive = threading.Thread(target=waiter, args=("interactive", 0))
+    interactive.start()
+    while slots.queued() < 2:
+        time.sleep(0.001)
+
+    slots.release()
+    batch.join(1)
+    interactive.join(1)
+    assert order == ["interactive", "batch"]
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    # First token is banked, the next five arrive at 50/s
+    assert time.monotonic() - start >= 0.09
+
+
+def test_concurrency_is_bounded():
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    class TrackingModel(FakeChatModel):
+        def invoke(self, messages, **kwargs):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+            return super().invoke(messages, **kwargs)
+
+    client = _client(TrackingModel(), max_concurrency=2)
+    threads = [threading.Thread(target=client.invoke, args=("hi",)) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(peak) <= 2
+
+
+def test_waits_and_calls_are_bounded_by_the_claim_deadline():
+    bucket = TokenBucket(rate=1, capacity=1)
+    bucket.acquire()
+    assert bucket.acquire(timeout=0.05) is False
+
+    client = _client(FakeChatModel(latency_ms=300), max_concurrency=1)
+    client._slots.acquire(priority=1)  # occupy the only slot
+    started = time.monotonic()
+    with deadline_scope(Deadline.after(50)), pytest.raises(DeadlineExceeded):
+        client.invoke("hello")
+    assert client._slots.queued() == 0
+    client._slots.release()
+
+    # A slow model call is given up at the deadline but keeps its slot until it returns
+    with deadline_scope(Deadline.after(50)), pytest.raises(DeadlineExceeded):
+        client.invoke("hello")
+    assert time.monotonic() - started < 0.25
+    assert client._slots.acquire(priority=1, timeout=0) is False
+    assert client._slots.acquire(priority=1, timeout=1) is True
+
+
+def test_backoff_gives_up_the_slot_until_the_retry():
+    model = FakeChatModel(responses=["ok"], fail_first=1, fail_status=429)
+    client = _client(model, max_concurrency=1)
+    client._backoff = lambda attempt: 0.3
+    throttled = threading.Thread(target=client.invoke, args=("first",))
+    throttled.start()
+    while model.calls < 1:
+        time.sleep(0.001)
+
+    # Runs in the throttled call's backoff instead of waiting behind it
+    started = time.monotonic()
+    assert client.invoke("second").content == "ok"
+    assert time.monotonic() - started < 0.2
+    throttled.join(2)
+    assert model.calls == 3 and client._slots.queued() == 0
@@ -0,0 +1,124 @@
+"""
+Tests for batched payout settlement against a local fake payment processor
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collections import Counter
+
+import pytest
+
+from agents.payout_settlement import PayoutSettlement, payout_idempotency_key
+from database import create_claim, iter_payments, update_claim
+
+ALL_STATUSES = ["PENDING", "SCHEDULED", "PROCESSING", "SETTLED", "FAILED"]
+
+
+class FakePaymentProcessor:
+    """
+    Stand-in for the processor behind PaymentAPI: keeps one payment per
+    idempotency key, settles a payment on its second status poll and can
+    lose the response to one batch after accepting it
+    """
+
+    def __init__(self, lose_response_on_batch: int = None):
+        self.accepted = {}
+        self.batches = []
+        self.status_calls = []
+        self.polls = Counter()
+        self.lose_response_on_batch = lose_response_on_batch
+
+    def process_payments(self, batch_id, payments, ach_file=None):
+        self.batches.append((batch_id, ach_file, len(payments)))
+        results = []
+        for payment in payments:
+            key = payment["idempotency_key"]
+            if key not in self.accepted:
+                self.accepted[key] = {
+                    "idempotency_key": key, "claim_id": payment["claim_id"], "amount": payment["amount"],
+                    "payment_id": f"FP-{len(self.accepted) + 1:06d}", "status": "SCHEDULED",
+                    "reference_number": f"REF-{key}"
+                }
+            results.append(dict(self.accepted[key]))
+        if len(self.batches) == self.lose_response_on_batch:
+            raise ConnectionError("connection reset before the response arrived")
+        return {"batch_id": batch_id, "results": results}
+
+    def get_payment_statuses(self, payment_ids):
+        self.status_calls.append(len(payment_ids))
+        statuses = []
+        for payment_id in payment_ids:
+            self.polls[payment_id] += 1
+            statuses.append({"payment_id": payment_id, "status": "PROCESSING" if self.polls[payment_id] == 1 else "SETTLED"})
+        return statuses
+
+
+def _approved_claims(customer_id, count, payout=1234.56):
+    claim_ids = []
+    for _ in range(count):
+        claim_id = create_claim({
+            "policy_id": "POL-001", "customer_id": customer_id, "incident_date": "2026-06-01T10:00:00",
+            "claim_date": "2026-06-03T10:00:00", "claim_type": "collision", "estimated_damage_amount": 2000.0
+        })
+        update_claim(claim_id, {"approval_status": "APPROVED", "payout_amount": payout})
+        claim_ids.append(claim_id)
+    return claim_ids
+
+
+def _payments(claim_ids):
+    claim_ids = set(claim_ids)
+    return {
+        payment["claim_id"]: payment
+        for chunk in iter_payments(ALL_STATUSES) for payment in chunk if payment["claim_id"] in claim_ids
+    }
+
+
+def test_settles_thousands_of_payouts_in_ach_batches(tmp_path):
+    claim_ids = _approved_claims("CUST-SETTLE-1", 2500)
+    denied = _approved_claims("CUST-SETTLE-1", 1)[0]
+    update_claim(denied, {"approval_status": "DENIED", "payout_amount": 0})
+
+    processor = FakePaymentProcessor()
+    settlement = PayoutSettlement(payment_api=processor, batch_size=1000, poll_chunk=400, out_dir=str(tmp_path))
+    summary = settlement.run()
+
+    payments = _payments(claim_ids + [denied])
+    assert len(payments) == 2500 and denied not in payments
+    assert {p["status"] for p in payments.values()} == {"SCHEDULED"}
+    assert all(processor.accepted[payout_idempotency_key(c)]["payment_id"] == payments[c]["payment_id"] for c in claim_ids)
+    assert summary["batches"] >= 3 and max(size for _, _, size in processor.batches) <= 1000
+
+    for path in summary["ach_files"]:
+        with open(path, encoding="ascii") as f:
+            records = f.read().splitlines()
+        assert all(len(record) == 94 for record in records) and len(records) % 10 == 0
+        entries = [record for record in records if record.startswith("6")]
+        file_control = next(record for record in records if record.startswith("9") and not record.startswith("99"))
+        assert int(file_control[13:21]) == len(entries)
+        assert int(file_control[43:55]) == sum(int(entry[29:39]) for entry in entries)
+
+    # Nothing new to pay on a second run
+    assert settlement.run().get("submitted", 0) == 0
+
+    assert settlement.poll().get("SCHEDULED->PROCESSING", 0) >= 2500
+    assert settlement.poll().get("PROCESSING->SETTLED", 0) >= 2500
+    assert max(processor.status_calls) <= 400
+    assert {p["status"] for p in _payments(claim_ids).values()} == {"SETTLED"}
+
+
+def test_interrupted_batch_is_resubmitted_without_paying_twice(tmp_path):
+    claim_ids = _approved_claims("CUST-SETTLE-2", 30, payout=800.0)
+    processor = FakePaymentProcessor(lose_response_on_batch=2)
+    settlement = PayoutSettlement(payment_api=processor, batch_size=10, out_dir=str(tmp_path))
+
+    with pytest.raises(ConnectionError):
+        settlement.run()
+    assert Counter(p["status"] for p in _payments(claim_ids).values())["PENDING"] >= 1
+
+    summary = settlement.run()
+    assert summary["resubmitted"] >= 1
+    payments = _payments(claim_ids)
+    assert {p["status"] for p in payments.values()} == {"SCHEDULED"}
+    assert len({p["payment_id"] for p in payments.values()}) == 30
+    assert sum(1 for key in processor.accepted if key in {payout_idempotency_key(c) for c in claim_ids}) == 30
@@ -0,0 +1,116 @@
+"""
+Tests for incremental reprocessing of corrected claims
+"""
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agents import supervisor_workflow
+from agents.agent_memo import TrackingState
+from agents.fraud_prescore import get_fraud_prescorer
+from api import main
+from api.main import app
+from tests.conftest import CLAIM
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_tracking_state_records_reads_not_own_writes():
+    state = TrackingState({"a": 1, "b": 2})
+    state["c"] = state["a"] + 1
+    state.get("c")
+    "b" in state
+    assert state.reads == {"a", "b"}
+
+
+def test_reprocess_reuses_agents_whose_inputs_did_not_change(client):
+    submitted = client.post("/submit-claim", json=CLAIM).json()
+    claim_id = submitted["claim_id"]
+    assert submitted["reused_agents"] is None
+
+    # Same claim, no corrections: nothing needs to run again
+    unchanged = client.post(f"/claim/{claim_id}/reprocess", json={}).json()
+    assert set(unchanged["reused_agents"]) == {"document_analyzer", "validation", "approval"}
+    assert unchanged["approval_status"] == submitted["approval_status"]
+    assert unchanged["payout_amount"] == submitted["payout_amount"]
+
+    # Only the approval agent looks at the repair shop
+    new_shop = client.post(f"/claim/{claim_id}/reprocess", json={"repair_shop": "Main Street Body"}).json()
+    assert set(new_shop["reused_agents"]) == {"document_analyzer", "validation"}
+    assert new_shop["node_timings"]["approval"]["calls"] == 1
+
+    # The amount feeds every agent's decision, so they all run again
+    corrected = client.post(f"/claim/{claim_id}/reprocess", json={"estimated_damage_amount": 4200.0}).json()
+    assert corrected["reused_agents"] is None
+    assert corrected["payout_amount"] != submitted["payout_amount"]
+    assert client.get(f"/claim/{claim_id}").json()["estimated_damage_amount"] == 4200.0
+
+
+def test_reprocess_reuses_agents_with_unseeded_vendor_scores(client, monkeypatch):
+    # Production vendors are not seeded: a fresh fraud score differs on every call
+    for api in (get_fraud_prescorer().fraud_api, supervisor_workflow.approval_agent.fraud_api,
+                supervisor_workflow.approval_agent.damage_api, supervisor_workflow.document_analyzer.damage_api):
+        monkeypatch.setattr(api, "seed", None)
+    prescorer = get_fraud_prescorer().fraud_api
+    score, scored = prescorer.score_claim, []
+    monkeypatch.setattr(prescorer, "score_claim", lambda **kwargs: scored.append(kwargs) or score(**kwargs))
+
+    submitted = client.post("/submit-claim", json=CLAIM).json()
+    unchanged = client.post(f"/claim/{submitted['claim_id']}/reprocess", json={}).json()
+    assert set(unchanged["reused_agents"]) == {"document_analyzer", "validation", "approval"}
+    assert unchanged["fraud_score"] == submitted["fraud_score"]
+    # The earlier score is carried over instead of asking the vendor again
+    assert len(scored) == 1
+
+
+def test_reprocess_unknown_claim_is_404(client):
+    assert client.post("/claim/CLM-MISSING/reprocess", json={}).status_code == 404
+
+
+def test_reprocess_does_not_block_other_requests(client, monkeypatch):
+    claim_id = client.post("/submit-claim", json=CLAIM).json()["claim_id"]
+    started, release = threading.Event(), threading.Event()
+    real_reprocess_claim = main.reprocess_claim
+
+    def slow_reprocess_claim(*args):
+        started.set()
+        release.wait(5)
+        return real_reprocess_claim(*args)
+
+    monkeypatch.setattr(main, "reprocess_claim", slow_reprocess_claim)
+    responses = []
+    reprocess = threading.Thread(target=lambda: responses.append(
+        client.post(f"/claim/{claim_id}/reprocess", json={"repair_shop": "Main Street Body"})))
+    reprocess.start()
+    assert started.wait(5)
+    try:
+        # Answered while the reprocessing is still running
+        assert client.get("/health").status_code == 200
+        assert reprocess.is_alive()
+    finally:
+        release.set()
+        reprocess.join()
+    assert responses[0].status_code == 200
+
+
+def test_failed_reprocess_leaves_the_claim_uncorrected(client, monkeypatch):
+    claim_id = client.post("/submit-claim", json=CLAIM).json()["claim_id"]
+
+    def failing_reprocess_claim(*args):
+        raise RuntimeError("agent failed")
+
+    monkeypatch.setattr(main, "reprocess_claim", failing_reprocess_claim)
+    assert client.post(f"/claim/{claim_id}/reprocess", json={"repair_shop": "Main Street Body"}).status_code == 500
+    assert main.get_claim(claim_id)["repair_shop"] == "Certified Auto"
+
+    monkeypatch.undo()
+    assert client.post(f"/claim/{claim_id}/reprocess", json={"repair_shop": "Main Street Body"}).status_code == 200
+    assert main.get_claim(claim_id)["repair_shop"] == "Main Street Body"
@@ -0,0 +1,90 @@
+"""
+Tests for the repair shop reputation index
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import string
+import time
+
+from agents.shop_reputation import RepairShopReputation, ShopNameIndex
+from database import create_claim, get_repair_shops, update_claim
+from database.repair_shops import normalize_shop_name
+
+
+def _row(name, reputation="standard", claims=0, frauds=0):
+    return {
+        "shop_key": normalize_shop_name(name), "display_name": name, "reputation": reputation,
+        "claim_count": claims, "fraud_claim_count": frauds, "updated_at": "2026-06-01T00:00:00"
+    }
+
+
+def test_exact_prefix_and_fuzzy_matches():
+    index = ShopNameIndex(min_similarity=0.7)
+    index.upsert([_row("Certified Auto Body"), _row("Dealer Service Center"), _row("Joe's Garage")])
+
+    assert index.match("CERTIFIED  auto-body")[1] == "exact"
+    assert index.match("Certified Auto Body Shop")[0]["display_name"] == "Certified Auto Body"
+    assert index.match("Certified Auto")[1] == "prefix"
+    assert index.match("Dealer Servce Center")[1] == "fuzzy"
+    assert index.match("Main Street Body") is None
+    assert index.match("") is None
+
+
+def test_reputation_and_fraud_rate_drive_the_risk_level():
+    rows = [
+        _row("Certified Auto Body", "trusted"), _row("Quick Fix Auto", "flagged"),
+        _row("Main Street Body", claims=10, frauds=4), _row("Quiet Lane Motors", claims=3, frauds=3)
+    ]
+    reputation = RepairShopReputation(loader=lambda updated_since=None: rows, refresh_s=3600)
+
+    assert reputation.assess("Certified Auto Body Shop")["risk_level"] == "low"
+    assert reputation.assess("Certified Auto Body Quick Service")["risk_level"] == "high"
+    assert reputation.assess("Quick Fix Auto")["reason"] == "Shop is flagged as high-risk"
+    assert reputation.assess("Main Street Body")["risk_level"] == "high"
+    assert reputation.assess("Quiet Lane Motors")["risk_level"] == "medium"  # too few claims to judge
+    assert reputation.assess("Authorized Dealer Hub")["risk_level"] == "low"  # unknown: name keywords
+    assert reputation.assess(None)["risk_level"] == "unknown"
+
+
+def test_scored_claims_update_shop_fraud_counts_incrementally():
+    since = []
+
+    def loader(updated_since=None):
+        since.append(updated_since)
+        return get_repair_shops(updated_since=updated_since)
+
+    reputation = RepairShopReputation(loader=loader, refresh_s=3600)
+    assert reputation.assess("Riverside Panel Works")["risk_level"] == "medium"
+
+    for score in (0.9, 0.85, 0.2, 0.95, 0.3):
+        claim_id = create_claim({
+            "policy_id": "POL-001", "customer_id": "CUST-SHOP", "incident_date": "2026-06-01T10:00:00",
+            "claim_date": "2026-06-03T10:00:00", "claim_type": "collision", "repair_shop": "Riverside Panel Works"
+        })
+        update_claim(claim_id, {"fraud_score": score})
+    update_claim(claim_id, {"fraud_score": 0.35})  # re-scoring does not count the claim twice
+
+    shop = next(s for s in get_repair_shops() if s["shop_key"] == "riverside panel works")
+    assert (shop["claim_count"], shop["fraud_claim_count"]) == (5, 3)
+
+    assert reputation.refresh() >= 1
+    assert since[0] is None and since[1] is not None  # first load reads everything, then only changes
+    assessment = reputation.assess("Riverside Panel Works")
+    assert assessment["risk_level"] == "high" and assessment["fraud_rate"] == 0.6
+
+
+def test_lookups_stay_fast_with_tens_of_thousands_of_shops():
+    rng = random.Random(3)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(3000)]
+    names = {" ".join(rng.sample(words, 3)) for _ in range(30000)}
+    index = ShopNameIndex()
+    index.upsert(_row(name) for name in names)
+
+    queries = [name[:-1] + "x" for name in rng.sample(sorted(names), 500)]  # one typo each, all uncached
+    started = time.perf_counter()
+    matched = sum(index.match(query) is not None for query in queries)
+    assert (time.perf_counter() - started) / len(queries) < 0.002
+    assert matched == len(queries)
@@ -0,0 +1,68 @@
+"""
+Tests for the compact workflow step log
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from config import config
+from agents import supervisor_workflow
+from agents.step_log import append_steps, step_record, summarize_steps, SEQ, STEP
+from api.main import app
+from tests.conftest import CLAIM
+
+
+def test_log_numbers_steps_and_keeps_the_newest(monkeypatch):
+    monkeypatch.setattr(config, "WORKFLOW_HISTORY_MAX_STEPS", 3)
+    log = append_steps([], [step_record("supervisor", "route to validation")])
+    log = append_steps(log, [step_record(f"agent{i}", "ran") for i in range(4)])
+
+    assert [record[SEQ] for record in log] == [3, 4, 5]
+    assert [record[STEP] for record in log] == ["agent1", "agent2", "agent3"]
+    summary = summarize_steps(log)
+    assert (summary["total_steps"], summary["dropped_steps"]) == (5, 2)
+
+
+def test_response_carries_summary_and_steps_are_stored():
+    with TestClient(app) as client:
+        submitted = client.post("/submit-claim", json=CLAIM).json()
+        steps = client.get(f"/claim/{submitted['claim_id']}/workflow-steps").json()
+
+    summary = submitted["workflow_summary"]
+    assert "workflow_history" not in submitted
+    assert summary["path"] == [step["step"] for step in steps]
+    assert [step["seq"] for step in steps] == list(range(1, summary["total_steps"] + 1))
+    validation = next(step for step in steps if step["step"] == "validation")
+    assert validation["db_calls"] >= 1 and validation["reused"] is False
+
+
+def test_stored_steps_are_not_capped(monkeypatch):
+    monkeypatch.setattr(config, "WORKFLOW_HISTORY_MAX_STEPS", 2)
+    with TestClient(app) as client:
+        submitted = client.post("/submit-claim", json=CLAIM).json()
+        steps = client.get(f"/claim/{submitted['claim_id']}/workflow-steps").json()
+
+    summary = submitted["workflow_summary"]
+    assert summary["dropped_steps"] > 0 and len(summary["path"]) == 2
+    assert [step["seq"] for step in steps] == list(range(1, summary["total_steps"] + 1))
+    assert [step["step"] for step in steps][-2:] == summary["path"]
+
+
+def test_stored_steps_follow_log_order_when_parallel_agents_finish_out_of_order(monkeypatch):
+    doc_agent = supervisor_workflow.document_analyzer
+    analyze = doc_agent.analyze_documents
+
+    def slow_analysis(state):
+        time.sleep(0.1)  # validation, fanned out alongside, finishes first
+        return analyze(state)
+
+    monkeypatch.setattr(doc_agent, "analyze_documents", slow_analysis)
+    with TestClient(app) as client:
+        submitted = client.post("/submit-claim", json=CLAIM).json()
+        steps = client.get(f"/claim/{submitted['claim_id']}/workflow-steps").json()
+
+    assert submitted["workflow_summary"]["path"][1:3] == ["document_analyzer", "validation"]
+    assert [step["step"] for step in steps] == submitted["workflow_summary"]["path"]
@@ -0,0 +1,73 @@
+"""
+Tests for parallel fan-out in the supervisor workflow
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langgraph.types import Send
+
+from config import config
+from agents import supervisor_workflow
+from agents.state import merge_current_step
+from agents.step_log import summarize_steps
+from tests.conftest import stored_claim
+
+
+def test_current_step_keeps_furthest_stage():
+    assert merge_current_step("validation_complete", "document_analysis_complete") == "validation_complete"
+    assert merge_current_step("document_analysis_complete", "validation_complete") == "validation_complete"
+    assert merge_current_step("approval_complete", "supervisor_routed") == "supervisor_routed"
+
+
+def test_route_fans_out_only_to_parallel_safe_agents():
+    state = {"supervisor_decision": "document_analyzer", "parallel_agents": ["document_analyzer", "validation"]}
+    sends = supervisor_workflow.route_from_supervisor(state)
+    assert [s.node for s in sends] == ["document_analyzer", "validation"]
+    assert all(isinstance(s, Send) for s in sends)
+
+    state["parallel_agents"] = ["approval", "validation"]
+    assert supervisor_workflow.route_from_supervisor(state) == "document_analyzer"
+
+
+def test_claim_with_photos_runs_document_analysis_and_validation_together():
+    result = supervisor_workflow.process_claim_with_supervisor(stored_claim(damage_photos=["front.jpg", "rear.jpg"]))
+
+    steps = summarize_steps(result["workflow_history"])["path"]
+    assert steps[1:3] == ["document_analyzer", "validation"]
+    assert steps.count("document_analyzer") == 1 and steps.count("validation") == 1
+    assert result["document_analysis"]["photos_analyzed"] == 2
+    assert result["validation_status"] == "VALID"
+    assert result["approval_status"] == "APPROVED"
+
+
+def test_fan_out_latency_is_max_not_sum():
+    doc_agent = supervisor_workflow.document_analyzer
+    validator = supervisor_workflow.validation_agent
+    original_doc, original_validate = doc_agent.analyze_documents, validator.validate_claim
+
+    def slow(fn):
+        def wrapped(state):
+            time.sleep(0.15)
+            return fn(state)
+        return wrapped
+
+    doc_agent.analyze_documents = slow(original_doc)
+    validator.validate_claim = slow(original_validate)
+    try:
+        start = time.perf_counter()
+        supervisor_workflow.process_claim_with_supervisor(stored_claim())
+        parallel = time.perf_counter() - start
+
+        config.SUPERVISOR_PARALLEL_FANOUT = False
+        start = time.perf_counter()
+        supervisor_workflow.process_claim_with_supervisor(stored_claim())
+        serial = time.perf_counter() - start
+    finally:
+        config.SUPERVISOR_PARALLEL_FANOUT = True
+        del doc_agent.analyze_documents
+        del validator.validate_claim
+
+    assert serial >= 0.3
+    assert parallel < 0.27
@@ -0,0 +1,189 @@
+"""
+Tests for the vendor HTTP transport against the local stub servers
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from database import seed_sample_policies
+from external_apis.http_transport import CircuitBreaker, CircuitOpenError, VendorClients, VendorError, VendorTransport
+from external_apis.policy_management_api import PolicyManagementAPI
+from external_apis.remote_apis import RemotePaymentAPI, RemotePolicyManagementAPI
+from external_apis.stub_servers import StubVendorServer
+
+
+@pytest.fixture
+def vertafore():
+    seed_sample_policies()
+    server = StubVendorServer("vertafore")
+    server.start()
+    yield server
+    server.stop()
+
+
+def _clients(server, **kwargs):
+    options = dict(max_retries=2, backoff_base=0.001, backoff_max=0.01, hedge_delay_ms=0)
+    options.update(kwargs)
+    return VendorClients(base_urls={server.vendor: server.base_url}, max_concurrency={server.vendor: 4}, **options)
+
+
+def test_remote_policy_api_matches_the_mock(vertafore):
+    clients = _clients(vertafore)
+    try:
+        remote = RemotePolicyManagementAPI(clients=clients)
+        assert remote.get_policy_details("POL-001") == PolicyManagementAPI().get_policy_details("POL-001")
+        assert remote.get_policy_details("POL-404") is None
+        assert remote.check_coverage("POL-002", "collision", "2026-01-15T10:00:00")["is_covered"]
+
+        # Concurrent callers share the pool and never exceed the vendor's slots
+        with ThreadPoolExecutor(16) as pool:
+            results = list(pool.map(lambda _: remote.get_policy_details("POL-001"), range(64)))
+        assert all(r["policy_id"] == "POL-001" for r in results)
+    finally:
+        clients.close()
+
+
+def test_reads_are_retried_and_writes_without_a_key_are_not(vertafore):
+    clients = _clients(vertafore)
+    try:
+        vertafore.inject(2, status=503)
+        assert clients.call("vertafore", "GET", "/v1/policies/POL-001")["policy_id"] == "POL-001"
+        assert vertafore.requests == 3
+
+        vertafore.inject(1, status=503)
+        with pytest.raises(VendorError) as error:
+            clients.call("vertafore", "POST", "/v1/policies/POL-001")
+        assert error.value.status == 503 and vertafore.requests == 4
+    finally:
+        clients.close()
+
+
+def test_slow_reads_are_hedged(vertafore):
+    clients = _clients(vertafore, hedge_delay_ms=50, timeout_s=5)
+    try:
+        vertafore.inject(1, delay_ms=2000)
+        started = time.perf_counter()
+        assert clients.call("vertafore", "GET", "/v1/policies/POL-002")["policy_id"] == "POL-002"
+        assert time.perf_counter() - started < 1.0
+        assert vertafore.requests == 2
+    finally:
+        clients.close()
+
+
+def test_circuit_opens_fails_fast_and_recovers(vertafore):
+    clients = _clients(vertafore, max_retries=0)
+    clients.transport("vertafore").breaker = CircuitBreaker(failure_threshold=3, reset_s=0.2, vendor="vertafore")
+    try:
+        vertafore.inject(3, status=500)
+        for _ in range(3):
+            with pytest.raises(VendorError):
+                clients.call("vertafore", "GET", "/v1/policies/POL-001")
+        with pytest.raises(CircuitOpenError):
+            clients.call("vertafore", "GET", "/v1/policies/POL-001")
+        assert vertafore.requests == 3
+
+        time.sleep(0.25)
+        assert clients.call("vertafore", "GET", "/v1/policies/POL-001")["policy_id"] == "POL-001"
+        assert clients.transport("vertafore").breaker.state == "closed"
+    finally:
+        clients.close()
+
+
+def test_half_open_trial_is_freed_when_an_attempt_never_reaches_the_vendor():
+    async def scenario():
+        breaker = CircuitBreaker(failure_threshold=1, reset_s=0, vendor="vertafore")
+        breaker.record_failure()  # open; half-open on the next attempt
+        transport = VendorTransport(
+            "vertafore", "http://vendor.test", max_concurrency=1, max_retries=0, hedge_delay_ms=0, breaker=breaker,
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True}))
+        )
+        transport._ensure_client()
+
+        # Cancelled while waiting for a slot: never became the trial
+        await transport._slots.acquire()
+        waiting = asyncio.ensure_future(transport.request("GET", "/v1/ping"))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        transport._slots.release()
+        assert not breaker._trial_in_flight
+
+        # The trial fails before sending (body is not JSON-serializable)
+        with pytest.raises(TypeError):
+            await transport.request("POST", "/v1/ping", json={"at": object()}, read=True)
+        assert not breaker._trial_in_flight
+
+        assert await transport.request("GET", "/v1/ping") == {"ok": True}
+        assert breaker.state == "closed"
+        await transport.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_the_whole_request_is_bounded_by_its_timeout():
+    async def scenario():
+        transport = VendorTransport(
+            "vertafore", "http://vendor.test", max_concurrency=1, max_retries=5, backoff_base=1, backoff_max=1,
+            hedge_delay_ms=0, transport=httpx.MockTransport(lambda request: httpx.Response(503))
+        )
+        transport._ensure_client()
+
+        # Waiting for a slot counts
+        await transport._slots.acquire()
+        started = time.perf_counter()
+        with pytest.raises(VendorError):
+            await transport.request("GET", "/v1/ping", timeout_s=0.1)
+        assert time.perf_counter() - started < 0.5
+        transport._slots.release()
+
+        # No retry is started whose backoff outlasts the time left: the vendor's answer is returned
+        started = time.perf_counter()
+        with pytest.raises(VendorError) as error:
+            await transport.request("GET", "/v1/ping", timeout_s=0.2)
+        assert error.value.status == 503
+        assert time.perf_counter() - started < 0.2
+        await transport.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_a_call_does_not_wait_on_a_stalled_loop(vertafore):
+    clients = _clients(vertafore)
+    try:
+        loop = clients._ensure_loop()
+        loop.call_soon_threadsafe(time.sleep, 3)
+        started = time.perf_counter()
+        with pytest.raises(VendorError):
+            clients.call("vertafore", "GET", "/v1/policies/POL-001", timeout_s=0.1)
+        assert time.perf_counter() - started < 2
+    finally:
+        clients.close()
+
+
+def test_payment_writes_are_idempotent_across_retries():
+    server = StubVendorServer("payments")
+    server.start()
+    clients = _clients(server)
+    try:
+        payments = RemotePaymentAPI(clients=clients)
+        batch = [{"idempotency_key": "PAYOUT-CLM-1", "claim_id": "CLM-1", "amount": 100.0}]
+        first = payments.process_payments("BATCH-1", batch)["results"][0]
+        again = payments.process_payments("BATCH-2", batch)["results"][0]
+        assert first["payment_id"] == again["payment_id"]
+
+        # A retried single payment reuses its key, so the processor pays once
+        server.inject(1, status=502)
+        assert payments.process_payment("CLM-2", 50.0)["status"] == "SCHEDULED"
+        assert server.requests == 4
+        assert payments.get_payment_statuses([first["payment_id"]])[0]["payment_id"] == first["payment_id"]
+    finally:
+        clients.close()
+        server.stop()
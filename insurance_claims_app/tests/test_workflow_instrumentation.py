@@ -0,0 +1,56 @@
+"""
+Tests for per-node timing and call accounting in the supervisor workflow
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import seed_sample_policies, create_claim
+from agents.supervisor_workflow import process_claim_with_supervisor, NODE_DURATION
+from agents.state import merge_node_timings
+from agents.step_log import step_dicts
+from monitoring import track_step, record_db_call, record_llm_call
+
+
+def test_track_step_attributes_calls_to_innermost_step():
+    with track_step() as outer:
+        record_db_call("memory")
+        with track_step() as inner:
+            record_db_call("memory")
+            record_llm_call()
+    assert (outer.db_calls, outer.llm_calls) == (1, 0)
+    assert (inner.db_calls, inner.llm_calls) == (1, 1)
+    assert outer.wall_ms >= inner.wall_ms
+
+
+def test_node_timings_reducer_sums_per_node():
+    merged = merge_node_timings(
+        {"supervisor": {"calls": 1, "duration_ms": 1.5, "db_calls": 0}},
+        {"supervisor": {"calls": 1, "duration_ms": 2.0, "db_calls": 1}, "approval": {"calls": 1, "duration_ms": 3.0}}
+    )
+    assert merged == {"supervisor": {"calls": 2, "duration_ms": 3.5, "db_calls": 1},
+                      "approval": {"calls": 1, "duration_ms": 3.0}}
+
+
+def test_workflow_records_step_timings_and_totals():
+    seed_sample_policies()
+    claim = {
+        "policy_id": "POL-001", "customer_id": "CUST-001",
+        "incident_date": "2026-06-01T10:00:00", "claim_date": "2026-06-03T10:00:00",
+        "claim_type": "collision", "damage_description": "Rear-ended at a stop light, bumper damaged",
+        "repair_shop": "Certified Auto", "estimated_damage_amount": 3000.0,
+        "damage_photos": [], "incident_report": "report", "repair_estimate": "estimate"
+    }
+    claim["claim_id"] = create_claim(claim)
+    runs_before = NODE_DURATION.count(node="validation")
+
+    result = process_claim_with_supervisor(claim)
+
+    timings = result["node_timings"]
+    assert timings["validation"]["calls"] == 1
+    assert timings["validation"]["db_calls"] >= 1  # policy lookups
+    assert timings["supervisor"]["calls"] >= 1
+    validation_entry = next(h for h in step_dicts(result["workflow_history"]) if h["step"] == "validation")
+    assert validation_entry["db_calls"] >= 1 and validation_entry["duration_ms"] is not None
+    assert result["total_processing_time_ms"] >= 0
+    assert NODE_DURATION.count(node="validation") == runs_before + 1
@@ -5,8 +5,10 @@ Enhanced UI with modern design, better UX, and improved problem-solving experien
 import streamlit as st
 import requests
 from datetime import datetime, date, timedelta
+import hashlib
 import json
 import time
+import uuid
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"
@@ -784,6 +786,21 @@ def show_api_error():
         4. **Check the logs** for any startup errors
         """)
 
+def submission_key(fields, photos=()):
+    """
+    Idempotency-Key for a claim submission: a resubmit of the same form (after
+    a timeout) reuses it and gets the original claim back, an edited form gets
+    a new one. The per-session nonce is rotated after each successful submit.
+    """
+    if "submission_nonce" not in st.session_state:
+        st.session_state["submission_nonce"] = uuid.uuid4().hex
+    digest = hashlib.sha256(st.session_state["submission_nonce"].encode())
+    digest.update(json.dumps(fields, sort_keys=True, default=str).encode())
+    for photo in photos:
+        digest.update(photo.getvalue())
+    return digest.hexdigest()[:64]
+
+
 def validate_claim_form(damage_description, incident_report, repair_estimate):
     """Validate form fields and return errors"""
     errors = []
@@ -1095,6 +1112,7 @@ with tab1:
                                 f"{API_BASE_URL}/submit-claim-with-images",
                                 data=data,
                                 files=files,
+                                headers={"Idempotency-Key": submission_key(data, damage_photos)},
                                 timeout=120
                             )
                         else:
@@ -1114,6 +1132,7 @@ with tab1:
                             response = requests.post(
                                 f"{API_BASE_URL}/submit-claim",
                                 json=payload,
+                                headers={"Idempotency-Key": submission_key(payload)},
                                 timeout=120
                             )
                         
@@ -1235,8 +1254,9 @@ with tab1:
                                     4. 🔄 You may resubmit with additional documentation
                                     """)
                                 
-                                # Store claim ID for tracking
+                                # Store claim ID for tracking; the next form is a new submission
                                 st.session_state["last_claim_id"] = result["claim_id"]
+                                st.session_state.pop("submission_nonce", None)
                                 
                                 # Detailed results in expander
                                 with st.expander("📊 View Full Analysis Details"):